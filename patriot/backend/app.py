@@ -1,25 +1,20 @@
 # backend/app.py
+import importlib
 import logging
-from flask import Flask
+import click
+from flask import Flask, g
+from flask.cli import with_appcontext
 from flask_cors import CORS
 from flask_bcrypt import Bcrypt
 from flask_jwt_extended import JWTManager
-from flask_migrate import Migrate
 from backend.config import Config
-from backend.database import db
-
-# Import blueprints
-from backend.routes.auth_routes import auth_bp
-from backend.routes.accounts_routes import accounts_bp
-from backend.routes.financial_accounts_routes import financial_accounts_bp
-from backend.routes.bills_routes import bills_bp
-from backend.routes.funds_routes import funds_bp
-from backend.routes.transactions_routes import tx_bp
-from backend.routes.income_routes import income_bp
-from backend.routes.reports_routes import reports_bp
-from backend.routes.dashboard_routes import dashboard_bp
-from backend.routes.debts_routes import debts_bp
-from backend.routes.households_routes import households_bp
+from backend.database import db, configure_engine_options, register_engine_listeners, init_read_replica
+from backend.utils.query_stats import init_query_stats
+from backend.utils.metrics import init_metrics
+from backend.utils.membership import init_membership_cache
+from backend.utils.passwords import init_password_hasher
+from backend.utils.search import init_search
+from backend.utils.money import init_money
 
 # Import models to ensure they're registered with SQLAlchemy
 from backend.models.user import User
@@ -27,15 +22,77 @@ from backend.models.household import Household, HouseholdInvite, user_household
 from backend.models.bill import Bill
 from backend.models.fund import Fund
 from backend.models.transaction import Transaction
+from backend.models.transaction_archive import ArchivedTransaction, TransactionPeriodSummary
 from backend.models.income import Income
 from backend.models.debt import Debt
 from backend.models.account import Account
+from backend.models.refresh_token import RefreshToken
+from backend.models.sentinel import SentinelCursor
+from backend.models.email_outbox import EmailOutbox
 
-from flask_migrate import Migrate
+# Blueprints: (module, attribute, url prefix), registered by create_app()
+BLUEPRINTS = (
+    ("backend.routes.auth_routes", "auth_bp", "/api/auth"),
+    ("backend.routes.households_routes", "households_bp", "/api/households"),
+    ("backend.routes.accounts_routes", "accounts_bp", "/api/accounts"),
+    ("backend.routes.financial_accounts_routes", "financial_accounts_bp", "/api/financial-accounts"),
+    ("backend.routes.bills_routes", "bills_bp", "/api/bills"),
+    ("backend.routes.funds_routes", "funds_bp", "/api/funds"),
+    ("backend.routes.transactions_routes", "tx_bp", "/api/transactions"),
+    ("backend.routes.income_routes", "income_bp", "/api/income"),
+    ("backend.routes.reports_routes", "reports_bp", "/api/reports"),
+    ("backend.routes.dashboard_routes", "dashboard_bp", "/api/dashboard"),
+    ("backend.routes.debts_routes", "debts_bp", "/api/debts"),
+    ("backend.routes.sentinel_routes", "sentinel_bp", "/api/sentinel"),
+    ("backend.routes.export_routes", "export_bp", "/api/export"),
+)
 
 bcrypt = Bcrypt()
 jwt = JWTManager()
-migrate = Migrate()
+
+
+def register_blueprints(app):
+    """Import and register every blueprint in BLUEPRINTS."""
+    for module_name, attribute, url_prefix in BLUEPRINTS:
+        blueprint = getattr(importlib.import_module(module_name), attribute)
+        app.register_blueprint(blueprint, url_prefix=url_prefix)
+
+
+class _LazyMigrateCommands(click.Group):
+    """``flask db`` stand-in that imports Flask-Migrate (and Alembic) only when used."""
+
+    def __init__(self, app):
+        # Same group options as flask_migrate.cli.db; its commands read them from g
+        super().__init__(
+            "db", help="Perform database migrations.", callback=self._configure,
+            params=[
+                click.Option(["-d", "--directory"], default=None,
+                             help='Migration script directory (default is "migrations")'),
+                click.Option(["-x", "--x-arg"], multiple=True,
+                             help="Additional arguments consumed by custom env.py scripts"),
+            ],
+        )
+        self.app = app
+
+    @staticmethod
+    @with_appcontext
+    def _configure(directory, x_arg):
+        g.directory = directory
+        g.x_arg = x_arg
+
+    def _commands(self):
+        from flask_migrate import Migrate
+        from flask_migrate.cli import db as db_commands
+        if "migrate" not in self.app.extensions:
+            Migrate(self.app, db)
+        return db_commands
+
+    def list_commands(self, ctx):
+        return self._commands().list_commands(ctx)
+
+    def get_command(self, ctx, name):
+        return self._commands().get_command(ctx, name)
+
 
 def create_app():
     app = Flask(__name__, instance_relative_config=True, static_folder='static', static_url_path='/static')
@@ -50,23 +107,25 @@ def create_app():
         )
 
     # Initialize extensions
+    configure_engine_options(app)
     db.init_app(app)
+    register_engine_listeners(app)
+    init_read_replica(app)
+    init_query_stats(app)
+    init_metrics(app)
+    init_membership_cache(app)
+    init_password_hasher(app)
+    init_search(app)
+    init_money(app)
     bcrypt.init_app(app)
     jwt.init_app(app)
-    migrate.init_app(app, db)
-
-    # Register blueprints
-    app.register_blueprint(auth_bp, url_prefix="/api/auth")
-    app.register_blueprint(households_bp, url_prefix="/api/households")
-    app.register_blueprint(accounts_bp, url_prefix="/api/accounts")
-    app.register_blueprint(financial_accounts_bp, url_prefix="/api/financial-accounts")
-    app.register_blueprint(bills_bp, url_prefix="/api/bills")
-    app.register_blueprint(funds_bp, url_prefix="/api/funds")
-    app.register_blueprint(tx_bp, url_prefix="/api/transactions")
-    app.register_blueprint(income_bp, url_prefix="/api/income")
-    app.register_blueprint(reports_bp, url_prefix="/api/reports")
-    app.register_blueprint(dashboard_bp, url_prefix="/api/dashboard")
-    app.register_blueprint(debts_bp, url_prefix="/api/debts")
+
+    # Flask-Migrate pulls in Alembic; only the `flask db` commands need it
+    app.cli.add_command(_LazyMigrateCommands(app))
+
+    # Registered here, not on the first request, so url_map is complete for
+    # `flask routes`, url_for() and any WSGI middleware wrapped around the app
+    register_blueprints(app)
 
     # CLI command for database setup
     @app.cli.command("init-db")
@@ -91,6 +150,180 @@ def create_app():
         from scripts.seed_db import seed_database
         seed_database()
     
+    @app.cli.command("gen-data")
+    @click.option("--households", default=10, show_default=True, help="Households to generate.")
+    @click.option("--years", default=2, show_default=True, help="Years of transaction history each.")
+    @click.option("--seed", default=42, show_default=True, help="RNG seed (same seed, same data).")
+    @click.option("--end-date", type=click.DateTime(formats=["%Y-%m-%d"]), default=None,
+                  help="Last day of history, YYYY-MM-DD (default: today).")
+    @click.option("--chunk-size", default=50_000, show_default=True, help="Rows per bulk insert.")
+    @click.option("--password", default="password123", show_default=True,
+                  help="Password for every generated user (gen<id>@example.com).")
+    def gen_data(households, years, seed, end_date, chunk_size, password):
+        """Bulk-generate synthetic households with multi-year histories."""
+        import time
+        from backend.utils.data_generator import generate
+
+        start = time.perf_counter()
+
+        def report(totals):
+            click.echo(f"  {totals['transactions']:>12,} transactions  "
+                       f"{time.perf_counter() - start:8.1f}s", err=True)
+
+        with app.app_context():
+            db.create_all()
+            totals = generate(
+                db.engine, households=households, years=years, seed=seed,
+                end_date=end_date.date() if end_date else None, chunk_size=chunk_size,
+                password_hash=bcrypt.generate_password_hash(password).decode("utf-8"),
+                progress=report,
+            )
+        elapsed = time.perf_counter() - start
+        click.echo("✅ Generated " + ", ".join(f"{count:,} {name}" for name, count in totals.items()
+                                               if name != "user_defaults" and count))
+        click.echo(f"   in {elapsed:.1f}s ({totals['transactions'] / max(elapsed, 1e-9):,.0f} transactions/s)")
+
+    @app.cli.command("purge-refresh-tokens")
+    def purge_refresh_tokens():
+        """Delete expired refresh-token records."""
+        from backend.utils.tokens import purge_expired_refresh_tokens
+        with app.app_context():
+            click.echo(f"✅ Removed {purge_expired_refresh_tokens()} expired refresh tokens.")
+
+    @app.cli.command("sentinel-pull")
+    @click.option("--loop", is_flag=True, help="Keep pulling every --interval seconds.")
+    @click.option("--interval", default=60.0, show_default=True, help="Seconds between pulls with --loop.")
+    def sentinel_pull(loop, interval):
+        """Replicate users from the SENTINEL_APPS changes feeds."""
+        import time
+        from backend.shared.user_sync import get_sync_service
+
+        with app.app_context():
+            sync_service = get_sync_service(app.config)
+            if not sync_service:
+                raise click.ClickException("SENTINEL_APPS / CURRENT_APP_URL not configured")
+            while True:
+                results = sync_service.replicate(db.session, User, SentinelCursor,
+                                                 page_size=app.config["SENTINEL_FEED_PAGE_SIZE"])
+                for peer_url, counts in results.items():
+                    click.echo(f"{peer_url}: {counts['created']} created, {counts['updated']} updated")
+                if not loop:
+                    break
+                time.sleep(interval)
+
+    @app.cli.command("rebuild-search")
+    def rebuild_search():
+        """Recreate the full-text search indexes from the searchable tables."""
+        from backend.utils.search import install, rebuild
+        with app.app_context(), db.engine.begin() as connection:
+            install(connection)
+            rebuild(connection)
+        click.echo("✅ Search indexes rebuilt.")
+
+    @app.cli.command("archive-transactions")
+    @click.option("--months", type=int, default=None,
+                  help="Keep this many whole months live (default: ARCHIVE_AFTER_MONTHS).")
+    @click.option("--household", type=int, default=None, help="Only archive this household.")
+    def archive_transactions_command(months, household):
+        """Move transactions from closed months to the archive."""
+        from backend.utils.archive import archive_transactions
+        with app.app_context():
+            months = app.config["ARCHIVE_AFTER_MONTHS"] if months is None else months
+            totals = archive_transactions(months, household_id=household)
+        click.echo(f"✅ Archived {totals['transactions']} transactions "
+                   f"({totals['months']} household-months, {totals['households']} households).")
+
+    @app.cli.command("export-parquet")
+    @click.option("--out", "directory", required=True, type=click.Path(file_okay=False),
+                  help="Directory for the <table>.parquet files.")
+    @click.option("--household", type=int, default=None, help="Only export this household (default: all).")
+    @click.option("--table", "tables", multiple=True,
+                  help="Table to export (repeatable; default: accounts, funds, bills, debts, incomes, transactions).")
+    @click.option("--batch-size", type=int, default=None, help="Rows per row group (default: EXPORT_BATCH_SIZE).")
+    def export_parquet(directory, household, tables, batch_size):
+        """Write household tables to Parquet files for analytics."""
+        from backend.utils.export import EXPORT_TABLES, ExportUnavailable, write_parquet
+        unknown = [table for table in tables if table not in EXPORT_TABLES]
+        if unknown:
+            raise click.ClickException(f"Unknown table {unknown[0]}; choose from {', '.join(EXPORT_TABLES)}")
+        with app.app_context():
+            try:
+                counts = write_parquet(directory, household_id=household, tables=tables or None,
+                                       batch_size=batch_size or app.config["EXPORT_BATCH_SIZE"])
+            except ExportUnavailable as exc:
+                raise click.ClickException(str(exc))
+        click.echo("✅ Exported " + ", ".join(f"{count:,} {table}" for table, count in counts.items())
+                   + f" to {directory}")
+
+    @app.cli.command("household-backup")
+    @click.option("--household", type=int, required=True, help="Household to back up.")
+    @click.option("--out", "path", required=True, type=click.Path(dir_okay=False),
+                  help="Backup file to write (gzip-compressed JSON lines).")
+    def household_backup(household, path):
+        """Write one household's data to a compressed backup file."""
+        import time
+        from backend.utils.household_backup import BackupError, write_backup
+
+        start = time.perf_counter()
+        with app.app_context():
+            try:
+                size = write_backup(path, household, batch_size=app.config["BACKUP_BATCH_SIZE"])
+            except BackupError as exc:
+                raise click.ClickException(str(exc))
+        click.echo(f"✅ Household {household} backed up to {path} "
+                   f"({size / 2**20:.1f}MiB in {time.perf_counter() - start:.1f}s)")
+
+    @app.cli.command("household-restore")
+    @click.argument("path", type=click.Path(exists=True, dir_okay=False))
+    @click.option("--name", default=None, help="Name of the new household (default: the backed-up name).")
+    def household_restore(path, name):
+        """Restore a backup file as a new household, creating members who have no account."""
+        import time
+        from backend.utils.household_backup import BackupError, restore_backup
+
+        start = time.perf_counter()
+        with app.app_context(), open(path, "rb") as stream:
+            try:
+                counts = restore_backup(stream, name=name, create_users=True,
+                                        batch_size=app.config["BACKUP_BATCH_SIZE"])
+            except BackupError as exc:
+                raise click.ClickException(str(exc))
+        rows = ", ".join(f"{count:,} {table}" for table, count in counts.items()
+                         if table not in ("household_id", "users_created", "members") and count)
+        click.echo(f"✅ Restored as household {counts['household_id']} in {time.perf_counter() - start:.1f}s: "
+                   f"{counts['members']} members ({counts['users_created']} new users), {rows or 'no rows'}")
+
+    @app.cli.command("email-worker")
+    @click.option("--once", is_flag=True, help="Send what is due now and exit.")
+    def email_worker(once):
+        """Deliver queued emails from the email outbox."""
+        from backend.utils.email_outbox import OutboxWorker
+
+        worker = OutboxWorker(app)
+        try:
+            totals = worker.run(once=once)
+        except KeyboardInterrupt:
+            worker.connection.close()
+            return
+        click.echo(f"{totals['sent']} sent, {totals['retried']} to retry, {totals['dead']} dead, "
+                   f"{totals['released']} deferred (SMTP unavailable)")
+
+    @app.cli.command("email-requeue")
+    @click.option("--id", "ids", type=int, multiple=True, help="Outbox row to retry (default: all dead).")
+    def email_requeue(ids):
+        """Move dead emails back to pending."""
+        from backend.utils.email_outbox import requeue_dead
+        with app.app_context():
+            click.echo(f"✅ Re-queued {requeue_dead(ids)} emails.")
+
+    @app.cli.command("purge-email-outbox")
+    @click.option("--days", default=30, show_default=True, help="Keep sent emails this many days.")
+    def purge_email_outbox(days):
+        """Delete sent emails older than --days."""
+        from backend.utils.email_outbox import purge_sent
+        with app.app_context():
+            click.echo(f"✅ Removed {purge_sent(days)} sent emails.")
+
     @app.cli.command("reset-and-seed")
     def reset_and_seed():
         """Reset database and seed with sample data."""
@@ -0,0 +1,19 @@
+# backend/benchmarks/__init__.py
+"""
+Route and forecasting benchmarks over synthetic households.
+
+    python -m backend.benchmarks run --scales small,medium
+    python -m backend.benchmarks compare before.json after.json
+
+``run`` seeds one household per scale with :func:`backend.utils.data_generator.build_household`,
+times the key routes through the Flask test client and writes a JSON result
+file tagged with the current git commit; ``compare`` diffs two such files.
+``python -m backend.benchmarks.loadtest`` is the HTTP load generator.
+"""
+
+# name -> (transactions, bills)
+SCALES = {
+    "small": (100, 10),
+    "medium": (10_000, 100),
+    "large": (1_000_000, 500),
+}
@@ -0,0 +1,58 @@
+# backend/benchmarks/__main__.py
+import argparse
+import json
+import sys
+from backend.benchmarks import SCALES
+from backend.benchmarks.compare import compare, format_rows
+from backend.benchmarks.runner import CASES, run
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m backend.benchmarks", description=__doc__)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub.add_parser("run", help="Seed synthetic households and time the routes")
+    run_parser.add_argument("--scales", default="small,medium",
+                            help=f"Comma-separated scales from: {', '.join(SCALES)}")
+    run_parser.add_argument("--cases", help=f"Comma-separated subset of: {', '.join(CASES)}")
+    run_parser.add_argument("--repeat", type=int, default=5, help="Timed runs per read-only case")
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--database-url",
+                            help="Database to benchmark against (tables are dropped!); default: temp SQLite")
+    run_parser.add_argument("--output", help="Result file (default: benchmark-<commit>.json)")
+
+    compare_parser = sub.add_parser("compare", help="Diff two result files")
+    compare_parser.add_argument("before")
+    compare_parser.add_argument("after")
+    compare_parser.add_argument("--threshold", type=float, default=0.2,
+                                help="Relative slowdown reported as a regression")
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        scales = args.scales.split(",")
+        unknown = [s for s in scales if s not in SCALES]
+        if unknown:
+            parser.error(f"unknown scale(s): {', '.join(unknown)}")
+        cases = args.cases.split(",") if args.cases else None
+        results = run(scales, args.database_url, args.repeat, cases, args.seed)
+        output = args.output or f"benchmark-{(results['commit'] or 'local')[:8]}.json"
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {output}")
+        return 0
+
+    with open(args.before) as f:
+        before = json.load(f)
+    with open(args.after) as f:
+        after = json.load(f)
+    rows, regressions = compare(before, after, args.threshold)
+    print(format_rows(rows))
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%} or with more queries")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+# backend/benchmarks/compare.py
+"""Diff two benchmark result files case by case."""
+
+
+def compare(before, after, threshold=0.2):
+    """
+    Compare median latency and query counts between two result documents.
+
+    Args:
+        before: Result document from the baseline commit
+        after: Result document from the candidate commit
+        threshold: Relative slowdown that counts as a regression (0.2 = 20%)
+
+    Returns:
+        tuple: (rows, regressions) where each row is
+        (scale, case, before_ms, after_ms, change, before_queries, after_queries)
+    """
+    rows, regressions = [], []
+    for scale, new in after.get("scales", {}).items():
+        old = before.get("scales", {}).get(scale)
+        if not old:
+            continue
+        for case, result in new["cases"].items():
+            previous = old["cases"].get(case)
+            if not previous:
+                continue
+            change = (result["median_ms"] - previous["median_ms"]) / previous["median_ms"] \
+                if previous["median_ms"] else 0.0
+            row = (scale, case, previous["median_ms"], result["median_ms"], change,
+                   previous.get("queries"), result.get("queries"))
+            rows.append(row)
+            more_queries = (result.get("queries") or 0) > (previous.get("queries") or 0)
+            if change > threshold or more_queries:
+                regressions.append(row)
+    return rows, regressions
+
+
+def format_rows(rows):
+    lines = [f"{'scale':<7} {'case':<32} {'before':>10} {'after':>10} {'change':>8} {'queries':>13}"]
+    for scale, case, old_ms, new_ms, change, old_q, new_q in rows:
+        lines.append(f"{scale:<7} {case:<32} {old_ms:>8.1f}ms {new_ms:>8.1f}ms {change:>+7.0%} "
+                     f"{str(old_q):>6}->{str(new_q):<6}")
+    return "\n".join(lines)
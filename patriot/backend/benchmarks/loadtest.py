@@ -0,0 +1,397 @@
+# backend/benchmarks/loadtest.py
+"""
+Async load generator for the REST API.
+
+Logs in as many users and has each replay a weighted mix of real flows
+(dashboard load, transaction create, bill pay, forecast view, household switch)
+against a server, then reports throughput, error rate and p50/p95/p99 latency
+per endpoint. Uses only the standard library: a small keep-alive HTTP/1.1
+client on asyncio streams, one connection per virtual user.
+
+    # self-contained: generate 20 households, start gunicorn, run for 30s
+    python -m backend.benchmarks.loadtest --generate 20 --concurrency 50 --duration 30
+
+    # against a running server and the seed_db demo logins
+    python -m backend.benchmarks.loadtest --url http://127.0.0.1:5000 \\
+        --credentials test@example.com:testpass123,demo@example.com:demo123
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import urlsplit
+
+
+class HTTPError(Exception):
+    pass
+
+
+class _Connection:
+    """Minimal keep-alive HTTP/1.1 client (Content-Length and chunked bodies)."""
+
+    def __init__(self, host, port):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+
+    async def _open(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    def close(self):
+        if self.writer:
+            self.writer.close()
+            self.reader = self.writer = None
+
+    async def request(self, method, path, token=None, payload=None):
+        body = json.dumps(payload).encode() if payload is not None else b""
+        head = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}",
+                f"Content-Length: {len(body)}", "Connection: keep-alive"]
+        if payload is not None:
+            head.append("Content-Type: application/json")
+        if token:
+            head.append(f"Authorization: Bearer {token}")
+        raw = ("\r\n".join(head) + "\r\n\r\n").encode() + body
+
+        for attempt in (0, 1):
+            if self.writer is None:
+                await self._open()
+            try:
+                self.writer.write(raw)
+                await self.writer.drain()
+                return await self._read_response()
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # The server closed an idle keep-alive connection; retry once on a fresh one
+                self.close()
+                if attempt:
+                    raise
+
+    async def _read_response(self):
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError("connection closed")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await self.reader.readline()
+                    break
+                chunks.append(await self.reader.readexactly(size))
+                await self.reader.readline()
+            body = b"".join(chunks)
+        else:
+            body = await self.reader.readexactly(int(headers.get("content-length", 0)))
+
+        if headers.get("connection", "").lower() == "close":
+            self.close()
+        return status, body
+
+
+class _Stats:
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+        self.started = time.perf_counter()
+
+    def record(self, endpoint, seconds, ok):
+        self.latencies.setdefault(endpoint, []).append(seconds * 1000)
+        if not ok:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+
+class VirtualUser:
+    """One logged-in user replaying flows over its own connection."""
+
+    def __init__(self, host, port, email, password, stats, rng):
+        self.conn = _Connection(host, port)
+        self.email, self.password = email, password
+        self.stats, self.rng = stats, rng
+        self.token = None
+        self.account_ids, self.bill_ids, self.household_ids = [], [], []
+
+    async def call(self, method, path, endpoint=None, payload=None):
+        start = time.perf_counter()
+        try:
+            status, body = await self.conn.request(method, path, self.token, payload)
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            self.conn.close()
+            self.stats.record(endpoint or f"{method} {path}", time.perf_counter() - start, False)
+            return None
+        self.stats.record(endpoint or f"{method} {path}", time.perf_counter() - start, status < 400)
+        if status >= 400:
+            return None
+        return json.loads(body) if body else {}
+
+    async def login(self):
+        data = await self.call("POST", "/api/auth/login", payload={"email": self.email, "password": self.password})
+        if not data or "access_token" not in data:
+            raise HTTPError(f"login failed for {self.email}")
+        self.token = data["access_token"]
+        accounts = await self.call("GET", "/api/financial-accounts/") or {}
+        self.account_ids = [a["id"] for a in accounts.get("accounts", [])]
+        bills = await self.call("GET", "/api/bills/") or {}
+        self.bill_ids = [b["id"] for b in bills.get("bills", [])]
+        households = await self.call("GET", "/api/households/") or {}
+        self.household_ids = [h["id"] for h in households.get("households", [])]
+
+    async def dashboard(self):
+        await self.call("GET", "/api/dashboard/summary")
+        await self.call("GET", "/api/dashboard/charts/bills")
+        await self.call("GET", "/api/dashboard/charts/debts")
+        await self.call("GET", "/api/transactions/summary")
+
+    async def create_transaction(self):
+        payload = {
+            "amount": f"{self.rng.uniform(3, 120):.2f}",
+            "description": "Load test purchase",
+            "category": self.rng.choice(("Dining", "Groceries", "Shopping", "Transportation")),
+            "transaction_type": "expense",
+        }
+        if self.account_ids:
+            payload["account_id"] = self.rng.choice(self.account_ids)
+        await self.call("POST", "/api/transactions/", payload=payload)
+
+    async def pay_bill(self):
+        await self.call("GET", "/api/bills/upcoming")
+        if self.bill_ids:
+            await self.call("POST", f"/api/bills/{self.rng.choice(self.bill_ids)}/pay", "POST /api/bills/<id>/pay")
+
+    async def forecast(self):
+        await self.call("GET", "/api/reports/forecast")
+        await self.call("GET", "/api/reports/upcoming-bills")
+        await self.call("GET", "/api/reports/financial-health")
+
+    async def switch_household(self):
+        await self.call("GET", "/api/households/")
+        if self.household_ids:
+            household_id = self.rng.choice(self.household_ids)
+            await self.call("POST", f"/api/households/{household_id}/switch",
+                            "POST /api/households/<id>/switch")
+
+
+FLOWS = {
+    "dashboard": (VirtualUser.dashboard, 40),
+    "create_transaction": (VirtualUser.create_transaction, 25),
+    "pay_bill": (VirtualUser.pay_bill, 10),
+    "forecast": (VirtualUser.forecast, 15),
+    "switch_household": (VirtualUser.switch_household, 10),
+}
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+async def run_load(url, credentials, concurrency, duration, weights, think_ms=0, seed=0):
+    """Drive ``concurrency`` virtual users for ``duration`` seconds; return the stats."""
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    stats = _Stats()
+    users = [
+        VirtualUser(host, port, email, password, stats, random.Random(seed + i))
+        for i, (email, password) in zip(range(concurrency), itertools.cycle(credentials))
+    ]
+    await asyncio.gather(*(user.login() for user in users))
+    # Logins and id lookups are reported separately from the steady-state mix
+    stats.setup = (stats.latencies, stats.errors)
+    stats.latencies, stats.errors = {}, {}
+
+    names = list(weights)
+    flow_weights = [weights[name] for name in names]
+    stats.started = time.perf_counter()
+    deadline = stats.started + duration
+
+    async def drive(user):
+        while time.perf_counter() < deadline:
+            flow = user.rng.choices(names, flow_weights)[0]
+            await FLOWS[flow][0](user)
+            if think_ms:
+                await asyncio.sleep(think_ms / 1000)
+
+    await asyncio.gather(*(drive(user) for user in users))
+    stats.elapsed = time.perf_counter() - stats.started
+    for user in users:
+        user.conn.close()
+    return stats
+
+
+def _endpoint_rows(latencies, errors):
+    rows = {}
+    for endpoint, samples in sorted(latencies.items()):
+        samples.sort()
+        rows[endpoint] = {
+            "requests": len(samples),
+            "errors": errors.get(endpoint, 0),
+            "p50_ms": round(percentile(samples, 50), 2),
+            "p95_ms": round(percentile(samples, 95), 2),
+            "p99_ms": round(percentile(samples, 99), 2),
+            "max_ms": round(samples[-1], 2),
+        }
+    return rows
+
+
+def summarize(stats):
+    endpoints = _endpoint_rows(stats.latencies, stats.errors)
+    total = sum(row["requests"] for row in endpoints.values())
+    errors = sum(row["errors"] for row in endpoints.values())
+    return {
+        "duration_s": round(stats.elapsed, 2),
+        "requests": total,
+        "throughput_rps": round(total / stats.elapsed, 1) if stats.elapsed else 0.0,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "endpoints": endpoints,
+        "setup": _endpoint_rows(*stats.setup),
+    }
+
+
+def _print_rows(rows):
+    print(f"{'endpoint':<44} {'reqs':>7} {'errs':>5} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    for endpoint, row in rows.items():
+        print(f"{endpoint:<44} {row['requests']:>7} {row['errors']:>5} {row['p50_ms']:>7.1f}ms "
+              f"{row['p95_ms']:>7.1f}ms {row['p99_ms']:>7.1f}ms {row['max_ms']:>7.1f}ms")
+
+
+def print_summary(summary):
+    print(f"\n{summary['requests']} requests in {summary['duration_s']}s: "
+          f"{summary['throughput_rps']} req/s, error rate {summary['error_rate']:.2%}\n")
+    _print_rows(summary["endpoints"])
+    print("\nsetup (login and id lookups, before the timed run)")
+    _print_rows(summary["setup"])
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(env, workers, threads):
+    """Start gunicorn on a free local port; return (process, url)."""
+    port = _free_port()
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, **env, GUNICORN_BIND=f"127.0.0.1:{port}",
+               GUNICORN_WORKERS=str(workers), GUNICORN_THREADS=str(threads))
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", os.path.join(backend_dir, "gunicorn.conf.py"),
+         "backend.app:create_app()"],
+        cwd=os.path.dirname(backend_dir), env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("server exited during startup")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return process, f"http://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("server did not start within 30s")
+
+
+def generate_database(households, password):
+    """Create a temp SQLite database filled by the data generator; return its URL and logins."""
+    from backend.config import Config
+    url = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='patriot-load-'), 'load.db')}"
+    Config.SQLALCHEMY_DATABASE_URI = url
+    from backend.app import bcrypt, create_app
+    from backend.database import db
+    from backend.models import User
+    from backend.utils.data_generator import generate
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        generate(db.engine, households=households, years=1,
+                 password_hash=bcrypt.generate_password_hash(password).decode("utf-8"))
+        emails = [email for (email,) in db.session.query(User.email).order_by(User.id)]
+    return url, [(email, password) for email in emails]
+
+
+def parse_weights(spec):
+    weights = {name: weight for name, (_, weight) in FLOWS.items()}
+    for item in filter(None, (spec or "").split(",")):
+        name, _, value = item.partition("=")
+        if name not in FLOWS:
+            raise argparse.ArgumentTypeError(f"unknown flow {name!r}; choose from {', '.join(FLOWS)}")
+        weights[name] = float(value)
+    return {name: weight for name, weight in weights.items() if weight > 0}
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m backend.benchmarks.loadtest", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Server to load (default: start gunicorn locally)")
+    parser.add_argument("--generate", type=int, metavar="HOUSEHOLDS",
+                        help="Generate a temp SQLite database with this many households and use its users")
+    parser.add_argument("--credentials", help="Comma-separated email:password logins")
+    parser.add_argument("--email-template", default="gen{}@example.com",
+                        help="Login template for generated users when --users is given")
+    parser.add_argument("--users", type=int, help="Log in as user ids 1..N via --email-template")
+    parser.add_argument("--password", default="password123")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds to run")
+    parser.add_argument("--think-ms", type=float, default=0, help="Pause between flows per user")
+    parser.add_argument("--weights", type=parse_weights, default=parse_weights(None),
+                        help=f"Override flow weights, e.g. dashboard=50,pay_bill=0 ({', '.join(FLOWS)})")
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn workers when starting a server")
+    parser.add_argument("--threads", type=int, default=4, help="gunicorn threads per worker")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Also write the summary as JSON")
+    args = parser.parse_args()
+
+    env = {}
+    credentials = []
+    if args.generate:
+        env["DATABASE_URL"], credentials = generate_database(args.generate, args.password)
+    if args.credentials:
+        credentials += [tuple(item.split(":", 1)) for item in args.credentials.split(",")]
+    if args.users:
+        credentials += [(args.email_template.format(i), args.password) for i in range(1, args.users + 1)]
+    if not credentials:
+        parser.error("no users: pass --generate, --users or --credentials")
+
+    process = None
+    url = args.url
+    if not url:
+        process, url = start_server(env, args.workers, args.threads)
+    try:
+        print(f"{args.concurrency} virtual users ({len(credentials)} logins) against {url} "
+              f"for {args.duration}s")
+        stats = asyncio.run(run_load(url, credentials, args.concurrency, args.duration,
+                                     args.weights, args.think_ms, args.seed))
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+
+    summary = summarize(stats)
+    print_summary(summary)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
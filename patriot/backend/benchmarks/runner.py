@@ -0,0 +1,117 @@
+# backend/benchmarks/runner.py
+"""Time the key routes against each synthetic scale and collect the results."""
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from flask_jwt_extended import create_access_token
+from backend.benchmarks import SCALES
+from backend.utils.data_generator import build_household
+from backend.config import Config
+from backend.database import db
+
+# name -> (method, path, mutates). Mutating cases run once, after the reads.
+CASES = {
+    "list_transactions": ("GET", "/api/transactions/", False),
+    "transactions_summary": ("GET", "/api/transactions/summary", False),
+    "transactions_by_category": ("GET", "/api/transactions/by-category", False),
+    "transactions_search": ("GET", "/api/transactions/search?q=card%20pur", False),
+    "income_summary": ("GET", "/api/income/summary", False),
+    "reports_forecast": ("GET", "/api/reports/forecast", False),
+    "reports_financial_health": ("GET", "/api/reports/financial-health", False),
+    "dashboard_summary": ("GET", "/api/dashboard/summary", False),
+    "dashboard_charts_bills": ("GET", "/api/dashboard/charts/bills", False),
+    "dashboard_charts_debts": ("GET", "/api/dashboard/charts/debts", False),
+    "auto_generate": ("POST", "/api/transactions/auto-generate", True),
+    "process_recurring_transactions": ("POST", "/api/transactions/process-recurring", True),
+    "process_recurring_funds": ("POST", "/api/dashboard/process-recurring", True),
+}
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _time_case(client, headers, method, path, repeat):
+    samples, queries, status = [], None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.open(path, method=method, headers=headers)
+        samples.append((time.perf_counter() - start) * 1000)
+        status = response.status_code
+        if "X-Query-Count" in response.headers:
+            queries = int(response.headers["X-Query-Count"])
+    samples.sort()
+    return {
+        "status": status,
+        "samples": len(samples),
+        "median_ms": round(statistics.median(samples), 3),
+        "min_ms": round(samples[0], 3),
+        "max_ms": round(samples[-1], 3),
+        "queries": queries,
+    }
+
+
+def run_scale(name, database_url=None, repeat=5, cases=None, seed=0):
+    """Seed a fresh database for one scale and time every selected case."""
+    from backend.app import create_app
+
+    transactions, bills = SCALES[name]
+    if database_url is None:
+        database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='patriot-bench-'), f'{name}.db')}"
+    Config.SQLALCHEMY_DATABASE_URI = database_url
+    app = create_app()
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        start = time.perf_counter()
+        user_id, household_id = build_household(db.engine, transactions, bills, seed=seed)
+        build_seconds = time.perf_counter() - start
+        token = create_access_token(identity=str(user_id), additional_claims={"household_id": household_id})
+
+    headers = {"Authorization": f"Bearer {token}"}
+    client = app.test_client()
+    selected = [c for c in CASES if cases is None or c in cases]
+    ordered = [c for c in selected if not CASES[c][2]] + [c for c in selected if CASES[c][2]]
+
+    results = {}
+    for case in ordered:
+        method, path, mutates = CASES[case]
+        if not mutates:
+            client.open(path, method=method, headers=headers)  # warm caches
+        results[case] = _time_case(client, headers, method, path, 1 if mutates else repeat)
+        print(f"  {name:<7} {case:<32} {results[case]['median_ms']:>10.1f} ms "
+              f"{results[case]['queries'] or '-':>6} queries")
+
+    with app.app_context():
+        db.engine.dispose()
+
+    return {
+        "transactions": transactions,
+        "bills": bills,
+        "build_seconds": round(build_seconds, 3),
+        "cases": results,
+    }
+
+
+def run(scales, database_url=None, repeat=5, cases=None, seed=0):
+    """Run every scale and return the full result document."""
+    return {
+        "commit": git_commit(),
+        "created_at": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "database": (database_url or "sqlite").split(":", 1)[0],
+        "repeat": repeat,
+        "seed": seed,
+        "scales": {name: run_scale(name, database_url, repeat, cases, seed) for name in scales},
+    }
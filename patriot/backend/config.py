@@ -13,9 +13,96 @@ class Config:
     SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-change-in-production")
     
     # Database
-    SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL", "sqlite:///patriot.db")
+    # Accept the legacy postgres:// scheme some hosts still hand out
+    SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL", "sqlite:///patriot.db").replace("postgres://", "postgresql://", 1)
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Connection pool for server databases (PostgreSQL). Values already present in
+    # SQLALCHEMY_ENGINE_OPTIONS take precedence over these.
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))  # seconds
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # seconds
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("true", "1", "yes", "on")
+    # Rows fetched per round trip for large scans (server-side cursor on PostgreSQL)
+    DB_STREAM_BATCH_SIZE = int(os.getenv("DB_STREAM_BATCH_SIZE", "1000"))
+    
+    # Optional read replica. Reports, dashboard and routes marked @read_only are
+    # served from it on GET; writes and reads after a write stay on the primary.
+    DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL", "").replace("postgres://", "postgresql://", 1)
+    SQLALCHEMY_BINDS = {"replica": DATABASE_REPLICA_URL} if DATABASE_REPLICA_URL else {}
+    READ_REPLICA_BLUEPRINTS = ("reports", "dashboard")
+    # The replica gets its own pool; timeout, recycle and pre-ping are shared
+    # with the primary's settings above.
+    DB_REPLICA_POOL_SIZE = int(os.getenv("DB_REPLICA_POOL_SIZE", os.getenv("DB_POOL_SIZE", "10")))
+    DB_REPLICA_MAX_OVERFLOW = int(os.getenv("DB_REPLICA_MAX_OVERFLOW", os.getenv("DB_MAX_OVERFLOW", "20")))
+    
+    # Per-request query instrumentation (X-Query-Count / Server-Timing headers)
+    QUERY_STATS_ENABLED = os.getenv("QUERY_STATS_ENABLED", "true").lower() in ("true", "1", "yes", "on")
+    # Warn (or raise when TESTING / QUERY_REPEAT_RAISE) when one statement repeats
+    # more than this many times in a single request - usually an N+1 lazy load
+    QUERY_REPEAT_THRESHOLD = int(os.getenv("QUERY_REPEAT_THRESHOLD", "10"))
+    QUERY_REPEAT_RAISE = os.getenv("QUERY_REPEAT_RAISE", "false").lower() in ("true", "1", "yes", "on")
+    
+    # Prometheus metrics at /metrics. Set PROMETHEUS_MULTIPROC_DIR when running
+    # several gunicorn workers so a scrape on any worker reports all of them.
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("true", "1", "yes", "on")
+    METRICS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", "1.0"))
+    # Bearer token a scrape must send; /metrics is refused while it is empty
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+    
+    # Full-text search (/api/transactions/search, /api/income/search)
+    SEARCH_PAGE_SIZE = int(os.getenv("SEARCH_PAGE_SIZE", "25"))
+    SEARCH_MAX_LIMIT = int(os.getenv("SEARCH_MAX_LIMIT", "100"))
+
+    # /api/transactions/ page sizes (ranges reaching archived months are always paged)
+    TRANSACTIONS_PAGE_SIZE = int(os.getenv("TRANSACTIONS_PAGE_SIZE", "100"))
+    TRANSACTIONS_PAGE_MAX = int(os.getenv("TRANSACTIONS_PAGE_MAX", "500"))
+
+    # /api/transactions/by-category: top=N limit and drilldown page sizes
+    CATEGORY_TOP_MAX = int(os.getenv("CATEGORY_TOP_MAX", "50"))
+    CATEGORY_PAGE_SIZE = int(os.getenv("CATEGORY_PAGE_SIZE", "50"))
+    CATEGORY_PAGE_MAX = int(os.getenv("CATEGORY_PAGE_MAX", "200"))
+
+    # /api/reports/timeseries: buckets returned before LTTB downsampling kicks in
+    TIMESERIES_MAX_POINTS = int(os.getenv("TIMESERIES_MAX_POINTS", "500"))
+    # ...and the most buckets a date range may span before it is rejected
+    TIMESERIES_MAX_BUCKETS = int(os.getenv("TIMESERIES_MAX_BUCKETS", "10000"))
+
+    # `flask archive-transactions` keeps this many whole months (plus the current one) live
+    ARCHIVE_AFTER_MONTHS = int(os.getenv("ARCHIVE_AFTER_MONTHS", "13"))
+
+    # Rows per Arrow record batch / Parquet row group in `flask export-parquet` and /api/export/arrow
+    EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "50000"))
+
+    # Rows per line of a household backup and per bulk insert on restore
+    BACKUP_BATCH_SIZE = int(os.getenv("BACKUP_BATCH_SIZE", "10000"))
+    # Largest compressed backup POST /api/households/restore accepts (413 above it)
+    BACKUP_MAX_UPLOAD_BYTES = int(os.getenv("BACKUP_MAX_UPLOAD_BYTES", str(256 * 2**20)))
+
+    # Household membership cache used for authorization checks (per process)
+    MEMBERSHIP_CACHE_ENABLED = os.getenv("MEMBERSHIP_CACHE_ENABLED", "true").lower() in ("true", "1", "yes", "on")
+    MEMBERSHIP_CACHE_SIZE = int(os.getenv("MEMBERSHIP_CACHE_SIZE", "10000"))  # users
+    MEMBERSHIP_CACHE_TTL = float(os.getenv("MEMBERSHIP_CACHE_TTL", "60"))  # seconds
+    
+    # Password hashing: bcrypt cost (also read by Flask-Bcrypt) and the process
+    # pool that runs it. 0 workers hashes inline on the request thread.
+    BCRYPT_LOG_ROUNDS = int(os.getenv("BCRYPT_LOG_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+    PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", "0"))  # in-flight hashes; 0 = 4 per worker
+    PASSWORD_HASH_TIMEOUT = float(os.getenv("PASSWORD_HASH_TIMEOUT", "5"))  # seconds to wait for a slot
+    
+    # SQLite production profile: WAL journal, tuned pragmas and a persistent pool.
+    # Only applies to file-backed sqlite:/// URIs.
+    SQLITE_PRODUCTION_PROFILE = os.getenv("SQLITE_PRODUCTION_PROFILE", "false").lower() in ("true", "1", "yes", "on")
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))  # bytes
+    SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))  # negative = KiB (64 MiB)
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_POOL_SIZE = int(os.getenv("SQLITE_POOL_SIZE", "8"))
+    SQLITE_MAX_OVERFLOW = int(os.getenv("SQLITE_MAX_OVERFLOW", "8"))
+    
     # JWT Configuration
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "dev-jwt-key-change-in-production")
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=int(os.getenv("JWT_ACCESS_MINUTES", "30")))
@@ -29,6 +116,19 @@ class Config:
     MAIL_USERNAME = os.getenv("MAIL_USERNAME", "")
     MAIL_PASSWORD = os.getenv("MAIL_PASSWORD", "")
     MAIL_DEFAULT_SENDER = os.getenv("MAIL_DEFAULT_SENDER", os.getenv("MAIL_USERNAME", ""))
+    MAIL_TIMEOUT = float(os.getenv("MAIL_TIMEOUT", "10"))  # seconds per SMTP operation
+    MAIL_IDLE_TIMEOUT = float(os.getenv("MAIL_IDLE_TIMEOUT", "30"))  # close the reused connection after this idle time
+
+    # Email outbox: emails commit with the request and a worker sends them
+    EMAIL_OUTBOX_ENABLED = os.getenv("EMAIL_OUTBOX_ENABLED", "true").lower() in ("true", "1", "yes", "on")
+    # Deliver from a thread in each web process; turn off when running `flask email-worker`
+    EMAIL_WORKER_THREAD = os.getenv("EMAIL_WORKER_THREAD", "true").lower() in ("true", "1", "yes", "on")
+    EMAIL_BATCH_SIZE = int(os.getenv("EMAIL_BATCH_SIZE", "50"))
+    EMAIL_POLL_INTERVAL = float(os.getenv("EMAIL_POLL_INTERVAL", "5"))  # seconds
+    EMAIL_MAX_ATTEMPTS = int(os.getenv("EMAIL_MAX_ATTEMPTS", "8"))  # then the email is marked dead
+    EMAIL_RETRY_BASE = float(os.getenv("EMAIL_RETRY_BASE", "30"))  # seconds, doubling per attempt
+    EMAIL_RETRY_MAX = float(os.getenv("EMAIL_RETRY_MAX", "3600"))  # seconds
+    EMAIL_LEASE_SECONDS = float(os.getenv("EMAIL_LEASE_SECONDS", "300"))  # claimed batch returns after this
     
     # Application Settings
     APP_NAME = "Patriot"
@@ -39,6 +139,25 @@ class Config:
     SENTINEL_APPS = os.getenv("SENTINEL_APPS", "")
     # Current app's API URL (used to exclude self from sync)
     CURRENT_APP_URL = os.getenv("CURRENT_APP_URL", "http://localhost:5001")
+    # Other apps are queried in parallel; the whole lookup is bounded by this timeout
+    SENTINEL_TIMEOUT = float(os.getenv("SENTINEL_TIMEOUT", "5"))  # seconds
+    # Remember identifiers every app answered 404 for (0 disables)
+    SENTINEL_NEGATIVE_TTL = float(os.getenv("SENTINEL_NEGATIVE_TTL", "60"))  # seconds
+    SENTINEL_LOOKUP_PATH = os.getenv("SENTINEL_LOOKUP_PATH", "/api/sentinel/user-lookup")
+    SENTINEL_HEALTH_PATH = os.getenv("SENTINEL_HEALTH_PATH", "/api/sentinel/health")
+    # Circuit breaker: skip a peer after this many consecutive failures, then probe
+    # it after SENTINEL_BACKOFF_BASE seconds, doubling up to SENTINEL_BACKOFF_MAX
+    SENTINEL_FAILURE_THRESHOLD = int(os.getenv("SENTINEL_FAILURE_THRESHOLD", "3"))
+    SENTINEL_BACKOFF_BASE = float(os.getenv("SENTINEL_BACKOFF_BASE", "1"))  # seconds
+    SENTINEL_BACKOFF_MAX = float(os.getenv("SENTINEL_BACKOFF_MAX", "60"))  # seconds
+    # Shared secret peers must send as X-Sentinel-Token (unset = peer endpoints answer 503)
+    SENTINEL_SHARED_SECRET = os.getenv("SENTINEL_SHARED_SECRET", "")
+    SENTINEL_BATCH_MAX = int(os.getenv("SENTINEL_BATCH_MAX", "500"))  # identifiers per batch lookup
+    SENTINEL_FEED_PAGE_SIZE = int(os.getenv("SENTINEL_FEED_PAGE_SIZE", "500"))  # users per feed page
+    SENTINEL_FEED_LAG = float(os.getenv("SENTINEL_FEED_LAG", "2"))  # seconds held back from the feed
+    # Ask peers at login for unknown users and for replicated users' hashes;
+    # turn off once `flask sentinel-pull` runs periodically
+    SENTINEL_LAZY_LOOKUP = os.getenv("SENTINEL_LAZY_LOOKUP", "true").lower() in ("true", "1", "yes", "on")
     
     @property
     def is_development(self):
@@ -1,4 +1,146 @@
 # backend/database.py
+from flask import current_app, g, has_request_context, request
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.sql.dml import UpdateBase
+from sqlalchemy.sql.elements import TextClause
 
-db = SQLAlchemy()
+REPLICA_BIND = "replica"
+
+
+class RoutingSession(Session):
+    """
+    Session that serves reads for read-only requests from the replica bind.
+    Writes always go to the primary, and once a request has written anything
+    every later read in that request sticks to the primary as well. Raw text()
+    statements can't be told apart from writes, so they count as one.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_request_context() and g.get("db_read_only"):
+            if self._flushing or isinstance(clause, (UpdateBase, TextClause)):
+                g.db_read_only = False
+            else:
+                replica = self._db.engines.get(REPLICA_BIND)
+                if replica is not None:
+                    return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
+
+
+def read_only(view):
+    """Mark a view as safe to serve from the read replica on GET requests."""
+    view.read_only = True
+    return view
+
+
+def init_read_replica(app):
+    """Route read-only GET requests to the replica when one is configured."""
+    if REPLICA_BIND not in (app.config.get("SQLALCHEMY_BINDS") or {}):
+        return
+
+    replica_blueprints = set(app.config.get("READ_REPLICA_BLUEPRINTS", ()))
+
+    @app.before_request
+    def _route_reads_to_replica():
+        if request.method not in ("GET", "HEAD"):
+            return
+        view = app.view_functions.get(request.endpoint)
+        if request.blueprint in replica_blueprints or getattr(view, "read_only", False):
+            g.db_read_only = True
+
+
+def _is_sqlite_file(uri):
+    """True for file-backed SQLite URIs (in-memory databases are left alone)."""
+    return uri.startswith("sqlite") and ":memory:" not in uri and uri not in ("sqlite://", "sqlite:///")
+
+
+def _engine_options(app, uri, options, pool_size, max_overflow):
+    """Fill in pool and connection defaults for one engine's options."""
+    options = dict(options or {})
+
+    if not uri.startswith("sqlite"):
+        # Server databases: pooled connections, checked before use and recycled
+        # before the server or a proxy drops them
+        options.setdefault("pool_size", pool_size)
+        options.setdefault("max_overflow", max_overflow)
+        options.setdefault("pool_timeout", app.config["DB_POOL_TIMEOUT"])
+        options.setdefault("pool_recycle", app.config["DB_POOL_RECYCLE"])
+        options.setdefault("pool_pre_ping", app.config["DB_POOL_PRE_PING"])
+    elif app.config.get("SQLITE_PRODUCTION_PROFILE") and _is_sqlite_file(uri):
+        # Keep connections (and their page cache / mmap) alive between requests
+        options.setdefault("poolclass", QueuePool)
+        options.setdefault("pool_size", app.config["SQLITE_POOL_SIZE"])
+        options.setdefault("max_overflow", app.config["SQLITE_MAX_OVERFLOW"])
+        connect_args = dict(options.get("connect_args") or {})
+        connect_args.setdefault("timeout", app.config["SQLITE_BUSY_TIMEOUT_MS"] / 1000)
+        connect_args.setdefault("check_same_thread", False)
+        options["connect_args"] = connect_args
+
+    return options
+
+
+def configure_engine_options(app):
+    """
+    Build SQLALCHEMY_ENGINE_OPTIONS for the configured backend, and the
+    replica bind's own options when one is configured (Flask-SQLAlchemy only
+    applies SQLALCHEMY_ENGINE_OPTIONS to the primary).
+    Must run before db.init_app(app) since the engines are created there.
+    """
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = _engine_options(
+        app, app.config["SQLALCHEMY_DATABASE_URI"], app.config.get("SQLALCHEMY_ENGINE_OPTIONS"),
+        app.config["DB_POOL_SIZE"], app.config["DB_MAX_OVERFLOW"],
+    )
+
+    binds = dict(app.config.get("SQLALCHEMY_BINDS") or {})
+    replica = binds.get(REPLICA_BIND)
+    if replica is None:
+        return
+    replica = {"url": replica} if isinstance(replica, str) else dict(replica)
+    binds[REPLICA_BIND] = _engine_options(
+        app, str(replica["url"]), replica,
+        app.config["DB_REPLICA_POOL_SIZE"], app.config["DB_REPLICA_MAX_OVERFLOW"],
+    )
+    app.config["SQLALCHEMY_BINDS"] = binds
+
+
+def register_engine_listeners(app):
+    """Attach per-connection setup to the app's engines (after db.init_app)."""
+    if not app.config.get("SQLITE_PRODUCTION_PROFILE"):
+        return
+
+    pragmas = (
+        ("journal_mode", "WAL"),
+        ("synchronous", "NORMAL"),
+        ("mmap_size", app.config["SQLITE_MMAP_SIZE"]),
+        ("cache_size", app.config["SQLITE_CACHE_SIZE"]),
+        ("busy_timeout", app.config["SQLITE_BUSY_TIMEOUT_MS"]),
+        ("foreign_keys", "ON"),
+        ("temp_store", "MEMORY"),
+    )
+
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas:
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    with app.app_context():
+        for engine in db.engines.values():
+            if _is_sqlite_file(str(engine.url)):
+                event.listen(engine, "connect", set_sqlite_pragmas)
+
+
+def stream(query, batch_size=None):
+    """
+    Iterate a large query in batches instead of loading every row at once.
+    On PostgreSQL this uses a server-side cursor; on SQLite rows are fetched
+    in chunks from the same cursor.
+    """
+    if batch_size is None:
+        batch_size = current_app.config.get("DB_STREAM_BATCH_SIZE", 1000)
+    return query.yield_per(batch_size)
@@ -0,0 +1,26 @@
+# backend/gunicorn.conf.py
+"""
+Gunicorn settings for production.
+
+    PROMETHEUS_MULTIPROC_DIR=/tmp/patriot-metrics \
+        gunicorn -c backend/gunicorn.conf.py "backend.app:create_app()"
+
+With PROMETHEUS_MULTIPROC_DIR set, every worker writes its metrics snapshot
+there and /metrics on any worker reports the sum across all of them.
+"""
+import multiprocessing
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv("GUNICORN_THREADS", "1"))
+
+
+def on_starting(server):
+    from backend.utils.metrics import clear_multiprocess_dir
+    clear_multiprocess_dir()
+
+
+def child_exit(server, worker):
+    from backend.utils.metrics import mark_process_dead
+    mark_process_dead(worker.pid)
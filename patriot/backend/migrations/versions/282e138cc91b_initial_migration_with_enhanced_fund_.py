@@ -18,7 +18,9 @@ depends_on = None
 
 def upgrade():
     # ### commands auto generated by Alembic - please adjust! ###
-    op.drop_table('_alembic_tmp_funds')
+    # Leftover from an interrupted SQLite batch migration; absent on PostgreSQL
+    if sa.inspect(op.get_bind()).has_table('_alembic_tmp_funds'):
+        op.drop_table('_alembic_tmp_funds')
     with op.batch_alter_table('funds', schema=None) as batch_op:
         batch_op.add_column(sa.Column('goal', sa.Float(), nullable=True))
         batch_op.add_column(sa.Column('recurring_amount', sa.Float(), nullable=True))
@@ -0,0 +1,27 @@
+"""Add (household_id, category, amount) index on transactions
+
+Serves the per-category totals, the top-N window and the keyset-paginated
+category drilldown without sorting the household's whole ledger.
+
+Revision ID: category_amount_index_v1
+Revises: search_fts_v1
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic
+revision = 'category_amount_index_v1'
+down_revision = 'search_fts_v1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_transactions_household_category_amount', 'transactions',
+                    ['household_id', 'category', 'amount'])
+
+
+def downgrade():
+    op.drop_index('ix_transactions_household_category_amount', table_name='transactions')
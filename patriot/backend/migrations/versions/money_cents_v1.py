@@ -0,0 +1,88 @@
+"""Store money as whole cents
+
+Every amount and balance column (Numeric(15, 2) on transactions, accounts,
+bills, debts and incomes, Float on funds) becomes a BIGINT of cents, rounded
+half up from the stored value. The models read it back as backend.utils.money.Money.
+
+On SQLite the tables are rebuilt by batch mode, which drops their triggers, so
+the search triggers are reinstalled afterwards. Their DDL is copied here as it
+stood at this revision rather than imported from backend.utils.search.
+
+Revision ID: money_cents_v1
+Revises: category_amount_index_v1
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic
+revision = 'money_cents_v1'
+down_revision = 'category_amount_index_v1'
+branch_labels = None
+depends_on = None
+
+NUMERIC = sa.Numeric(15, 2)
+
+# table -> [(column, type before this revision, nullable)]
+COLUMNS = {
+    'transactions': [('amount', NUMERIC, False)],
+    'accounts': [('balance', NUMERIC, True)],
+    'bills': [('amount', NUMERIC, False)],
+    'debts': [('total_amount', NUMERIC, False), ('current_balance', NUMERIC, False),
+              ('minimum_payment', NUMERIC, False)],
+    'incomes': [('amount', NUMERIC, False)],
+    'funds': [('balance', sa.Float(), True), ('goal', sa.Float(), True), ('recurring_amount', sa.Float(), True)],
+}
+
+# SQLite FTS5 sync triggers from search_fts_v1: table -> indexed columns
+SEARCH_TRIGGERS = {
+    'transactions': ('description', 'category'),
+    'incomes': ('source', 'category', 'description'),
+}
+
+
+def _install_search_triggers():
+    for table, columns in SEARCH_TRIGGERS.items():
+        fts = f"{table}_fts"
+        names = ', '.join(columns) + ', household'
+
+        def values(row):
+            return ', '.join(f"coalesce({row}.{column}, '')" for column in columns) + f", 'h' || {row}.household_id"
+
+        insert = f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {values('new')});"
+        delete = f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {values('old')});"
+        op.execute(f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN {insert} END")
+        op.execute(f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN {delete} END")
+        op.execute(f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {', '.join(columns)}, household_id "
+                   f"ON {table} BEGIN {delete} {insert} END")
+
+
+def _convert(to_cents):
+    connection = op.get_bind()
+    postgresql = connection.dialect.name == 'postgresql'
+    for table, columns in COLUMNS.items():
+        if not postgresql:
+            # SQLite: rewrite the values in place, then rebuild the table with the new types
+            assignments = ', '.join(
+                f"{name} = CAST(ROUND({name} * 100) AS INTEGER)" if to_cents else f"{name} = {name} / 100.0"
+                for name, _, _ in columns
+            )
+            op.execute(f"UPDATE {table} SET {assignments}")
+        with op.batch_alter_table(table) as batch_op:
+            for name, old_type, nullable in columns:
+                new_type, existing_type = (sa.BigInteger(), old_type) if to_cents else (old_type, sa.BigInteger())
+                using = f"round({name} * 100)::bigint" if to_cents else f"{name} / 100.0"
+                batch_op.alter_column(name, type_=new_type, existing_type=existing_type,
+                                      existing_nullable=nullable, postgresql_using=using)
+    if not postgresql:
+        _install_search_triggers()
+
+
+def upgrade():
+    _convert(to_cents=True)
+
+
+def downgrade():
+    _convert(to_cents=False)
@@ -0,0 +1,77 @@
+"""Add household lookup and partial indexes
+
+Adds the composite indexes used by the household-scoped list and report queries,
+plus partial indexes (PostgreSQL native, also supported by SQLite) that only
+cover the rows the hot queries touch: due recurring transactions, autopay bills,
+recurring funds and active accounts/bills/debts.
+
+Revision ID: partial_indexes_v1
+Revises: household_multiuser_v1
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic
+revision = 'partial_indexes_v1'
+down_revision = 'household_multiuser_v1'
+branch_labels = None
+depends_on = None
+
+
+def _flag(name, value=True):
+    """Boolean predicate rendered as `col = true` on PostgreSQL and `col = 1` on SQLite"""
+    return sa.column(name, sa.Boolean) == (sa.true() if value else sa.false())
+
+
+def _partial(where):
+    return {'postgresql_where': where, 'sqlite_where': where}
+
+
+def upgrade():
+    op.create_index('ix_transactions_household_date', 'transactions', ['household_id', 'date'])
+    op.create_index(
+        'ix_transactions_recurring_due', 'transactions', ['household_id', 'next_occurrence'],
+        **_partial(sa.and_(_flag('is_recurring'), _flag('is_skipped', False)))
+    )
+    op.create_index(
+        'ix_transactions_autopay_bill', 'transactions', ['bill_id', 'date'],
+        **_partial(_flag('is_autopay'))
+    )
+
+    op.create_index('ix_bills_household_active', 'bills', ['household_id'], **_partial(_flag('is_active')))
+    op.create_index(
+        'ix_bills_autopay_due', 'bills', ['household_id', 'next_due_date'],
+        **_partial(sa.and_(_flag('is_autopay'), _flag('is_active')))
+    )
+
+    op.create_index('ix_funds_household_type', 'funds', ['household_id', 'fund_type'])
+    op.create_index(
+        'ix_funds_household_recurring', 'funds', ['household_id'],
+        **_partial(sa.column('recurring_amount').isnot(None))
+    )
+
+    op.create_index(
+        'ix_debts_household_active', 'debts', ['household_id', 'category'],
+        **_partial(_flag('is_active'))
+    )
+    op.create_index(
+        'ix_accounts_household_active', 'accounts', ['household_id'],
+        **_partial(_flag('is_active'))
+    )
+    op.create_index('ix_incomes_household_date', 'incomes', ['household_id', 'date'])
+
+
+def downgrade():
+    op.drop_index('ix_incomes_household_date', table_name='incomes')
+    op.drop_index('ix_accounts_household_active', table_name='accounts')
+    op.drop_index('ix_debts_household_active', table_name='debts')
+    op.drop_index('ix_funds_household_recurring', table_name='funds')
+    op.drop_index('ix_funds_household_type', table_name='funds')
+    op.drop_index('ix_bills_autopay_due', table_name='bills')
+    op.drop_index('ix_bills_household_active', table_name='bills')
+    op.drop_index('ix_transactions_autopay_bill', table_name='transactions')
+    op.drop_index('ix_transactions_recurring_due', table_name='transactions')
+    op.drop_index('ix_transactions_household_date', table_name='transactions')
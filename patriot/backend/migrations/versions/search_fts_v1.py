@@ -0,0 +1,87 @@
+"""Add full-text search indexes for transactions and incomes
+
+SQLite: contentless FTS5 tables transactions_fts / incomes_fts with sync
+triggers. PostgreSQL: search_vector tsvector columns, GIN indexes and
+tsvector_update_trigger triggers. Existing rows are indexed on upgrade.
+The DDL is a copy of backend/utils/search.py as it stood at this revision,
+so later changes there do not change what this migration does.
+
+Revision ID: search_fts_v1
+Revises: email_outbox_v1
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic
+revision = 'search_fts_v1'
+down_revision = 'email_outbox_v1'
+branch_labels = None
+depends_on = None
+
+# table -> (searchable columns, bm25 weights in the same order)
+TABLES = {
+    'transactions': (('description', 'category'), (10.0, 4.0)),
+    'incomes': (('source', 'category', 'description'), (10.0, 4.0, 2.0)),
+}
+
+
+def _values(row, columns):
+    return ', '.join(f"coalesce({row}.{column}, '')" for column in columns) + f", 'h' || {row}.household_id"
+
+
+def _sqlite_upgrade(table, columns, weights):
+    fts = f"{table}_fts"
+    names = ', '.join(columns) + ', household'
+    insert = f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {_values('new', columns)});"
+    delete = f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {_values('old', columns)});"
+    ranking = ', '.join(str(w) for w in weights) + ', 0.0'
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({names}, content='', "
+        f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        f"INSERT INTO {fts}({fts}, rank) VALUES ('rank', 'bm25({ranking})')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN {insert} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN {delete} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {', '.join(columns)}, household_id "
+        f"ON {table} BEGIN {delete} {insert} END",
+        # Index the rows already there
+        f"INSERT INTO {fts}({fts}) VALUES ('delete-all')",
+        f"INSERT INTO {fts}(rowid, {names}) SELECT id, {_values(table, columns)} FROM {table}",
+        f"INSERT INTO {fts}({fts}) VALUES ('optimize')",
+    ]
+
+
+def _postgresql_upgrade(table, columns):
+    document = " || ' ' || ".join(f"coalesce({column}, '')" for column in columns)
+    return [
+        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector",
+        f"CREATE INDEX IF NOT EXISTS ix_{table}_search_vector ON {table} USING gin (search_vector)",
+        f"DROP TRIGGER IF EXISTS {table}_search_vector_update ON {table}",
+        f"CREATE TRIGGER {table}_search_vector_update BEFORE INSERT OR UPDATE OF {', '.join(columns)} "
+        f"ON {table} FOR EACH ROW EXECUTE FUNCTION "
+        f"tsvector_update_trigger(search_vector, 'pg_catalog.simple', {', '.join(columns)})",
+        f"UPDATE {table} SET search_vector = to_tsvector('pg_catalog.simple', {document})",
+    ]
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    for table, (columns, weights) in TABLES.items():
+        statements = _sqlite_upgrade(table, columns, weights) if dialect == 'sqlite' else \
+            _postgresql_upgrade(table, columns) if dialect == 'postgresql' else []
+        for statement in statements:
+            op.execute(statement)
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    for table in TABLES:
+        if dialect == 'sqlite':
+            for trigger in ('ai', 'ad', 'au'):
+                op.execute(f"DROP TRIGGER IF EXISTS {table}_fts_{trigger}")
+            op.execute(f"DROP TABLE IF EXISTS {table}_fts")
+        elif dialect == 'postgresql':
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_search_vector_update ON {table}")
+            op.execute(f"DROP INDEX IF EXISTS ix_{table}_search_vector")
+            op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector")
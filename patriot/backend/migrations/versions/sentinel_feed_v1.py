@@ -0,0 +1,41 @@
+"""Add users.updated_at and sentinel_cursors for the Sentinel replication feed
+
+users.updated_at (backfilled from created_at) plus an (updated_at, id) index
+back the keyset-paginated changes-since feed; sentinel_cursors stores how far
+this app has pulled each peer's feed.
+
+Revision ID: sentinel_feed_v1
+Revises: refresh_tokens_v1
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic
+revision = 'sentinel_feed_v1'
+down_revision = 'refresh_tokens_v1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.execute("UPDATE users SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP)")
+    op.create_index('ix_users_updated_at_id', 'users', ['updated_at', 'id'])
+
+    op.create_table('sentinel_cursors',
+        sa.Column('peer_url', sa.String(length=255), nullable=False),
+        sa.Column('cursor', sa.String(length=64), nullable=True),
+        sa.Column('pulled_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('peer_url')
+    )
+
+
+def downgrade():
+    op.drop_table('sentinel_cursors')
+    op.drop_index('ix_users_updated_at_id', table_name='users')
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
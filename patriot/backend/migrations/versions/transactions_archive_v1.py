@@ -0,0 +1,121 @@
+"""Add transactions_archive and transaction_period_summaries
+
+Cold storage for transactions older than ARCHIVE_AFTER_MONTHS, filled by
+``flask archive-transactions`` (backend/utils/archive.py). The archive has the
+columns of transactions without the foreign keys, plus archived_at, and gets
+the same search index. The summaries hold one row of totals per household,
+month, category, type and account of archived rows. The search DDL is a copy
+of backend/utils/search.py as it stood at this revision.
+
+Revision ID: transactions_archive_v1
+Revises: money_cents_v1
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic
+revision = 'transactions_archive_v1'
+down_revision = 'money_cents_v1'
+branch_labels = None
+depends_on = None
+
+FTS = 'transactions_archive_fts'
+VALUES = "coalesce({row}.description, ''), coalesce({row}.category, ''), 'h' || {row}.household_id"
+
+
+def _search_ddl(dialect):
+    if dialect == 'sqlite':
+        names = 'description, category, household'
+        insert = f"INSERT INTO {FTS}(rowid, {names}) VALUES (new.id, {VALUES.format(row='new')});"
+        delete = f"INSERT INTO {FTS}({FTS}, rowid, {names}) VALUES ('delete', old.id, {VALUES.format(row='old')});"
+        return [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS} USING fts5({names}, content='', "
+            f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+            f"INSERT INTO {FTS}({FTS}, rank) VALUES ('rank', 'bm25(10.0, 4.0, 0.0)')",
+            f"CREATE TRIGGER IF NOT EXISTS {FTS}_ai AFTER INSERT ON transactions_archive BEGIN {insert} END",
+            f"CREATE TRIGGER IF NOT EXISTS {FTS}_ad AFTER DELETE ON transactions_archive BEGIN {delete} END",
+            f"CREATE TRIGGER IF NOT EXISTS {FTS}_au AFTER UPDATE OF description, category, household_id "
+            f"ON transactions_archive BEGIN {delete} {insert} END",
+        ]
+    if dialect == 'postgresql':
+        return [
+            "ALTER TABLE transactions_archive ADD COLUMN IF NOT EXISTS search_vector tsvector",
+            "CREATE INDEX IF NOT EXISTS ix_transactions_archive_search_vector "
+            "ON transactions_archive USING gin (search_vector)",
+            "DROP TRIGGER IF EXISTS transactions_archive_search_vector_update ON transactions_archive",
+            "CREATE TRIGGER transactions_archive_search_vector_update BEFORE INSERT OR UPDATE OF "
+            "description, category ON transactions_archive FOR EACH ROW EXECUTE FUNCTION "
+            "tsvector_update_trigger(search_vector, 'pg_catalog.simple', description, category)",
+        ]
+    return []
+
+
+def upgrade():
+    op.create_table('transactions_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('household_id', sa.Integer(), nullable=False),
+        sa.Column('created_by_user_id', sa.Integer(), nullable=True),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('description', sa.String(length=255), nullable=False),
+        sa.Column('amount', sa.BigInteger(), nullable=False),
+        sa.Column('category', sa.String(length=100), nullable=False),
+        sa.Column('account_id', sa.Integer(), nullable=True),
+        sa.Column('fund_id', sa.Integer(), nullable=True),
+        sa.Column('bill_id', sa.Integer(), nullable=True),
+        sa.Column('to_account_id', sa.Integer(), nullable=True),
+        sa.Column('to_fund_id', sa.Integer(), nullable=True),
+        sa.Column('transaction_type', sa.String(length=20), nullable=False),
+        sa.Column('is_recurring', sa.Boolean(), nullable=True),
+        sa.Column('frequency', sa.String(length=20), nullable=True),
+        sa.Column('next_occurrence', sa.Date(), nullable=True),
+        sa.Column('parent_transaction_id', sa.Integer(), nullable=True),
+        sa.Column('is_skipped', sa.Boolean(), nullable=True),
+        sa.Column('is_autopay', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('archived_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_transactions_archive_household_date', 'transactions_archive', ['household_id', 'date'])
+    op.create_index('ix_transactions_archive_household_category_amount', 'transactions_archive',
+                    ['household_id', 'category', 'amount'])
+    op.create_index('ix_transactions_archive_fund', 'transactions_archive', ['fund_id'])
+
+    op.create_table('transaction_period_summaries',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('household_id', sa.Integer(), nullable=False),
+        sa.Column('period', sa.Date(), nullable=False),
+        sa.Column('category', sa.String(length=100), nullable=False),
+        sa.Column('transaction_type', sa.String(length=20), nullable=False),
+        sa.Column('account_id', sa.Integer(), nullable=True),
+        sa.Column('amount', sa.BigInteger(), nullable=False),
+        sa.Column('abs_amount', sa.BigInteger(), nullable=False),
+        sa.Column('transaction_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_transaction_period_summaries_household_period', 'transaction_period_summaries',
+                    ['household_id', 'period'])
+
+    for statement in _search_ddl(op.get_bind().dialect.name):
+        op.execute(statement)
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for trigger in ('ai', 'ad', 'au'):
+            op.execute(f"DROP TRIGGER IF EXISTS {FTS}_{trigger}")
+        op.execute(f"DROP TABLE IF EXISTS {FTS}")
+    elif dialect == 'postgresql':
+        op.execute("DROP TRIGGER IF EXISTS transactions_archive_search_vector_update ON transactions_archive")
+        op.execute("DROP INDEX IF EXISTS ix_transactions_archive_search_vector")
+        op.execute("ALTER TABLE transactions_archive DROP COLUMN IF EXISTS search_vector")
+
+    op.drop_index('ix_transaction_period_summaries_household_period', table_name='transaction_period_summaries')
+    op.drop_table('transaction_period_summaries')
+    op.drop_index('ix_transactions_archive_fund', table_name='transactions_archive')
+    op.drop_index('ix_transactions_archive_household_category_amount', table_name='transactions_archive')
+    op.drop_index('ix_transactions_archive_household_date', table_name='transactions_archive')
+    op.drop_table('transactions_archive')
@@ -0,0 +1,73 @@
+"""Never reuse transaction ids on SQLite
+
+Archived transactions keep their ids, so an id handed out once must never be
+handed out again. PostgreSQL sequences never go back; SQLite's default rowid
+picks max(id) + 1, which reuses the ids of archived rows once the newest rows
+are gone. This rebuilds transactions with AUTOINCREMENT and starts its
+counter above every id in transactions and transactions_archive.
+
+The rebuild drops the table's triggers and may lose the partial index
+predicates, so both are put back afterwards. The search trigger DDL is a copy
+of backend/utils/search.py as it stood at this revision.
+
+Revision ID: transactions_autoincrement_v1
+Revises: transactions_archive_v1
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic
+revision = 'transactions_autoincrement_v1'
+down_revision = 'transactions_archive_v1'
+branch_labels = None
+depends_on = None
+
+_VALUES = "coalesce({row}.description, ''), coalesce({row}.category, ''), 'h' || {row}.household_id"
+_INSERT = (f"INSERT INTO transactions_fts(rowid, description, category, household) "
+           f"VALUES (new.id, {_VALUES.format(row='new')});")
+_DELETE = (f"INSERT INTO transactions_fts(transactions_fts, rowid, description, category, household) "
+           f"VALUES ('delete', old.id, {_VALUES.format(row='old')});")
+SEARCH_TRIGGERS = [
+    f"CREATE TRIGGER IF NOT EXISTS transactions_fts_ai AFTER INSERT ON transactions BEGIN {_INSERT} END",
+    f"CREATE TRIGGER IF NOT EXISTS transactions_fts_ad AFTER DELETE ON transactions BEGIN {_DELETE} END",
+    f"CREATE TRIGGER IF NOT EXISTS transactions_fts_au AFTER UPDATE OF description, category, household_id "
+    f"ON transactions BEGIN {_DELETE} {_INSERT} END",
+]
+
+
+def _flag(name, value=True):
+    return sa.column(name, sa.Boolean) == (sa.true() if value else sa.false())
+
+
+def _rebuild(autoincrement):
+    with op.batch_alter_table('transactions', recreate='always',
+                              table_kwargs={'sqlite_autoincrement': autoincrement}):
+        pass
+    op.drop_index('ix_transactions_recurring_due', table_name='transactions', if_exists=True)
+    op.drop_index('ix_transactions_autopay_bill', table_name='transactions', if_exists=True)
+    op.create_index('ix_transactions_recurring_due', 'transactions', ['household_id', 'next_occurrence'],
+                    sqlite_where=sa.and_(_flag('is_recurring'), _flag('is_skipped', False)))
+    op.create_index('ix_transactions_autopay_bill', 'transactions', ['bill_id', 'date'],
+                    sqlite_where=_flag('is_autopay'))
+    for statement in SEARCH_TRIGGERS:
+        op.execute(statement)
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    _rebuild(True)
+    op.execute("DELETE FROM sqlite_sequence WHERE name = 'transactions'")
+    op.execute(
+        "INSERT INTO sqlite_sequence (name, seq) SELECT 'transactions', max(coalesce(max(id), 0), "
+        "(SELECT coalesce(max(id), 0) FROM transactions_archive)) FROM transactions"
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    _rebuild(False)
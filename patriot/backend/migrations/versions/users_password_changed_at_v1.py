@@ -0,0 +1,31 @@
+"""Add users.password_changed_at for the Sentinel replication feed
+
+The changes-since feed carries no password hashes. Peers compare this
+timestamp with their own to tell a real password change (drop the local hash)
+from any other update (keep it). Existing users are left NULL, meaning "not
+known", which never clears a hash anywhere.
+
+Revision ID: users_password_changed_at_v1
+Revises: transactions_autoincrement_v1
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic
+revision = 'users_password_changed_at_v1'
+down_revision = 'transactions_autoincrement_v1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('password_changed_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('password_changed_at')
@@ -3,10 +3,14 @@ from .user import User
 from .household import Household, HouseholdInvite, user_household
 from .fund import Fund
 from .transaction import Transaction
+from .transaction_archive import ArchivedTransaction, TransactionPeriodSummary
 from .bill import Bill
 from .income import Income
 from .debt import Debt
 from .account import Account
+from .refresh_token import RefreshToken
+from .sentinel import SentinelCursor
+from .email_outbox import EmailOutbox
 
 __all__ = [
     "User",
@@ -15,8 +19,13 @@ __all__ = [
     "user_household",
     "Fund",
     "Transaction",
+    "ArchivedTransaction",
+    "TransactionPeriodSummary",
     "Bill",
     "Income",
     "Debt",
     "Account",
+    "RefreshToken",
+    "SentinelCursor",
+    "EmailOutbox",
 ]
@@ -2,6 +2,7 @@
 Account model for financial accounts (checking, savings, credit cards, etc.)
 """
 from backend.database import db
+from backend.utils.money import MoneyType
 from datetime import datetime
 
 class Account(db.Model):
@@ -14,12 +15,21 @@ class Account(db.Model):
     name = db.Column(db.String(100), nullable=False)
     type = db.Column(db.String(50), nullable=False)  # checking, savings, credit, investment
     institution = db.Column(db.String(100), nullable=False)
-    balance = db.Column(db.Numeric(15, 2), default=0.00)
+    balance = db.Column(MoneyType, default=0)
     last_four = db.Column(db.String(4))  # Last 4 digits of account number
     is_active = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Partial index: account listings only show active accounts
+    __table_args__ = (
+        db.Index(
+            'ix_accounts_household_active', household_id,
+            postgresql_where=is_active == True,
+            sqlite_where=is_active == True,
+        ),
+    )
+
     # Relationships
     household = db.relationship("Household", backref="accounts")
     owner = db.relationship("User", foreign_keys=[owner_user_id], backref="owned_accounts")
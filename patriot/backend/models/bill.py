@@ -2,6 +2,7 @@
 from datetime import datetime, date, timedelta
 from dateutil.relativedelta import relativedelta
 from backend.database import db
+from backend.utils.money import MoneyType
 
 
 class Bill(db.Model):
@@ -11,7 +12,7 @@ class Bill(db.Model):
     household_id = db.Column(db.Integer, db.ForeignKey('households.id'), nullable=False)
     name = db.Column(db.String(120), nullable=False)
     description = db.Column(db.String(255))
-    amount = db.Column(db.Numeric(15, 2), nullable=False)
+    amount = db.Column(MoneyType, nullable=False)
     due_date = db.Column(db.Date, nullable=False)
     frequency = db.Column(db.String(20), default='monthly')  # monthly, weekly, yearly, etc.
     category = db.Column(db.String(100), nullable=False)
@@ -21,6 +22,20 @@ class Bill(db.Model):
     account_id = db.Column(db.Integer, db.ForeignKey('accounts.id'), nullable=True)  # Link to account for autopay
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # Partial indexes for the active-bill listing and the autopay sweep
+    __table_args__ = (
+        db.Index(
+            'ix_bills_household_active', household_id,
+            postgresql_where=is_active == True,
+            sqlite_where=is_active == True,
+        ),
+        db.Index(
+            'ix_bills_autopay_due', household_id, next_due_date,
+            postgresql_where=db.and_(is_autopay == True, is_active == True),
+            sqlite_where=db.and_(is_autopay == True, is_active == True),
+        ),
+    )
+
     # Relationships
     household = db.relationship('Household', backref=db.backref('bills', lazy=True))
     account = db.relationship('Account', backref=db.backref('bills', lazy=True))
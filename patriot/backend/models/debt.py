@@ -1,6 +1,7 @@
 # backend/models/debt.py
 from datetime import datetime, date
 from backend.database import db
+from backend.utils.money import Money, MoneyType
 
 
 class Debt(db.Model):
@@ -13,9 +14,9 @@ class Debt(db.Model):
     )  # Optional: track whose debt this is
     name = db.Column(db.String(120), nullable=False)
     description = db.Column(db.String(255))
-    total_amount = db.Column(db.Numeric(15, 2), nullable=False)  # Original debt amount
-    current_balance = db.Column(db.Numeric(15, 2), nullable=False)  # Remaining balance
-    minimum_payment = db.Column(db.Numeric(15, 2), nullable=False)
+    total_amount = db.Column(MoneyType, nullable=False)  # Original debt amount
+    current_balance = db.Column(MoneyType, nullable=False)  # Remaining balance
+    minimum_payment = db.Column(MoneyType, nullable=False)
     interest_rate = db.Column(
         db.Float, default=0.0
     )  # Annual interest rate as percentage
@@ -27,6 +28,15 @@ class Debt(db.Model):
     is_active = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # Partial index: every debt query filters on active debts
+    __table_args__ = (
+        db.Index(
+            'ix_debts_household_active', household_id, category,
+            postgresql_where=is_active == True,
+            sqlite_where=is_active == True,
+        ),
+    )
+
     # Relationships
     household = db.relationship("Household", backref=db.backref("debts", lazy=True))
     owner = db.relationship("User", foreign_keys=[owner_user_id], backref="owned_debts")
@@ -63,8 +73,8 @@ class Debt(db.Model):
         """Calculate payoff progress as percentage"""
         if self.total_amount <= 0:
             return 100.0
-        paid_amount = float(self.total_amount) - float(self.current_balance)
-        return min((paid_amount / float(self.total_amount)) * 100, 100.0)
+        paid_amount = self.total_amount - self.current_balance
+        return min((paid_amount / self.total_amount) * 100, 100.0)
 
     @property
     def remaining_percentage(self):
@@ -72,18 +82,17 @@ class Debt(db.Model):
         return 100.0 - self.progress_percentage
 
     def make_payment(self, amount):
-        """Make a payment towards the debt"""
-        if amount > 0 and amount <= self.current_balance:
-            self.current_balance -= amount
-            return True
-        return False
+        """Make a payment towards the debt (atomic, guarded against overpayment)"""
+        from backend.utils.balances import adjust_debt_balance
+
+        if amount <= 0:
+            return False
+        return adjust_debt_balance(self.id, -amount) is not None
 
     @property
     def is_paid_off(self):
         """Check if debt is fully paid off"""
-        return (
-            float(self.current_balance) <= 0.01
-        )  # Account for floating point precision
+        return self.current_balance.cents <= 1  # a stray cent still counts as paid off
 
     @staticmethod
     def get_total_debt(household_id):
@@ -92,7 +101,7 @@ class Debt(db.Model):
             db.session.query(db.func.sum(Debt.current_balance))
             .filter_by(household_id=household_id, is_active=True)
             .scalar()
-            or 0.0
+            or Money()
         )
 
     @staticmethod
@@ -102,5 +111,5 @@ class Debt(db.Model):
             db.session.query(db.func.sum(Debt.minimum_payment))
             .filter_by(household_id=household_id, is_active=True)
             .scalar()
-            or 0.0
+            or Money()
         )
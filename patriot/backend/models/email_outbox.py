@@ -0,0 +1,35 @@
+# backend/models/email_outbox.py
+from datetime import datetime
+from backend.database import db
+
+
+class EmailOutbox(db.Model):
+    """
+    An email waiting to be delivered (or already handled) by the outbox worker.
+
+    Rows are added in the same transaction as the change that triggers them, so
+    a rolled-back registration never mails anyone and a committed one always
+    does. ``status`` moves from ``pending`` to ``sent``, or to ``dead`` after a
+    permanent SMTP rejection or EMAIL_MAX_ATTEMPTS failed tries.
+    """
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        db.Index('ix_email_outbox_status_next_attempt', 'status', 'next_attempt_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(32), nullable=False)
+    to_email = db.Column(db.String(120), nullable=False)
+    subject = db.Column(db.String(255), nullable=False)
+    text_body = db.Column(db.Text, nullable=False)
+    html_body = db.Column(db.Text, nullable=True)
+    status = db.Column(db.String(16), nullable=False, default='pending')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    claimed_by = db.Column(db.String(36), nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f'<EmailOutbox {self.id} {self.kind} to {self.to_email} {self.status}>'
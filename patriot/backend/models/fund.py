@@ -1,6 +1,7 @@
 # backend/models/fund.py
 from datetime import datetime, date, timedelta
 from backend.database import db
+from backend.utils.money import Money, MoneyType
 
 
 class Fund(db.Model):
@@ -9,13 +10,13 @@ class Fund(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     household_id = db.Column(db.Integer, db.ForeignKey("households.id"), nullable=False)
     name = db.Column(db.String(120), nullable=False)
-    balance = db.Column(db.Float, default=0.0)
-    goal = db.Column(db.Float, default=0.0)
+    balance = db.Column(MoneyType, default=0)
+    goal = db.Column(MoneyType, default=0)
     fund_type = db.Column(
         db.String(20), default="Expenses", nullable=False
     )  # Expenses, Savings, Cash
     recurring_amount = db.Column(
-        db.Float, nullable=True
+        MoneyType, nullable=True
     )  # Optional recurring deposit amount
     next_deposit_date = db.Column(db.Date, nullable=True)  # Next scheduled deposit date
     skip_next = db.Column(db.Boolean, default=False)  # Skip next deposit
@@ -25,6 +26,16 @@ class Fund(db.Model):
     description = db.Column(db.String(255), nullable=True)  # Optional description
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # Partial index for recurring-deposit processing and forecasting
+    __table_args__ = (
+        db.Index('ix_funds_household_type', household_id, fund_type),
+        db.Index(
+            'ix_funds_household_recurring', household_id,
+            postgresql_where=recurring_amount.isnot(None),
+            sqlite_where=recurring_amount.isnot(None),
+        ),
+    )
+
     # Relationships
     household = db.relationship("Household", backref=db.backref("funds", lazy=True))
     account = db.relationship("Account", backref=db.backref("funds", lazy=True))
@@ -38,10 +49,12 @@ class Fund(db.Model):
             "id": self.id,
             "household_id": self.household_id,
             "name": self.name,
-            "balance": self.balance,
-            "goal": self.goal,
+            "balance": float(self.balance) if self.balance is not None else None,
+            "goal": float(self.goal) if self.goal is not None else None,
             "fund_type": self.fund_type,
-            "recurring_amount": self.recurring_amount,
+            "recurring_amount": (
+                float(self.recurring_amount) if self.recurring_amount is not None else None
+            ),
             "next_deposit_date": (
                 self.next_deposit_date.isoformat() if self.next_deposit_date else None
             ),
@@ -61,7 +74,7 @@ class Fund(db.Model):
     @property
     def amount_to_goal(self):
         """Calculate remaining amount needed to reach goal"""
-        return max(self.goal - self.balance, 0.0)
+        return max(self.goal - self.balance, Money())
 
     def add_funds(self, amount):
         """Add funds to the balance"""
@@ -96,8 +109,10 @@ class Fund(db.Model):
             self.next_deposit_date = date.today() + timedelta(days=14)
             return False
 
-        # Add recurring amount to balance
-        self.balance += self.recurring_amount
+        # Add recurring amount to balance as a single atomic UPDATE
+        from backend.utils.balances import adjust_fund_balance
+
+        adjust_fund_balance(self.id, self.recurring_amount)
         # Set next deposit date to 14 days from now (biweekly)
         self.next_deposit_date = date.today() + timedelta(days=14)
         return True
@@ -109,7 +124,7 @@ class Fund(db.Model):
             db.session.query(db.func.sum(Fund.balance))
             .filter_by(household_id=household_id, fund_type=fund_type)
             .scalar()
-            or 0.0
+            or Money()
         )
 
     @staticmethod
@@ -123,5 +138,5 @@ class Fund(db.Model):
                 Fund.skip_next == False,
             )
             .scalar()
-            or 0.0
+            or Money()
         )
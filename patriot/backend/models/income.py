@@ -1,5 +1,6 @@
 from datetime import date
 from backend.database import db
+from backend.utils.money import MoneyType
 
 
 class Income(db.Model):
@@ -8,12 +9,16 @@ class Income(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     household_id = db.Column(db.Integer, db.ForeignKey('households.id'), nullable=False)
     date = db.Column(db.Date, nullable=False, default=date.today)
-    amount = db.Column(db.Numeric(15, 2), nullable=False)
+    amount = db.Column(MoneyType, nullable=False)
     source = db.Column(db.String(100), nullable=False)
     category = db.Column(db.String(50), nullable=False, default='Paycheck')  # Paycheck, Bonus, Gift, Other
     description = db.Column(db.Text)
     account_id = db.Column(db.Integer, db.ForeignKey('accounts.id'), nullable=True)  # Link to account
     
+    __table_args__ = (
+        db.Index('ix_incomes_household_date', household_id, date),
+    )
+    
     # Relationships
     household = db.relationship('Household', backref='incomes')
     account = db.relationship('Account', backref='incomes')
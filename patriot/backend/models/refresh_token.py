@@ -0,0 +1,25 @@
+# backend/models/refresh_token.py
+from datetime import datetime
+from backend.database import db
+
+
+class RefreshToken(db.Model):
+    """
+    One issued refresh token, keyed by its JWT ``jti``.
+
+    Tokens from one login share a ``family_id``; each refresh revokes the
+    presented token and issues its successor in the same family. Presenting an
+    already-revoked token means it was copied, so the whole family is revoked.
+    """
+    __tablename__ = "refresh_tokens"
+
+    jti = db.Column(db.String(36), primary_key=True)
+    family_id = db.Column(db.String(36), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+    issued_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
+    revoked_at = db.Column(db.DateTime, nullable=True)
+    replaced_by = db.Column(db.String(36), nullable=True)
+
+    def __repr__(self):
+        return f'<RefreshToken {self.jti} user={self.user_id}>'
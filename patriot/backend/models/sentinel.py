@@ -0,0 +1,15 @@
+# backend/models/sentinel.py
+from datetime import datetime
+from backend.database import db
+
+
+class SentinelCursor(db.Model):
+    """Position in a peer's changes-since feed, so each pull resumes where the last stopped."""
+    __tablename__ = "sentinel_cursors"
+
+    peer_url = db.Column(db.String(255), primary_key=True)
+    cursor = db.Column(db.String(64), nullable=True)
+    pulled_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<SentinelCursor {self.peer_url} {self.cursor}>'
@@ -1,6 +1,7 @@
 # backend/models/transaction.py
 from datetime import datetime, date
 from backend.database import db
+from backend.utils.money import MoneyType
 
 
 class Transaction(db.Model):
@@ -11,7 +12,7 @@ class Transaction(db.Model):
     created_by_user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)  # Track who created it
     date = db.Column(db.Date, default=date.today)
     description = db.Column(db.String(255), nullable=False)
-    amount = db.Column(db.Numeric(15, 2), nullable=False)  # Use Numeric for precision
+    amount = db.Column(MoneyType, nullable=False)  # Whole cents, loads as Money
     category = db.Column(db.String(100), nullable=False)
     
     # Optional relationships - transaction can be linked to account, fund, and/or bill
@@ -37,6 +38,24 @@ class Transaction(db.Model):
     is_autopay = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # Indexes; partial ones only cover the rows their hot query touches
+    __table_args__ = (
+        db.Index('ix_transactions_household_date', household_id, date),
+        db.Index('ix_transactions_household_category_amount', household_id, category, amount),
+        db.Index(
+            'ix_transactions_recurring_due', household_id, next_occurrence,
+            postgresql_where=db.and_(is_recurring == True, is_skipped == False),
+            sqlite_where=db.and_(is_recurring == True, is_skipped == False),
+        ),
+        db.Index(
+            'ix_transactions_autopay_bill', bill_id, date,
+            postgresql_where=is_autopay == True,
+            sqlite_where=is_autopay == True,
+        ),
+        # Archived rows keep their ids, so SQLite must never hand one out again
+        {'sqlite_autoincrement': True},
+    )
+
     # Relationships
     household = db.relationship('Household', backref=db.backref('transactions', lazy=True))
     created_by = db.relationship('User', foreign_keys=[created_by_user_id], backref='created_transactions')
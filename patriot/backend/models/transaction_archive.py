@@ -0,0 +1,79 @@
+# backend/models/transaction_archive.py
+from datetime import datetime
+from backend.database import db
+from backend.models.transaction import Transaction
+from backend.utils.money import MoneyType
+
+
+class ArchivedTransaction(db.Model):
+    """
+    A transaction from a closed period, moved out of ``transactions`` by
+    ``flask archive-transactions``.
+
+    Same columns and ids as the row it replaces, minus the foreign keys, so
+    accounts, funds and bills can still be deleted after their history is
+    archived. Archived rows are read-only.
+    """
+    __tablename__ = "transactions_archive"
+    __table_args__ = (
+        db.Index('ix_transactions_archive_household_date', 'household_id', 'date'),
+        db.Index('ix_transactions_archive_household_category_amount', 'household_id', 'category', 'amount'),
+        db.Index('ix_transactions_archive_fund', 'fund_id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    household_id = db.Column(db.Integer, nullable=False)
+    created_by_user_id = db.Column(db.Integer, nullable=True)
+    date = db.Column(db.Date, nullable=False)
+    description = db.Column(db.String(255), nullable=False)
+    amount = db.Column(MoneyType, nullable=False)
+    category = db.Column(db.String(100), nullable=False)
+    account_id = db.Column(db.Integer, nullable=True)
+    fund_id = db.Column(db.Integer, nullable=True)
+    bill_id = db.Column(db.Integer, nullable=True)
+    to_account_id = db.Column(db.Integer, nullable=True)
+    to_fund_id = db.Column(db.Integer, nullable=True)
+    transaction_type = db.Column(db.String(20), nullable=False)
+    is_recurring = db.Column(db.Boolean, default=False)
+    frequency = db.Column(db.String(20), nullable=True)
+    next_occurrence = db.Column(db.Date, nullable=True)
+    parent_transaction_id = db.Column(db.Integer, nullable=True)
+    is_skipped = db.Column(db.Boolean, default=False)
+    is_autopay = db.Column(db.Boolean, default=False)
+    created_at = db.Column(db.DateTime, nullable=True)
+    archived_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    created_by = db.relationship(
+        'User', primaryjoin='foreign(ArchivedTransaction.created_by_user_id) == User.id', viewonly=True,
+    )
+
+    # Same JSON as a live transaction
+    to_dict = Transaction.to_dict
+
+    def __repr__(self):
+        return f'<ArchivedTransaction {self.id}: {self.description} - ${self.amount}>'
+
+
+class TransactionPeriodSummary(db.Model):
+    """
+    Totals of the archived transactions of one household and month, per
+    category, type and account. Reports read these instead of the archived rows
+    for whole archived months; the archiver keeps them equal to the rows.
+    """
+    __tablename__ = "transaction_period_summaries"
+    __table_args__ = (
+        db.Index('ix_transaction_period_summaries_household_period', 'household_id', 'period'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    household_id = db.Column(db.Integer, nullable=False)
+    period = db.Column(db.Date, nullable=False)  # First day of the month
+    category = db.Column(db.String(100), nullable=False)
+    transaction_type = db.Column(db.String(20), nullable=False)
+    account_id = db.Column(db.Integer, nullable=True)
+    amount = db.Column(MoneyType, nullable=False)  # Sum of the signed amounts
+    abs_amount = db.Column(MoneyType, nullable=False)  # Sum of abs(amount)
+    transaction_count = db.Column(db.Integer, nullable=False)
+
+    def __repr__(self):
+        return f'<TransactionPeriodSummary {self.household_id} {self.period} {self.category} {self.transaction_type}>'
@@ -1,7 +1,12 @@
 # backend/models/user.py
 from datetime import datetime
+from sqlalchemy import event, inspect
 from backend.database import db
 
+# Columns other Sentinel apps replicate; only a change to one of them moves a
+# user up the changes-since feed
+REPLICATED_COLUMNS = ("username", "email", "name", "is_verified", "password")
+
 
 class User(db.Model):
     __tablename__ = "users"
@@ -16,6 +21,10 @@ class User(db.Model):
     verification_token = db.Column(db.String(255))
     token_expiration = db.Column(db.DateTime)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Bumped when a replicated column changes; drives the Sentinel changes-since feed
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Set when the user picks a new password (not on rehashes); tells peers to drop their hash
+    password_changed_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Default household - automatically created for single users
     default_household_id = db.Column(db.Integer, db.ForeignKey('households.id'), nullable=True)
@@ -23,6 +32,11 @@ class User(db.Model):
     # Relationships
     default_household = db.relationship('Household', foreign_keys=[default_household_id], backref='default_for_users')
 
+    # Keyset order of the changes-since feed
+    __table_args__ = (
+        db.Index('ix_users_updated_at_id', updated_at, id),
+    )
+
     def __repr__(self):
         return f'<User {self.username}>'
 
@@ -49,4 +63,13 @@ class User(db.Model):
                 for h in self.households
             ]
         
-        return result
\ No newline at end of file
+        return result
+
+
+@event.listens_for(User, "before_update")
+def _touch_updated_at(mapper, connection, target):
+    state = inspect(target)
+    if state.attrs.updated_at.history.has_changes():
+        return  # set explicitly, e.g. to the origin app's timestamp
+    if any(state.attrs[name].history.has_changes() for name in REPLICATED_COLUMNS):
+        target.updated_at = datetime.utcnow()
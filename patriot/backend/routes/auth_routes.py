@@ -1,15 +1,25 @@
 from flask import Blueprint, request, jsonify, current_app
 from datetime import datetime, timedelta
 import secrets
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
-from flask_bcrypt import Bcrypt
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
 from backend.database import db
 from backend.models import User, Household, user_household
-from backend.utils.email_service import send_verification_email
+from backend.utils.membership import get_membership
+from backend.utils.passwords import HasherBusy, check_password, hash_password, needs_rehash
+from backend.utils.tokens import issue_tokens, revoke_family, revoke_user_tokens, rotate_refresh_token
 from backend.templates.verification_theme import get_verification_styles
 
 auth_bp = Blueprint("auth", __name__)
 
+
+@auth_bp.errorhandler(HasherBusy)
+def hasher_busy(error):
+    """Shed login/registration load instead of queueing behind bcrypt."""
+    response = jsonify({"error": "server busy, please retry"})
+    response.headers["Retry-After"] = "1"
+    return response, 503
+
+
 @auth_bp.route("/register", methods=["POST"])
 def register():
     data = request.get_json()
@@ -28,8 +38,7 @@ def register():
 
     token = secrets.token_urlsafe(32)
     token_exp = datetime.utcnow() + timedelta(hours=24)
-    bcrypt = Bcrypt(current_app)
-    hashed = bcrypt.generate_password_hash(password).decode("utf-8")
+    hashed = hash_password(password)
 
     user = User(
         username=username,
@@ -65,8 +74,10 @@ def register():
     # Set as default household
     user.default_household_id = household.id
     
-    db.session.commit()
+    # Queued in the outbox, so it commits with the user
+    from backend.utils.email_service import send_verification_email  # smtplib/ssl load on demand
     send_verification_email(email, token)
+    db.session.commit()
 
     return jsonify({"message": "registered - verification email sent"}), 201
 
@@ -141,8 +152,8 @@ def login():
     ).first()
     
     # If user not found locally, try to sync from other Sentinel apps
-    if not user:
-        from shared.user_sync import get_sync_service
+    if not user and current_app.config.get("SENTINEL_LAZY_LOOKUP", True):
+        from backend.shared.user_sync import get_sync_service
         sync_service = get_sync_service(current_app.config)
         
         if sync_service:
@@ -157,31 +168,89 @@ def login():
     if not user:
         return jsonify({"error": "user not found"}), 404
 
-    bcrypt = Bcrypt(current_app)
-    if not bcrypt.check_password_hash(user.password, password):
+    # Replicated users arrive without a hash; fetch it from the app that has one
+    if not user.password and current_app.config.get("SENTINEL_LAZY_LOOKUP", True):
+        from backend.shared.user_sync import get_sync_service
+        sync_service = get_sync_service(current_app.config)
+        if sync_service:
+            sync_service.refresh_password(user, db.session)
+
+    if not check_password(user.password, password):
         return jsonify({"error": "invalid password"}), 401
 
+    # Upgrade hashes made with a different BCRYPT_LOG_ROUNDS while we have the password
+    if needs_rehash(user.password):
+        user.password = hash_password(password)
+        db.session.commit()
+
     if not user.is_verified:
         return jsonify({"error": "email not verified"}), 403
 
-    # Include household_id in JWT claims
-    additional_claims = {
-        "household_id": user.default_household_id
-    }
-    token = create_access_token(
-        identity=str(user.id), 
-        additional_claims=additional_claims,
-        expires_delta=timedelta(days=1)
-    )
+    # Include household_id in JWT claims; the refresh token renews them later
+    access_token, refresh_token = issue_tokens(user.id, user.default_household_id)
+    db.session.commit()
     
     return jsonify({
-        "access_token": token, 
+        "access_token": access_token, 
+        "refresh_token": refresh_token,
         "username": user.username,
         "email": user.email,
         "household_id": user.default_household_id
     }), 200
 
 
+@auth_bp.route("/refresh", methods=["POST"])
+@jwt_required(refresh=True)
+def refresh():
+    """
+    Exchange a refresh token for a new access/refresh pair.
+    Send the refresh token as the Bearer token. The presented token is revoked;
+    reusing it later revokes every token from the same login.
+    """
+    claims = get_jwt()
+    successor = rotate_refresh_token(claims["jti"])
+    if successor is None:
+        revoke_family(claims.get("fam"))
+        db.session.commit()
+        return jsonify({"error": "refresh token revoked"}), 401
+
+    # The user may have been deleted or unverified since the token was issued
+    is_verified = db.session.scalar(db.select(User.is_verified).where(User.id == int(get_jwt_identity())))
+    if is_verified is None:
+        db.session.commit()
+        return jsonify({"error": "user not found"}), 401
+    if not is_verified:
+        db.session.commit()
+        return jsonify({"error": "email not verified"}), 403
+
+    # Household claims come from the membership cache, not the old token
+    membership = get_membership(get_jwt_identity())
+    if membership is None:
+        db.session.rollback()
+        return jsonify({"error": "user not found"}), 401
+
+    access_token, refresh_token = issue_tokens(
+        membership.user_id, membership.default_household_id,
+        family_id=claims.get("fam"), jti=successor,
+    )
+    db.session.commit()
+
+    return jsonify({
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "household_id": membership.default_household_id
+    }), 200
+
+
+@auth_bp.route("/logout", methods=["POST"])
+@jwt_required(refresh=True)
+def logout():
+    """Revoke the presented refresh token and every token rotated from the same login."""
+    revoke_family(get_jwt().get("fam"))
+    db.session.commit()
+    return jsonify({"message": "logged out"}), 200
+
+
 @auth_bp.route("/test-jwt", methods=["GET"])
 @jwt_required()
 def test_jwt():
@@ -221,10 +290,11 @@ def resend_verification():
     # Update user with new token
     user.verification_token = token
     user.token_expiration = token_exp
-    db.session.commit()
 
     # Send verification email
+    from backend.utils.email_service import send_verification_email
     send_verification_email(email, token)
+    db.session.commit()
 
     return jsonify({"message": "verification email resent"}), 200
 
@@ -276,15 +346,15 @@ def forgot_password():
     # Store token in user record
     user.verification_token = reset_token
     user.token_expiration = reset_token_exp
-    db.session.commit()
 
     # Send password reset email
     try:
-        from utils.email_service import send_password_reset_email
+        from backend.utils.email_service import send_password_reset_email
         send_password_reset_email(email, reset_token)
     except Exception as e:
         current_app.logger.error(f"Failed to send password reset email: {str(e)}")
         # Still return success to user for security
+    db.session.commit()
     
     return jsonify({"message": "If that email exists, a password reset link has been sent"}), 200
 
@@ -314,13 +384,14 @@ def reset_password():
         return jsonify({"error": "reset token has expired"}), 400
 
     # Hash new password
-    bcrypt = Bcrypt(current_app)
-    hashed = bcrypt.generate_password_hash(new_password).decode("utf-8")
+    hashed = hash_password(new_password)
     
-    # Update password and clear reset token
+    # Update password, clear reset token and sign out existing sessions
     user.password = hashed
+    user.password_changed_at = datetime.utcnow()
     user.verification_token = None
     user.token_expiration = None
+    revoke_user_tokens(user.id)
     db.session.commit()
 
     return jsonify({"message": "password reset successful"}), 200
@@ -333,49 +404,13 @@ def reset_password():
 
 @auth_bp.route("/sentinel/user-lookup", methods=["GET"])
 def sentinel_user_lookup():
-    """
-    Lookup user for Sentinel Systems cross-app sync.
-    Other Sentinel apps call this to find if a user exists here.
-    
-    Query params:
-        identifier: username or email to search for
-    
-    Returns:
-        User data (without sensitive tokens) or 404
-    """
-    identifier = request.args.get("identifier")
-    
-    if not identifier:
-        return jsonify({"error": "identifier parameter required"}), 400
-    
-    # Find user by username or email
-    user = User.query.filter(
-        (User.email == identifier) | (User.username == identifier)
-    ).first()
-    
-    if not user:
-        return jsonify({"error": "user not found"}), 404
-    
-    # Return user data (password hash is safe to share - it's already hashed)
-    # Don't share verification tokens (they're single-use)
-    return jsonify({
-        "username": user.username,
-        "email": user.email,
-        "password": user.password,  # Already hashed, safe to sync
-        "is_verified": user.is_verified,
-        "synced_from": current_app.config.get('APP_NAME', 'Unknown App')
-    }), 200
+    """Older path of /api/sentinel/user-lookup (see routes/sentinel_routes.py)."""
+    from backend.routes.sentinel_routes import user_lookup
+    return user_lookup()
 
 
 @auth_bp.route("/sentinel/health", methods=["GET"])
 def sentinel_health():
-    """
-    Health check endpoint for Sentinel Systems.
-    Other apps use this to verify this app is online and part of the network.
-    """
-    return jsonify({
-        "status": "online",
-        "app_name": current_app.config.get('APP_NAME', 'Unknown'),
-        "version": "1.0.0",
-        "sentinel_system": True
-    }), 200
+    """Older path of /api/sentinel/health (see routes/sentinel_routes.py)."""
+    from backend.routes.sentinel_routes import health
+    return health()
@@ -5,12 +5,14 @@ from datetime import datetime, date, timedelta
 from backend.models.bill import Bill
 from backend.utils.forecasting import generate_forecast, get_bill_schedule_summary
 from backend.utils.auth_helpers import get_current_household_id
-from backend.database import db
+from backend.utils.money import Money
+from backend.database import db, read_only
 
 bills_bp = Blueprint('bills', __name__)
 
 
 @bills_bp.route('/', methods=['GET'])
+@read_only
 @jwt_required()
 def get_bills():
     """Get all bills for the current household"""
@@ -53,7 +55,7 @@ def create_bill():
             household_id=household_id,
             name=data['name'],
             description=data.get('description', ''),
-            amount=float(data['amount']),
+            amount=Money.parse(data['amount']),
             due_date=due_date,
             frequency=data.get('frequency', 'monthly'),
             category=data['category'],
@@ -99,7 +101,7 @@ def update_bill(bill_id):
         if 'description' in data:
             bill.description = data['description']
         if 'amount' in data:
-            bill.amount = float(data['amount'])
+            bill.amount = Money.parse(data['amount'])
         if 'due_date' in data:
             bill.due_date = datetime.strptime(data['due_date'], '%Y-%m-%d').date()
         if 'frequency' in data:
@@ -217,6 +219,7 @@ def get_bill_schedule():
 
 
 @bills_bp.route('/upcoming', methods=['GET'])
+@read_only
 @jwt_required()
 def get_upcoming_bills():
     """Get bills due in the next N days (default: 7 days)"""
@@ -240,6 +243,7 @@ def get_upcoming_bills():
 
 
 @bills_bp.route('/categories', methods=['GET'])
+@read_only
 @jwt_required()
 def get_bill_categories():
     """Get all unique bill categories for the user"""
@@ -8,6 +8,8 @@ from backend.models.transaction import Transaction
 from backend.models.income import Income
 from sqlalchemy import func, and_
 from backend.utils.auth_helpers import get_current_household_id
+from backend.utils.metrics import JOB_DURATION, timed
+from backend.utils.money import Money
 
 dashboard_bp = Blueprint("dashboard", __name__)
 
@@ -162,6 +164,7 @@ def get_debts_chart_data():
 
 @dashboard_bp.route("/process-recurring", methods=["POST"])
 @jwt_required()
+@timed(JOB_DURATION, job="dashboard.process_recurring")
 def process_recurring_deposits():
     """Process all recurring deposits for the current user"""
     try:
@@ -177,7 +180,7 @@ def process_recurring_deposits():
         )
 
         processed_count = 0
-        total_processed = 0.0
+        total_processed = Money()
 
         for fund in funds:
             if fund.process_recurring_deposit():
@@ -1,15 +1,17 @@
 # backend/routes/debts_routes.py
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from backend.database import db
+from backend.database import db, read_only
 from backend.models.debt import Debt
 from datetime import datetime, date
 from backend.utils.auth_helpers import get_current_household_id, get_current_user_id
+from backend.utils.money import Money
 
 debts_bp = Blueprint("debts", __name__)
 
 
 @debts_bp.route("/", methods=["GET"])
+@read_only
 @jwt_required()
 def get_debts():
     """Get all debts for the current user"""
@@ -60,9 +62,9 @@ def create_debt():
             owner_user_id=current_user_id,
             name=data["name"],
             description=data.get("description", ""),
-            total_amount=float(data["total_amount"]),
-            current_balance=float(data["current_balance"]),
-            minimum_payment=float(data["minimum_payment"]),
+            total_amount=Money.parse(data["total_amount"]),
+            current_balance=Money.parse(data["current_balance"]),
+            minimum_payment=Money.parse(data["minimum_payment"]),
             interest_rate=float(data.get("interest_rate", 0.0)),
             due_date=due_date,
             category=data["category"],
@@ -120,11 +122,11 @@ def update_debt(debt_id):
         if "description" in data:
             debt.description = data["description"]
         if "total_amount" in data:
-            debt.total_amount = float(data["total_amount"])
+            debt.total_amount = Money.parse(data["total_amount"])
         if "current_balance" in data:
-            debt.current_balance = float(data["current_balance"])
+            debt.current_balance = Money.parse(data["current_balance"])
         if "minimum_payment" in data:
-            debt.minimum_payment = float(data["minimum_payment"])
+            debt.minimum_payment = Money.parse(data["minimum_payment"])
         if "interest_rate" in data:
             debt.interest_rate = float(data["interest_rate"])
         if "due_date" in data:
@@ -192,18 +194,19 @@ def make_payment(debt_id):
         if "amount" not in data:
             return jsonify({"error": "Payment amount is required"}), 400
 
-        amount = float(data["amount"])
+        amount = Money.parse(data["amount"])
         if amount <= 0:
             return jsonify({"error": "Payment amount must be positive"}), 400
 
-        if amount > debt.current_balance:
+        # Make the payment; the guarded UPDATE rejects payments larger than
+        # the remaining balance even when other payments land concurrently
+        if not debt.make_payment(amount):
+            db.session.rollback()
             return (
                 jsonify({"error": "Payment amount cannot exceed current balance"}),
                 400,
             )
 
-        # Make the payment
-        debt.make_payment(amount)
         db.session.commit()
 
         return (
@@ -222,6 +225,7 @@ def make_payment(debt_id):
 
 
 @debts_bp.route("/summary", methods=["GET"])
+@read_only
 @jwt_required()
 def get_debt_summary():
     """Get debt summary for the current user"""
@@ -0,0 +1,41 @@
+# backend/routes/export_routes.py
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+from flask_jwt_extended import jwt_required
+from backend.database import read_only
+from backend.utils.auth_helpers import get_current_household_id
+from backend.utils.export import EXPORT_TABLES, ExportUnavailable, arrow_stream
+
+export_bp = Blueprint("export", __name__)
+
+
+@export_bp.route("/arrow", methods=["GET"])
+@read_only
+@jwt_required()
+def export_arrow():
+    """
+    Stream one of the household's tables as an Arrow IPC stream.
+
+    Query params:
+        table: accounts, funds, bills, debts, incomes or transactions (archived ones included)
+
+    Money columns are decimal128(19, 2) dollars and dates are date32; read the
+    body with pyarrow.ipc.open_stream (or pandas/polars).
+    """
+    household_id = get_current_household_id()
+    if not household_id:
+        return jsonify({"error": "No household found for user"}), 404
+
+    table = request.args.get("table")
+    if table not in EXPORT_TABLES:
+        return jsonify({"error": f"table must be one of {', '.join(EXPORT_TABLES)}"}), 400
+
+    try:
+        chunks = arrow_stream(table, household_id, current_app.config["EXPORT_BATCH_SIZE"])
+    except ExportUnavailable as e:
+        return jsonify({"error": str(e)}), 501
+
+    return Response(
+        stream_with_context(chunks),
+        mimetype="application/vnd.apache.arrow.stream",
+        headers={"Content-Disposition": f'attachment; filename="{table}.arrows"'},
+    )
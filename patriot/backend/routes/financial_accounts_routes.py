@@ -2,7 +2,7 @@
 Financial accounts routes
 """
 from flask import Blueprint, request, jsonify
-from backend.database import db
+from backend.database import db, read_only
 from backend.models.account import Account
 from backend.models.user import User
 from flask_jwt_extended import jwt_required, get_jwt_identity
@@ -11,6 +11,7 @@ from backend.utils.auth_helpers import get_current_household_id, get_current_use
 financial_accounts_bp = Blueprint("financial_accounts", __name__)
 
 @financial_accounts_bp.route("/", methods=["GET"])
+@read_only
 @jwt_required()
 def get_accounts():
     """Get all financial accounts for the current user."""
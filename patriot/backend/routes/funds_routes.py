@@ -1,14 +1,18 @@
 from flask import Blueprint, request, jsonify
-from backend.database import db
-from backend.models import Fund, User, Transaction, Account
+from backend.database import db, read_only
+from backend.models import ArchivedTransaction, Fund, User, Transaction, Account
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime, date
-from decimal import Decimal
-from backend.utils.auth_helpers import get_current_household_id
+from backend.utils.archive import reaches_archive
+from backend.utils.auth_helpers import get_current_household_id, get_current_user_id
+from backend.utils.balances import move_fund_money
+from backend.utils.metrics import JOB_DURATION, timed
+from backend.utils.money import Money
 
 funds_bp = Blueprint("funds", __name__)
 
 @funds_bp.route("/", methods=["GET"])
+@read_only
 @jwt_required()
 def list_funds():
     """Get all funds for the current household"""
@@ -70,14 +74,14 @@ def create_fund():
     
     # Validate balance and goal
     try:
-        balance = float(balance)
+        balance = Money.parse(balance)
         if balance < 0:
             return jsonify({"error": "Balance cannot be negative"}), 400
     except (ValueError, TypeError):
         return jsonify({"error": "Invalid balance amount"}), 400
     
     try:
-        goal = float(goal)
+        goal = Money.parse(goal)
         if goal < 0:
             return jsonify({"error": "Goal cannot be negative"}), 400
     except (ValueError, TypeError):
@@ -86,7 +90,7 @@ def create_fund():
     # Validate recurring_amount if provided
     if recurring_amount is not None:
         try:
-            recurring_amount = float(recurring_amount)
+            recurring_amount = Money.parse(recurring_amount)
             if recurring_amount < 0:
                 return jsonify({"error": "Recurring amount cannot be negative"}), 400
         except (ValueError, TypeError):
@@ -169,7 +173,7 @@ def update_fund(fund_id):
     # Update goal if provided
     if "goal" in data:
         try:
-            goal = float(data["goal"])
+            goal = Money.parse(data["goal"])
             if goal < 0:
                 return jsonify({"error": "Goal cannot be negative"}), 400
             fund.goal = goal
@@ -179,7 +183,7 @@ def update_fund(fund_id):
     # Update balance if provided
     if "balance" in data:
         try:
-            balance = float(data["balance"])
+            balance = Money.parse(data["balance"])
             if balance < 0:
                 return jsonify({"error": "Balance cannot be negative"}), 400
             fund.balance = balance
@@ -198,7 +202,7 @@ def update_fund(fund_id):
         recurring_amount = data["recurring_amount"]
         if recurring_amount is not None:
             try:
-                recurring_amount = float(recurring_amount)
+                recurring_amount = Money.parse(recurring_amount)
                 if recurring_amount < 0:
                     return jsonify({"error": "Recurring amount cannot be negative"}), 400
                 fund.recurring_amount = recurring_amount
@@ -276,8 +280,11 @@ def get_fund_transactions(fund_id):
     if not fund:
         return jsonify({"error": "Fund not found or access denied"}), 404
     
-    # Get all transactions for this fund
+    # Get all transactions for this fund, archived ones included
     transactions = Transaction.query.filter_by(fund_id=fund_id).order_by(Transaction.date.desc()).all()
+    if reaches_archive(fund.household_id):
+        archived = ArchivedTransaction.query.filter_by(fund_id=fund_id).all()
+        transactions = sorted(transactions + archived, key=lambda t: t.date or date.min, reverse=True)
     
     return jsonify({
         "fund": fund.to_dict(),
@@ -300,13 +307,15 @@ def get_fund(fund_id):
     if not fund:
         return jsonify({"error": "Fund not found or access denied"}), 404
     
-    # Get transaction count for this fund
+    # Get transaction count for this fund, archived ones included
     transaction_count = Transaction.query.filter_by(fund_id=fund_id).count()
+    if reaches_archive(household_id):
+        transaction_count += ArchivedTransaction.query.filter_by(fund_id=fund_id).count()
     
     fund_data = fund.to_dict()
     fund_data["transaction_count"] = transaction_count
     fund_data["progress_percentage"] = fund.progress_percentage
-    fund_data["amount_to_goal"] = fund.amount_to_goal
+    fund_data["amount_to_goal"] = float(fund.amount_to_goal)
     
     return jsonify(fund_data), 200
 
@@ -332,8 +341,8 @@ def get_funds_summary():
     
     return jsonify({
         "fund_count": len(funds),
-        "total_balance": total_balance,
-        "total_goal": total_goal,
+        "total_balance": float(total_balance),
+        "total_goal": float(total_goal),
         "overall_progress_percentage": overall_progress,
         "funds_with_goals": len(funds_with_goals),
         "funds": [fund.to_dict() for fund in funds]
@@ -344,10 +353,14 @@ def get_funds_summary():
 @jwt_required()
 def deposit_to_fund(fund_id):
     """Deposit money to a fund (creates transaction with recurring support)"""
-    current_user_id = get_jwt_identity()
+    household_id = get_current_household_id()
+    if not household_id:
+        return jsonify({"error": "No household found for user"}), 404
     
-    # Get fund and verify ownership
-    fund = Fund.query.filter_by(id=fund_id, user_id=current_user_id).first()
+    current_user_id = get_current_user_id()
+    
+    # Get fund and verify household access
+    fund = Fund.query.filter_by(id=fund_id, household_id=household_id).first()
     if not fund:
         return jsonify({"error": "Fund not found or access denied"}), 404
     
@@ -365,7 +378,7 @@ def deposit_to_fund(fund_id):
         return jsonify({"error": "Amount is required"}), 400
     
     try:
-        amount = float(amount)
+        amount = Money.parse(amount)
         if amount <= 0:
             return jsonify({"error": "Amount must be positive"}), 400
         transaction_date = datetime.fromisoformat(date_str.replace('Z', '+00:00')).date()
@@ -373,11 +386,10 @@ def deposit_to_fund(fund_id):
         return jsonify({"error": f"Invalid data: {str(e)}"}), 400
     
     try:
-        from models import Transaction
-        
         # Create transaction
         transaction = Transaction(
-            user_id=current_user_id,
+            household_id=household_id,
+            created_by_user_id=current_user_id,
             fund_id=fund.id,
             amount=amount,
             description=description,
@@ -392,13 +404,10 @@ def deposit_to_fund(fund_id):
         if is_recurring and frequency:
             transaction.next_occurrence = transaction.calculate_next_occurrence(transaction_date)
         
-        # Update fund balance
-        fund.balance += amount
-        if fund.account:
-            from decimal import Decimal
-            fund.account.balance += Decimal(str(amount))
-        
         db.session.add(transaction)
+        
+        # Update fund balance (and linked account) atomically
+        move_fund_money(fund, amount)
         db.session.commit()
         
         return jsonify({
@@ -415,10 +424,14 @@ def deposit_to_fund(fund_id):
 @jwt_required()
 def withdraw_from_fund(fund_id):
     """Withdraw money from a fund (creates transaction with recurring support)"""
-    current_user_id = get_jwt_identity()
+    household_id = get_current_household_id()
+    if not household_id:
+        return jsonify({"error": "No household found for user"}), 404
     
-    # Get fund and verify ownership
-    fund = Fund.query.filter_by(id=fund_id, user_id=current_user_id).first()
+    current_user_id = get_current_user_id()
+    
+    # Get fund and verify household access
+    fund = Fund.query.filter_by(id=fund_id, household_id=household_id).first()
     if not fund:
         return jsonify({"error": "Fund not found or access denied"}), 404
     
@@ -436,7 +449,7 @@ def withdraw_from_fund(fund_id):
         return jsonify({"error": "Amount is required"}), 400
     
     try:
-        amount = float(amount)
+        amount = Money.parse(amount)
         if amount <= 0:
             return jsonify({"error": "Amount must be positive"}), 400
         transaction_date = datetime.fromisoformat(date_str.replace('Z', '+00:00')).date()
@@ -446,14 +459,15 @@ def withdraw_from_fund(fund_id):
     if fund.balance < amount:
         return jsonify({
             "error": "Insufficient funds",
-            "current_balance": fund.balance,
-            "requested_amount": amount
+            "current_balance": float(fund.balance),
+            "requested_amount": float(amount)
         }), 400
     
     try:
         # Create transaction
         transaction = Transaction(
-            user_id=current_user_id,
+            household_id=household_id,
+            created_by_user_id=current_user_id,
             fund_id=fund.id,
             amount=amount,
             description=description,
@@ -468,12 +482,19 @@ def withdraw_from_fund(fund_id):
         if is_recurring and frequency:
             transaction.next_occurrence = transaction.calculate_next_occurrence(transaction_date)
         
-        # Update fund balance
-        fund.balance -= amount
-        if fund.account:
-            fund.account.balance -= Decimal(str(amount))
-        
         db.session.add(transaction)
+        
+        # Update fund balance (and linked account) atomically, guarded against overdraw
+        fund_balance, _ = move_fund_money(fund, -amount, require_sufficient=True)
+        if fund_balance is None:
+            db.session.rollback()
+            fund = Fund.query.get(fund_id)
+            return jsonify({
+                "error": "Insufficient funds",
+                "current_balance": float(fund.balance),
+                "requested_amount": float(amount)
+            }), 400
+        
         db.session.commit()
         
         return jsonify({
@@ -512,12 +533,15 @@ def toggle_skip_next(fund_id):
 
 @funds_bp.route("/process-recurring", methods=["POST"])
 @jwt_required()
+@timed(JOB_DURATION, job="funds.process_recurring")
 def process_recurring_deposits():
     """Process all recurring deposits for funds that are due"""
-    current_user_id = get_jwt_identity()
+    household_id = get_current_household_id()
+    if not household_id:
+        return jsonify({"error": "No household found for user"}), 404
     
     # Get all funds that are due for recurring deposits
-    funds = Fund.query.filter_by(user_id=current_user_id).all()
+    funds = Fund.query.filter_by(household_id=household_id).all()
     processed_funds = []
     
     try:
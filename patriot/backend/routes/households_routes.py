@@ -3,10 +3,16 @@
 Household Management Routes
 Handles creating households, inviting members, and managing household memberships.
 """
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.wsgi import LimitedStream
 from backend.database import db
 from backend.models import User, Household, HouseholdInvite, user_household
+from backend.utils.household_backup import BackupError, backup_chunks, restore_backup
+from backend.utils.membership import (
+    get_membership, household_member_required, invalidate_household, invalidate_user,
+)
 from datetime import datetime, timedelta
 import secrets
 import string
@@ -21,10 +27,10 @@ def generate_invite_token():
 
 def get_user_household(user_id):
     """Get the user's default household ID"""
-    user = User.query.get(user_id)
-    if not user:
+    membership = get_membership(user_id)
+    if not membership:
         return None
-    return user.default_household_id
+    return membership.default_household_id
 
 
 @households_bp.route('/', methods=['GET'])
@@ -52,20 +58,15 @@ def get_user_households():
 
 @households_bp.route('/<int:household_id>', methods=['GET'])
 @jwt_required()
+@household_member_required()
 def get_household(household_id):
     """Get details of a specific household"""
     try:
-        current_user_id = get_jwt_identity()
         household = Household.query.get(household_id)
         
         if not household:
             return jsonify({"error": "Household not found"}), 404
         
-        # Check if user is a member
-        user = User.query.get(current_user_id)
-        if user not in household.members:
-            return jsonify({"error": "Access denied - you are not a member of this household"}), 403
-        
         return jsonify(household.to_dict(include_members=True)), 200
         
     except Exception as e:
@@ -112,6 +113,7 @@ def create_household():
             user.default_household_id = household.id
         
         db.session.commit()
+        invalidate_user(current_user_id)
         
         return jsonify({
             "message": "Household created successfully",
@@ -125,19 +127,15 @@ def create_household():
 
 @households_bp.route('/<int:household_id>', methods=['PUT'])
 @jwt_required()
+@household_member_required(role='owner', message="Only the household owner can update details")
 def update_household(household_id):
     """Update household details (owner only)"""
     try:
-        current_user_id = get_jwt_identity()
         household = Household.query.get(household_id)
         
         if not household:
             return jsonify({"error": "Household not found"}), 404
         
-        user = User.query.get(current_user_id)
-        if not household.is_owner(user):
-            return jsonify({"error": "Only the household owner can update details"}), 403
-        
         data = request.get_json()
         if 'name' in data:
             household.name = data['name']
@@ -156,6 +154,7 @@ def update_household(household_id):
 
 @households_bp.route('/<int:household_id>/invite', methods=['POST'])
 @jwt_required()
+@household_member_required(message="Only household members can send invites")
 def invite_member(household_id):
     """Invite someone to join the household (mission/operation)"""
     try:
@@ -165,11 +164,6 @@ def invite_member(household_id):
         if not household:
             return jsonify({"error": "Household not found"}), 404
         
-        # Check if user is a member (any member can invite)
-        user = User.query.get(current_user_id)
-        if user not in household.members:
-            return jsonify({"error": "Only household members can send invites"}), 403
-        
         data = request.get_json()
         invitee_email = data.get('email')
         
@@ -295,6 +289,7 @@ def accept_invite(token):
         invite.status = 'accepted'
         
         db.session.commit()
+        invalidate_user(current_user_id)
         
         return jsonify({
             "message": "Welcome to the operation! You've successfully joined the household.",
@@ -337,19 +332,16 @@ def reject_invite(token):
 
 @households_bp.route('/<int:household_id>/members/<int:user_id>', methods=['DELETE'])
 @jwt_required()
+@household_member_required(role='owner', message="Only the household owner can remove members")
 def remove_member(household_id, user_id):
     """Remove a member from the household (owner only)"""
     try:
-        current_user_id = get_jwt_identity()
+        current_user_id = int(get_jwt_identity())
         household = Household.query.get(household_id)
         
         if not household:
             return jsonify({"error": "Household not found"}), 404
         
-        current_user = User.query.get(current_user_id)
-        if not household.is_owner(current_user):
-            return jsonify({"error": "Only the household owner can remove members"}), 403
-        
         user_to_remove = User.query.get(user_id)
         if not user_to_remove:
             return jsonify({"error": "User not found"}), 404
@@ -368,6 +360,7 @@ def remove_member(household_id, user_id):
             user_to_remove.default_household_id = None
         
         db.session.commit()
+        invalidate_user(user_id)
         
         return jsonify({"message": "Member removed successfully"}), 200
         
@@ -387,13 +380,16 @@ def leave_household(household_id):
         if not household:
             return jsonify({"error": "Household not found"}), 404
         
-        user = User.query.get(current_user_id)
-        if user not in household.members:
+        membership = get_membership(current_user_id)
+        role = membership.roles.get(household_id) if membership else None
+        if role is None:
             return jsonify({"error": "You are not a member of this household"}), 400
         
-        if household.is_owner(user):
+        if role == 'owner':
             return jsonify({"error": "Owner cannot leave household. Transfer ownership or delete household instead."}), 400
         
+        user = User.query.get(current_user_id)
+        
         # Remove from household
         household.remove_member(user)
         
@@ -402,6 +398,7 @@ def leave_household(household_id):
             user.default_household_id = None
         
         db.session.commit()
+        invalidate_user(current_user_id)
         
         return jsonify({"message": "You have left the household"}), 200
         
@@ -412,24 +409,20 @@ def leave_household(household_id):
 
 @households_bp.route('/<int:household_id>/switch', methods=['POST'])
 @jwt_required()
+@household_member_required(message="You are not a member of this household")
 def switch_default_household(household_id):
     """Switch to a different household as the default"""
     try:
         current_user_id = get_jwt_identity()
         user = User.query.get(current_user_id)
         
-        if not user:
-            return jsonify({"error": "User not found"}), 404
-        
         household = Household.query.get(household_id)
         if not household:
             return jsonify({"error": "Household not found"}), 404
         
-        if user not in household.members:
-            return jsonify({"error": "You are not a member of this household"}), 403
-        
         user.default_household_id = household_id
         db.session.commit()
+        invalidate_user(current_user_id)
         
         return jsonify({
             "message": "Default household switched successfully",
@@ -443,26 +436,86 @@ def switch_default_household(household_id):
 
 @households_bp.route('/<int:household_id>', methods=['DELETE'])
 @jwt_required()
+@household_member_required(role='owner', message="Only the household owner can delete the household")
 def delete_household(household_id):
     """Delete a household (owner only) - WARNING: deletes all associated data"""
     try:
-        current_user_id = get_jwt_identity()
         household = Household.query.get(household_id)
         
         if not household:
             return jsonify({"error": "Household not found"}), 404
         
-        user = User.query.get(current_user_id)
-        if not household.is_owner(user):
-            return jsonify({"error": "Only the household owner can delete the household"}), 403
+        member_ids = [member.id for member in household.members]
         
         # TODO: This will cascade delete all funds, bills, accounts, transactions, etc.
         # Consider adding a confirmation step or soft delete
         db.session.delete(household)
         db.session.commit()
+        invalidate_user(*member_ids)
+        invalidate_household(household_id)
         
         return jsonify({"message": "Household deleted successfully"}), 200
         
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
+
+
+@households_bp.route('/<int:household_id>/backup', methods=['GET'])
+@jwt_required()
+@household_member_required(role='owner', message="Only the household owner can back up the household")
+def backup_household(household_id):
+    """Download the household's data as a compressed backup (restore with POST /restore)"""
+    try:
+        chunks = backup_chunks(household_id, current_app.config["BACKUP_BATCH_SIZE"])
+    except BackupError as e:
+        return jsonify({"error": str(e)}), 404
+
+    return Response(
+        stream_with_context(chunks),
+        mimetype="application/gzip",
+        headers={"Content-Disposition": f'attachment; filename="household-{household_id}.jsonl.gz"'},
+    )
+
+
+@households_bp.route('/restore', methods=['POST'])
+@jwt_required()
+def restore_household():
+    """
+    Restore a backup as a new household owned by the current user.
+
+    Send the file as multipart field "backup" (or as the raw request body),
+    at most BACKUP_MAX_UPLOAD_BYTES; optional "name" renames the household.
+    The current user is its only member: nobody else from the backup is added
+    or linked, whatever the file says.
+    """
+    limit = current_app.config["BACKUP_MAX_UPLOAD_BYTES"]
+    too_large = jsonify({"error": f"backup is larger than {limit} bytes"}), 413
+    if request.content_length is not None and request.content_length > limit:
+        return too_large
+
+    upload = request.files.get('backup')
+    if upload:
+        stream = upload.stream
+        stream.seek(0, 2)
+        if stream.tell() > limit:
+            return too_large
+        stream.seek(0)
+    else:
+        stream = LimitedStream(request.stream, limit, is_max=True)
+    name = request.form.get('name') or request.args.get('name')
+
+    try:
+        counts = restore_backup(stream, name=name, owner_id=int(get_jwt_identity()),
+                                batch_size=current_app.config["BACKUP_BATCH_SIZE"])
+    except BackupError as e:
+        return jsonify({"error": str(e)}), 400
+    except RequestEntityTooLarge:
+        return too_large
+
+    household = db.session.get(Household, counts.pop("household_id"))
+    return jsonify({
+        "message": "Household restored successfully",
+        "household": household.to_dict(include_members=True),
+        "restored": counts
+    }), 201
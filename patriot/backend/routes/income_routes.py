@@ -1,14 +1,20 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
-from backend.database import db
+from decimal import Decimal
+from sqlalchemy import func
+from backend.database import db, read_only
 from backend.models.income import Income
 from backend.utils.auth_helpers import get_current_household_id
+from backend.utils.balances import adjust_account_balance
+from backend.utils.money import Money
+from backend.utils.search import search
 
 income_bp = Blueprint('income', __name__)
 
 
 @income_bp.route('/', methods=['GET'])
+@read_only
 @jwt_required()
 def get_income_entries():
     """Get all income entries for the logged-in user"""
@@ -47,12 +53,13 @@ def get_income_entries():
                 query = query.order_by(Income.source.asc())
         
         income_entries = query.all()
+        total_amount = query.order_by(None).with_entities(func.sum(Income.amount)).scalar()
         
         return jsonify({
             'success': True,
             'income_entries': [entry.to_dict() for entry in income_entries],
             'total_entries': len(income_entries),
-            'total_amount': sum(entry.amount for entry in income_entries)
+            'total_amount': total_amount if total_amount is not None else 0
         }), 200
         
     except Exception as e:
@@ -62,6 +69,32 @@ def get_income_entries():
         }), 500
 
 
+@income_bp.route('/search', methods=['GET'])
+@read_only
+@jwt_required()
+def search_income_entries():
+    """Ranked full-text search over source, category and description (prefix match per word)"""
+    household_id = get_current_household_id()
+    if not household_id:
+        return jsonify({"error": "No household found for user"}), 404
+
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({"error": "q parameter required"}), 400
+    limit = min(request.args.get('limit', current_app.config['SEARCH_PAGE_SIZE'], type=int),
+                current_app.config['SEARCH_MAX_LIMIT'])
+    offset = request.args.get('offset', 0, type=int)
+    if limit < 1 or offset < 0:
+        return jsonify({"error": "limit must be positive and offset not negative"}), 400
+
+    income_entries, has_more = search(Income, household_id, query, limit, offset)
+    return jsonify({
+        'success': True,
+        'income_entries': [entry.to_dict() for entry in income_entries],
+        'next_offset': offset + limit if has_more else None
+    }), 200
+
+
 @income_bp.route('/', methods=['POST'])
 @jwt_required()
 def create_income_entry():
@@ -90,7 +123,7 @@ def create_income_entry():
         
         # Validate amount
         try:
-            amount = float(data['amount'])
+            amount = Money.parse(data['amount'])
             if amount <= 0:
                 return jsonify({
                     'success': False,
@@ -119,7 +152,7 @@ def create_income_entry():
         # Validate account if provided
         account = None
         if account_id:
-            from models import Account
+            from backend.models import Account
             account = Account.query.filter_by(id=account_id, household_id=household_id).first()
             if not account:
                 return jsonify({
@@ -138,11 +171,13 @@ def create_income_entry():
             account_id=account_id
         )
         
-        # Update account balance if account is linked
+        db.session.add(income_entry)
+        
+        # Update account balance atomically if account is linked
+        account_balance = None
         if account:
-            account.balance += amount
+            account_balance = adjust_account_balance(account.id, amount)
         
-        db.session.add(income_entry)
         db.session.commit()
         
         response_data = {
@@ -151,8 +186,8 @@ def create_income_entry():
             'income_entry': income_entry.to_dict()
         }
         
-        if account:
-            response_data['updated_account_balance'] = float(account.balance)
+        if account_balance is not None:
+            response_data['updated_account_balance'] = float(account_balance)
         
         return jsonify(response_data), 201
         
@@ -204,6 +239,7 @@ def delete_income_entry(income_id):
 
 
 @income_bp.route('/summary', methods=['GET'])
+@read_only
 @jwt_required()
 def get_income_summary():
     """Get income summary breakdown by source type"""
@@ -240,34 +276,27 @@ def get_income_summary():
                     'message': 'Invalid end_date format. Use YYYY-MM-DD'
                 }), 400
         
-        # Get all income entries
-        income_entries = query.all()
+        # One row per source; the window sums give the overall totals alongside.
+        # Averages and percentages are derived from the exact cent sums and
+        # keep the Decimal rounding the endpoint has always returned
+        source_total = func.sum(Income.amount)
+        source_count = func.count(Income.id)
+        rows = query.with_entities(
+            Income.source, source_total, source_count,
+            func.sum(source_total).over(), func.sum(source_count).over(),
+        ).group_by(Income.source).all()
         
-        # Calculate summary by source
         source_summary = {}
-        total_income = 0
-        
-        for entry in income_entries:
-            source = entry.source
-            amount = entry.amount
-            
-            if source not in source_summary:
-                source_summary[source] = {
-                    'total_amount': 0,
-                    'count': 0,
-                    'average_amount': 0
-                }
-            
-            source_summary[source]['total_amount'] += amount
-            source_summary[source]['count'] += 1
-            total_income += amount
-        
-        # Calculate averages and percentages
-        for source in source_summary:
-            count = source_summary[source]['count']
-            total = source_summary[source]['total_amount']
-            source_summary[source]['average_amount'] = round(total / count, 2)
-            source_summary[source]['percentage'] = round((total / total_income * 100), 2) if total_income > 0 else 0
+        total_income = rows[0][3] if rows else 0
+        total_entries = int(rows[0][4]) if rows else 0
+        
+        for source, total, count, _, _ in rows:
+            source_summary[source] = {
+                'total_amount': total,
+                'count': count,
+                'average_amount': round(total / count, 2),
+                'percentage': round(Decimal(total.cents * 100) / total_income.cents, 2) if total_income > 0 else 0
+            }
         
         # Sort by total amount (descending)
         sorted_sources = dict(sorted(source_summary.items(), 
@@ -278,7 +307,7 @@ def get_income_summary():
             'success': True,
             'summary': {
                 'total_income': round(total_income, 2),
-                'total_entries': len(income_entries),
+                'total_entries': total_entries,
                 'unique_sources': len(source_summary),
                 'by_source': sorted_sources,
                 'date_range': {
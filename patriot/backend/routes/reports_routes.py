@@ -1,9 +1,14 @@
-from flask import Blueprint, jsonify, request
-from backend.models import Fund, Transaction, Bill, Income, Debt
+from flask import Blueprint, current_app, jsonify, request
+from sqlalchemy import case, func
+from backend.database import db
+from backend.models import Account, Fund, Transaction, Bill, Income, Debt
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from backend.utils.forecasting import generate_forecast, get_bill_schedule_summary
 from datetime import datetime, date, timedelta
+from backend.utils.archive import archived_count, ledger
 from backend.utils.auth_helpers import get_current_household_id
+from backend.utils.money import Money
+from backend.utils.timeseries import BUCKETS, DIALECTS, bucket_count, bucket_expression, bucket_labels, lttb
 
 reports_bp = Blueprint("reports", __name__)
 
@@ -18,8 +23,9 @@ def summary_report():
 
     # Get user's funds and transactions
     funds = Fund.query.filter_by(household_id=household_id).all()
-    total_balance = sum(f.balance for f in funds)
-    total_transactions = Transaction.query.filter_by(household_id=household_id).count()
+    total_balance = float(sum(f.balance for f in funds))
+    total_transactions = Transaction.query.filter_by(household_id=household_id).count() \
+        + archived_count(household_id)
 
     # Get basic forecast data for next 30 days
     try:
@@ -36,7 +42,7 @@ def summary_report():
                         {
                             "id": f.id,
                             "name": f.name,
-                            "balance": f.balance,
+                            "balance": float(f.balance),
                             "fund_type": f.fund_type,
                         }
                         for f in funds
@@ -68,7 +74,7 @@ def summary_report():
                         {
                             "id": f.id,
                             "name": f.name,
-                            "balance": f.balance,
+                            "balance": float(f.balance),
                             "fund_type": f.fund_type,
                         }
                         for f in funds
@@ -86,6 +92,131 @@ def summary_report():
         )
 
 
+@reports_bp.route("/timeseries", methods=["GET"])
+@jwt_required()
+def timeseries_report():
+    """
+    Income, expense, transfer and net per date bucket, from one grouped query.
+
+    Query params:
+        bucket: day, week (Monday start), month (default) or quarter
+        group_by: category or account for one series each (default: one "total" series)
+        start_date, end_date: YYYY-MM-DD, inclusive; the range may span at
+                    most TIMESERIES_MAX_BUCKETS buckets
+        max_points: downsample (LTTB on total net) to at most this many buckets
+                    (default and upper bound TIMESERIES_MAX_POINTS)
+
+    Returns:
+        {"bucket", "group_by", "buckets": [first day of each bucket],
+         "series": [{"key", "label", "income": [...], "expense": [...],
+                     "transfer": [...], "net": [...]}],
+         "total_buckets", "downsampled"}
+        Every array is parallel to "buckets"; empty buckets are zeros.
+    """
+    household_id = get_current_household_id()
+    if not household_id:
+        return jsonify({"error": "No household found for user"}), 404
+
+    bucket = request.args.get("bucket", "month")
+    if bucket not in BUCKETS:
+        return jsonify({"error": f"bucket must be one of {', '.join(BUCKETS)}"}), 400
+    group_by = request.args.get("group_by")
+    if group_by and group_by not in ("category", "account"):
+        return jsonify({"error": "group_by must be category or account"}), 400
+
+    limit = current_app.config["TIMESERIES_MAX_POINTS"]
+    try:
+        max_points = int(request.args.get("max_points", limit))
+    except ValueError:
+        return jsonify({"error": "max_points must be an integer"}), 400
+    if not 3 <= max_points <= limit:
+        return jsonify({"error": f"max_points must be between 3 and {limit}"}), 400
+
+    bounds = {}
+    for param in ("start_date", "end_date"):
+        value = request.args.get(param)
+        if value:
+            try:
+                bounds[param] = datetime.strptime(value, "%Y-%m-%d").date()
+            except ValueError:
+                return jsonify({"error": f"Invalid {param} format. Use YYYY-MM-DD"}), 400
+
+    dialect = db.session.get_bind(mapper=Transaction.__mapper__).dialect.name
+    if dialect not in DIALECTS:
+        return jsonify({"error": f"timeseries reports are not available on {dialect}"}), 501
+
+    # Month and quarter buckets can take whole archived months from their summaries
+    rows = ledger(household_id, bounds.get("start_date"), bounds.get("end_date"),
+                  whole_months=bucket in ("month", "quarter"))
+    label = bucket_expression(rows.c.date, bucket, dialect).label("bucket")
+    group_columns = {"category": rows.c.category, "account": rows.c.account_id}
+    group = group_columns[group_by].label("series") if group_by else None
+
+    def total(transaction_type):
+        return func.sum(case((rows.c.transaction_type == transaction_type, rows.c.abs_amount), else_=0))
+
+    query = db.session.query(
+        label, *([group] if group is not None else []),
+        total("income"), total("expense"), total("transfer"),
+    ).filter(rows.c.date.isnot(None))
+    query = query.group_by(label, group) if group is not None else query.group_by(label)
+
+    # (bucket label, series key) -> (income, expense, transfer)
+    cells = {}
+    for row in query:
+        key = row[1] if group is not None else "total"
+        day = row[0] if isinstance(row[0], str) else row[0].isoformat()
+        cells[(day, key)] = tuple(round(float(value or 0), 2) for value in row[-3:])
+
+    observed = sorted({day for day, _ in cells})
+    first = bounds.get("start_date") or (datetime.strptime(observed[0], "%Y-%m-%d").date() if observed else None)
+    last = bounds.get("end_date") or (datetime.strptime(observed[-1], "%Y-%m-%d").date() if observed else None)
+    max_buckets = current_app.config["TIMESERIES_MAX_BUCKETS"]
+    if first and last and bucket_count(first, last, bucket) > max_buckets:
+        return jsonify({"error": f"date range spans more than {max_buckets} {bucket} buckets; "
+                                 f"narrow it or use a larger bucket"}), 400
+    buckets = bucket_labels(first, last, bucket) if first and last else []
+
+    names = {}
+    if group_by == "account":
+        names = dict(Account.query.with_entities(Account.id, Account.name).filter_by(household_id=household_id))
+    activity = {}
+    for (_, key), (income, expense, transfer) in cells.items():
+        activity[key] = activity.get(key, 0) + income + expense + transfer
+    keys = sorted(activity, key=lambda k: (-activity[k], str(k)))
+
+    series = []
+    for key in keys:
+        columns = [cells.get((day, key), (0.0, 0.0, 0.0)) for day in buckets]
+        income, expense, transfer = ([c[i] for c in columns] for i in range(3))
+        series.append({
+            "key": key,
+            "label": names.get(key, "Unassigned" if key is None else key) if group_by == "account" else key,
+            "income": income,
+            "expense": expense,
+            "transfer": transfer,
+            "net": [round(i - e, 2) for i, e in zip(income, expense)],
+        })
+
+    total_buckets = len(buckets)
+    if total_buckets > max_points:
+        net = [sum(s["net"][i] for s in series) for i in range(total_buckets)]
+        keep = lttb(net, max_points)
+        buckets = [buckets[i] for i in keep]
+        for entry in series:
+            for field in ("income", "expense", "transfer", "net"):
+                entry[field] = [entry[field][i] for i in keep]
+
+    return jsonify({
+        "bucket": bucket,
+        "group_by": group_by,
+        "buckets": buckets,
+        "series": series,
+        "total_buckets": total_buckets,
+        "downsampled": len(buckets) < total_buckets,
+    }), 200
+
+
 @reports_bp.route("/forecast", methods=["GET"])
 @jwt_required()
 def forecast_report():
@@ -139,14 +270,12 @@ def upcoming_bills_report():
             jsonify(
                 {
                     "upcoming_bills": upcoming_bills,
-                    "total_amount": sum(bill["amount"] for bill in upcoming_bills),
-                    "autopay_amount": sum(
-                        bill["amount"] for bill in upcoming_bills if bill["is_autopay"]
+                    "total_amount": _total(upcoming_bills),
+                    "autopay_amount": _total(
+                        bill for bill in upcoming_bills if bill["is_autopay"]
                     ),
-                    "manual_amount": sum(
-                        bill["amount"]
-                        for bill in upcoming_bills
-                        if not bill["is_autopay"]
+                    "manual_amount": _total(
+                        bill for bill in upcoming_bills if not bill["is_autopay"]
                     ),
                     "period_days": days,
                 }
@@ -171,9 +300,9 @@ def financial_health_report():
         funds = Fund.query.filter_by(household_id=household_id).all()
 
         # Calculate totals by fund type
-        cash_funds = sum(f.balance for f in funds if f.fund_type == "Cash")
-        savings_funds = sum(f.balance for f in funds if f.fund_type == "Savings")
-        expense_funds = sum(f.balance for f in funds if f.fund_type == "Expenses")
+        cash_funds = sum((f.balance for f in funds if f.fund_type == "Cash"), Money())
+        savings_funds = sum((f.balance for f in funds if f.fund_type == "Savings"), Money())
+        expense_funds = sum((f.balance for f in funds if f.fund_type == "Expenses"), Money())
 
         # Get forecast for buffer analysis
         forecast = generate_forecast(household_id=household_id, months_to_project=6)
@@ -181,7 +310,7 @@ def financial_health_report():
         # Calculate financial health metrics
         total_balance = cash_funds + savings_funds + expense_funds
         emergency_fund_ratio = cash_funds / max(
-            total_balance, 1
+            total_balance, Money(100)
         )  # Avoid division by zero
 
         # Determine health status
@@ -204,10 +333,10 @@ def financial_health_report():
             jsonify(
                 {
                     "health_status": health_status,
-                    "total_balance": round(total_balance, 2),
-                    "cash_funds": round(cash_funds, 2),
-                    "savings_funds": round(savings_funds, 2),
-                    "expense_funds": round(expense_funds, 2),
+                    "total_balance": float(total_balance),
+                    "cash_funds": float(cash_funds),
+                    "savings_funds": float(savings_funds),
+                    "expense_funds": float(expense_funds),
                     "emergency_fund_ratio": round(emergency_fund_ratio * 100, 1),
                     "buffer_status": forecast["summary"]["buffer_status"],
                     "projected_minimum": forecast["summary"]["expected_minimum"],
@@ -227,6 +356,11 @@ def financial_health_report():
         )
 
 
+def _total(bills):
+    """Sum bill amounts in cents so the total doesn't pick up float error"""
+    return float(sum((Money.parse(bill["amount"]) for bill in bills), Money()))
+
+
 def _generate_recommendations(health_status, emergency_fund_ratio, forecast_summary):
     """Generate personalized financial recommendations"""
     recommendations = []
@@ -0,0 +1,199 @@
+# backend/routes/sentinel_routes.py
+"""
+Sentinel Systems network routes.
+
+Serves what the shared sync client (shared/user_sync.py) calls on its peers:
+health, single and batch user lookup, and a changes-since replication feed,
+plus a status view of this app's own peers. Every endpoint but health requires
+SENTINEL_SHARED_SECRET in the X-Sentinel-Token header and answers 503 while no
+secret is configured.
+"""
+import functools
+import hmac
+from datetime import datetime, timedelta
+from flask import Blueprint, jsonify, request, current_app
+from backend.models import User
+
+sentinel_bp = Blueprint("sentinel", __name__)
+
+
+def _user_payload(user, include_password=False):
+    # Tokens are never shared. The password hash only goes out one user at a time
+    # (single lookup at login); bulk answers would hand out every hash at once.
+    payload = {
+        "username": user.username,
+        "email": user.email,
+        "name": user.name,
+        "is_verified": user.is_verified,
+        "updated_at": user.updated_at.isoformat() if user.updated_at else None,
+        "password_changed_at": user.password_changed_at.isoformat() if user.password_changed_at else None,
+        "synced_from": current_app.config.get('APP_NAME', 'Unknown App')
+    }
+    if include_password:
+        payload["password"] = user.password
+    return payload
+
+
+def _encode_cursor(updated_at, user_id):
+    return f"{updated_at.isoformat()}_{user_id}"
+
+
+def _decode_cursor(cursor):
+    stamp, _, user_id = cursor.rpartition("_")
+    return datetime.fromisoformat(stamp), int(user_id)
+
+
+def peer_token_required(view):
+    """
+    Require X-Sentinel-Token to match SENTINEL_SHARED_SECRET.
+    Without a configured secret the endpoint is off (503) rather than open.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        secret = current_app.config.get("SENTINEL_SHARED_SECRET")
+        if not secret:
+            return jsonify({"error": "SENTINEL_SHARED_SECRET is not configured"}), 503
+        token = request.headers.get("X-Sentinel-Token", "")
+        if not hmac.compare_digest(token.encode(), secret.encode()):
+            return jsonify({"error": "invalid sentinel token"}), 401
+        return view(*args, **kwargs)
+    return wrapper
+
+
+@sentinel_bp.route("/health", methods=["GET"])
+def health():
+    """
+    Health check endpoint for Sentinel Systems.
+    Other apps use this to verify this app is online and part of the network.
+    """
+    return jsonify({
+        "status": "online",
+        "app_name": current_app.config.get('APP_NAME', 'Unknown'),
+        "version": "1.0.0",
+        "sentinel_system": True
+    }), 200
+
+
+@sentinel_bp.route("/user-lookup", methods=["GET"])
+@peer_token_required
+def user_lookup():
+    """
+    Lookup user for Sentinel Systems cross-app sync.
+    Other Sentinel apps call this to find if a user exists here.
+
+    Query params:
+        identifier: username or email to search for
+
+    Returns:
+        User data with the password hash (without sensitive tokens) or 404
+    """
+    identifier = request.args.get("identifier")
+
+    if not identifier:
+        return jsonify({"error": "identifier parameter required"}), 400
+
+    # Two unique-index point lookups instead of one OR across both columns
+    first, second = (User.email, User.username) if "@" in identifier else (User.username, User.email)
+    user = User.query.filter(first == identifier).first() or User.query.filter(second == identifier).first()
+
+    if not user:
+        return jsonify({"error": "user not found"}), 404
+
+    return jsonify(_user_payload(user, include_password=True)), 200
+
+
+@sentinel_bp.route("/user-lookup/batch", methods=["POST"])
+@peer_token_required
+def user_lookup_batch():
+    """
+    Lookup many users in one call.
+    Expects: {"identifiers": ["alice", "bob@example.com", ...]}
+    Returns the users found (without password hashes) and the identifiers
+    that matched nobody.
+    """
+    data = request.get_json(silent=True) or {}
+    identifiers = data.get("identifiers")
+
+    if not isinstance(identifiers, list) or not all(isinstance(i, str) for i in identifiers):
+        return jsonify({"error": "identifiers must be a list of strings"}), 400
+
+    limit = current_app.config.get("SENTINEL_BATCH_MAX", 500)
+    if len(identifiers) > limit:
+        return jsonify({"error": f"at most {limit} identifiers per request"}), 400
+
+    wanted = set(identifiers)
+    users = User.query.filter(User.username.in_(wanted) | User.email.in_(wanted)).all() if wanted else []
+    matched = {u.username for u in users} | {u.email for u in users}
+
+    return jsonify({
+        "users": [_user_payload(u) for u in users],
+        "missing": sorted(wanted - matched)
+    }), 200
+
+
+@sentinel_bp.route("/changes", methods=["GET"])
+@peer_token_required
+def changes_since():
+    """
+    Users created or modified after a cursor, oldest first.
+
+    Query params:
+        since: cursor from a previous page (omit to start from the beginning)
+        limit: page size (default/max SENTINEL_FEED_PAGE_SIZE)
+
+    Returns:
+        {"users": [...], "next_cursor": "...", "has_more": bool}
+        Pass next_cursor back as ``since``; it is opaque to callers. Users
+        come without password hashes.
+    """
+    page_size = current_app.config.get("SENTINEL_FEED_PAGE_SIZE", 500)
+    limit = min(request.args.get("limit", page_size, type=int), page_size)
+    if limit < 1:
+        return jsonify({"error": "limit must be positive"}), 400
+
+    # Rows committed out of timestamp order could slip behind a cursor; leave the
+    # most recent seconds for the next pull
+    horizon = datetime.utcnow() - timedelta(seconds=current_app.config.get("SENTINEL_FEED_LAG", 2))
+    query = User.query.filter(User.updated_at <= horizon)
+
+    since = request.args.get("since")
+    if since:
+        try:
+            stamp, last_id = _decode_cursor(since)
+        except ValueError:
+            return jsonify({"error": "invalid cursor"}), 400
+        query = query.filter(
+            (User.updated_at > stamp) | ((User.updated_at == stamp) & (User.id > last_id))
+        )
+
+    users = query.order_by(User.updated_at, User.id).limit(limit + 1).all()
+    has_more = len(users) > limit
+    users = users[:limit]
+    next_cursor = _encode_cursor(users[-1].updated_at, users[-1].id) if users else since
+
+    return jsonify({
+        "users": [_user_payload(u) for u in users],
+        "next_cursor": next_cursor,
+        "has_more": has_more
+    }), 200
+
+
+@sentinel_bp.route("/peers", methods=["GET"])
+@peer_token_required
+def peers():
+    """
+    Circuit-breaker state and lookup latency of each peer in SENTINEL_APPS.
+    Peer URLs and failure reasons map the internal network, so this takes the
+    same token as the user endpoints.
+    """
+    from backend.shared.user_sync import get_sync_service
+    sync_service = get_sync_service(current_app.config)
+    if not sync_service:
+        return jsonify({"configured": False, "peers": []}), 200
+
+    statuses = sync_service.peer_status()
+    return jsonify({
+        "configured": True,
+        "healthy": sum(peer["state"] == "closed" for peer in statuses),
+        "peers": statuses
+    }), 200
@@ -1,28 +1,128 @@
-from flask import Blueprint, request, jsonify
-from backend.database import db
-from backend.models import Transaction, Fund, Bill, User
+from flask import Blueprint, request, jsonify, current_app
+from backend.database import db, read_only
+from backend.models import ArchivedTransaction, Transaction, Fund, Bill, User
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from decimal import Decimal
 from datetime import datetime, date
-from sqlalchemy import func
+from sqlalchemy import case, func, or_
+from backend.utils.archive import archived_query, ledger, reaches_archive
 from backend.utils.auth_helpers import get_current_household_id, get_current_user_id
+from backend.utils.balances import adjust_account_balance, adjust_fund_balance, move_fund_money
+from backend.utils.metrics import JOB_DURATION, timed
+from backend.utils.money import Money
+from backend.utils.search import count_matches, search
 
 tx_bp = Blueprint("transactions", __name__)
 
 @tx_bp.route("/", methods=["GET"])
+@read_only
 @jwt_required()
 def list_transactions():
-    """Get all transactions for the current user"""
+    """
+    Get the household's transactions, newest first.
+
+    Query params:
+        start_date, end_date: optional YYYY-MM-DD bounds; archived months are
+            only read when the range reaches them
+        limit: page size (default TRANSACTIONS_PAGE_SIZE, at most TRANSACTIONS_PAGE_MAX)
+        cursor: X-Next-Cursor header of the previous page
+
+    Without limit or cursor every live transaction in the range is returned.
+    A range that reaches archived months is always paged; the next page's
+    cursor comes back in the X-Next-Cursor header.
+    """
     household_id = get_current_household_id()
     if not household_id:
         return jsonify({"error": "No household found for user"}), 404
-    
-    # Get all transactions for the user, ordered by date descending
-    transactions = Transaction.query.filter_by(
-        household_id=household_id
-    ).order_by(Transaction.date.desc()).all()
-    
-    return jsonify([transaction.to_dict() for transaction in transactions]), 200
+
+    (start, end), error = _requested_dates()
+    if error:
+        return error
+    live = _in_range(Transaction.query.filter_by(household_id=household_id), Transaction, start, end)
+    archived = archived_query(household_id, start, end)
+    if archived is None and "limit" not in request.args and "cursor" not in request.args:
+        transactions = live.order_by(Transaction.date.desc()).all()
+        return jsonify([transaction.to_dict() for transaction in transactions]), 200
+
+    limit = min(request.args.get("limit", current_app.config["TRANSACTIONS_PAGE_SIZE"], type=int),
+                current_app.config["TRANSACTIONS_PAGE_MAX"])
+    if limit < 1:
+        return jsonify({"error": "limit must be positive"}), 400
+    cursor = request.args.get("cursor")
+    if cursor:
+        last_day, _, last_id = cursor.rpartition("_")
+        try:
+            last_day, last_id = date.fromisoformat(last_day) if last_day else None, int(last_id)
+        except ValueError:
+            return jsonify({"error": "invalid cursor"}), 400
+
+    def page(model, query):
+        # Keyset on (date, id), so each page is a range read of the
+        # (household_id, date) index. Undated rows come after every dated one.
+        undated = query.filter(model.date.is_(None))
+        if cursor and last_day is None:
+            return undated.filter(model.id < last_id).order_by(model.id.desc()).limit(limit + 1).all()
+        dated = query.filter(model.date.isnot(None))
+        if cursor:
+            dated = dated.filter(model.date <= last_day, or_(model.date < last_day, model.id < last_id))
+        rows = dated.order_by(model.date.desc(), model.id.desc()).limit(limit + 1).all()
+        if len(rows) <= limit:
+            rows += undated.order_by(model.id.desc()).limit(limit + 1 - len(rows)).all()
+        return rows
+
+    transactions = page(Transaction, live)
+    if archived is not None:
+        newest_first = lambda t: (t.date is not None, t.date or date.min, t.id)
+        transactions = sorted(transactions + page(ArchivedTransaction, archived),
+                              key=newest_first, reverse=True)[:limit + 1]
+    has_more = len(transactions) > limit
+    transactions = transactions[:limit]
+
+    response = jsonify([transaction.to_dict() for transaction in transactions])
+    if has_more:
+        last = transactions[-1]
+        response.headers["X-Next-Cursor"] = f"{last.date.isoformat() if last.date else ''}_{last.id}"
+    return response, 200
+
+
+@tx_bp.route("/search", methods=["GET"])
+@read_only
+@jwt_required()
+def search_transactions():
+    """
+    Ranked full-text search over description and category.
+
+    Query params:
+        q: search words; each matches as a prefix ("groc sto" finds "Grocery Store")
+        limit: results per page (default SEARCH_PAGE_SIZE, at most SEARCH_MAX_LIMIT)
+        offset: results to skip
+
+    Returns:
+        {"results": [...], "next_offset": int or null}
+    """
+    household_id = get_current_household_id()
+    if not household_id:
+        return jsonify({"error": "No household found for user"}), 404
+
+    query = request.args.get("q", "").strip()
+    if not query:
+        return jsonify({"error": "q parameter required"}), 400
+    limit = min(request.args.get("limit", current_app.config["SEARCH_PAGE_SIZE"], type=int),
+                current_app.config["SEARCH_MAX_LIMIT"])
+    offset = request.args.get("offset", 0, type=int)
+    if limit < 1 or offset < 0:
+        return jsonify({"error": "limit must be positive and offset not negative"}), 400
+
+    results, has_more = search(Transaction, household_id, query, limit, offset)
+    if not has_more and reaches_archive(household_id):
+        # Live matches rank first; the archive's continue where they run out
+        live_total = offset + len(results) if results or not offset else count_matches(Transaction, household_id, query)
+        archived, has_more = search(ArchivedTransaction, household_id, query, limit - len(results),
+                                    max(offset - live_total, 0))
+        results += archived
+    return jsonify({
+        "results": [transaction.to_dict() for transaction in results],
+        "next_offset": offset + limit if has_more else None
+    }), 200
 
 
 @tx_bp.route("/", methods=["POST"])
@@ -74,7 +174,7 @@ def create_transaction():
     
     # Validate amount
     try:
-        amount = Decimal(str(amount))
+        amount = Money.parse(amount)
     except (ValueError, TypeError):
         return jsonify({"error": "Invalid amount"}), 400
     
@@ -87,7 +187,7 @@ def create_transaction():
             return jsonify({"error": "Invalid date format. Use ISO format (YYYY-MM-DD)"}), 400
     
     # Validate account if provided
-    from models import Account
+    from backend.models import Account
     account = None
     if account_id:
         account = Account.query.filter_by(id=account_id, household_id=household_id).first()
@@ -153,47 +253,47 @@ def create_transaction():
         if is_recurring and frequency:
             transaction.next_occurrence = transaction.calculate_next_occurrence(parsed_date)
         
-        # Handle balance updates based on transaction type
-        # Account.balance is Numeric (Decimal), Fund.balance is Float
+        db.session.add(transaction)
+        
+        # Handle balance updates based on transaction type.
+        # Each change is a single atomic UPDATE so concurrent writers can't lose updates.
         amount_value = abs(amount)
+        account_balance = None
+        fund_balance = None
         
         if transaction_type == "transfer":
             # TRANSFER: Deduct from source, add to destination
-            # Deduct from source
             if account:
-                account.balance -= Decimal(str(amount_value))
+                account_balance = adjust_account_balance(account.id, -amount_value)
             elif fund:
-                fund.balance -= float(amount_value)
-                if fund.account:
-                    fund.account.balance -= Decimal(str(amount_value))
+                fund_balance, account_balance = move_fund_money(fund, -amount_value)
             
-            # Add to destination
             if to_account:
-                to_account.balance += Decimal(str(amount_value))
+                adjust_account_balance(to_account.id, amount_value)
             elif to_fund:
-                to_fund.balance += float(amount_value)
-                if to_fund.account:
-                    to_fund.account.balance += Decimal(str(amount_value))
+                move_fund_money(to_fund, amount_value)
                     
         elif transaction_type == "income":
             # INCOME: Add to account or fund
             if account and not fund:
-                account.balance += Decimal(str(amount_value))
+                account_balance = adjust_account_balance(account.id, amount_value)
             if fund:
-                fund.balance += float(amount_value)
-                if fund.account:
-                    fund.account.balance += Decimal(str(amount_value))
+                fund_balance, account_balance = move_fund_money(fund, amount_value)
                     
         elif transaction_type == "expense":
             # EXPENSE: Deduct from account or fund
             if account and not fund:
-                account.balance -= Decimal(str(amount_value))
+                account_balance = adjust_account_balance(account.id, -amount_value)
             if fund:
-                fund.balance -= float(amount_value)
-                if fund.account:
-                    fund.account.balance -= Decimal(str(amount_value))
+                # Same rule as the pre-check above, re-checked in the UPDATE so that
+                # concurrent expenses can't both pass it and overdraw the fund
+                fund_balance, account_balance = move_fund_money(
+                    fund, -amount_value, require_sufficient=True
+                )
+                if fund_balance is None:
+                    db.session.rollback()
+                    return jsonify({"error": "Insufficient fund balance"}), 400
         
-        db.session.add(transaction)
         db.session.commit()
         
         response_data = {
@@ -201,13 +301,11 @@ def create_transaction():
             "transaction": transaction.to_dict()
         }
         
-        if account:
-            response_data["updated_account_balance"] = float(account.balance)
+        if account_balance is not None:
+            response_data["updated_account_balance"] = float(account_balance)
         
-        if fund:
-            response_data["updated_fund_balance"] = float(fund.balance)
-            if fund.account:
-                response_data["updated_account_balance"] = float(fund.account.balance)
+        if fund_balance is not None:
+            response_data["updated_fund_balance"] = float(fund_balance)
         
         return jsonify(response_data), 201
         
@@ -218,6 +316,7 @@ def create_transaction():
 
 @tx_bp.route("/auto-generate", methods=["POST"])
 @jwt_required()
+@timed(JOB_DURATION, job="transactions.auto_generate")
 def auto_generate_transactions():
     """Create new transactions for bills marked as autopay and due today or earlier"""
     household_id = get_current_household_id()
@@ -273,8 +372,8 @@ def auto_generate_transactions():
             created_transactions.append(transaction)
             
             # Deduct from bill's linked account if it has one
-            if bill.account:
-                bill.account.balance -= abs(bill.amount)
+            if bill.account_id:
+                adjust_account_balance(bill.account_id, -abs(bill.amount))
             
             # Mark bill as paid and update next due date
             bill.mark_as_paid()
@@ -303,6 +402,9 @@ def get_transaction(transaction_id):
     transaction = Transaction.query.filter_by(
         id=transaction_id,
         household_id=household_id
+    ).first() or ArchivedTransaction.query.filter_by(
+        id=transaction_id,
+        household_id=household_id
     ).first()
     
     if not transaction:
@@ -325,6 +427,8 @@ def update_transaction(transaction_id):
     ).first()
     
     if not transaction:
+        if _is_archived(transaction_id, household_id):
+            return jsonify({"error": "archived transactions are read-only"}), 409
         return jsonify({"error": "Transaction not found or access denied"}), 404
     
     data = request.get_json()
@@ -342,14 +446,14 @@ def update_transaction(transaction_id):
             fund = Fund.query.filter_by(id=original_fund_id, household_id=household_id).first()
             if fund:
                 if original_type == "income":
-                    fund.balance -= abs(original_amount)
+                    adjust_fund_balance(fund.id, -abs(original_amount))
                 elif original_type == "expense":
-                    fund.balance += abs(original_amount)
+                    adjust_fund_balance(fund.id, abs(original_amount))
         
         # Update transaction fields
         if "amount" in data:
             try:
-                transaction.amount = Decimal(str(data["amount"]))
+                transaction.amount = Money.parse(data["amount"])
             except (ValueError, TypeError):
                 return jsonify({"error": "Invalid amount"}), 400
         
@@ -392,15 +496,19 @@ def update_transaction(transaction_id):
                 return jsonify({"error": "Invalid date format. Use ISO format (YYYY-MM-DD)"}), 400
         
         # Apply updated transaction's effect on fund balance
+        fund_balance = None
         if transaction.fund_id:
             fund = Fund.query.filter_by(id=transaction.fund_id, household_id=household_id).first()
             if fund:
                 if transaction.transaction_type == "income":
-                    fund.balance += abs(transaction.amount)
+                    fund_balance = adjust_fund_balance(fund.id, abs(transaction.amount))
                 elif transaction.transaction_type == "expense":
-                    if fund.balance < abs(transaction.amount):
+                    fund_balance = adjust_fund_balance(
+                        fund.id, -abs(transaction.amount), require_sufficient=True
+                    )
+                    if fund_balance is None:
+                        db.session.rollback()
                         return jsonify({"error": "Insufficient fund balance for this expense"}), 400
-                    fund.balance -= abs(transaction.amount)
         
         db.session.commit()
         
@@ -409,9 +517,8 @@ def update_transaction(transaction_id):
             "transaction": transaction.to_dict()
         }
         
-        if transaction.fund_id:
-            fund = Fund.query.get(transaction.fund_id)
-            response_data["updated_fund_balance"] = float(fund.balance)
+        if fund_balance is not None:
+            response_data["updated_fund_balance"] = float(fund_balance)
         
         return jsonify(response_data), 200
         
@@ -434,26 +541,28 @@ def delete_transaction(transaction_id):
     ).first()
     
     if not transaction:
+        if _is_archived(transaction_id, household_id):
+            return jsonify({"error": "archived transactions are read-only"}), 409
         return jsonify({"error": "Transaction not found or access denied"}), 404
     
     try:
         # Revert the transaction's effect on fund balance
+        fund_balance = None
         if transaction.fund_id:
             fund = Fund.query.filter_by(id=transaction.fund_id, household_id=household_id).first()
             if fund:
                 if transaction.transaction_type == "income":
-                    fund.balance -= abs(transaction.amount)
+                    fund_balance = adjust_fund_balance(fund.id, -abs(transaction.amount))
                 elif transaction.transaction_type == "expense":
-                    fund.balance += abs(transaction.amount)
+                    fund_balance = adjust_fund_balance(fund.id, abs(transaction.amount))
         
         db.session.delete(transaction)
         db.session.commit()
         
         response_data = {"message": "Transaction deleted successfully"}
         
-        if transaction.fund_id:
-            fund = Fund.query.get(transaction.fund_id)
-            response_data["updated_fund_balance"] = float(fund.balance)
+        if fund_balance is not None:
+            response_data["updated_fund_balance"] = float(fund_balance)
         
         return jsonify(response_data), 200
         
@@ -464,56 +573,169 @@ def delete_transaction(transaction_id):
 
 # Additional helpful endpoints
 
+def _requested_dates():
+    """The optional start_date/end_date query params; returns ((start, end), error response)."""
+    bounds = []
+    for param in ("start_date", "end_date"):
+        value = request.args.get(param)
+        try:
+            bounds.append(datetime.fromisoformat(value).date() if value else None)
+        except ValueError:
+            return (None, None), (jsonify({"error": f"Invalid {param} format. Use YYYY-MM-DD"}), 400)
+    return tuple(bounds), None
+
+
+def _is_archived(transaction_id, household_id):
+    """Whether the household's transaction ``transaction_id`` has been moved to the archive."""
+    return db.session.query(
+        ArchivedTransaction.query.filter_by(id=transaction_id, household_id=household_id).exists()
+    ).scalar()
+
+
+def _in_range(query, model, start, end):
+    if start:
+        query = query.filter(model.date >= start)
+    if end:
+        query = query.filter(model.date <= end)
+    return query
+
+
+def _category_order(model=Transaction):
+    """Drilldown/top-N order: largest amount first, newest id breaking ties."""
+    return model.amount.desc(), model.id.desc()
+
+
+def _by_category_order(transactions):
+    """Merge live and archived rows into drilldown order (ids are unique across both)."""
+    return sorted(transactions, key=lambda t: (t.amount.cents, t.id), reverse=True)
+
+
+def _leaders(model, query, top):
+    """Each category's ``top`` largest rows of ``query``."""
+    ranked = query.with_entities(
+        model.id.label("id"),
+        func.row_number().over(partition_by=model.category, order_by=_category_order(model)).label("rank"),
+    ).subquery()
+    return model.query.join(ranked, model.id == ranked.c.id) \
+        .filter(ranked.c.rank <= top).order_by(ranked.c.rank).all()
+
+
 @tx_bp.route("/by-category", methods=["GET"])
+@read_only
 @jwt_required()
 def get_transactions_by_category():
-    """Get transactions grouped by category"""
+    """
+    Totals and counts per category, largest total first.
+
+    Query params:
+        start_date, end_date: optional YYYY-MM-DD bounds
+        top: also return each category's N largest transactions (at most CATEGORY_TOP_MAX)
+
+    The rest of a category is paged with /by-category/transactions.
+    """
     household_id = get_current_household_id()
     if not household_id:
         return jsonify({"error": "No household found for user"}), 404
-    
-    # Get optional date filters
-    start_date = request.args.get('start_date')
-    end_date = request.args.get('end_date')
-    
-    query = Transaction.query.filter_by(household_id=household_id)
-    
-    if start_date:
-        try:
-            start_date = datetime.fromisoformat(start_date).date()
-            query = query.filter(Transaction.date >= start_date)
-        except ValueError:
-            return jsonify({"error": "Invalid start_date format. Use YYYY-MM-DD"}), 400
-    
-    if end_date:
+
+    top = request.args.get("top", 0, type=int)
+    if top < 0 or top > current_app.config["CATEGORY_TOP_MAX"]:
+        return jsonify({"error": f"top must be between 0 and {current_app.config['CATEGORY_TOP_MAX']}"}), 400
+
+    (start, end), error = _requested_dates()
+    if error:
+        return error
+
+    rows = ledger(household_id, start, end)
+    total = func.sum(rows.c.amount)
+    categories = {
+        category: {
+            "category": category,
+            "total_amount": float(total_amount or 0),
+            "transaction_count": count,
+            "transactions": []
+        }
+        for category, total_amount, count in db.session.query(
+            rows.c.category, total, func.sum(rows.c.transaction_count)
+        ).group_by(rows.c.category).order_by(total.desc(), rows.c.category)
+    }
+
+    if top:
+        leaders = _leaders(Transaction, _in_range(Transaction.query.filter_by(household_id=household_id),
+                                                  Transaction, start, end), top)
+        archived = archived_query(household_id, start, end)
+        if archived is not None:
+            leaders = _by_category_order(leaders + _leaders(ArchivedTransaction, archived, top))
+        for transaction in leaders:
+            entries = categories[transaction.category]["transactions"]
+            if len(entries) < top:
+                entries.append(transaction.to_dict())
+
+    return jsonify(list(categories.values())), 200
+
+
+@tx_bp.route("/by-category/transactions", methods=["GET"])
+@read_only
+@jwt_required()
+def get_category_transactions():
+    """
+    One category's transactions, largest amount first, a page at a time.
+
+    Query params:
+        category: category name (required)
+        start_date, end_date: optional YYYY-MM-DD bounds
+        limit: page size (default CATEGORY_PAGE_SIZE, at most CATEGORY_PAGE_MAX)
+        cursor: next_cursor from the previous page
+
+    Returns:
+        {"category": ..., "transactions": [...], "next_cursor": str or null}
+    """
+    household_id = get_current_household_id()
+    if not household_id:
+        return jsonify({"error": "No household found for user"}), 404
+
+    category = request.args.get("category")
+    if not category:
+        return jsonify({"error": "category parameter required"}), 400
+    limit = min(request.args.get("limit", current_app.config["CATEGORY_PAGE_SIZE"], type=int),
+                current_app.config["CATEGORY_PAGE_MAX"])
+    if limit < 1:
+        return jsonify({"error": "limit must be positive"}), 400
+
+    (start, end), error = _requested_dates()
+    if error:
+        return error
+
+    cursor = request.args.get("cursor")
+    if cursor:
+        amount, _, last_id = cursor.rpartition("_")
         try:
-            end_date = datetime.fromisoformat(end_date).date()
-            query = query.filter(Transaction.date <= end_date)
+            amount, last_id = Money.parse(amount), int(last_id)
         except ValueError:
-            return jsonify({"error": "Invalid end_date format. Use YYYY-MM-DD"}), 400
-    
-    transactions = query.all()
-    
-    # Group by category
-    categories = {}
-    for transaction in transactions:
-        category = transaction.category
-        if category not in categories:
-            categories[category] = {
-                "category": category,
-                "total_amount": 0,
-                "transaction_count": 0,
-                "transactions": []
-            }
-        
-        categories[category]["total_amount"] += float(transaction.amount)
-        categories[category]["transaction_count"] += 1
-        categories[category]["transactions"].append(transaction.to_dict())
-    
-    return jsonify(list(categories.values())), 200
+            return jsonify({"error": "invalid cursor"}), 400
+
+    def page(model, query):
+        query = _in_range(query.filter(model.category == category), model, start, end)
+        if cursor:
+            # Keyset on (amount, id) so deep pages cost the same as the first
+            query = query.filter((model.amount < amount) | ((model.amount == amount) & (model.id < last_id)))
+        return query.order_by(*_category_order(model)).limit(limit + 1).all()
+
+    transactions = page(Transaction, Transaction.query.filter_by(household_id=household_id))
+    archived = archived_query(household_id, start, end)
+    if archived is not None:
+        transactions = _by_category_order(transactions + page(ArchivedTransaction, archived))[:limit + 1]
+    has_more = len(transactions) > limit
+    transactions = transactions[:limit]
+
+    return jsonify({
+        "category": category,
+        "transactions": [t.to_dict() for t in transactions],
+        "next_cursor": f"{transactions[-1].amount}_{transactions[-1].id}" if has_more else None
+    }), 200
 
 
 @tx_bp.route("/summary", methods=["GET"])
+@read_only
 @jwt_required()
 def get_transaction_summary():
     """Get transaction summary (income, expenses, balance)"""
@@ -522,36 +744,28 @@ def get_transaction_summary():
         return jsonify({"error": "No household found for user"}), 404
     
     # Get optional date filters
-    start_date = request.args.get('start_date')
-    end_date = request.args.get('end_date')
-    
-    query = Transaction.query.filter_by(household_id=household_id)
-    
-    if start_date:
-        try:
-            start_date = datetime.fromisoformat(start_date).date()
-            query = query.filter(Transaction.date >= start_date)
-        except ValueError:
-            return jsonify({"error": "Invalid start_date format. Use YYYY-MM-DD"}), 400
-    
-    if end_date:
-        try:
-            end_date = datetime.fromisoformat(end_date).date()
-            query = query.filter(Transaction.date <= end_date)
-        except ValueError:
-            return jsonify({"error": "Invalid end_date format. Use YYYY-MM-DD"}), 400
-    
-    transactions = query.all()
-    
-    total_income = sum(float(t.amount) for t in transactions if t.transaction_type == "income")
-    total_expenses = sum(abs(float(t.amount)) for t in transactions if t.transaction_type == "expense")
-    net_balance = total_income - total_expenses
+    (start_date, end_date), error = _requested_dates()
+    if error:
+        return error
+    
+    # One aggregate row, however many transactions match; archived months come
+    # from their summary rows
+    rows = ledger(household_id, start_date, end_date)
+    income_sum, expense_sum, transaction_count = db.session.query(
+        func.sum(case((rows.c.transaction_type == "income", rows.c.amount), else_=0)),
+        func.sum(case((rows.c.transaction_type == "expense", rows.c.abs_amount), else_=0)),
+        func.coalesce(func.sum(rows.c.transaction_count), 0),
+    ).one()
+    income_sum, expense_sum = income_sum or Money(), expense_sum or Money()
+    total_income = float(income_sum)
+    total_expenses = float(expense_sum)
+    net_balance = float(income_sum - expense_sum)
     
     return jsonify({
         "total_income": total_income,
         "total_expenses": total_expenses,
         "net_balance": net_balance,
-        "transaction_count": len(transactions),
+        "transaction_count": transaction_count,
         "date_range": {
             "start_date": start_date.isoformat() if start_date else None,
             "end_date": end_date.isoformat() if end_date else None
@@ -573,6 +787,8 @@ def skip_recurring_instance(transaction_id):
     ).first()
     
     if not transaction:
+        if _is_archived(transaction_id, household_id):
+            return jsonify({"error": "archived transactions are read-only"}), 409
         return jsonify({"error": "Transaction not found"}), 404
     
     if not transaction.is_recurring and not transaction.parent_transaction_id:
@@ -593,6 +809,7 @@ def skip_recurring_instance(transaction_id):
 
 @tx_bp.route("/process-recurring", methods=["POST"])
 @jwt_required()
+@timed(JOB_DURATION, job="transactions.process_recurring")
 def process_recurring_transactions():
     """Create instances for recurring transactions that are due"""
     household_id = get_current_household_id()
@@ -631,37 +848,28 @@ def process_recurring_transactions():
             )
             
             # Update balances (same logic as regular transaction)
-            # Account.balance is Numeric (Decimal), Fund.balance is Float
             amount_value = abs(parent_tx.amount)
             
             if parent_tx.transaction_type == "transfer":
-                if parent_tx.account:
-                    parent_tx.account.balance -= Decimal(str(amount_value))
+                if parent_tx.account_id:
+                    adjust_account_balance(parent_tx.account_id, -amount_value)
                 elif parent_tx.fund:
-                    parent_tx.fund.balance -= float(amount_value)
-                    if parent_tx.fund.account:
-                        parent_tx.fund.account.balance -= Decimal(str(amount_value))
+                    move_fund_money(parent_tx.fund, -amount_value)
                 
-                if parent_tx.to_account:
-                    parent_tx.to_account.balance += Decimal(str(amount_value))
+                if parent_tx.to_account_id:
+                    adjust_account_balance(parent_tx.to_account_id, amount_value)
                 elif parent_tx.to_fund:
-                    parent_tx.to_fund.balance += float(amount_value)
-                    if parent_tx.to_fund.account:
-                        parent_tx.to_fund.account.balance += Decimal(str(amount_value))
+                    move_fund_money(parent_tx.to_fund, amount_value)
             elif parent_tx.transaction_type == "income":
-                if parent_tx.account:
-                    parent_tx.account.balance += Decimal(str(amount_value))
+                if parent_tx.account_id:
+                    adjust_account_balance(parent_tx.account_id, amount_value)
                 if parent_tx.fund:
-                    parent_tx.fund.balance += float(amount_value)
-                    if parent_tx.fund.account:
-                        parent_tx.fund.account.balance += Decimal(str(amount_value))
+                    move_fund_money(parent_tx.fund, amount_value)
             elif parent_tx.transaction_type == "expense":
-                if parent_tx.account:
-                    parent_tx.account.balance -= Decimal(str(amount_value))
+                if parent_tx.account_id:
+                    adjust_account_balance(parent_tx.account_id, -amount_value)
                 if parent_tx.fund:
-                    parent_tx.fund.balance -= float(amount_value)
-                    if parent_tx.fund.account:
-                        parent_tx.fund.account.balance -= Decimal(str(amount_value))
+                    move_fund_money(parent_tx.fund, -amount_value)
             
             db.session.add(new_tx)
             created_instances.append(new_tx)
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Transaction/income summary benchmark and parity check.
+
+For each --scales row count, seeds one household with that many transactions
+and income entries, then compares the SQL-aggregate /api/transactions/summary
+and /api/income/summary with the previous Python loops (kept below and mounted
+on /legacy/... for the run):
+
+- parity: income output is identical (Decimal strings included); transaction
+  totals agree to the cent (the old loop accumulated float error)
+- latency (median of --rounds) and peak Python memory (tracemalloc) per call
+
+Usage:
+    python scripts/bench_aggregates.py [--scales 1000,10000,100000] [--rounds 5]
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from decimal import Decimal
+
+project_root = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+sys.path.insert(0, project_root)
+
+from flask import jsonify, request
+from flask_jwt_extended import create_access_token, jwt_required
+from backend.utils.data_generator import build_household
+from backend.config import Config
+from backend.database import db, stream
+from backend.models import Income, Transaction
+from backend.utils.auth_helpers import get_current_household_id
+
+SOURCES = ("Employer Payroll", "Freelance", "Dividends", "Rental", "Side Gig", "Gifts", "Refunds")
+
+
+def _filtered(model, household_id):
+    query = model.query.filter_by(household_id=household_id)
+    if request.args.get("start_date"):
+        query = query.filter(model.date >= date.fromisoformat(request.args["start_date"]))
+    if request.args.get("end_date"):
+        query = query.filter(model.date <= date.fromisoformat(request.args["end_date"]))
+    return query
+
+
+@jwt_required()
+def legacy_transaction_summary():
+    """The previous /api/transactions/summary loop."""
+    total_income = 0.0
+    total_expenses = 0.0
+    transaction_count = 0
+    for t in stream(_filtered(Transaction, get_current_household_id())):
+        transaction_count += 1
+        if t.transaction_type == "income":
+            total_income += float(t.amount)
+        elif t.transaction_type == "expense":
+            total_expenses += abs(float(t.amount))
+    return jsonify({"total_income": total_income, "total_expenses": total_expenses,
+                    "net_balance": total_income - total_expenses, "transaction_count": transaction_count})
+
+
+@jwt_required()
+def legacy_income_summary():
+    """The previous /api/income/summary loop, on the Decimals the Numeric column used to load."""
+    source_summary = {}
+    total_income = 0
+    total_entries = 0
+    for entry in stream(_filtered(Income, get_current_household_id())):
+        amount = Decimal(str(entry.amount))
+        total_entries += 1
+        if entry.source not in source_summary:
+            source_summary[entry.source] = {'total_amount': 0, 'count': 0, 'average_amount': 0}
+        source_summary[entry.source]['total_amount'] += amount
+        source_summary[entry.source]['count'] += 1
+        total_income += amount
+    for source in source_summary:
+        count = source_summary[source]['count']
+        total = source_summary[source]['total_amount']
+        source_summary[source]['average_amount'] = round(total / count, 2)
+        source_summary[source]['percentage'] = round((total / total_income * 100), 2) if total_income > 0 else 0
+    return jsonify({'total_income': round(total_income, 2), 'total_entries': total_entries,
+                    'unique_sources': len(source_summary), 'by_source': source_summary})
+
+
+def seed_incomes(engine, household_id, count, rng):
+    today = date.today()
+    rows = [dict(household_id=household_id, date=today - timedelta(days=rng.randint(0, 1500)),
+                 amount=Decimal(rng.randint(100, 500000)) / 100, source=rng.choice(SOURCES),
+                 category="Paycheck", description=None, account_id=None)
+            for _ in range(count)]
+    with engine.begin() as conn:
+        for start in range(0, len(rows), 20000):
+            conn.execute(Income.__table__.insert(), rows[start:start + 20000])
+
+
+def measure(client, path, headers, rounds):
+    client.get(path, headers=headers)  # warm up
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        client.get(path, headers=headers)
+        samples.append(time.perf_counter() - start)
+    tracemalloc.start()
+    client.get(path, headers=headers)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(samples) * 1000, peak / 1024
+
+
+def check(label, condition):
+    print(f"{'✅' if condition else '❌'} {label}")
+    return condition
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summary aggregate benchmark")
+    parser.add_argument("--scales", default="1000,10000,100000")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    scales = [int(s) for s in args.scales.split(",")]
+    ok = True
+    results = {}
+
+    from backend.app import create_app
+    for rows in scales:
+        Config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='patriot-agg-'), 'agg.db')}"
+        app = create_app()
+        app.add_url_rule("/legacy/transactions/summary", view_func=legacy_transaction_summary)
+        app.add_url_rule("/legacy/income/summary", view_func=legacy_income_summary)
+        with app.app_context():
+            db.create_all()
+            user_id, household_id = build_household(db.engine, rows, 0, seed=rows)
+            seed_incomes(db.engine, household_id, rows, random.Random(rows))
+            token = create_access_token(identity=str(user_id), additional_claims={"household_id": household_id})
+        headers = {"Authorization": f"Bearer {token}"}
+        client = app.test_client()
+
+        window = "?start_date=" + (date.today() - timedelta(days=400)).isoformat() + \
+                 "&end_date=" + (date.today() - timedelta(days=30)).isoformat()
+        for query in ("", window):
+            new = client.get("/api/transactions/summary" + query, headers=headers).get_json()
+            old = client.get("/legacy/transactions/summary" + query, headers=headers).get_json()
+            ok &= check(f"{rows:>7} rows{' (date range)' if query else ''}: transaction summary matches to the cent",
+                        new["transaction_count"] == old["transaction_count"] and all(
+                            abs(new[k] - old[k]) < 0.005 for k in ("total_income", "total_expenses", "net_balance")))
+            new = client.get("/api/income/summary" + query, headers=headers).get_json()["summary"]
+            old = client.get("/legacy/income/summary" + query, headers=headers).get_json()
+            new.pop("date_range")
+            ok &= check(f"{rows:>7} rows{' (date range)' if query else ''}: income summary is identical",
+                        json.dumps(new, sort_keys=True) == json.dumps(old, sort_keys=True))
+
+        results[rows] = {
+            name: (measure(client, old_path, headers, args.rounds), measure(client, new_path, headers, args.rounds))
+            for name, old_path, new_path in (
+                ("transactions/summary", "/legacy/transactions/summary", "/api/transactions/summary"),
+                ("income/summary", "/legacy/income/summary", "/api/income/summary"),
+            )
+        }
+        with app.app_context():
+            db.engine.dispose()
+
+    print(f"\n{'endpoint':<22}{'rows':>9}{'loop ms':>10}{'SQL ms':>9}{'loop peak':>12}{'SQL peak':>11}")
+    for rows, endpoints in results.items():
+        for name, ((old_ms, old_kib), (new_ms, new_kib)) in endpoints.items():
+            print(f"{name:<22}{rows:>9}{old_ms:>10.1f}{new_ms:>9.1f}{old_kib:>9.0f}KiB{new_kib:>8.0f}KiB")
+
+    smallest, largest = results[scales[0]], results[scales[-1]]
+    for name in largest:
+        ok &= check(f"{name}: SQL version is faster at {scales[-1]} rows", largest[name][1][0] < largest[name][0][0])
+        ok &= check(f"{name}: SQL version's peak memory does not grow with rows",
+                    largest[name][1][1] < smallest[name][1][1] * 1.5 + 64)
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
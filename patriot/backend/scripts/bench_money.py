@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Money representation benchmark: integer cents against the old Numeric/Float columns.
+
+Seeds a synthetic household with --rows transactions, copies the amounts into a
+scratch table typed the old way (Numeric(15, 2) and Float, in dollars) and
+times the conversions the hot paths pay per row:
+
+- load: reading the amount column (Decimal or float per row vs Money)
+- serialize: float() for the JSON response
+- balance updates: Decimal(str(delta)) + balance, as utils/balances did, vs
+  Money.parse(delta) + balance
+- running balance: the forecast's float accumulation vs int cents
+
+Parsing request input and loading rows cost about the same either way (one
+Python object per value); the gain is in the arithmetic and the serialization
+that follow, and in totals that are exact where the float ones drift.
+
+Usage:
+    python scripts/bench_money.py [--rows 200000] [--rounds 5]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from decimal import Decimal
+
+project_root = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+sys.path.insert(0, project_root)
+
+import sqlalchemy as sa
+from backend.utils.data_generator import build_household
+from backend.config import Config
+from backend.database import db
+from backend.models import Transaction
+from backend.utils.money import Money
+
+legacy = sa.Table(
+    "legacy_amounts", sa.MetaData(),
+    sa.Column("id", sa.Integer, primary_key=True),
+    sa.Column("amount", sa.Numeric(15, 2)),
+    sa.Column("balance", sa.Float),
+)
+
+
+def check(label, condition):
+    print(f"{'✅' if condition else '❌'} {label}")
+    return condition
+
+
+def timed(fn, rounds):
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000, result
+
+
+def report(label, old_ms, new_ms):
+    print(f"   {label:<34} old {old_ms:8.1f}ms   cents {new_ms:8.1f}ms   ({old_ms / new_ms:.1f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Money representation benchmark")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    ok = True
+
+    from backend.app import create_app
+    Config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='patriot-money-'), 'money.db')}"
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        _, household_id = build_household(db.engine, args.rows, 0, seed=args.rows)
+        with db.engine.begin() as conn:
+            legacy.create(conn)
+            conn.execute(sa.text("INSERT INTO legacy_amounts (id, amount, balance) "
+                                 "SELECT id, amount / 100.0, amount / 100.0 FROM transactions"))
+
+        with db.engine.connect() as conn:
+            old_load, decimals = timed(lambda: conn.execute(sa.select(legacy.c.amount)).scalars().all(), args.rounds)
+            new_load, moneys = timed(lambda: conn.execute(sa.select(Transaction.__table__.c.amount)).scalars().all(),
+                                     args.rounds)
+            float_load, floats = timed(lambda: conn.execute(sa.select(legacy.c.balance)).scalars().all(), args.rounds)
+            sql_total = conn.execute(sa.select(sa.func.sum(Transaction.amount))
+                                     .where(Transaction.household_id == household_id)).scalar()
+
+    print(f"   {len(moneys)} amounts")
+    report("load Numeric -> Decimal", old_load, new_load)
+    report("load Float -> float", float_load, new_load)
+
+    old_ms, _ = timed(lambda: [float(d) for d in decimals], args.rounds)
+    new_ms, _ = timed(lambda: [float(m) for m in moneys], args.rounds)
+    report("serialize float()", old_ms, new_ms)
+
+    def decimal_updates():
+        balance = Decimal("0")
+        for delta in floats:
+            balance = balance + Decimal(str(delta))
+        return balance
+
+    def cents_updates():
+        balance = Money()
+        for delta in floats:
+            balance = balance + Money.parse(delta)
+        return balance
+
+    old_ms, decimal_balance = timed(decimal_updates, args.rounds)
+    new_ms, cents_balance = timed(cents_updates, args.rounds)
+    report("balance updates from request input", old_ms, new_ms)
+
+    def float_running():
+        balance = 0.0
+        for amount in decimals:
+            balance += float(amount)
+        return balance
+
+    def cents_running():
+        balance = 0
+        for amount in moneys:
+            balance += amount.cents
+        return balance
+
+    old_ms, float_balance = timed(float_running, args.rounds)
+    new_ms, cents_total = timed(cents_running, args.rounds)
+    report("running balance", old_ms, new_ms)
+
+    exact = sum(decimals)
+    ok &= check("loading cents stays within 50% of Numeric -> Decimal", new_load < old_load * 1.5)
+    ok &= check("int running balance is faster than float accumulation", new_ms < old_ms)
+    ok &= check("cents totals are exact (Python, SQL SUM and Decimal agree)",
+                Decimal(cents_total) / 100 == exact == Decimal(cents_balance.cents) / 100
+                and sql_total.cents == cents_total and decimal_balance == exact)
+    print(f"   float running balance {float_balance!r} vs exact {exact} (off by {abs(Decimal(float_balance) - exact):.2E})")
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
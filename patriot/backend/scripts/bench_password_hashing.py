@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Login-storm benchmark for the password hashing pool.
+
+Serves the app on a local threaded server, fires --logins concurrent logins
+and, at the same time, polls a cheap endpoint to see how responsive the rest
+of the app stays. Runs once with bcrypt inline on the request threads
+(PASSWORD_HASH_WORKERS=0) and once per --workers value on the process pool.
+
+Also checks that logging in with a hash made at a different cost rewrites it
+at BCRYPT_LOG_ROUNDS.
+
+Usage:
+    python scripts/bench_password_hashing.py [--logins 32] [--concurrency 16] [--workers 2,4]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+_db_dir = tempfile.mkdtemp(prefix="patriot-hashing-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'hashing.db')}"
+
+project_root = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+sys.path.insert(0, project_root)
+
+from werkzeug.serving import make_server
+from backend.app import create_app
+from backend.database import db
+from backend.models import User
+from backend.utils.passwords import HASHER, PasswordHasher
+
+PASSWORD = "correct horse battery staple"
+
+
+def seed(app, rounds):
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(username="storm", email="storm@example.com", is_verified=True,
+                            password=PasswordHasher(rounds=rounds, workers=0).hash(PASSWORD)))
+        db.session.add(User(username="legacy", email="legacy@example.com", is_verified=True,
+                            password=PasswordHasher(rounds=max(4, rounds - 2), workers=0).hash(PASSWORD)))
+        db.session.commit()
+
+
+def request(base, path, body=None):
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(base + path, data=data, headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=120) as response:
+            status = response.status
+    except urllib.error.HTTPError as error:
+        status = error.code
+    return status, time.perf_counter() - start
+
+
+def storm(base, logins, concurrency):
+    """Run the login burst while polling a cheap endpoint; return both results."""
+    done = threading.Event()
+    probes = []
+
+    def poll():
+        while not done.is_set():
+            probes.append(request(base, "/api/auth/sentinel/health")[1])
+            time.sleep(0.01)
+
+    poller = threading.Thread(target=poll)
+    poller.start()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        results = list(pool.map(
+            lambda _: request(base, "/api/auth/login", {"email": "storm", "password": PASSWORD}),
+            range(logins),
+        ))
+    elapsed = time.perf_counter() - start
+    done.set()
+    poller.join()
+    return results, elapsed, probes
+
+
+def pct(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] * 1000 if values else float("nan")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Password hashing login-storm benchmark")
+    parser.add_argument("--logins", type=int, default=32)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", default="2,4", help="Pool sizes to compare with inline hashing")
+    args = parser.parse_args()
+
+    app = create_app()
+    rounds = app.config["BCRYPT_LOG_ROUNDS"]
+    seed(app, rounds)
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    request(base, "/api/auth/sentinel/health")  # register blueprints
+
+    print(f"{os.cpu_count()} CPUs, BCRYPT_LOG_ROUNDS={rounds}, {args.logins} logins at concurrency {args.concurrency}")
+    print(f"{'mode':<10} {'logins/s':>9} {'login p50':>10} {'login p95':>10} {'other p50':>10} {'other p95':>10} {'errors':>7}")
+    ok = True
+    for workers in [0] + [int(w) for w in args.workers.split(",") if w]:
+        HASHER.shutdown()
+        HASHER.configure(rounds=rounds, workers=workers, queue=max(workers, 1) * 4 * 8, timeout=60)
+        if workers:
+            request(base, "/api/auth/login", {"email": "storm", "password": PASSWORD})  # warm the pool
+        results, elapsed, probes = storm(base, args.logins, args.concurrency)
+        latencies = [latency for _, latency in results]
+        errors = sum(status != 200 for status, _ in results)
+        ok &= errors == 0
+        label = "inline" if workers == 0 else f"pool={workers}"
+        print(f"{label:<10} {args.logins / elapsed:>9.1f} {pct(latencies, .5):>8.0f}ms {pct(latencies, .95):>8.0f}ms "
+              f"{pct(probes, .5):>8.1f}ms {pct(probes, .95):>8.1f}ms {errors:>7}")
+
+    status, _ = request(base, "/api/auth/login", {"email": "legacy", "password": PASSWORD})
+    with app.app_context():
+        stored = User.query.filter_by(username="legacy").one().password
+    rehashed = status == 200 and not HASHER.needs_rehash(stored)
+    print(f"\n{'✅' if rehashed else '❌'} login rehashed a cost-{rounds - 2} hash to cost {stored.split('$')[2]}")
+    ok &= rehashed
+
+    HASHER.shutdown()
+    server.shutdown()
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Full-text search check and benchmark.
+
+Seeds --households households with --rows transactions in total (merchant-style
+descriptions) plus income entries, then:
+
+- compares /api/transactions/search with what the client does today
+  (downloading /api/transactions/) and with a leading-wildcard LIKE scan
+- checks results against a plain Python word-prefix filter
+- checks ranking, pagination, household isolation and that the triggers follow
+  inserts, updates and deletes
+- checks the LIKE fallback used on databases without full-text search finds
+  the same rows, and that create_all installs the indexes without warnings
+
+Usage:
+    python scripts/bench_search.py [--rows 300000] [--households 20] [--rounds 20]
+"""
+
+import argparse
+import os
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+from datetime import date, datetime, timedelta
+
+_db_dir = tempfile.mkdtemp(prefix="patriot-search-")
+
+project_root = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+sys.path.insert(0, project_root)
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import text
+from sqlalchemy.exc import SAWarning
+from backend.config import Config
+from backend.database import db
+from backend.models import User, Household, Transaction, Income
+from backend.utils.data_generator import EXPENSE_CATEGORIES
+from backend.utils.search import _like_match, parse_terms, search_ids
+
+MERCHANTS = ("Whole Foods Market", "Trader Joe's", "Shell Gas Station", "Chevron", "Starbucks Coffee",
+             "Amazon Marketplace", "Target Store", "Costco Wholesale", "Netflix Subscription",
+             "Spotify Premium", "Uber Trip", "Lyft Ride", "Home Depot", "CVS Pharmacy",
+             "Walgreens Pharmacy", "Delta Airlines", "Marriott Hotel", "Chipotle Grill",
+             "Electric Utility", "Water Utility", "Verizon Wireless", "Comcast Internet",
+             "Planet Fitness", "Petco Supplies", "Barnes Noble Books", "Apple Store")
+SOURCES = ("Employer Payroll", "Freelance Design", "Dividend Payment", "Tax Refund", "Gift from Family")
+_WORD = re.compile(r"\w+")
+
+
+def seed(engine, households, rows, rng):
+    now = datetime.utcnow()
+    today = date.today()
+    ids = []
+    with engine.begin() as conn:
+        for h in range(households):
+            user_id = conn.execute(User.__table__.insert().values(
+                username=f"search{h}", email=f"search{h}@example.com", password="x", is_verified=True,
+            )).inserted_primary_key[0]
+            ids.append((user_id, conn.execute(Household.__table__.insert().values(
+                name=f"Search {h}", created_by=user_id, created_at=now,
+            )).inserted_primary_key[0]))
+        batch = []
+        for i in range(rows):
+            user_id, household_id = ids[i % households]
+            batch.append(dict(
+                household_id=household_id, created_by_user_id=user_id,
+                date=today - timedelta(days=rng.randint(0, 1000)), amount=rng.randint(200, 25000) / 100,
+                description=f"{rng.choice(MERCHANTS)} #{rng.randint(1, 9999)}", category=rng.choice(EXPENSE_CATEGORIES),
+                transaction_type="expense", is_recurring=False, is_skipped=False, is_autopay=False,
+                created_at=now,
+            ))
+            if len(batch) == 20000:
+                conn.execute(Transaction.__table__.insert(), batch)
+                batch = []
+        if batch:
+            conn.execute(Transaction.__table__.insert(), batch)
+        conn.execute(Income.__table__.insert(), [
+            dict(household_id=household_id, date=today - timedelta(days=14 * i), amount=2000,
+                 source=rng.choice(SOURCES), category="Paycheck", description=f"Pay period {i}")
+            for _, household_id in ids for i in range(60)
+        ])
+    return ids
+
+
+def word_prefix_match(terms, *fields):
+    words = [w.lower() for field in fields for w in _WORD.findall(field or "")]
+    return all(any(w.startswith(term) for w in words) for term in terms)
+
+
+def timed(fn, rounds):
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def check(label, condition):
+    print(f"{'✅' if condition else '❌'} {label}")
+    return condition
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Full-text search benchmark")
+    parser.add_argument("--rows", type=int, default=300_000)
+    parser.add_argument("--households", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    ok = True
+
+    from backend.app import create_app
+    Config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(_db_dir, 'search.db')}"
+    app = create_app()
+    with app.app_context(), warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        db.create_all()
+    ok &= check("create_all installs the search indexes without SQLAlchemy warnings",
+                not [w for w in caught if issubclass(w.category, SAWarning)])
+    with app.app_context():
+        start = time.perf_counter()
+        households = seed(db.engine, args.households, args.rows, random.Random(7))
+        print(f"seeded {args.rows} transactions in {args.households} households "
+              f"in {time.perf_counter() - start:.1f}s (FTS triggers included)")
+        user_id, household_id = households[0]
+        token = create_access_token(identity=str(user_id), additional_claims={"household_id": household_id})
+        other_user, other_household = households[1]
+        other_token = create_access_token(identity=str(other_user),
+                                          additional_claims={"household_id": other_household})
+    headers = {"Authorization": f"Bearer {token}"}
+    client = app.test_client()
+
+    def all_pages(path, q, key="results", limit=100):
+        found, offset, pages = [], 0, 0
+        while offset is not None:
+            body = client.get(path, query_string={"q": q, "limit": limit, "offset": offset},
+                              headers=headers).get_json()
+            found += [r["id"] for r in body[key]]
+            offset, pages = body["next_offset"], pages + 1
+        return found, pages
+
+    with app.app_context():
+        rows = db.session.query(Transaction.id, Transaction.description, Transaction.category) \
+            .filter(Transaction.household_id == household_id).all()
+    expected = {row.id for row in rows if word_prefix_match(["whole", "fo"], row.description, row.category)}
+    found, pages = all_pages("/api/transactions/search", "Whole fo")
+    ok &= check(f"'Whole fo' matches the word-prefix filter ({len(expected)} rows over {pages} pages)",
+                set(found) == expected and len(found) == len(expected))
+
+    with app.app_context():
+        clause, id_column, order, params = _like_match("transactions", household_id, parse_terms("Whole fo"))
+        like_found = db.session.execute(text(f"SELECT {id_column} {clause} ORDER BY {order}"), params).scalars().all()
+    ok &= check("LIKE fallback for other databases finds the same rows", set(like_found) == expected)
+
+    body = client.get("/api/transactions/search?q=pharm&limit=5", headers=headers).get_json()
+    ok &= check("every result of a prefix search contains the prefix",
+                body["results"] and all("pharm" in (r["description"] + r["category"]).lower()
+                                        for r in body["results"]))
+
+    with app.app_context():
+        db.session.add_all([
+            Transaction(household_id=household_id, description="Quokka Travel Agency", category="Travel",
+                        amount=10, transaction_type="expense", date=date.today()),
+            Transaction(household_id=household_id, description="Airline seat", category="Quokka",
+                        amount=10, transaction_type="expense", date=date.today()),
+        ])
+        db.session.commit()
+    body = client.get("/api/transactions/search?q=quok", headers=headers).get_json()
+    ok &= check("inserted rows are searchable and description matches rank first",
+                [r["description"] for r in body["results"]] == ["Quokka Travel Agency", "Airline seat"])
+    quokka_id = body["results"][0]["id"]
+
+    other = client.get("/api/transactions/search?q=quok",
+                       headers={"Authorization": f"Bearer {other_token}"}).get_json()
+    ok &= check("search is scoped to the caller's household", other["results"] == [])
+
+    with app.app_context():
+        db.session.get(Transaction, quokka_id).description = "Wombat Travel Agency"
+        db.session.commit()
+    renamed = client.get("/api/transactions/search?q=wombat", headers=headers).get_json()["results"]
+    stale = client.get("/api/transactions/search?q=quok", headers=headers).get_json()["results"]
+    ok &= check("updates reindex the row", [r["id"] for r in renamed] == [quokka_id]
+                and quokka_id not in [r["id"] for r in stale])
+    with app.app_context():
+        db.session.delete(db.session.get(Transaction, quokka_id))
+        db.session.commit()
+    ok &= check("deletes remove the row from the index",
+                client.get("/api/transactions/search?q=wombat", headers=headers).get_json()["results"] == [])
+
+    with app.app_context():
+        incomes = Income.query.filter_by(household_id=household_id).all()
+    expected_income = {i.id for i in incomes if word_prefix_match(["div"], i.source, i.category, i.description)}
+    found_income, _ = all_pages("/api/income/search", "div", key="income_entries", limit=10)
+    ok &= check("income search matches the word-prefix filter", set(found_income) == expected_income)
+
+    rounds = args.rounds
+    like_sql = text("SELECT id FROM transactions WHERE household_id = :h AND "
+                    "(description LIKE :p OR category LIKE :p) ORDER BY date DESC LIMIT 25")
+    print(f"household of {len(rows)} rows ({args.rows} in the table), median of {rounds}:")
+    print(f"  {'query':<22}{'LIKE %x% scan':>15}{'FTS ids':>12}{'/search':>12}")
+    # LIKE ordered by date stops after 25 hits, so only common words are cheap;
+    # FTS cost follows the number of matches it ranks
+    faster = True
+    for label, q in (("common 'starb'", "starb"), ("rare '4242'", "4242"), ("no match 'zzyzx'", "zzyzx")):
+        pattern = f"%{q}%"
+        with app.app_context():
+            like_ms = timed(lambda: db.session.execute(like_sql, {"h": household_id, "p": pattern}).all(), rounds)
+            fts_ms = timed(lambda: search_ids(Transaction, household_id, parse_terms(q), 26), rounds)
+        endpoint_ms = timed(lambda: client.get("/api/transactions/search", query_string={"q": q, "limit": 25},
+                                               headers=headers), rounds)
+        print(f"  {label:<22}{like_ms:13.2f}ms{fts_ms:10.2f}ms{endpoint_ms:10.2f}ms")
+        faster &= q == "starb" or fts_ms < like_ms
+    list_ms = timed(lambda: client.get("/api/transactions/", headers=headers), max(1, rounds // 5))
+    print(f"  client-side filter today: GET /api/transactions/ {list_ms:.1f}ms")
+    ok &= check("index lookups beat the LIKE scan when it cannot stop early", faster)
+    ok &= check("search is faster than downloading the list", endpoint_ms < list_ms)
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
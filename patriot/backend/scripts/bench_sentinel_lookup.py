@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Sentinel user-lookup benchmark against local stub apps.
+
+Starts --apps stub HTTP servers that answer the user-lookup endpoint after
+--delay-ms; only the last one knows the user "known". Compares the old
+sequential lookup (fresh connection per request) with SentinelUserSync's
+parallel, pooled lookup for a user found on the last app, an unknown user, and
+the same unknown user again (negative cache). One stub can be made to hang
+(--slow-ms) to show the lookup stays bounded by the timeout.
+
+Usage:
+    python scripts/bench_sentinel_lookup.py [--apps 4] [--delay-ms 50] [--rounds 10]
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+project_root = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+sys.path.insert(0, project_root)
+
+import requests
+from backend.shared.user_sync import DEFAULT_LOOKUP_PATH, SentinelUserSync
+
+USER = {"username": "known", "email": "known@example.com", "password": "$2b$12$x", "is_verified": True}
+
+
+def start_stub(delay, knows_user):
+    """Serve the user-lookup endpoint on a free port; returns (url, connections counter)."""
+    connections = [0]
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            connections[0] += 1
+            super().setup()
+            # Headers and body go out in separate writes; avoid Nagle/delayed-ACK stalls
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            time.sleep(delay)
+            identifier = parse_qs(url.query).get("identifier", [""])[0]
+            found = url.path == DEFAULT_LOOKUP_PATH and knows_user and identifier == USER["username"]
+            body = json.dumps(USER if found else {"error": "user not found"}).encode()
+            self.send_response(200 if found else 404)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}", connections
+
+
+def sequential_lookup(app_urls, identifier, timeout):
+    """The previous implementation: one app after another, new connection each time."""
+    for app_url in app_urls:
+        try:
+            response = requests.get(f"{app_url}{DEFAULT_LOOKUP_PATH}", params={"identifier": identifier},
+                                    timeout=timeout)
+            if response.status_code == 200:
+                return response.json()
+        except requests.exceptions.RequestException:
+            continue
+    return None
+
+
+def timed(fn, rounds):
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sentinel lookup benchmark")
+    parser.add_argument("--apps", type=int, default=4)
+    parser.add_argument("--delay-ms", type=float, default=50)
+    parser.add_argument("--slow-ms", type=float, default=3000, help="Delay of the hanging stub")
+    parser.add_argument("--timeout", type=float, default=1.0)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    stubs = [start_stub(args.delay_ms / 1000, knows_user=(i == args.apps - 1)) for i in range(args.apps)]
+    urls = [url for url, _ in stubs]
+    ok = True
+
+    def check(label, condition):
+        print(f"{'✅' if condition else '❌'} {label}")
+        return condition
+
+    print(f"{args.apps} stub apps, {args.delay_ms:.0f}ms each, median of {args.rounds}")
+    seq_ms, found = timed(lambda: sequential_lookup(urls, "known", args.timeout), args.rounds)
+    print(f"  sequential  found on last app   {seq_ms:8.1f}ms")
+
+    before = sum(counter[0] for _, counter in stubs)
+    sync = SentinelUserSync(urls, "http://self", timeout=args.timeout, negative_ttl=0)
+    par_ms, found = timed(lambda: sync.find_user_in_apps("known"), args.rounds)
+    connections = sum(counter[0] for _, counter in stubs) - before
+    print(f"  parallel    found on last app   {par_ms:8.1f}ms   ({connections} connections "
+          f"for {args.rounds * args.apps} requests)")
+    ok &= check("parallel lookup finds the user", found == USER)
+    ok &= check("parallel lookup beats sequential", par_ms < seq_ms)
+    ok &= check("connections are kept alive", connections <= args.apps * 4)
+
+    sync = SentinelUserSync(urls, "http://self", timeout=args.timeout, negative_ttl=60)
+    miss_ms, missing = timed(lambda: sync.find_user_in_apps("nobody"), 1)
+    cached_ms, missing_again = timed(lambda: sync.find_user_in_apps("nobody"), args.rounds)
+    print(f"  parallel    unknown user        {miss_ms:8.1f}ms")
+    print(f"  parallel    unknown (cached)    {cached_ms:8.3f}ms")
+    ok &= check("unknown user served from the negative cache", missing is None and missing_again is None
+                and cached_ms < 1)
+
+    slow_url, _ = start_stub(args.slow_ms / 1000, knows_user=False)
+    sync = SentinelUserSync(urls + [slow_url], "http://self", timeout=args.timeout, negative_ttl=60)
+    hit_ms, found = timed(lambda: sync.find_user_in_apps("known"), 1)
+    bounded_ms, _ = timed(lambda: sync.find_user_in_apps("ghost"), 1)
+    print(f"  with a {args.slow_ms:.0f}ms app: hit {hit_ms:.1f}ms, miss {bounded_ms:.1f}ms "
+          f"(timeout {args.timeout * 1000:.0f}ms)")
+    ok &= check("a hanging app does not delay a hit", found == USER and hit_ms < args.slow_ms)
+    ok &= check("a miss is bounded by the timeout", bounded_ms < args.timeout * 1000 + 250)
+    ok &= check("an incomplete miss is not cached", not sync._cached_miss("ghost"))
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Concurrent read/write benchmark for the SQLite production profile.
+
+Runs the same mixed workload twice against fresh SQLite files - once with the
+default engine (rollback journal) and once with SQLITE_PRODUCTION_PROFILE
+enabled (WAL, synchronous=NORMAL, mmap, cache, busy_timeout, pooled
+connections) - and prints throughput and lock errors for each.
+
+Writers post atomic balance updates plus a new transaction row; readers run
+the kind of aggregate queries the dashboard issues.
+
+Usage:
+    python scripts/bench_sqlite_profile.py [--writers 4] [--readers 8] [--seconds 5]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import date
+
+project_root = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+sys.path.insert(0, project_root)
+
+from sqlalchemy import func
+from sqlalchemy.exc import OperationalError
+from backend.config import Config
+from backend.app import create_app
+from backend.database import db
+from backend.models import User, Household, Account, Transaction
+from backend.utils.balances import adjust_account_balance
+
+
+def build_app(db_path, profile):
+    """Create an app bound to ``db_path`` with the profile on or off."""
+    Config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{db_path}"
+    Config.SQLITE_PRODUCTION_PROFILE = profile
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        user = User(username="bench", email="bench@example.com", password="x", is_verified=True)
+        db.session.add(user)
+        db.session.flush()
+        household = Household(name="Bench", created_by=user.id)
+        db.session.add(household)
+        db.session.flush()
+        account = Account(household_id=household.id, name="Checking", type="checking",
+                          institution="Bench Bank", balance=0)
+        db.session.add(account)
+        db.session.commit()
+        return app, household.id, account.id
+
+
+def run_workload(app, household_id, account_id, writers, readers, seconds):
+    """Run writers and readers concurrently for ``seconds``; return counters."""
+    counts = {"writes": 0, "reads": 0, "locked": 0}
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def writer():
+        with app.app_context():
+            while not stop.is_set():
+                try:
+                    adjust_account_balance(account_id, 1)
+                    db.session.add(Transaction(
+                        household_id=household_id, date=date.today(), description="bench",
+                        amount=1, category="Bench", transaction_type="income", account_id=account_id,
+                    ))
+                    db.session.commit()
+                    key = "writes"
+                except OperationalError:
+                    db.session.rollback()
+                    key = "locked"
+                with lock:
+                    counts[key] += 1
+
+    def reader():
+        with app.app_context():
+            while not stop.is_set():
+                try:
+                    db.session.query(func.sum(Transaction.amount), func.count(Transaction.id)).filter(
+                        Transaction.household_id == household_id,
+                        Transaction.transaction_type == "income",
+                    ).one()
+                    db.session.get(Account, account_id)
+                    db.session.commit()
+                    key = "reads"
+                except OperationalError:
+                    db.session.rollback()
+                    key = "locked"
+                with lock:
+                    counts[key] += 1
+
+    threads = [threading.Thread(target=writer) for _ in range(writers)]
+    threads += [threading.Thread(target=reader) for _ in range(readers)]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite profile read/write benchmark")
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="patriot-sqlite-bench-")
+    print(f"{args.writers} writers, {args.readers} readers, {args.seconds}s per run\n")
+    print(f"{'profile':<10} {'writes/s':>10} {'reads/s':>10} {'locked':>8}")
+
+    for label, profile in (("default", False), ("wal", True)):
+        app, household_id, account_id = build_app(os.path.join(workdir, f"{label}.db"), profile)
+        counts = run_workload(app, household_id, account_id, args.writers, args.readers, args.seconds)
+        print(f"{label:<10} {counts['writes'] / args.seconds:>10.1f} "
+              f"{counts['reads'] / args.seconds:>10.1f} {counts['locked']:>8}")
+        with app.app_context():
+            db.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark: import time, create_app() and time to first request.
+
+Each run is a fresh interpreter, so nothing is cached between measurements.
+One extra run uses ``python -X importtime`` to list the heaviest imports.
+Every run also checks that create_app() registered the routes and that WSGI
+middleware wrapped around the app stays in place past the first request.
+
+Exits non-zero when the median time to first request is above --target-ms.
+
+Usage:
+    python scripts/bench_startup.py [--runs 5] [--target-ms 1000] [--top 15]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+project_root = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+CHILD = """
+import json, time
+t0 = time.perf_counter()
+from backend.app import create_app
+t1 = time.perf_counter()
+app = create_app()
+t2 = time.perf_counter()
+routes = len(list(app.url_map.iter_rules()))
+calls = []
+inner = app.wsgi_app
+app.wsgi_app = lambda environ, start_response: calls.append(1) or inner(environ, start_response)
+client = app.test_client()
+response = client.get("/api/auth/sentinel/health")
+t3 = time.perf_counter()
+assert response.status_code == 200, response.status_code
+client.get("/api/auth/sentinel/health")
+print(json.dumps({"import": t1 - t0, "create_app": t2 - t1, "first_request": t3 - t2, "total": t3 - t0,
+                  "routes": routes, "middleware_calls": len(calls)}))
+"""
+
+
+def run_child(importtime=False):
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite://")
+    cmd = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", CHILD]
+    result = subprocess.run(cmd, cwd=project_root, env=env, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+
+
+def heaviest_imports(stderr, top):
+    """Parse -X importtime output into the ``top`` imports by cumulative time."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, self_us, cumulative_us, name = (part.strip() for part in line.replace("import time:", "|").split("|"))
+        depth = (len(line.split("|")[2]) - len(line.split("|")[2].lstrip())) // 2
+        rows.append((int(cumulative_us), int(self_us), depth, name.strip()))
+    # Only report packages directly imported by our code or the interpreter
+    rows = [row for row in rows if row[2] <= 2]
+    return sorted(rows, reverse=True)[:top]
+
+
+def check(label, condition):
+    print(f"{'✅' if condition else '❌'} {label}")
+    return condition
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--target-ms", type=float, default=1000.0,
+                        help="Budget for import + create_app + first request")
+    parser.add_argument("--top", type=int, default=15, help="Heaviest imports to list")
+    args = parser.parse_args()
+
+    print(f"{'import':>10} {'create_app':>11} {'1st request':>12} {'total':>10}   (median of {args.runs})")
+    samples = [run_child()[0] for _ in range(args.runs)]
+    m = {key: statistics.median(s[key] for s in samples) * 1000
+         for key in ("import", "create_app", "first_request", "total")}
+    print(f"{m['import']:>8.1f}ms {m['create_app']:>9.1f}ms {m['first_request']:>10.1f}ms {m['total']:>8.1f}ms")
+
+    _, stderr = run_child(importtime=True)
+    print(f"\nHeaviest imports (cumulative):")
+    for cumulative_us, self_us, depth, name in heaviest_imports(stderr, args.top):
+        print(f"  {cumulative_us / 1000:>8.1f}ms  {'  ' * depth}{name}")
+
+    print()
+    ok = check(f"create_app() registers the routes ({samples[0]['routes']})", samples[0]["routes"] > 50)
+    ok &= check("WSGI middleware added after create_app() sees every request",
+                all(s["middleware_calls"] == 2 for s in samples))
+    ok &= check(f"time to first request {m['total']:.0f}ms (target {args.target_ms:.0f}ms)",
+                m["total"] <= args.target_ms)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Local check for transaction archiving (flask archive-transactions).
+
+Seeds a synthetic household with --rows transactions over three years, records
+what the transaction and report endpoints return for several date ranges, runs
+the archiver and checks:
+- every response is the same afterwards: listing, search, summary, by-category
+  with top-N, drilldown pages, timeseries (month and day buckets), the reports
+  summary count, fund counts and transactions fetched by id
+- recurring templates and parents of live rows stay live, while an old row
+  holding the highest id is archived and its id is never handed out again
+- summary rows add up to the archived rows, and a second run moves nothing
+- ranges after the cutoff never read transactions_archive
+- a listing that reaches the archive is paged instead of loading every
+  archived row (undated rows included, last), and archived rows refuse updates, deletes and skips with 409
+- how much smaller the live table got and what recent-range queries cost
+
+Usage:
+    python scripts/check_archive.py [--rows 100000] [--rounds 5]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+project_root = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+sys.path.insert(0, project_root)
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event, func
+from backend.utils.data_generator import build_household
+from backend.config import Config
+from backend.database import db
+from backend.models import ArchivedTransaction, Fund, Transaction, TransactionPeriodSummary
+from backend.utils.archive import archive_cutoff
+
+
+def check(label, condition):
+    print(f"{'✅' if condition else '❌'} {label}")
+    return condition
+
+
+def timed(fn, rounds):
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transaction archive check")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    ok = True
+
+    from backend.app import create_app
+    Config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='patriot-archive-'), 'archive.db')}"
+    app = create_app()
+    today = date.today()
+    cutoff = archive_cutoff(app.config["ARCHIVE_AFTER_MONTHS"], today)
+    with app.app_context():
+        db.create_all()
+        user_id, household_id = build_household(db.engine, args.rows, 0, seed=args.rows)
+        token = create_access_token(identity=str(user_id), additional_claims={"household_id": household_id})
+        # A live child of an old row keeps its parent live
+        parent = Transaction.query.filter(Transaction.household_id == household_id, Transaction.date < cutoff,
+                                          Transaction.is_recurring.is_(False)).order_by(Transaction.id).first()
+        child = Transaction(household_id=household_id, created_by_user_id=user_id, date=today,
+                            description="Card purchase", amount=parent.amount, category=parent.category,
+                            transaction_type="expense", parent_transaction_id=parent.id)
+        db.session.add(child)
+        db.session.commit()
+        # An undated row lists last, paged or not
+        undated = Transaction(household_id=household_id, created_by_user_id=user_id,
+                              description="Undated", amount=parent.amount, category=parent.category,
+                              transaction_type="expense")
+        db.session.add(undated)
+        db.session.flush()
+        Transaction.query.filter_by(id=undated.id).update({"date": None})  # the column default fills None in
+        db.session.commit()
+        # An old row with the highest id goes to the archive too
+        newest = Transaction(household_id=household_id, created_by_user_id=user_id,
+                             date=cutoff - timedelta(days=40), description="Late entry", amount=parent.amount,
+                             category=parent.category, transaction_type="expense")
+        db.session.add(newest)
+        db.session.commit()
+        parent_id, newest_id = parent.id, newest.id
+        sample_ids = [row_id for (row_id,) in db.session.query(Transaction.id)
+                      .filter(Transaction.household_id == household_id).order_by(Transaction.id)
+                      .limit(args.rows).all()[::max(args.rows // 20, 1)]]
+        fund_ids = [fund_id for (fund_id,) in db.session.query(Fund.id).filter_by(household_id=household_id)]
+        live_before = Transaction.query.count()
+    headers = {"Authorization": f"Bearer {token}"}
+    client = app.test_client()
+
+    def get(path, **params):
+        response = client.get(path, headers=headers, query_string=params)
+        return response.status_code, response.get_json()
+
+    ranges = {
+        "all time": {},
+        "archived months only": {"start_date": (cutoff - timedelta(days=400)).isoformat(),
+                                 "end_date": (cutoff - timedelta(days=1)).isoformat()},
+        "cuts through archived months": {"start_date": (cutoff - timedelta(days=283)).isoformat(),
+                                         "end_date": (cutoff - timedelta(days=47)).isoformat()},
+        "spans the cutoff": {"start_date": (cutoff - timedelta(days=75)).isoformat(),
+                             "end_date": (cutoff + timedelta(days=40)).isoformat()},
+        "recent": {"start_date": (today - timedelta(days=90)).isoformat(), "end_date": today.isoformat()},
+    }
+
+    def drilldown(dates):
+        pages, cursor = [], None
+        while True:
+            _, body = get("/api/transactions/by-category/transactions", category="Groceries", limit=500,
+                          **dates, **({"cursor": cursor} if cursor else {}))
+            pages.append(body)
+            cursor = body["next_cursor"]
+            if not cursor:
+                return pages
+
+    def search_all(q):
+        found, offset = [], 0
+        while offset is not None:
+            _, body = get("/api/transactions/search", q=q, limit=100, offset=offset)
+            found += [t["id"] for t in body["results"]]
+            offset = body["next_offset"]
+        return sorted(found)
+
+    def listing(dates):
+        body, cursor = [], None
+        while True:
+            response = client.get("/api/transactions/", headers=headers, query_string={
+                "limit": 500, **dates, **({"cursor": cursor} if cursor else {})})
+            body += response.get_json()
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+        return response.status_code, body  # paged listings are in (date, id) order
+
+    def snapshot():
+        results = {}
+        for name, dates in ranges.items():
+            results[f"list ({name})"] = listing(dates)
+            results[f"summary ({name})"] = get("/api/transactions/summary", **dates)
+            results[f"by-category top=5 ({name})"] = get("/api/transactions/by-category", top=5, **dates)
+            results[f"drilldown ({name})"] = drilldown(dates)
+            for bucket in ("month", "day"):
+                results[f"timeseries {bucket} by category ({name})"] = get(
+                    "/api/reports/timeseries", bucket=bucket, group_by="category", max_points=2000, **dates)
+            results[f"timeseries quarter by account ({name})"] = get(
+                "/api/reports/timeseries", bucket="quarter", group_by="account", **dates)
+        results["search (card purchase)"] = search_all("card purch")
+        results["search (deposit)"] = search_all("deposit")
+        results["reports summary count"] = get("/api/reports/summary")[1]["total_transactions"]
+        results["fund transaction counts"] = [get(f"/api/funds/{fund_id}")[1]["transaction_count"]
+                                              for fund_id in fund_ids]
+        results["transactions by id"] = [get(f"/api/transactions/{row_id}") for row_id in sample_ids]
+        return results
+
+    recent = ranges["recent"]
+    before = snapshot()
+    before_ms, _ = timed(lambda: get("/api/transactions/summary", **recent), args.rounds)
+    before_list_ms, _ = timed(lambda: get("/api/transactions/", **recent), args.rounds)
+
+    started = time.perf_counter()
+    output = app.test_cli_runner().invoke(args=["archive-transactions"]).output
+    archive_seconds = time.perf_counter() - started
+    print(f"   {output.strip()} in {archive_seconds:.1f}s")
+
+    with app.app_context():
+        live_after = Transaction.query.count()
+        archived = ArchivedTransaction.query.count()
+        stale = Transaction.query.filter(Transaction.date < cutoff).all()
+        ok &= check(f"{archived} rows archived, {live_after} live (was {live_before}), none lost",
+                    archived > 0 and archived + live_after == live_before)
+        ok &= check(f"the {len(stale)} old rows still live are recurring templates or the live child's parent",
+                    all(t.is_recurring or t.id == parent_id for t in stale) and any(t.id == parent_id for t in stale))
+        ok &= check("an old row with the highest id is archived",
+                    db.session.get(ArchivedTransaction, newest_id) is not None
+                    and db.session.query(func.max(Transaction.id)).scalar() < newest_id)
+        summed = db.session.query(func.sum(TransactionPeriodSummary.amount),
+                                  func.sum(TransactionPeriodSummary.transaction_count)).one()
+        rows = db.session.query(func.sum(ArchivedTransaction.amount), func.count(ArchivedTransaction.id)).one()
+        ok &= check("summary rows add up to the archived rows", tuple(summed) == tuple(rows))
+    rerun = app.test_cli_runner().invoke(args=["archive-transactions"]).output
+    ok &= check("a second run moves nothing", "Archived 0 transactions" in rerun)
+
+    after = snapshot()
+    for name in before:
+        ok &= check(f"{name} unchanged", before[name] == after[name])
+
+    with app.app_context():
+        fresh = Transaction(household_id=household_id, created_by_user_id=user_id, date=today,
+                            description="After archiving", amount=1, category="Groceries",
+                            transaction_type="expense")
+        db.session.add(fresh)
+        db.session.commit()
+        ok &= check(f"new transactions never reuse an archived id (got {fresh.id})",
+                    fresh.id > newest_id and db.session.get(ArchivedTransaction, fresh.id) is None)
+
+    statements = []
+    with app.app_context():
+        listener = lambda conn, cursor, statement, *rest: statements.append(statement)
+        event.listen(db.engine, "before_cursor_execute", listener)
+        get("/api/transactions/", **recent)
+        get("/api/transactions/", limit=50, **recent)
+        get("/api/transactions/summary", **recent)
+        get("/api/transactions/by-category", top=5, **recent)
+        drilldown(recent)
+        get("/api/reports/timeseries", bucket="day", **recent)
+        event.remove(db.engine, "before_cursor_execute", listener)
+    ok &= check(f"recent-range queries never read transactions_archive ({len(statements)} statements)",
+                statements and not any("transactions_archive" in s for s in statements))
+
+    with app.app_context():
+        archived_limit = app.config["TRANSACTIONS_PAGE_SIZE"]
+    first_page = client.get("/api/transactions/", headers=headers)
+    ok &= check("an all-time listing is paged once it reaches the archive",
+                len(first_page.get_json()) == archived_limit and "X-Next-Cursor" in first_page.headers)
+    ok &= check("paging reaches an undated row, listed last", after["list (all time)"][1][-1]["description"] == "Undated")
+    modified = [client.put(f"/api/transactions/{newest_id}", headers=headers, json={"description": "x"}),
+                client.delete(f"/api/transactions/{newest_id}", headers=headers),
+                client.put(f"/api/transactions/{newest_id}/skip", headers=headers)]
+    ok &= check("archived transactions refuse update, delete and skip with 409",
+                all(r.status_code == 409 and r.get_json()["error"] == "archived transactions are read-only"
+                    for r in modified))
+
+    after_ms, _ = timed(lambda: get("/api/transactions/summary", **recent), args.rounds)
+    after_list_ms, _ = timed(lambda: get("/api/transactions/", **recent), args.rounds)
+    print(f"   live table {live_before} -> {live_after} rows; last 90 days: summary {before_ms:.1f}ms -> "
+          f"{after_ms:.1f}ms, listing {before_list_ms:.1f}ms -> {after_list_ms:.1f}ms")
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
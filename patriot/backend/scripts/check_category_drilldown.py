@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Local check for /api/transactions/by-category and its drilldown.
+
+For each --scales transaction count, seeds a synthetic household and checks:
+- per-category totals and counts match a Python pass over every row
+- top=N returns each category's N largest transactions (amount, then id, descending)
+- paging /by-category/transactions with the cursor walks the whole category in
+  the same order, starting with the top-N rows
+- the response size depends on categories x N, not on the ledger (the old
+  response nested every transaction)
+
+Usage:
+    python scripts/check_category_drilldown.py [--scales 10000,100000] [--top 5]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+
+project_root = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+sys.path.insert(0, project_root)
+
+from flask_jwt_extended import create_access_token
+from backend.utils.data_generator import build_household
+from backend.config import Config
+from backend.database import db
+from backend.models import Transaction
+
+
+def check(label, condition):
+    print(f"{'✅' if condition else '❌'} {label}")
+    return condition
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Category drilldown check")
+    parser.add_argument("--scales", default="10000,100000")
+    parser.add_argument("--top", type=int, default=5)
+    parser.add_argument("--page", type=int, default=200)
+    args = parser.parse_args()
+    ok = True
+    sizes = []
+
+    from backend.app import create_app
+    for rows in [int(s) for s in args.scales.split(",")]:
+        Config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='patriot-cat-'), 'cat.db')}"
+        app = create_app()
+        with app.app_context():
+            db.create_all()
+            user_id, household_id = build_household(db.engine, rows, 0, seed=rows)
+            token = create_access_token(identity=str(user_id), additional_claims={"household_id": household_id})
+            ledger = db.session.query(Transaction.id, Transaction.category, Transaction.amount, Transaction.date) \
+                .filter_by(household_id=household_id).all()
+        headers = {"Authorization": f"Bearer {token}"}
+        client = app.test_client()
+
+        expected = defaultdict(list)
+        for row in ledger:
+            expected[row.category].append(row)
+        for bucket in expected.values():
+            bucket.sort(key=lambda r: (r.amount, r.id), reverse=True)
+
+        response = client.get(f"/api/transactions/by-category?top={args.top}", headers=headers)
+        body = response.get_json()
+        ok &= check(f"{rows:>7} rows: totals and counts match a full pass",
+                    {c["category"]: c["transaction_count"] for c in body} == {k: len(v) for k, v in expected.items()}
+                    and all(abs(c["total_amount"] - float(sum(r.amount for r in expected[c["category"]]))) < 0.005
+                            for c in body))
+        ok &= check(f"{rows:>7} rows: top={args.top} returns each category's largest transactions",
+                    all([t["id"] for t in c["transactions"]] == [r.id for r in expected[c["category"]][:args.top]]
+                        for c in body))
+        sizes.append((rows, len(response.data)))
+
+        category = max(expected, key=lambda k: len(expected[k]))
+        walked, cursor, timings = [], None, []
+        while True:
+            start = time.perf_counter()
+            page = client.get("/api/transactions/by-category/transactions", headers=headers, query_string={
+                "category": category, "limit": args.page, **({"cursor": cursor} if cursor else {})}).get_json()
+            timings.append((time.perf_counter() - start) * 1000)
+            walked += [t["id"] for t in page["transactions"]]
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+        ok &= check(f"{rows:>7} rows: drilldown pages walk '{category}' in order "
+                    f"({len(walked)} rows, {len(timings)} pages; first {timings[0]:.1f}ms, last {timings[-1]:.1f}ms)",
+                    walked == [r.id for r in expected[category]])
+
+        since = (date.today() - timedelta(days=90)).isoformat()
+        ranged = client.get(f"/api/transactions/by-category?top=1&start_date={since}", headers=headers).get_json()
+        recent = defaultdict(int)
+        for row in ledger:
+            if row.date >= date.fromisoformat(since):
+                recent[row.category] += 1
+        ok &= check(f"{rows:>7} rows: date range applies to totals",
+                    {c["category"]: c["transaction_count"] for c in ranged} == dict(recent))
+
+        if rows == int(args.scales.split(",")[0]):
+            with app.app_context():
+                nested = json.dumps([t.to_dict() for t in Transaction.query.filter_by(household_id=household_id)])
+            print(f"   old response nested every transaction: {len(nested) / 1024:.0f}KiB at {rows} rows")
+            ok &= check("bad cursor and oversized top are rejected",
+                        client.get("/api/transactions/by-category/transactions?category=x&cursor=zz",
+                                   headers=headers).status_code == 400
+                        and client.get("/api/transactions/by-category?top=100000",
+                                       headers=headers).status_code == 400)
+
+    for rows, size in sizes:
+        print(f"   by-category?top={args.top} response at {rows} rows: {size / 1024:.1f}KiB")
+    ok &= check("response size does not grow with the ledger", max(s for _, s in sizes) < min(s for _, s in sizes) * 1.2)
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Local check for the email outbox against an SMTP stand-in.
+
+The stand-in (a few lines of socketserver; aiosmtpd is not a dependency and
+smtpd is gone from Python 3.12) delays its greeting by --handshake-ms to stand
+in for a remote server's TLS and AUTH round trips, and can answer chosen
+recipients with 4xx/5xx replies or drop every session.
+
+Checks that:
+- /register with the outbox is faster than sending inline, and the mail still arrives
+- a burst of emails goes out over one SMTP connection
+- a 4xx reply is retried with backoff and a 5xx reply is dead-lettered at once
+- an unreachable server defers the batch without spending attempts
+- email-requeue style requeue_dead() sends a dead email again
+
+Usage:
+    python scripts/check_email_outbox.py [--handshake-ms 150] [--requests 10]
+"""
+
+import argparse
+import os
+import socket
+import socketserver
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+_db_dir = tempfile.mkdtemp(prefix="patriot-outbox-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'outbox.db')}"
+os.environ.setdefault("BCRYPT_LOG_ROUNDS", "4")
+os.environ.setdefault("PASSWORD_HASH_WORKERS", "0")
+
+project_root = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+sys.path.insert(0, project_root)
+
+from backend.app import create_app
+from backend.database import db
+from backend.models import EmailOutbox
+from backend.utils.email_outbox import get_worker, queue_email, requeue_dead
+
+
+class SMTPStandIn:
+    """Minimal ESMTP server that records recipients and can be told to misbehave."""
+
+    def __init__(self, handshake_delay):
+        self.handshake_delay = handshake_delay
+        self.delivered = []
+        self.connections = 0
+        self.replies = {}  # recipient -> RCPT reply codes to give before accepting
+        self.down = False
+        self.server = None
+
+    def start(self, port=0):
+        stand_in = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def reply(self, text):
+                self.wfile.write(text.encode() + b"\r\n")
+
+            def handle(self):
+                if stand_in.down:
+                    return
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                stand_in.connections += 1
+                time.sleep(stand_in.handshake_delay)
+                self.reply("220 stand-in ESMTP")
+                recipient = None
+                for line in self.rfile:
+                    if stand_in.down:
+                        return  # drop the session mid-conversation
+                    command = line.decode().strip()
+                    verb = command[:4].upper()
+                    if verb == "EHLO":
+                        self.reply("250-stand-in\r\n250 AUTH PLAIN")
+                    elif verb == "AUTH":
+                        self.reply("235 authenticated")
+                    elif verb == "RCPT":
+                        recipient = command.partition("<")[2].rstrip(">")
+                        codes = stand_in.replies.get(recipient)
+                        self.reply(f"{codes.pop(0)} not now" if codes else "250 OK")
+                    elif verb == "DATA":
+                        self.reply("354 go ahead")
+                        for data in self.rfile:
+                            if data == b".\r\n":
+                                break
+                        stand_in.delivered.append(recipient)
+                        self.reply("250 queued")
+                    elif verb == "QUIT":
+                        self.reply("221 bye")
+                        return
+                    else:  # HELO, MAIL, RSET, NOOP
+                        self.reply("250 OK")
+
+        socketserver.ThreadingTCPServer.allow_reuse_address = True
+        self.server = socketserver.ThreadingTCPServer(("127.0.0.1", port), Handler)
+        self.server.daemon_threads = True
+        self.down = False
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self.server.server_address[1]
+
+    def stop(self):
+        self.down = True
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def check(label, condition):
+    print(f"{'✅' if condition else '❌'} {label}")
+    return condition
+
+
+def wait_for(predicate, limit):
+    deadline = time.monotonic() + limit
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def time_registrations(client, prefix, count):
+    samples = []
+    for i in range(count):
+        start = time.perf_counter()
+        response = client.post("/api/auth/register", json={
+            "username": f"{prefix}{i}", "email": f"{prefix}{i}@example.com", "password": "pw-12345"})
+        samples.append(time.perf_counter() - start)
+        assert response.status_code == 201, response.get_json()
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Email outbox check")
+    parser.add_argument("--handshake-ms", type=float, default=150)
+    parser.add_argument("--requests", type=int, default=10)
+    args = parser.parse_args()
+    ok = True
+
+    stand_in = SMTPStandIn(args.handshake_ms / 1000)
+    port = stand_in.start()
+
+    app = create_app()
+    app.config.update(
+        ENV="production", MAIL_SERVER="127.0.0.1", MAIL_PORT=port, MAIL_USE_TLS=False,
+        MAIL_USERNAME="patriot", MAIL_PASSWORD="secret", MAIL_DEFAULT_SENDER="noreply@patriot.test",
+        EMAIL_POLL_INTERVAL=0.2, EMAIL_RETRY_BASE=0.2, EMAIL_RETRY_MAX=1, EMAIL_MAX_ATTEMPTS=4,
+    )
+    with app.app_context():
+        db.create_all()
+    client = app.test_client()
+
+    app.config["EMAIL_OUTBOX_ENABLED"] = False
+    inline_ms = time_registrations(client, "inline", args.requests)
+    app.config["EMAIL_OUTBOX_ENABLED"] = True
+    before = stand_in.connections
+    outbox_ms = time_registrations(client, "queued", args.requests)
+    print(f"   /register median: inline SMTP {inline_ms:.1f}ms, outbox {outbox_ms:.1f}ms "
+          f"(stand-in handshake {args.handshake_ms:.0f}ms)")
+    ok &= check("outbox takes SMTP off the request path", outbox_ms < inline_ms - args.handshake_ms / 2)
+    ok &= check("queued verification emails are delivered",
+                wait_for(lambda: sum(r.startswith("queued") for r in stand_in.delivered) == args.requests, 10))
+    worker = get_worker(app)
+
+    with app.app_context():
+        before = stand_in.connections
+        for i in range(25):
+            queue_email(f"burst{i}@example.com", "Burst", "hello", kind="check")
+        db.session.commit()
+    ok &= check("a burst of emails is delivered",
+                wait_for(lambda: sum(r.startswith("burst") for r in stand_in.delivered) == 25, 10))
+    print(f"   burst of 25 used {stand_in.connections - before} new SMTP connection(s)")
+    ok &= check("the SMTP connection is reused", stand_in.connections - before <= 1)
+
+    stand_in.replies = {"flaky@example.com": [451, 451], "bounce@example.com": [550]}
+    with app.app_context():
+        flaky = queue_email("flaky@example.com", "Flaky", "hello", kind="check")
+        bounce = queue_email("bounce@example.com", "Bounce", "hello", kind="check")
+        db.session.commit()
+        flaky_id, bounce_id = flaky.id, bounce.id
+
+    def row(row_id):
+        with app.app_context():
+            return db.session.get(EmailOutbox, row_id)
+
+    ok &= check("4xx replies are retried until delivered",
+                wait_for(lambda: row(flaky_id).status == 'sent', 10) and row(flaky_id).attempts == 3)
+    dead = row(bounce_id)
+    print(f"   dead letter: status={dead.status} attempts={dead.attempts} last_error={dead.last_error!r}")
+    ok &= check("5xx reply is dead-lettered without retries",
+                dead.status == 'dead' and dead.attempts == 1 and "550" in dead.last_error)
+
+    stand_in.stop()
+    with app.app_context():
+        down = queue_email("outage@example.com", "Outage", "hello", kind="check")
+        db.session.commit()
+        down_id = down.id
+    ok &= check("an unreachable server defers without spending attempts",
+                wait_for(lambda: row(down_id).last_error is not None, 5)
+                and row(down_id).status == 'pending' and row(down_id).attempts == 0)
+    stand_in.start(port)
+    ok &= check("deferred email goes out once the server is back",
+                wait_for(lambda: row(down_id).status == 'sent', 10))
+
+    with app.app_context():
+        requeued = requeue_dead([bounce_id])
+    worker.wake()
+    ok &= check("a re-queued dead email is sent again",
+                requeued == 1 and wait_for(lambda: row(bounce_id).status == 'sent', 10))
+
+    worker.stop(timeout=5)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
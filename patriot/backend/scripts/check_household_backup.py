@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Local check for household backup and restore.
+
+Seeds a synthetic household with --rows transactions, a second member, an
+invite, and archived months that include a child of a live recurring
+transaction. It then checks:
+- cloning through the API (GET /backup, POST /restore) gives a household with
+  the same rows and references and the same endpoint responses, ids aside,
+  whose only member is the caller
+- restoring the CLI backup into an empty database creates the members,
+  without usable passwords
+- the transaction id counter moves past every restored id, so new
+  transactions can't take an archived id
+- invite tokens are regenerated, only owners can back up, and broken files
+  are rejected without leaving anything behind
+- forged files are rejected: unsorted header ids, spans that don't match the
+  rows, references outside the backup, and uploads over BACKUP_MAX_UPLOAD_BYTES
+- backup and restore times
+
+Usage:
+    python scripts/check_household_backup.py [--rows 200000]
+"""
+
+import argparse
+import gzip
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+project_root = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+sys.path.insert(0, project_root)
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import text
+from backend.utils.data_generator import build_household
+from backend.config import Config
+from backend.database import db
+from backend.models import (
+    Account, ArchivedTransaction, Bill, Fund, Household, HouseholdInvite, Transaction, TransactionPeriodSummary,
+    User, user_household,
+)
+from backend.utils.archive import archive_cutoff, archive_transactions
+from backend.utils.passwords import check_password
+
+
+def check(label, condition):
+    print(f"{'✅' if condition else '❌'} {label}")
+    return condition
+
+
+def ledger(household_id, authors=True):
+    """Every transaction with its references resolved to names, in a comparable form."""
+    names = {}
+    for model in (Account, Fund, Bill):
+        names[model] = dict(db.session.query(model.id, model.name).filter_by(household_id=household_id))
+    rows = []
+    for model in (Transaction, ArchivedTransaction):
+        by_id = {t.id: t for t in model.query.filter_by(household_id=household_id)}
+        parents = {**{t.id: t for t in Transaction.query.filter_by(household_id=household_id)}, **by_id}
+        for t in by_id.values():
+            parent = parents.get(t.parent_transaction_id)
+            rows.append((
+                model.__tablename__, str(t.date), t.amount.cents, t.description, t.category, t.transaction_type,
+                names[Account].get(t.account_id), names[Account].get(t.to_account_id),
+                names[Fund].get(t.fund_id), names[Fund].get(t.to_fund_id), names[Bill].get(t.bill_id),
+                (parent.description, str(parent.date)) if parent else None,
+                (t.created_by.email if t.created_by else None) if authors else None, bool(t.is_recurring),
+            ))
+    return sorted(rows, key=repr)
+
+
+def summaries(household_id):
+    accounts = dict(db.session.query(Account.id, Account.name).filter_by(household_id=household_id))
+    return sorted(((str(s.period), s.category, s.transaction_type, accounts.get(s.account_id), s.amount.cents,
+                   s.abs_amount.cents, s.transaction_count)
+                  for s in TransactionPeriodSummary.query.filter_by(household_id=household_id)), key=repr)
+
+
+def members(household_id):
+    return sorted(db.session.query(User.email, user_household.c.role)
+                  .join(user_household, user_household.c.user_id == User.id)
+                  .filter(user_household.c.household_id == household_id))
+
+
+def forge(body, header=None, chunks=None):
+    """The backup ``body`` with its header and chunks passed through the given edits."""
+    lines = [json.loads(line) for line in gzip.decompress(body).splitlines()]
+    if header:
+        header(lines[0])
+    if chunks:
+        chunks(lines[1:])
+    return gzip.compress(b"".join(json.dumps(line).encode() + b"\n" for line in lines))
+
+
+def without_ids(value):
+    """
+    A response with ids, id references and linked user names dropped (an API
+    restore links no users) and lists put in a fixed order.
+    """
+    if isinstance(value, dict):
+        return {k: without_ids(v) for k, v in value.items()
+                if k != "id" and not k.endswith("_id") and k not in ("created_by_name", "owner_name")}
+    if isinstance(value, list):
+        return sorted((without_ids(v) for v in value), key=lambda v: json.dumps(v, sort_keys=True))
+    return value
+
+
+def responses(client, headers):
+    paths = ["/api/transactions/", "/api/transactions/summary", "/api/transactions/by-category?top=5",
+             "/api/reports/timeseries?bucket=month&group_by=category", "/api/financial-accounts/", "/api/funds/",
+             "/api/bills/", "/api/debts/", "/api/income/", "/api/transactions/search?q=card&limit=50"]
+    results = {path: client.get(path, headers=headers).get_json() for path in paths}
+    # Equal amounts are ordered by id, and a restore keeps id order within the live and archived
+    # tables but not between them, so which of several tied rows makes the top 5 may differ
+    for category in results["/api/transactions/by-category?top=5"]:
+        category["transactions"] = [t["amount"] for t in category["transactions"]]
+    return {path: without_ids(result) for path, result in results.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Household backup and restore check")
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+    ok = True
+
+    from backend.app import create_app
+    workdir = tempfile.mkdtemp(prefix="patriot-backup-")
+    Config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(workdir, 'source.db')}"
+    app = create_app()
+    today = date.today()
+    with app.app_context():
+        db.create_all()
+        user_id, household_id = build_household(db.engine, args.rows, 300, seed=args.rows)
+        partner = User(username="partner", email="partner@example.com", password="x", name="Partner")
+        db.session.add(partner)
+        db.session.flush()
+        db.session.execute(user_household.insert().values(
+            user_id=partner.id, household_id=household_id, role="member", joined_at=datetime.utcnow()))
+        db.session.add(HouseholdInvite(household_id=household_id, inviter_id=user_id, invitee_email="x@example.com",
+                                       token="original-token", status="pending",
+                                       expires_at=datetime.utcnow() + timedelta(days=7)))
+        # An old instance of a live recurring transaction, archived with its parent left live
+        template = Transaction.query.filter_by(household_id=household_id, is_recurring=True).first()
+        db.session.add(Transaction(household_id=household_id, created_by_user_id=partner.id,
+                                   date=archive_cutoff(app.config["ARCHIVE_AFTER_MONTHS"], today) - timedelta(days=40),
+                                   description="Recurring instance", amount=template.amount,
+                                   category=template.category, transaction_type=template.transaction_type,
+                                   account_id=template.account_id, parent_transaction_id=template.id))
+        db.session.commit()
+        archive_transactions(app.config["ARCHIVE_AFTER_MONTHS"], household_id=household_id)
+        partner_id = partner.id
+        original = ledger(household_id), summaries(household_id), members(household_id)
+        archived = ArchivedTransaction.query.filter_by(household_id=household_id).count()
+        owner = {"Authorization": "Bearer " + create_access_token(
+            identity=str(user_id), additional_claims={"household_id": household_id})}
+        member = {"Authorization": "Bearer " + create_access_token(
+            identity=str(partner_id), additional_claims={"household_id": household_id})}
+    print(f"   {len(original[0])} transactions ({archived} archived), 2 members")
+
+    client = app.test_client()
+    before = responses(client, owner)
+
+    started = time.perf_counter()
+    backup = client.get(f"/api/households/{household_id}/backup", headers=owner)
+    body = backup.data
+    backup_seconds = time.perf_counter() - started
+    ok &= check(f"owner downloads a {len(body) / 2**20:.1f}MiB backup in {backup_seconds:.1f}s",
+                backup.status_code == 200 and backup.mimetype == "application/gzip")
+    ok &= check("members who aren't owners can't back up",
+                client.get(f"/api/households/{household_id}/backup", headers=member).status_code == 403)
+
+    started = time.perf_counter()
+    restored = client.post("/api/households/restore", headers=owner,
+                           data={"backup": (io.BytesIO(body), "backup.jsonl.gz"), "name": "Clone"})
+    restore_seconds = time.perf_counter() - started
+    clone_id = restored.get_json()["household"]["id"]
+    ok &= check(f"POST /restore clones it as household {clone_id} in {restore_seconds:.1f}s",
+                restored.status_code == 201 and clone_id != household_id)
+
+    with app.app_context():
+        ok &= check("the clone has the same transactions, archive and references",
+                    ledger(clone_id, authors=False) == ledger(household_id, authors=False))
+        ok &= check("the clone links no other user as author",
+                    not Transaction.query.filter(Transaction.household_id == clone_id,
+                                                 Transaction.created_by_user_id.isnot(None)).count())
+        ok &= check("the clone has the same archive summaries", summaries(clone_id) == original[1])
+        owner_email = db.session.get(User, user_id).email
+        ok &= check("the caller is the clone's only member", members(clone_id) == [(owner_email, "owner")])
+        clone_archived = db.session.query(db.func.max(ArchivedTransaction.id)).filter_by(household_id=clone_id).scalar()
+        clone_live = db.session.query(db.func.max(Transaction.id)).scalar()
+        counter = db.session.execute(text("SELECT seq FROM sqlite_sequence WHERE name = 'transactions'")).scalar()
+        ok &= check("the transaction id counter is past every restored id",
+                    counter >= max(clone_archived, clone_live))
+        invite = HouseholdInvite.query.filter_by(household_id=clone_id).one()
+        ok &= check("invite tokens are regenerated", invite.token != "original-token")
+        households = Household.query.count()
+        clone = {"Authorization": "Bearer " + create_access_token(
+            identity=str(user_id), additional_claims={"household_id": clone_id})}
+    after = responses(client, clone)
+    for path in before:
+        ok &= check(f"GET {path} matches the original, ids aside", before[path] == after[path])
+    created = client.post("/api/transactions/", headers=clone, json={
+        "description": "After restore", "amount": 5, "category": "Dining", "transaction_type": "expense",
+        "date": today.isoformat()})
+    with app.app_context():
+        new_id = created.get_json()["transaction"]["id"] if created.status_code == 201 else None
+        ok &= check("a new transaction takes an id no archived row has",
+                    new_id is not None and db.session.get(ArchivedTransaction, new_id) is None)
+
+    truncated = client.post("/api/households/restore", headers=owner, data=body[: len(body) // 2],
+                            content_type="application/gzip")
+    garbage = client.post("/api/households/restore", headers=owner, data=b"not a backup",
+                          content_type="application/gzip")
+    with app.app_context():
+        ok &= check("truncated and foreign files are rejected and leave nothing behind",
+                    truncated.status_code == 400 and garbage.status_code == 400
+                    and Household.query.count() == households)
+
+    def restore(data, headers=owner):
+        return client.post("/api/households/restore", headers=headers, data=data, content_type="application/gzip")
+
+    def retarget(lines):
+        # Point a transaction at an account that is not in the backup
+        rows = next(line for line in lines if line["table"] == "transactions")["rows"]
+        rows[0][columns.index("account_id")] = foreign_account
+
+    header = json.loads(gzip.decompress(body).split(b"\n", 1)[0])
+    columns = header["columns"]["transactions"]
+    foreign_account = header["ids"]["accounts"][-1] + 1000
+    forged = {
+        "unsorted header ids": forge(body, header=lambda h: h["ids"]["accounts"].reverse()),
+        "a span wider than the rows": forge(body, header=lambda h: h["spans"]["transactions"].__setitem__(1, 10**12)),
+        "an account outside the backup": forge(body, header=lambda h: h["ids"]["accounts"].append(foreign_account)),
+        "a reference outside the backup": forge(body, chunks=retarget),
+    }
+    with app.app_context():
+        for label, data in forged.items():
+            response = restore(data)
+            ok &= check(f"a file with {label} is rejected ({response.get_json()['error']})",
+                        response.status_code == 400 and Household.query.count() == households)
+
+    stolen = client.post("/api/households/restore", headers=member,
+                         data={"backup": (io.BytesIO(body), "backup.jsonl.gz")})
+    with app.app_context():
+        theft_id = stolen.get_json()["household"]["id"]
+        ok &= check("a member restoring the backup does not pull the original owner in",
+                    stolen.status_code == 201
+                    and members(theft_id) == [(db.session.get(User, partner_id).email, "owner")])
+        households = Household.query.count()
+    app.config["BACKUP_MAX_UPLOAD_BYTES"] = len(body) - 1
+    raw = restore(body)
+    multipart = client.post("/api/households/restore", headers=owner,
+                            data={"backup": (io.BytesIO(body), "backup.jsonl.gz")})
+    app.config["BACKUP_MAX_UPLOAD_BYTES"] = Config.BACKUP_MAX_UPLOAD_BYTES
+    with app.app_context():
+        ok &= check("uploads over BACKUP_MAX_UPLOAD_BYTES get a 413",
+                    raw.status_code == 413 and multipart.status_code == 413 and Household.query.count() == households)
+
+    # Into an empty database through the CLI, creating the members
+    path = os.path.join(workdir, "household.jsonl.gz")
+    output = app.test_cli_runner().invoke(args=["household-backup", "--household", str(household_id), "--out", path])
+    print(f"   {output.output.strip()}")
+    Config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(workdir, 'target.db')}"
+    target = create_app()
+    with target.app_context():
+        db.create_all()
+    output = target.test_cli_runner().invoke(args=["household-restore", path])
+    print(f"   {output.output.strip()}")
+    with target.app_context():
+        household = Household.query.one()
+        users = User.query.order_by(User.email).all()
+        ok &= check("restoring into an empty database creates the members with their roles",
+                    members(household.id) == original[2] and all(u.default_household_id == household.id for u in users))
+        ok &= check("created members have no usable password", not check_password(users[0].password, "x"))
+        ok &= check("the empty database gets the same transactions, archive and summaries",
+                    ledger(household.id) == original[0] and summaries(household.id) == original[1])
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Local check for the cached household-membership authorization layer.
+
+Seeds two users with a household each, then drives the household routes
+through the Flask test client.
+
+Checks that:
+- an authorized request issues no queries once the membership is cached
+- non-members get 403 and unknown households 404
+- accepting an invite, removal, switching and deleting take effect immediately
+- entries expire after the TTL and the cache stays within its size bound
+
+Usage:
+    python scripts/check_membership_cache.py
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+_db_dir = tempfile.mkdtemp(prefix="patriot-membership-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'membership.db')}"
+
+project_root = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+sys.path.insert(0, project_root)
+
+from flask import jsonify
+from flask_jwt_extended import create_access_token, jwt_required
+from backend.app import create_app
+from backend.database import db
+from backend.models import User, Household, user_household
+from backend.utils.membership import (
+    Membership, MembershipCache, get_membership, household_member_required,
+)
+
+
+def seed(app):
+    """Two users, each owning one household; returns their access tokens."""
+    with app.app_context():
+        db.create_all()
+        for user_id in (1, 2):
+            db.session.add(User(id=user_id, username=f"user{user_id}", email=f"user{user_id}@example.com",
+                                password="x", is_verified=True))
+        db.session.flush()
+        for household_id in (1, 2):
+            db.session.add(Household(id=household_id, name=f"House {household_id}", created_by=household_id))
+            db.session.flush()
+            db.session.execute(user_household.insert().values(
+                user_id=household_id, household_id=household_id, role="owner", joined_at=datetime.utcnow()
+            ))
+            db.session.get(User, household_id).default_household_id = household_id
+        db.session.commit()
+        return {user_id: create_access_token(identity=str(user_id), additional_claims={"household_id": user_id})
+                for user_id in (1, 2)}
+
+
+def check(label, condition):
+    print(f"{'✅' if condition else '❌'} {label}")
+    return condition
+
+
+def main():
+    ok = True
+    app = create_app()
+
+    # Authorization only, so X-Query-Count measures the check itself
+    @app.route("/_probe/<int:household_id>")
+    @jwt_required()
+    @household_member_required()
+    def probe(household_id):
+        return jsonify({"household_id": household_id})
+
+    tokens = seed(app)
+    client = app.test_client()
+
+    def get(path, user):
+        return client.get(path, headers={"Authorization": f"Bearer {tokens[user]}"})
+
+    def post(path, user, body=None):
+        return client.post(path, json=body or {}, headers={"Authorization": f"Bearer {tokens[user]}"})
+
+    miss, hit = get("/_probe/1", 1), get("/_probe/1", 1)
+    print(f"   X-Query-Count miss={miss.headers.get('X-Query-Count')} hit={hit.headers.get('X-Query-Count')}")
+    ok &= check("cache hit authorizes with zero queries",
+                miss.status_code == hit.status_code == 200 and hit.headers.get("X-Query-Count") == "0")
+    ok &= check("non-member is denied", get("/_probe/1", 2).status_code == 403)
+    ok &= check("unknown household is 404", get("/_probe/99", 1).status_code == 404)
+
+    invite_url = post("/api/households/1/invite", 1, {"email": "user2@example.com"}).get_json()["invite_url"]
+    post(f"/api/households/invites/{invite_url.rsplit('/', 1)[-1]}/accept", 2)
+    ok &= check("accepted invite is visible at once", get("/_probe/1", 2).status_code == 200)
+    ok &= check("member cannot act as owner", client.put(
+        "/api/households/1", json={"name": "x"}, headers={"Authorization": f"Bearer {tokens[2]}"}
+    ).status_code == 403)
+
+    with app.app_context():
+        get_membership(2)  # cache the pre-switch default
+        post("/api/households/1/switch", 2)
+        ok &= check("switch updates the cached default household", get_membership(2).default_household_id == 1)
+
+    client.delete("/api/households/1/members/2", headers={"Authorization": f"Bearer {tokens[1]}"})
+    ok &= check("removed member is denied at once", get("/_probe/1", 2).status_code == 403)
+
+    get("/_probe/2", 2)
+    client.delete("/api/households/2", headers={"Authorization": f"Bearer {tokens[2]}"})
+    ok &= check("deleted household is no longer authorized", get("/_probe/2", 2).status_code == 404)
+
+    now = [0.0]
+    cache = MembershipCache(maxsize=3, ttl=10, clock=lambda: now[0])
+    for user_id in range(5):
+        cache.set(Membership(user_id, None, {}))
+    ok &= check("cache is bounded (LRU)", len(cache) == 3 and cache.get(0) is None and cache.get(4) is not None)
+    now[0] = 11
+    ok &= check("entries expire after the TTL", cache.get(4) is None)
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
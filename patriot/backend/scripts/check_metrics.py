@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Local check for the /metrics endpoint.
+
+Single-process: issues a few requests (including a forecast and a recurring
+processing job) and checks the scrape reports latency histograms, status
+counts, pool checkout waits, forecast and job timings.
+
+Multi-process: forks worker processes sharing a PROMETHEUS_MULTIPROC_DIR while
+another thread holds the registry lock, has each serve requests, then checks a
+scrape sums every worker and that an exited worker's counters survive
+mark_process_dead().
+
+Scrapes need the METRICS_TOKEN bearer token; without one configured, /metrics
+is refused.
+
+Usage:
+    python scripts/check_metrics.py [--workers 3] [--requests 20]
+"""
+
+import argparse
+import multiprocessing
+import os
+import re
+import sys
+import tempfile
+import threading
+from datetime import datetime
+
+_work_dir = tempfile.mkdtemp(prefix="patriot-metrics-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_work_dir, 'metrics.db')}"
+os.environ["PROMETHEUS_MULTIPROC_DIR"] = os.path.join(_work_dir, "multiproc")
+
+project_root = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+sys.path.insert(0, project_root)
+
+from flask_jwt_extended import create_access_token
+from backend.config import Config
+from backend.app import create_app
+from backend.database import db
+from backend.models import User, Household, user_household
+from backend.utils.metrics import REGISTRY, mark_process_dead
+
+ENDPOINT = "funds.list_funds"
+Config.METRICS_TOKEN = "check-metrics-token"
+SCRAPE = {"Authorization": f"Bearer {Config.METRICS_TOKEN}"}
+
+
+def seed(app):
+    with app.app_context():
+        db.create_all()
+        if db.session.get(Household, 1) is None:
+            db.session.add(User(id=1, username="metrics", email="metrics@example.com",
+                                password="x", is_verified=True, default_household_id=1))
+            db.session.add(Household(id=1, name="Metrics", created_by=1))
+            db.session.flush()
+            db.session.execute(user_household.insert().values(
+                user_id=1, household_id=1, role="owner", joined_at=datetime.utcnow()
+            ))
+            db.session.commit()
+        return {"Authorization": "Bearer " + create_access_token(
+            identity="1", additional_claims={"household_id": 1})}
+
+
+def sample(text, name, **labels):
+    """Return the value of one sample line from an exposition, or None."""
+    for line in text.splitlines():
+        match = re.match(rf"{re.escape(name)}(\{{.*\}})? (\S+)$", line)
+        if match and all(f'{k}="{v}"' in (match.group(1) or "") for k, v in labels.items()):
+            return float(match.group(2))
+    return None
+
+
+def check(label, condition):
+    print(f"{'✅' if condition else '❌'} {label}")
+    return condition
+
+
+def single_process(requests):
+    Config.METRICS_MULTIPROC_DIR = None
+    app = create_app()
+    headers = seed(app)
+    client = app.test_client()
+    for _ in range(requests):
+        client.get("/api/funds/", headers=headers)
+    client.get("/api/does-not-exist")
+    client.get("/api/reports/forecast", headers=headers)
+    client.post("/api/funds/process-recurring", headers=headers)
+
+    ok = check("scrape without the token is refused", client.get("/metrics").status_code == 401)
+    text = client.get("/metrics", headers=SCRAPE).get_data(as_text=True)
+    ok &= check("request counter per endpoint",
+               sample(text, "patriot_http_requests_total", endpoint=ENDPOINT, status="200") == requests)
+    ok &= check("latency histogram count matches",
+                sample(text, "patriot_http_request_duration_seconds_count", endpoint=ENDPOINT) == requests)
+    ok &= check("+Inf bucket present",
+                sample(text, "patriot_http_request_duration_seconds_bucket", endpoint=ENDPOINT, le="+Inf") == requests)
+    ok &= check("unmatched routes collapse to one label",
+                sample(text, "patriot_http_requests_total", endpoint="unmatched", status="404") == 1)
+    ok &= check("in-flight gauge back to zero",
+                sample(text, "patriot_http_requests_in_flight", endpoint=ENDPOINT) == 0)
+    ok &= check("pool checkout wait recorded",
+                (sample(text, "patriot_db_pool_checkout_wait_seconds_count", bind="default") or 0) > 0)
+    ok &= check("forecast compute time recorded",
+                sample(text, "patriot_forecast_compute_seconds_count", function="generate_forecast") == 1)
+    ok &= check("job duration recorded",
+                sample(text, "patriot_job_duration_seconds_count", job="funds.process_recurring") == 1)
+    app.config["METRICS_TOKEN"] = ""
+    ok &= check("no METRICS_TOKEN configured: /metrics is refused",
+                client.get("/metrics", headers=SCRAPE).status_code == 403)
+    return ok
+
+
+def _worker(requests, ready):
+    app = create_app()
+    headers = seed(app)
+    client = app.test_client()
+    for _ in range(requests):
+        client.get("/api/funds/", headers=headers)
+    REGISTRY.flush(force=True)
+    ready.put(os.getpid())
+
+
+def multi_process(workers, requests):
+    Config.METRICS_MULTIPROC_DIR = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    seed(create_app())
+
+    ctx = multiprocessing.get_context("fork")
+    ready = ctx.Queue()
+    procs = [ctx.Process(target=_worker, args=(requests, ready)) for _ in range(workers)]
+    # Fork while another thread holds the registry lock; children must not inherit it held
+    held, release = threading.Event(), threading.Event()
+
+    def hold_lock():
+        with REGISTRY._lock:
+            held.set()
+            release.wait()
+
+    holder = threading.Thread(target=hold_lock)
+    holder.start()
+    held.wait()
+    for p in procs:
+        p.start()
+    release.set()
+    holder.join()
+    pids = [ready.get(timeout=60) for _ in procs]
+    for p in procs:
+        p.join()
+
+    # The scraping process starts with a clean registry of its own
+    REGISTRY.reset()
+    mark_process_dead(pids[0])
+    app = create_app()
+    text = app.test_client().get("/metrics", headers=SCRAPE).get_data(as_text=True)
+    total = sample(text, "patriot_http_requests_total", endpoint=ENDPOINT, status="200")
+    ok = check(f"scrape sums {workers} workers", total == workers * requests)
+    ok &= check("dead worker folded into retired snapshot",
+                os.path.exists(os.path.join(Config.METRICS_MULTIPROC_DIR, "metrics_retired.json")))
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/metrics endpoint check")
+    parser.add_argument("--workers", type=int, default=3)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    ok = single_process(args.requests)
+    ok &= multi_process(args.workers, args.requests)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Local check for the per-request query counter and N+1 detector.
+
+Seeds a household with more members than QUERY_REPEAT_THRESHOLD, each of whom
+created one transaction, then requests the household detail (one role lookup
+per member in Household.to_dict) and the transaction list (one lazy
+Transaction.created_by load per creator).
+
+Checks that:
+- every response carries X-Query-Count and Server-Timing headers
+- both N+1 patterns are logged as warnings
+- with QUERY_REPEAT_RAISE enabled the same request raises instead
+
+Usage:
+    python scripts/check_query_stats.py [--members 15]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+from datetime import date, datetime
+
+_db_dir = tempfile.mkdtemp(prefix="patriot-query-stats-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'query_stats.db')}"
+
+project_root = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+sys.path.insert(0, project_root)
+
+from flask_jwt_extended import create_access_token
+from backend.config import Config
+from backend.app import create_app
+from backend.database import db
+from backend.models import User, Household, Transaction, user_household
+from backend.utils.query_stats import RepeatedQueryError
+
+
+class _Capture(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def seed(app, members):
+    """Create one household whose members each recorded a transaction."""
+    with app.app_context():
+        db.create_all()
+        if db.session.get(Household, 1) is None:
+            users = [
+                User(username=f"member{i}", email=f"member{i}@example.com", password="x",
+                     is_verified=True, default_household_id=1)
+                for i in range(members)
+            ]
+            db.session.add_all(users)
+            db.session.flush()
+            db.session.add(Household(id=1, name="N+1", created_by=users[0].id))
+            db.session.flush()
+            for user in users:
+                db.session.execute(user_household.insert().values(
+                    user_id=user.id, household_id=1, role="member", joined_at=datetime.utcnow()
+                ))
+                db.session.add(Transaction(
+                    household_id=1, created_by_user_id=user.id, date=date.today(),
+                    description="lunch", amount=10, category="Food", transaction_type="expense",
+                ))
+            db.session.commit()
+        return create_access_token(identity="1", additional_claims={"household_id": 1})
+
+
+def check(label, condition):
+    print(f"{'✅' if condition else '❌'} {label}")
+    return condition
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query counter / N+1 detector check")
+    parser.add_argument("--members", type=int, default=15)
+    args = parser.parse_args()
+    ok = True
+
+    capture = _Capture()
+    logging.getLogger("backend.utils.query_stats").addHandler(capture)
+
+    app = create_app()
+    headers = {"Authorization": f"Bearer {seed(app, args.members)}"}
+    client = app.test_client()
+
+    for path, pattern in (("/api/households/1", "user_household"),
+                          ("/api/transactions/", "SELECT users.id")):
+        capture.messages.clear()
+        response = client.get(path, headers=headers)
+        print(f"   {path}: X-Query-Count={response.headers.get('X-Query-Count')} "
+              f"Server-Timing={response.headers.get('Server-Timing')}")
+        ok &= check(f"{path} reports query headers",
+                    "X-Query-Count" in response.headers and "Server-Timing" in response.headers)
+        ok &= check(f"{path} N+1 logged", any(pattern in m for m in capture.messages))
+
+    Config.QUERY_REPEAT_RAISE = True
+    strict = create_app()
+    strict.config["PROPAGATE_EXCEPTIONS"] = True
+    try:
+        strict.test_client().get("/api/households/1", headers=headers)
+        raised = False
+    except RepeatedQueryError:
+        raised = True
+    ok &= check("QUERY_REPEAT_RAISE turns the warning into an error", raised)
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
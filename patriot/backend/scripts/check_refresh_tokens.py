@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Local check for refresh-token rotation and revocation.
+
+Checks that:
+- login returns an access and a refresh token
+- /api/auth/refresh rotates the pair without touching bcrypt and picks up a
+  household switch made after login
+- access tokens expire after JWT_ACCESS_TOKEN_EXPIRES, refreshed ones too
+- replaying a rotated refresh token is refused and revokes the whole family
+- a user who is no longer verified cannot refresh
+- logout and password reset revoke refresh tokens
+
+Usage:
+    python scripts/check_refresh_tokens.py
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+_db_dir = tempfile.mkdtemp(prefix="patriot-refresh-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'refresh.db')}"
+os.environ.setdefault("BCRYPT_LOG_ROUNDS", "4")
+
+project_root = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+sys.path.insert(0, project_root)
+
+from flask_jwt_extended import decode_token
+from backend.app import create_app
+from backend.database import db
+from backend.models import User, Household, RefreshToken, user_household
+from backend.utils import passwords
+from backend.utils.passwords import hash_password
+
+PASSWORD = "refresh-me-please"
+
+
+def seed(app):
+    """One verified user who belongs to two households."""
+    with app.app_context():
+        db.create_all()
+        user = User(username="rotor", email="rotor@example.com", is_verified=True,
+                    password=hash_password(PASSWORD))
+        db.session.add(user)
+        db.session.flush()
+        for household_id in (1, 2):
+            db.session.add(Household(id=household_id, name=f"House {household_id}", created_by=user.id))
+            db.session.flush()
+            db.session.execute(user_household.insert().values(
+                user_id=user.id, household_id=household_id, role="owner", joined_at=datetime.utcnow()
+            ))
+        user.default_household_id = 1
+        db.session.commit()
+
+
+def check(label, condition):
+    print(f"{'✅' if condition else '❌'} {label}")
+    return condition
+
+
+def main():
+    ok = True
+    app = create_app()
+    seed(app)
+    client = app.test_client()
+
+    def bearer(token):
+        return {"Authorization": f"Bearer {token}"}
+
+    login = client.post("/api/auth/login", json={"email": "rotor", "password": PASSWORD}).get_json()
+    ok &= check("login returns access and refresh tokens", {"access_token", "refresh_token"} <= login.keys())
+    first_refresh = login["refresh_token"]
+
+    client.post("/api/households/2/switch", headers=bearer(login["access_token"]))
+
+    hashes = []
+    original_verify = passwords.HASHER.verify
+    passwords.HASHER.verify = lambda *args: hashes.append(args) or original_verify(*args)
+    rotated = client.post("/api/auth/refresh", headers=bearer(first_refresh))
+    passwords.HASHER.verify = original_verify
+    body = rotated.get_json()
+    print(f"   refresh: {rotated.status_code} X-Query-Count={rotated.headers.get('X-Query-Count')}")
+    ok &= check("refresh issues a new pair without bcrypt",
+                rotated.status_code == 200 and not hashes and body["refresh_token"] != first_refresh)
+    with app.app_context():
+        claims = decode_token(body["access_token"])
+    ok &= check("refreshed access token carries the current household", claims["household_id"] == 2)
+    with app.app_context():
+        lifetime = app.config["JWT_ACCESS_TOKEN_EXPIRES"].total_seconds()
+        login_claims = decode_token(login["access_token"])
+    ok &= check("access tokens expire after JWT_ACCESS_TOKEN_EXPIRES",
+                login_claims["exp"] - login_claims["iat"] == lifetime
+                and claims["exp"] - claims["iat"] == lifetime)
+    ok &= check("refreshed access token works",
+                client.get("/api/auth/test-jwt", headers=bearer(body["access_token"])).status_code == 200)
+
+    replay = client.post("/api/auth/refresh", headers=bearer(first_refresh))
+    ok &= check("replayed refresh token is refused", replay.status_code == 401)
+    ok &= check("replay revokes the rotated successor too",
+                client.post("/api/auth/refresh", headers=bearer(body["refresh_token"])).status_code == 401)
+    ok &= check("access tokens cannot be used to refresh",
+                client.post("/api/auth/refresh", headers=bearer(body["access_token"])).status_code == 422)
+
+    second = client.post("/api/auth/login", json={"email": "rotor", "password": PASSWORD}).get_json()
+    client.post("/api/auth/logout", headers=bearer(second["refresh_token"]))
+    ok &= check("logout revokes the refresh token",
+                client.post("/api/auth/refresh", headers=bearer(second["refresh_token"])).status_code == 401)
+
+    unverified = client.post("/api/auth/login", json={"email": "rotor", "password": PASSWORD}).get_json()
+    with app.app_context():
+        User.query.filter_by(username="rotor").update({"is_verified": False})
+        db.session.commit()
+    ok &= check("unverified user cannot refresh",
+                client.post("/api/auth/refresh", headers=bearer(unverified["refresh_token"])).status_code == 403)
+    with app.app_context():
+        User.query.filter_by(username="rotor").update({"is_verified": True})
+        db.session.commit()
+
+    third = client.post("/api/auth/login", json={"email": "rotor", "password": PASSWORD}).get_json()
+    with app.app_context():
+        user = User.query.filter_by(username="rotor").one()
+        user.verification_token, user.token_expiration = "reset-token", None
+        db.session.commit()
+    client.post("/api/auth/reset-password", json={"token": "reset-token", "new_password": "brand-new-pass"})
+    ok &= check("password reset revokes existing refresh tokens",
+                client.post("/api/auth/refresh", headers=bearer(third["refresh_token"])).status_code == 401)
+
+    with app.app_context():
+        live = RefreshToken.query.filter(RefreshToken.revoked_at.is_(None)).count()
+    ok &= check("no live refresh tokens remain", live == 0)
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
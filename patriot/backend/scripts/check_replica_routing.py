@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Local check for read-replica routing.
+
+Uses two SQLite files: the primary and a stand-in replica holding the same
+household, except the replica's fund balance is deliberately different so
+every response reveals which database served it.
+
+Checks that:
+- report and dashboard GETs, and @read_only list routes, read from the replica
+- writes always land on the primary
+- reads after a write in the same request stick to the primary
+- raw text() statements count as writes
+- the replica engine gets its own pool size
+
+Usage:
+    python scripts/check_replica_routing.py
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+_db_dir = tempfile.mkdtemp(prefix="patriot-replica-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'primary.db')}"
+os.environ["DATABASE_REPLICA_URL"] = f"sqlite:///{os.path.join(_db_dir, 'replica.db')}"
+os.environ["SQLITE_PRODUCTION_PROFILE"] = "true"
+
+project_root = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+sys.path.insert(0, project_root)
+
+from flask import g
+from sqlalchemy import text
+from flask_jwt_extended import create_access_token
+from backend.app import create_app
+from backend.database import db, REPLICA_BIND
+from backend.models import User, Household, Fund, user_household
+
+PRIMARY_BALANCE = 100.0
+REPLICA_BALANCE = 999.0
+
+
+def seed(app):
+    """Create identical households on both databases, differing in fund balance."""
+    with app.app_context():
+        replica = db.engines[REPLICA_BIND]
+        db.metadata.create_all(db.engine)
+        db.metadata.create_all(replica)
+
+        for engine, balance in ((db.engine, PRIMARY_BALANCE), (replica, REPLICA_BALANCE)):
+            with engine.begin() as conn:
+                conn.execute(User.__table__.insert().values(
+                    id=1, username="replica", email="replica@example.com", password="x",
+                    is_verified=True,
+                ))
+                conn.execute(Household.__table__.insert().values(id=1, name="Replica", created_by=1))
+                conn.execute(User.__table__.update().values(default_household_id=1))
+                conn.execute(user_household.insert().values(
+                    user_id=1, household_id=1, role="owner", joined_at=datetime.utcnow()
+                ))
+                conn.execute(Fund.__table__.insert().values(
+                    id=1, household_id=1, name="Cash", fund_type="Cash", balance=balance
+                ))
+
+        return create_access_token(identity="1", additional_claims={"household_id": 1})
+
+
+def check(label, condition):
+    print(f"{'✅' if condition else '❌'} {label}")
+    return condition
+
+
+def main():
+    app = create_app()
+    token = seed(app)
+    headers = {"Authorization": f"Bearer {token}"}
+    client = app.test_client()
+    ok = True
+
+    summary = client.get("/api/reports/summary", headers=headers).get_json()
+    ok &= check("reports GET served by replica", summary["total_balance"] == REPLICA_BALANCE)
+
+    dashboard = client.get("/api/dashboard/summary", headers=headers).get_json()
+    ok &= check("dashboard GET served by replica", dashboard["cash"] == REPLICA_BALANCE)
+
+    funds = client.get("/api/funds/", headers=headers).get_json()
+    ok &= check("@read_only list route served by replica", funds[0]["balance"] == REPLICA_BALANCE)
+
+    fund = client.get("/api/funds/1", headers=headers).get_json()
+    ok &= check("unmarked GET served by primary", fund["balance"] == PRIMARY_BALANCE)
+
+    response = client.post("/api/transactions/", headers=headers, json={
+        "amount": "5.00", "description": "deposit", "category": "Test",
+        "transaction_type": "income", "fund_id": 1,
+    })
+    ok &= check("write lands on primary",
+                response.status_code == 201 and response.get_json()["updated_fund_balance"] == PRIMARY_BALANCE + 5)
+
+    with app.test_request_context("/api/reports/summary"):
+        g.db_read_only = True
+        before = db.session.get(Fund, 1).balance
+        db.session.add(Fund(household_id=1, name="Sticky", balance=1.0))
+        db.session.flush()
+        db.session.expire_all()
+        after = db.session.get(Fund, 1).balance
+        db.session.rollback()
+    ok &= check("read before write uses replica", before == REPLICA_BALANCE)
+    ok &= check("read after write sticks to primary", after == PRIMARY_BALANCE + 5)
+
+    with app.test_request_context("/api/reports/summary"):
+        g.db_read_only = True
+        db.session.execute(text("UPDATE funds SET name = 'Raw' WHERE id = 1"))
+        raw_on_primary = not g.db_read_only
+        db.session.rollback()
+    ok &= check("raw text() statement goes to primary", raw_on_primary)
+
+    with app.app_context():
+        replica_pool = db.engines[REPLICA_BIND].pool
+        ok &= check("replica engine has its own pool",
+                    replica_pool is not db.engine.pool and replica_pool.size() == app.config["SQLITE_POOL_SIZE"])
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Local check for the Sentinel batch lookup and changes-since replication feed.
+
+Runs two apps in one process on separate SQLite files: "origin" is served over
+HTTP and "replica" pulls its feed with SentinelUserSync.replicate, the same
+code `flask sentinel-pull` runs.
+
+Checks that:
+- the batch lookup answers many identifiers with one query
+- a full pull pages through the feed and copies every user
+- later pulls only carry changes, and newer remote copies win
+- replicated users are not echoed back to the origin as changes
+- batch and feed answers carry no password hashes; a replicated user fetches
+  theirs with one lookup at login (only with SENTINEL_LAZY_LOOKUP on), and a
+  password change on the origin stops the old password from working on the
+  replica
+- a password reset request does not reach the feed, and other changes
+  replicate without dropping the replica's hash
+- the user endpoints require SENTINEL_SHARED_SECRET and answer 503 without one
+
+Usage:
+    python scripts/check_sentinel_feed.py [--users 1200]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import threading
+from datetime import datetime, timedelta
+
+_db_dir = tempfile.mkdtemp(prefix="patriot-feed-")
+os.environ.setdefault("BCRYPT_LOG_ROUNDS", "4")
+
+project_root = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+sys.path.insert(0, project_root)
+
+from werkzeug.serving import make_server
+from backend.config import Config
+from backend.database import db
+from backend.models import User, SentinelCursor
+from backend.shared.user_sync import SentinelUserSync
+from backend.utils.passwords import PasswordHasher
+
+PASSWORD = "replicate-me"
+SECRET = "feed-secret"
+
+
+def make_app(name):
+    from backend.app import create_app
+    Config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(_db_dir, name + '.db')}"
+    app = create_app()
+    app.config.update(SENTINEL_FEED_LAG=0, SENTINEL_FEED_PAGE_SIZE=500, SENTINEL_SHARED_SECRET=SECRET,
+                      SENTINEL_LAZY_LOOKUP=False, APP_NAME=name)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def seed(app, count):
+    """Bulk-insert users with staggered updated_at timestamps."""
+    password = PasswordHasher(rounds=4, workers=0).hash(PASSWORD)
+    start = datetime.utcnow() - timedelta(days=1)
+    with app.app_context():
+        db.session.execute(User.__table__.insert(), [
+            {"username": f"user{i}", "email": f"user{i}@example.com", "password": password,
+             "is_verified": True, "created_at": start, "updated_at": start + timedelta(seconds=i // 3)}
+            for i in range(count)
+        ])
+        db.session.commit()
+
+
+def check(label, condition):
+    print(f"{'✅' if condition else '❌'} {label}")
+    return condition
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sentinel feed check")
+    parser.add_argument("--users", type=int, default=1200)
+    args = parser.parse_args()
+    ok = True
+
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    origin, replica = make_app("origin"), make_app("replica")
+    seed(origin, args.users)
+    server = make_server("127.0.0.1", 0, origin, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    origin_url = f"http://127.0.0.1:{server.server_port}"
+    client = origin.test_client()
+
+    batch = client.post("/api/sentinel/user-lookup/batch", headers={"X-Sentinel-Token": SECRET},
+                        json={"identifiers": ["user1", "user2@example.com", "nobody"]})
+    body = batch.get_json()
+    print(f"   batch lookup: {len(body['users'])} found, missing={body['missing']}, "
+          f"X-Query-Count={batch.headers.get('X-Query-Count')}")
+    ok &= check("batch lookup answers many identifiers in one query",
+                len(body["users"]) == 2 and body["missing"] == ["nobody"]
+                and batch.headers.get("X-Query-Count") == "1")
+    ok &= check("user endpoints require the shared secret",
+                client.get("/api/sentinel/user-lookup?identifier=user1").status_code == 401
+                and client.get("/api/sentinel/changes").status_code == 401)
+    feed = client.get("/api/sentinel/changes?limit=5", headers={"X-Sentinel-Token": SECRET}).get_json()
+    single = client.get("/api/sentinel/user-lookup?identifier=user1", headers={"X-Sentinel-Token": SECRET})
+    ok &= check("batch and feed answers carry no password hashes, the single lookup does",
+                all("password" not in u for u in body["users"] + feed["users"])
+                and bool(single.get_json().get("password")))
+    origin.config["SENTINEL_SHARED_SECRET"] = ""
+    closed = [client.get("/api/sentinel/changes").status_code,
+              client.get("/api/sentinel/user-lookup?identifier=user1").status_code,
+              client.post("/api/sentinel/user-lookup/batch", json={"identifiers": ["user1"]}).status_code]
+    origin.config["SENTINEL_SHARED_SECRET"] = SECRET
+    ok &= check("without a configured secret the user endpoints answer 503", closed == [503, 503, 503])
+
+    sync = SentinelUserSync([origin_url], "http://replica", timeout=5, token=SECRET)
+    with replica.app_context():
+        first = sync.replicate(db.session, User, SentinelCursor, page_size=500)[origin_url]
+        copied = User.query.count()
+        second = sync.replicate(db.session, User, SentinelCursor, page_size=500)[origin_url]
+    print(f"   first pull {first}, second pull {second}")
+    ok &= check("full pull pages through the feed", first["created"] == args.users == copied)
+    ok &= check("a pull with nothing new copies nothing", second == {"created": 0, "updated": 0, "unchanged": 0})
+
+    replica.config.update(SENTINEL_APPS=origin_url, CURRENT_APP_URL="http://replica")
+    replica_client = replica.test_client()
+    lazy_off = replica_client.post("/api/auth/login", json={"email": "user45", "password": PASSWORD})
+    with replica.app_context():
+        unfetched = not User.query.filter_by(username="user45").one().password
+    ok &= check("with SENTINEL_LAZY_LOOKUP off login fetches no hash",
+                lazy_off.status_code == 401 and unfetched)
+    replica.config["SENTINEL_LAZY_LOOKUP"] = True
+    with replica.app_context():
+        stamp = User.query.filter_by(username="user42").one().updated_at
+    login = replica_client.post("/api/auth/login", json={"email": "user42", "password": PASSWORD})
+    with replica.app_context():
+        user = User.query.filter_by(username="user42").one()
+        fetched = bool(user.password) and user.updated_at == stamp
+    ok &= check("replicated user logs in after fetching only their own hash",
+                login.status_code == 200 and fetched)
+    ok &= check("a wrong password still fails for a replicated user",
+                replica_client.post("/api/auth/login", json={"email": "user43", "password": "nope"})
+                .status_code == 401)
+
+    replica_client.post("/api/auth/login", json={"email": "user44", "password": PASSWORD})
+    with origin.app_context():
+        before_reset = User.query.filter_by(username="user44").one().updated_at
+    client.post("/api/auth/forgot-password", json={"email": "user44@example.com"})
+    with origin.app_context():
+        renamed = User.query.filter_by(username="user44").one()
+        quiet = renamed.verification_token is not None and renamed.updated_at == before_reset
+        renamed.name = "Renamed"
+        renamed.updated_at = datetime.utcnow() - timedelta(seconds=1)
+        db.session.commit()
+    with replica.app_context():
+        pulled = sync.replicate(db.session, User, SentinelCursor, page_size=500)[origin_url]
+        kept = User.query.filter_by(username="user44").one()
+        kept = kept.name == "Renamed" and bool(kept.password)
+    ok &= check("a password reset request on the origin does not reach the feed", quiet)
+    ok &= check("other changes replicate without dropping the replica's hash", pulled["updated"] == 1 and kept)
+
+    with origin.app_context():
+        changed = User.query.filter_by(username="user42").one()
+        changed.password = PasswordHasher(rounds=4, workers=0).hash("changed-password")
+        changed.updated_at = changed.password_changed_at = datetime.utcnow() - timedelta(seconds=1)
+        db.session.commit()
+    with replica.app_context():
+        third = sync.replicate(db.session, User, SentinelCursor, page_size=500)[origin_url]
+    old = replica_client.post("/api/auth/login", json={"email": "user42", "password": PASSWORD})
+    new = replica_client.post("/api/auth/login", json={"email": "user42", "password": "changed-password"})
+    ok &= check("a password change on the origin replicates as an update and retires the old password",
+                third["updated"] == 1 and old.status_code == 401 and new.status_code == 200)
+
+    replica_server = make_server("127.0.0.1", 0, replica, threaded=True)
+    threading.Thread(target=replica_server.serve_forever, daemon=True).start()
+    back = SentinelUserSync([f"http://127.0.0.1:{replica_server.server_port}"], origin_url, token=SECRET)
+    with origin.app_context():
+        echoed = next(iter(back.replicate(db.session, User, SentinelCursor).values()))
+    ok &= check("replicated users are not echoed back as changes",
+                echoed["created"] == 0 and echoed["updated"] == 0)
+
+    server.shutdown()
+    replica_server.shutdown()
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Local check for the Sentinel peer circuit breaker.
+
+Runs two stub peers: one healthy, one that hangs past the lookup timeout
+until it is switched back on.
+
+Checks that:
+- after SENTINEL_FAILURE_THRESHOLD timed-out lookups the hanging peer is skipped
+  and a login miss costs only the healthy peer's latency
+- failed half-open probes double the backoff
+- a probe restores the peer once it answers again
+- /api/sentinel/peers reports state and latency, and only to callers with the
+  shared token
+
+Usage:
+    python scripts/check_sentinel_peers.py
+"""
+
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_db_dir = tempfile.mkdtemp(prefix="patriot-peers-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'peers.db')}"
+
+project_root = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+sys.path.insert(0, project_root)
+
+from backend.app import create_app
+from backend.shared.user_sync import get_sync_service
+
+TIMEOUT = 0.5
+SECRET = "peers-check-secret"
+
+
+def start_stub(state):
+    """Peer that 404s every lookup after state['delay'] seconds."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        def do_GET(self):
+            time.sleep(state["delay"])
+            body = json.dumps({"status": "online"} if self.path.endswith("/health")
+                              else {"error": "user not found"}).encode()
+            self.send_response(200 if self.path.endswith("/health") else 404)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except OSError:  # client gave up waiting
+                pass
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+
+def check(label, condition):
+    print(f"{'✅' if condition else '❌'} {label}")
+    return condition
+
+
+def wait_for(predicate, limit):
+    deadline = time.monotonic() + limit
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def main():
+    ok = True
+    healthy_state, flaky_state = {"delay": 0.02}, {"delay": 2.0}
+    healthy, flaky = start_stub(healthy_state), start_stub(flaky_state)
+
+    app = create_app()
+    app.config.update(
+        SENTINEL_APPS=f"{healthy},{flaky}", CURRENT_APP_URL="http://self",
+        SENTINEL_TIMEOUT=TIMEOUT, SENTINEL_NEGATIVE_TTL=0,
+        SENTINEL_FAILURE_THRESHOLD=2, SENTINEL_BACKOFF_BASE=0.5, SENTINEL_BACKOFF_MAX=5,
+        SENTINEL_SHARED_SECRET=SECRET,
+    )
+    sync = get_sync_service(app.config)
+    peer = sync.peers[flaky]
+
+    timings = []
+    for i in range(3):
+        start = time.perf_counter()
+        sync.find_user_in_apps(f"nobody{i}")
+        timings.append(time.perf_counter() - start)
+    print("   lookup times: " + ", ".join(f"{t * 1000:.0f}ms" for t in timings))
+    ok &= check("lookups wait for the hanging peer until the circuit opens",
+                all(t >= TIMEOUT * 0.9 for t in timings[:2]))
+    ok &= check("open circuit skips the hanging peer", peer.state == "open" and timings[2] < TIMEOUT / 2)
+
+    ok &= check("failed half-open probe reopens with a longer backoff",
+                wait_for(lambda: peer.opened_count >= 2, 3) and peer.state == "open")
+
+    client = app.test_client()
+    ok &= check("/api/sentinel/peers rejects callers without the shared token",
+                client.get("/api/sentinel/peers").status_code == 401
+                and client.get("/api/sentinel/peers", headers={"X-Sentinel-Token": "guess"}).status_code == 401)
+    status = client.get("/api/sentinel/peers", headers={"X-Sentinel-Token": SECRET}).get_json()
+    states = {p["url"]: p for p in status["peers"]}
+    print(f"   peers: {[(p['url'][-5:], p['state'], p['latency_ms'], p['retry_in_s']) for p in status['peers']]}")
+    ok &= check("/api/sentinel/peers reports state and latency",
+                states[flaky]["state"] == "open" and states[healthy]["state"] == "closed"
+                and states[healthy]["latency_ms"] is not None and status["healthy"] == 1)
+
+    flaky_state["delay"] = 0.01
+    ok &= check("background probe restores the peer", wait_for(lambda: peer.state == "closed", 5))
+    ok &= check("restored peer is queried again",
+                sync.find_user_in_apps("nobody-again") is None and peer.consecutive_failures == 0
+                and peer.last_success is not None)
+    ok &= check("peers also serve /api/sentinel/health",
+                client.get("/api/sentinel/health").get_json().get("sentinel_system") is True)
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
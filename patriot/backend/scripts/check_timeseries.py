@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Local check for /api/reports/timeseries.
+
+Seeds a synthetic household with --rows transactions over three years and checks:
+- every bucket (day/week/month/quarter) and group_by (none/category/account)
+  matches a Python pass over the raw rows, empty buckets included as zeros
+- date ranges, LTTB downsampling (cap respected, first and last bucket kept)
+  and bad parameters, including ranges past TIMESERIES_MAX_BUCKETS and ones
+  ending on 9999-12-31
+- time and payload against what the frontend does today: download
+  GET /api/transactions/ and bucket it client-side
+
+Usage:
+    python scripts/check_timeseries.py [--rows 100000] [--rounds 5]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+
+project_root = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+sys.path.insert(0, project_root)
+
+from flask_jwt_extended import create_access_token
+from backend.utils.data_generator import build_household
+from backend.config import Config
+from backend.database import db
+from backend.models import Transaction
+from backend.utils.timeseries import BUCKETS, bucket_count, bucket_labels, bucket_start
+
+
+def check(label, condition):
+    print(f"{'✅' if condition else '❌'} {label}")
+    return condition
+
+
+def python_series(rows, bucket, group_by, first=None, last=None):
+    """The client-side bucketing the endpoint replaces."""
+    cells = defaultdict(lambda: [0.0, 0.0, 0.0])
+    for row in rows:
+        if (first and row["date"] < first) or (last and row["date"] > last):
+            continue
+        key = row[group_by] if group_by else "total"
+        slot = ("income", "expense", "transfer").index(row["transaction_type"])
+        cells[(bucket_start(row["date"], bucket).isoformat(), key)][slot] += abs(row["amount"])
+    days = sorted({d for d, _ in cells})
+    labels = bucket_labels(first or date.fromisoformat(days[0]), last or date.fromisoformat(days[-1]), bucket)
+    keys = {k for _, k in cells}
+    return labels, {
+        key: [[round(cells[(d, key)][i], 2) if (d, key) in cells else 0.0 for d in labels] for i in range(3)]
+        for key in keys
+    }
+
+
+def matches(body, expected):
+    labels, series = expected
+    if body["buckets"] != labels or {s["key"] for s in body["series"]} != set(series):
+        return False
+    for entry in body["series"]:
+        for i, field in enumerate(("income", "expense", "transfer")):
+            if any(abs(a - b) > 0.011 for a, b in zip(entry[field], series[entry["key"]][i])):
+                return False
+        if any(abs(n - (i - e)) > 0.011 for n, i, e in zip(entry["net"], entry["income"], entry["expense"])):
+            return False
+    return True
+
+
+def timed(fn, rounds):
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Timeseries report check")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    ok = True
+
+    from backend.app import create_app
+    Config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='patriot-ts-'), 'ts.db')}"
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        user_id, household_id = build_household(db.engine, args.rows, 0, seed=args.rows)
+        token = create_access_token(identity=str(user_id), additional_claims={"household_id": household_id})
+        rows = [dict(date=r.date, amount=float(r.amount), transaction_type=r.transaction_type,
+                     category=r.category, account=r.account_id)
+                for r in db.session.query(Transaction.date, Transaction.amount, Transaction.transaction_type,
+                                          Transaction.category, Transaction.account_id)
+                .filter_by(household_id=household_id)]
+    headers = {"Authorization": f"Bearer {token}"}
+    client = app.test_client()
+
+    def get(**params):
+        return client.get("/api/reports/timeseries", headers=headers, query_string=params)
+
+    for bucket in BUCKETS:
+        for group_by in (None, "category", "account"):
+            params = {"bucket": bucket, "max_points": 500, **({"group_by": group_by} if group_by else {})}
+            body = get(**params).get_json()
+            if body["downsampled"]:  # compare the full series; downsampling is checked below
+                app.config["TIMESERIES_MAX_POINTS"] = body["total_buckets"]
+                body = get(**{**params, "max_points": body["total_buckets"]}).get_json()
+                app.config["TIMESERIES_MAX_POINTS"] = Config.TIMESERIES_MAX_POINTS
+            ok &= check(f"bucket={bucket:<7} group_by={str(group_by):<8} matches a Python pass "
+                        f"({len(body['buckets'])} buckets x {len(body['series'])} series)",
+                        matches(body, python_series(rows, bucket, group_by)))
+
+    first, last = date.today() - timedelta(days=200), date.today() - timedelta(days=20)
+    body = get(bucket="week", group_by="category", start_date=first.isoformat(), end_date=last.isoformat()).get_json()
+    ok &= check("date range limits rows and fills the whole range",
+                matches(body, python_series(rows, "week", "category", first, last)))
+
+    app.config["TIMESERIES_MAX_POINTS"] = 5000
+    full = get(bucket="day", max_points=5000).get_json()
+    app.config["TIMESERIES_MAX_POINTS"] = Config.TIMESERIES_MAX_POINTS
+    thin = get(bucket="day", max_points=100).get_json()
+    ok &= check(f"max_points=100 downsamples {thin['total_buckets']} daily buckets, keeping the endpoints",
+                thin["downsampled"] and len(thin["buckets"]) == 100
+                and thin["buckets"][0] == full["buckets"][0] and thin["buckets"][-1] == full["buckets"][-1]
+                and all(len(thin["series"][0][f]) == 100 for f in ("income", "expense", "transfer", "net")))
+    ok &= check("downsampled points are the original values",
+                all(full["series"][0]["net"][full["buckets"].index(d)] == v
+                    for d, v in zip(thin["buckets"], thin["series"][0]["net"])))
+    ok &= check("bad bucket, group_by, max_points and dates are rejected",
+                all(get(**params).status_code == 400 for params in (
+                    {"bucket": "hour"}, {"group_by": "fund"}, {"max_points": 2}, {"max_points": 100000},
+                    {"max_points": "many"}, {"start_date": "2024-13-01"})))
+    ok &= check("ranges spanning too many buckets are rejected, including ones up to 9999-12-31",
+                all(get(**params).status_code == 400 for params in (
+                    {"bucket": "day", "end_date": "9999-12-31"}, {"bucket": "quarter", "end_date": "9999-12-31"},
+                    {"bucket": "day", "start_date": "0001-01-01"})))
+    edge = get(bucket="week", start_date="9999-12-01", end_date="9999-12-31")
+    ok &= check("buckets reaching 9999-12-31 stop there instead of overflowing",
+                edge.status_code == 200 and edge.get_json()["buckets"][-1] == "9999-12-27")
+    spans = [(date(2019, 12, 30), date(2024, 3, 1)), (date(2024, 3, 1), date(2024, 3, 1)),
+             (date(2023, 1, 1), date(2022, 1, 1)), (date(9999, 11, 1), date(9999, 12, 31))]
+    ok &= check("bucket_count agrees with bucket_labels",
+                all(bucket_count(a, b, bucket) == len(bucket_labels(a, b, bucket))
+                    for a, b in spans for bucket in BUCKETS))
+
+    def client_side():
+        listing = client.get("/api/transactions/", headers=headers)
+        fetched = [dict(t, date=date.fromisoformat(t["date"])) for t in listing.get_json()]
+        python_series(fetched, "month", "category")
+        return len(listing.data)
+
+    old_ms, old_bytes = timed(client_side, args.rounds)
+    new_ms, response = timed(lambda: get(bucket="month", group_by="category"), args.rounds)
+    print(f"   monthly by category over {len(rows)} rows: download + bucket {old_ms:.0f}ms ({old_bytes / 1024:.0f}KiB), "
+          f"/timeseries {new_ms:.1f}ms ({len(response.data) / 1024:.1f}KiB)")
+    ok &= check("the grouped query is faster than downloading and bucketing", new_ms < old_ms)
+    day_ms, _ = timed(lambda: get(bucket="day", group_by="category"), args.rounds)
+    print(f"   daily by category (downsampled to {Config.TIMESERIES_MAX_POINTS}): {day_ms:.1f}ms")
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
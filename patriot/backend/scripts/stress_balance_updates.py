@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Concurrency stress test for atomic balance updates.
+
+Many threads post transactions against the same fund (linked to an account)
+through the Flask test client at the same time. Afterwards the stored balances
+must equal the starting balance plus every successful delta - any difference
+means an update was lost. A second phase hammers a small fund with expenses to
+prove the guarded UPDATE never lets it go negative, and a third checks that a
+single expense larger than the fund balance is still rejected with a 400, as it
+was before the updates became atomic.
+
+Usage:
+    python scripts/stress_balance_updates.py [--workers 16] [--requests 50]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+from datetime import datetime
+
+# Point the app at a throwaway SQLite file before the config is imported
+_db_dir = tempfile.mkdtemp(prefix="patriot-stress-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_db_dir, 'stress.db')}")
+
+project_root = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+sys.path.insert(0, project_root)
+
+from flask_jwt_extended import create_access_token
+from backend.app import create_app
+from backend.database import db
+from backend.models import User, Household, Fund, Account, user_household
+
+
+def setup_household(app):
+    """Create a user, household, account and two funds; return ids and a JWT."""
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+
+        user = User(username="stress", email="stress@example.com", password="x", is_verified=True)
+        db.session.add(user)
+        db.session.flush()
+
+        household = Household(name="Stress Household", created_by=user.id)
+        db.session.add(household)
+        db.session.flush()
+        db.session.execute(
+            user_household.insert().values(
+                user_id=user.id, household_id=household.id, role="owner", joined_at=datetime.utcnow()
+            )
+        )
+        user.default_household_id = household.id
+
+        account = Account(household_id=household.id, name="Checking", type="checking",
+                          institution="Test Bank", balance=0)
+        db.session.add(account)
+        db.session.flush()
+
+        busy_fund = Fund(household_id=household.id, name="Busy", balance=0.0, account_id=account.id)
+        small_fund = Fund(household_id=household.id, name="Small", balance=100.0)
+        db.session.add_all([busy_fund, small_fund])
+        db.session.commit()
+
+        token = create_access_token(
+            identity=str(user.id), additional_claims={"household_id": household.id}
+        )
+        return {
+            "token": token,
+            "account_id": account.id,
+            "busy_fund_id": busy_fund.id,
+            "small_fund_id": small_fund.id,
+        }
+
+
+def run_workers(app, workers, requests_per_worker, payload_for):
+    """Fire requests from many threads at once; return (successes, failures)."""
+    results = {"ok": 0, "rejected": 0, "errors": 0}
+    lock = threading.Lock()
+    barrier = threading.Barrier(workers)
+
+    def worker(worker_id):
+        client = app.test_client()
+        barrier.wait()
+        for i in range(requests_per_worker):
+            headers, body = payload_for(worker_id, i)
+            response = client.post("/api/transactions/", json=body, headers=headers)
+            with lock:
+                if response.status_code == 201:
+                    results["ok"] += 1
+                elif response.status_code == 400:
+                    results["rejected"] += 1
+                else:
+                    results["errors"] += 1
+
+    threads = [threading.Thread(target=worker, args=(w,)) for w in range(workers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    app = create_app()
+    ids = setup_household(app)
+    headers = {"Authorization": f"Bearer {ids['token']}"}
+
+    # Phase 1: concurrent deposits must all be reflected in the balances
+    print(f"Phase 1: {args.workers} workers x {args.requests} deposits of $1.00")
+    deposit = {
+        "amount": "1.00", "description": "stress deposit", "category": "Stress",
+        "transaction_type": "income", "fund_id": ids["busy_fund_id"],
+    }
+    results = run_workers(app, args.workers, args.requests, lambda w, i: (headers, deposit))
+
+    with app.app_context():
+        fund_balance = db.session.get(Fund, ids["busy_fund_id"]).balance
+        account_balance = float(db.session.get(Account, ids["account_id"]).balance)
+
+    expected = float(results["ok"])
+    print(f"  requests ok={results['ok']} rejected={results['rejected']} errors={results['errors']}")
+    print(f"  fund balance={fund_balance:.2f} account balance={account_balance:.2f} expected={expected:.2f}")
+    lost = round(expected - fund_balance, 2), round(expected - account_balance, 2)
+
+    # Phase 2: concurrent expenses must never overdraw the fund
+    print(f"Phase 2: {args.workers} workers x 5 expenses of $3.00 against a $100.00 fund")
+    expense = {
+        "amount": "3.00", "description": "stress expense", "category": "Stress",
+        "transaction_type": "expense", "fund_id": ids["small_fund_id"],
+    }
+    guarded = run_workers(app, args.workers, 5, lambda w, i: (headers, expense))
+
+    with app.app_context():
+        small_balance = db.session.get(Fund, ids["small_fund_id"]).balance
+
+    print(f"  requests ok={guarded['ok']} rejected={guarded['rejected']} errors={guarded['errors']}")
+    print(f"  fund balance={small_balance:.2f} expected={100.0 - 3.0 * guarded['ok']:.2f}")
+
+    # Phase 3: a single expense larger than the fund is rejected, as it always was
+    client = app.test_client()
+    overdraw = client.post("/api/transactions/", headers=headers,
+                           json={**expense, "amount": f"{small_balance + 1:.2f}"})
+    with app.app_context():
+        after_overdraw = db.session.get(Fund, ids["small_fund_id"]).balance
+    print(f"Phase 3: expense of ${small_balance + 1:.2f} against a ${small_balance:.2f} fund -> "
+          f"{overdraw.status_code} {overdraw.get_json().get('error', '')}")
+
+    failed = False
+    if overdraw.status_code != 400 or after_overdraw != small_balance:
+        print("❌ An expense larger than the fund balance was not rejected cleanly")
+        failed = True
+    if lost != (0, 0):
+        print(f"❌ Lost updates detected (fund, account): {lost}")
+        failed = True
+    if small_balance < 0 or round(100.0 - 3.0 * guarded["ok"], 2) != round(small_balance, 2):
+        print("❌ Guarded expenses overdrew or lost updates")
+        failed = True
+
+    if failed:
+        sys.exit(1)
+    print("✅ No lost updates")
+
+
+if __name__ == "__main__":
+    main()
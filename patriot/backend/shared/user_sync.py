@@ -10,55 +10,298 @@ Configuration:
 - Example: SENTINEL_APPS=http://localhost:5001,http://localhost:5002,http://localhost:5003
 """
 
-import requests
 import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from typing import Optional, Dict, List
 from datetime import datetime
 
+import requests
+from requests.adapters import HTTPAdapter
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_LOOKUP_PATH = "/api/sentinel/user-lookup"
+DEFAULT_HEALTH_PATH = "/api/sentinel/health"
+DEFAULT_CHANGES_PATH = "/api/sentinel/changes"
+
+
+class PeerHealth:
+    """
+    Circuit breaker for one peer app.
+
+    ``closed``: lookups go to the peer. After ``failure_threshold`` consecutive
+    failures the circuit opens and lookups skip the peer. Once the backoff has
+    passed, a background probe moves it to ``half_open`` and checks its health
+    endpoint: success closes the circuit, failure reopens it with the backoff
+    doubled (up to ``backoff_max``).
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, url: str, failure_threshold: int = 3, backoff_base: float = 1.0,
+                 backoff_max: float = 60.0):
+        self.url = url
+        self.failure_threshold = failure_threshold
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_count = 0  # opens since the last close, drives the backoff
+        self.retry_at = 0.0
+        self.latency = None  # EWMA seconds
+        self.last_error = None
+        self.last_success = None
+        self.last_failure = None
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        return self.state == self.CLOSED
+
+    def record_success(self, latency: float):
+        with self._lock:
+            self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+            self.consecutive_failures = 0
+            self.opened_count = 0
+            self.last_success = time.time()
+            if self.state != self.CLOSED:
+                logger.info(f"Sentinel peer {self.url} recovered")
+            self.state = self.CLOSED
+
+    def record_failure(self, error: str):
+        with self._lock:
+            self.consecutive_failures += 1
+            self.last_error = error
+            self.last_failure = time.time()
+            if self.state == self.HALF_OPEN or (
+                self.state == self.CLOSED and self.consecutive_failures >= self.failure_threshold
+            ):
+                self.opened_count += 1
+                backoff = min(self.backoff_base * 2 ** (self.opened_count - 1), self.backoff_max)
+                self.retry_at = time.monotonic() + backoff
+                if self.state == self.CLOSED:
+                    logger.warning(f"Sentinel peer {self.url} marked down after "
+                                   f"{self.consecutive_failures} failures: {error}")
+                self.state = self.OPEN
+
+    def begin_probe(self) -> bool:
+        """Move an open circuit whose backoff has passed to half-open."""
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() >= self.retry_at:
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def status(self) -> Dict:
+        return {
+            "url": self.url,
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "latency_ms": round(self.latency * 1000, 1) if self.latency is not None else None,
+            "retry_in_s": round(max(self.retry_at - time.monotonic(), 0), 1) if self.state == self.OPEN else None,
+            "last_error": self.last_error,
+            "last_success": datetime.utcfromtimestamp(self.last_success).isoformat() if self.last_success else None,
+            "last_failure": datetime.utcfromtimestamp(self.last_failure).isoformat() if self.last_failure else None,
+        }
+
 
 class SentinelUserSync:
     """Handles user synchronization across Sentinel System apps"""
     
-    def __init__(self, app_urls: List[str], current_app_url: str):
+    def __init__(self, app_urls: List[str], current_app_url: str, timeout: float = 5,
+                 negative_ttl: float = 60, negative_cache_size: int = 10000,
+                 lookup_path: str = DEFAULT_LOOKUP_PATH, health_path: str = DEFAULT_HEALTH_PATH,
+                 failure_threshold: int = 3, backoff_base: float = 1.0, backoff_max: float = 60.0,
+                 changes_path: str = DEFAULT_CHANGES_PATH, token: Optional[str] = None):
         """
         Initialize the sync service.
         
         Args:
             app_urls: List of URLs for all Sentinel apps
             current_app_url: URL of the current app (to exclude from sync)
+            timeout: Seconds to wait for the whole lookup (all apps in parallel)
+            negative_ttl: Seconds to remember identifiers no app knows (0 disables)
+            negative_cache_size: Max identifiers kept in the negative cache
+            lookup_path: Path of the user-lookup endpoint on the other apps
+            health_path: Path probed to bring a failed app back
+            failure_threshold: Consecutive failures before an app is skipped
+            backoff_base: Seconds before the first probe of a failed app
+            backoff_max: Upper bound for the doubling probe backoff
+            changes_path: Path of the changes-since replication feed
+            token: Shared secret sent as X-Sentinel-Token, if the network uses one
         """
         self.app_urls = [url for url in app_urls if url != current_app_url]
-        self.timeout = 5  # seconds
+        self.timeout = timeout
+        self.negative_ttl = negative_ttl
+        self.negative_cache_size = negative_cache_size
+        self.lookup_path = lookup_path
+        self.health_path = health_path
+        self.changes_path = changes_path
+        self.token = token
+        self.peers = {
+            url: PeerHealth(url, failure_threshold, backoff_base, backoff_max) for url in self.app_urls
+        }
+        self._not_found = OrderedDict()  # identifier -> expiry (monotonic)
+        self._lock = threading.Lock()
+        self._pid = None
+        self._sessions = {}
+        self._executor = None
+    
+    def _resources(self):
+        """Per-process keep-alive sessions (one pool per app) and lookup threads."""
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    size = max(len(self.app_urls), 1) * 4
+                    sessions = {}
+                    for app_url in self.app_urls:
+                        session = requests.Session()
+                        if self.token:
+                            session.headers["X-Sentinel-Token"] = self.token
+                        session.mount(app_url, HTTPAdapter(pool_connections=1, pool_maxsize=size))
+                        sessions[app_url] = session
+                    self._sessions = sessions
+                    self._executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="sentinel-lookup")
+                    self._pid = os.getpid()
+                    threading.Thread(target=self._probe_loop, args=(self._pid,), daemon=True,
+                                     name="sentinel-probe").start()
+        return self._sessions, self._executor
+    
+    def _probe_loop(self, pid: int):
+        """Half-open probes for peers whose circuit is open (one thread per process)."""
+        interval = min(min((peer.backoff_base for peer in self.peers.values()), default=1.0), 1.0)
+        while self._pid == pid:
+            time.sleep(interval)
+            for peer in self.peers.values():
+                if peer.begin_probe():
+                    self._executor.submit(self._probe, self._sessions[peer.url], peer)
+    
+    def _probe(self, session, peer: PeerHealth):
+        start = time.monotonic()
+        try:
+            response = session.get(f"{peer.url}{self.health_path}", timeout=self.timeout)
+            if response.status_code < 500:
+                peer.record_success(time.monotonic() - start)
+                return
+            peer.record_failure(f"HTTP {response.status_code}")
+        except requests.exceptions.RequestException as e:
+            peer.record_failure(str(e))
+    
+    def _lookup(self, session, app_url: str, identifier: str, reported: threading.Event = None):
+        """
+        Ask one app for the user; returns (status, user_data or None).
+        
+        A failure is not recorded again if the caller already counted this
+        request as timed out (``reported`` set).
+        """
+        peer = self.peers[app_url]
+        start = time.monotonic()
+        try:
+            response = session.get(
+                f"{app_url}{self.lookup_path}",
+                params={"identifier": identifier},
+                timeout=self.timeout
+            )
+            user_data = response.json() if response.status_code == 200 else None
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.warning(f"Failed to connect to {app_url}: {str(e)}")
+            if reported is None or not reported.is_set():
+                peer.record_failure(str(e))
+            return None, None
+        if response.status_code >= 500:
+            peer.record_failure(f"HTTP {response.status_code}")
+        else:
+            peer.record_success(time.monotonic() - start)
+        return response.status_code, user_data
+    
+    def peer_status(self) -> List[Dict]:
+        """Circuit state and latency of every peer app."""
+        return [peer.status() for peer in self.peers.values()]
+    
+    def _cached_miss(self, identifier: str) -> bool:
+        with self._lock:
+            expires = self._not_found.get(identifier)
+            if expires is None:
+                return False
+            if expires <= time.monotonic():
+                del self._not_found[identifier]
+                return False
+            return True
+    
+    def _remember_miss(self, identifier: str):
+        if self.negative_ttl <= 0:
+            return
+        with self._lock:
+            self._not_found[identifier] = time.monotonic() + self.negative_ttl
+            self._not_found.move_to_end(identifier)
+            while len(self._not_found) > self.negative_cache_size:
+                self._not_found.popitem(last=False)
+    
+    def forget_miss(self, identifier: str):
+        """Drop ``identifier`` from the negative cache."""
+        with self._lock:
+            self._not_found.pop(identifier, None)
     
     def find_user_in_apps(self, identifier: str) -> Optional[Dict]:
         """
         Search for a user across all Sentinel apps.
         
+        All apps are queried at once and the first one that knows the user
+        wins; the lookup never takes longer than ``timeout``. Apps whose
+        circuit is open are skipped. An identifier every app answered 404 for
+        is remembered for ``negative_ttl`` seconds.
+        
         Args:
             identifier: Username or email to search for
             
         Returns:
             User data dict if found, None otherwise
         """
-        for app_url in self.app_urls:
-            try:
-                response = requests.get(
-                    f"{app_url}/api/sentinel/user-lookup",
-                    params={"identifier": identifier},
-                    timeout=self.timeout
-                )
-                
-                if response.status_code == 200:
-                    user_data = response.json()
-                    logger.info(f"Found user {identifier} in app: {app_url}")
-                    return user_data
-                    
-            except requests.exceptions.RequestException as e:
-                logger.warning(f"Failed to connect to {app_url}: {str(e)}")
-                continue
+        if not self.app_urls:
+            return None
+        if self._cached_miss(identifier):
+            logger.info(f"User {identifier} not found in any Sentinel app (cached)")
+            return None
+        
+        sessions, executor = self._resources()
+        live = [app_url for app_url in self.app_urls if self.peers[app_url].allow_request()]
+        reported = {app_url: threading.Event() for app_url in live}
+        pending = {
+            executor.submit(self._lookup, sessions[app_url], app_url, identifier, reported[app_url]): app_url
+            for app_url in live
+        }
+        deadline = time.monotonic() + self.timeout
+        all_answered = len(live) == len(self.app_urls)
+        try:
+            while pending:
+                done, _ = wait(pending, timeout=max(deadline - time.monotonic(), 0),
+                               return_when=FIRST_COMPLETED)
+                if not done:
+                    # Count the timeout now so the next lookup already sees it
+                    for app_url in pending.values():
+                        reported[app_url].set()
+                        self.peers[app_url].record_failure(f"no answer within {self.timeout}s")
+                    all_answered = False
+                    break
+                for future in done:
+                    app_url = pending.pop(future)
+                    status, user_data = future.result()
+                    if status == 200 and user_data:
+                        logger.info(f"Found user {identifier} in app: {app_url}")
+                        return user_data
+                    if status != 404:
+                        all_answered = False
+        finally:
+            # First hit wins: drop lookups that have not started yet
+            for future in pending:
+                future.cancel()
         
+        # Only a definite "no" from every app is cached; errors and timeouts are retried
+        if all_answered:
+            self._remember_miss(identifier)
         logger.info(f"User {identifier} not found in any Sentinel app")
         return None
     
@@ -86,14 +329,7 @@ class SentinelUserSync:
                 return existing
             
             # Create new user with synced data
-            new_user = User(
-                username=user_data['username'],
-                email=user_data['email'],
-                password=user_data['password'],  # Already hashed
-                is_verified=user_data.get('is_verified', True),  # Trust verified status
-                verification_token=None,  # Don't copy tokens
-                token_expiration=None
-            )
+            new_user = self._new_user(user_data, User)
             
             db_session.add(new_user)
             db_session.commit()
@@ -132,10 +368,173 @@ class SentinelUserSync:
             logger.error(f"Auto-sync failed for {identifier}: {str(e)}")
             return None
 
+    def refresh_password(self, user, db_session) -> bool:
+        """
+        Fetch the password hash of a replicated user from the app that has it.
+        Called at login for local users without a hash.
+        
+        Returns:
+            True if a hash was stored
+        """
+        user_data = self.find_user_in_apps(user.username)
+        if not user_data or not user_data.get('password'):
+            return False
+        if user_data.get('email') != user.email:
+            logger.warning(f"Not taking the password of {user.username}: email differs on the peer")
+            return False
+        # A bulk UPDATE leaves updated_at alone: the fetched hash is not a change
+        # to feed back to peers
+        values = {"password": user_data['password']}
+        password_changed_at = self._remote_time(user_data, 'password_changed_at')
+        if password_changed_at:
+            values["password_changed_at"] = password_changed_at
+        type(user).query.filter_by(id=user.id).update(values)
+        db_session.commit()
+        return True
+
+    @staticmethod
+    def _remote_time(user_data: Dict, key: str = 'updated_at') -> Optional[datetime]:
+        try:
+            return datetime.fromisoformat(user_data[key])
+        except (KeyError, TypeError, ValueError):
+            return None
+    
+    def _new_user(self, user_data: Dict, User):
+        new_user = User(
+            username=user_data['username'],
+            email=user_data['email'],
+            # Already hashed; feed and batch copies carry none and fetch it at first login
+            password=user_data.get('password') or '',
+            name=user_data.get('name'),
+            is_verified=user_data.get('is_verified', True),  # Trust verified status
+            verification_token=None,  # Don't copy tokens
+            token_expiration=None
+        )
+        # Keep the origin's timestamps so our own feed does not echo the change back as new
+        remote_updated_at = self._remote_time(user_data)
+        if remote_updated_at and hasattr(User, 'updated_at'):
+            new_user.updated_at = remote_updated_at
+        if hasattr(User, 'password_changed_at'):
+            new_user.password_changed_at = self._remote_time(user_data, 'password_changed_at')
+        return new_user
+    
+    def upsert_users(self, users_data: List[Dict], db_session, User) -> Dict[str, int]:
+        """
+        Apply a page of replicated users to the local database (caller commits).
+        
+        New users are created; existing ones (matched by username or email) are
+        updated only when the remote copy is newer, last writer wins. Feed pages
+        carry no password hashes. The local hash is kept unless the peer reports
+        a newer ``password_changed_at``; then it is cleared and the next login
+        fetches the current one (see ``refresh_password``).
+        
+        Returns:
+            Counts of created, updated and unchanged users
+        """
+        counts = {"created": 0, "updated": 0, "unchanged": 0}
+        if not users_data:
+            return counts
+        usernames = {u['username'] for u in users_data}
+        emails = {u['email'] for u in users_data}
+        existing = User.query.filter(User.username.in_(usernames) | User.email.in_(emails)).all()
+        by_username = {u.username: u for u in existing}
+        by_email = {u.email: u for u in existing}
+        
+        for user_data in users_data:
+            local = by_username.get(user_data['username']) or by_email.get(user_data['email'])
+            if local is None:
+                local = self._new_user(user_data, User)
+                db_session.add(local)
+                by_username[local.username], by_email[local.email] = local, local
+                counts["created"] += 1
+                continue
+            
+            remote_updated_at = self._remote_time(user_data)
+            if remote_updated_at is None or (local.updated_at and remote_updated_at <= local.updated_at):
+                counts["unchanged"] += 1
+                continue
+            if local.username != user_data['username'] or local.email != user_data['email']:
+                # Username and email belong to different accounts here; leave both alone
+                logger.warning(f"Skipping replicated user {user_data['username']}: conflicts with local users")
+                counts["unchanged"] += 1
+                continue
+            password_changed_at = self._remote_time(user_data, 'password_changed_at')
+            if password_changed_at and (local.password_changed_at is None
+                                        or password_changed_at > local.password_changed_at):
+                # The password changed on the peer: the old hash must stop working here
+                local.password = user_data.get('password') or ''
+                local.password_changed_at = password_changed_at
+            local.is_verified = user_data.get('is_verified', local.is_verified)
+            local.name = user_data.get('name', local.name)
+            local.updated_at = remote_updated_at
+            counts["updated"] += 1
+        return counts
+    
+    def _fetch_changes(self, session, app_url: str, since: Optional[str], limit: int) -> Dict:
+        params = {"limit": limit}
+        if since:
+            params["since"] = since
+        start = time.monotonic()
+        response = session.get(f"{app_url}{self.changes_path}", params=params, timeout=self.timeout)
+        response.raise_for_status()
+        self.peers[app_url].record_success(time.monotonic() - start)
+        return response.json()
+    
+    def replicate(self, db_session, User, Cursor, page_size: int = 500) -> Dict[str, Dict[str, int]]:
+        """
+        Pull every peer's changes-since feed and apply it locally.
+        
+        Each page is committed together with the peer's cursor, so an
+        interrupted pull resumes where it stopped. Peers with an open circuit
+        are skipped until their probe succeeds.
+        
+        Args:
+            db_session: SQLAlchemy database session
+            User: User model class
+            Cursor: Model with ``peer_url`` and ``cursor`` columns
+            page_size: Users requested per page
+            
+        Returns:
+            Per-peer counts of created/updated/unchanged users
+        """
+        sessions, _ = self._resources()
+        results = {}
+        for app_url in self.app_urls:
+            peer = self.peers[app_url]
+            totals = {"created": 0, "updated": 0, "unchanged": 0}
+            results[app_url] = totals
+            if not peer.allow_request():
+                continue
+            state = db_session.get(Cursor, app_url) or Cursor(peer_url=app_url)
+            try:
+                while True:
+                    page = self._fetch_changes(sessions[app_url], app_url, state.cursor, page_size)
+                    for key, count in self.upsert_users(page.get('users', []), db_session, User).items():
+                        totals[key] += count
+                    state.cursor = page.get('next_cursor') or state.cursor
+                    db_session.add(state)
+                    db_session.commit()
+                    if not page.get('has_more'):
+                        break
+            except (requests.exceptions.RequestException, ValueError) as e:
+                db_session.rollback()
+                peer.record_failure(str(e))
+                logger.warning(f"Replication from {app_url} stopped: {str(e)}")
+            if totals["created"] or totals["updated"]:
+                logger.info(f"Replicated from {app_url}: {totals}")
+        return results
+
+
+_services = {}
+_services_lock = threading.Lock()
+
 
 def get_sync_service(config) -> Optional[SentinelUserSync]:
     """
-    Create a SentinelUserSync instance from Flask config.
+    Return the SentinelUserSync instance for the Flask config.
+    
+    Instances are reused for the same settings so their connection pools
+    and negative cache survive across requests.
     
     Args:
         config: Flask app config
@@ -156,4 +555,19 @@ def get_sync_service(config) -> Optional[SentinelUserSync]:
         logger.warning("SENTINEL_APPS is empty, user sync disabled")
         return None
     
-    return SentinelUserSync(app_urls, current_app_url)
+    settings = dict(
+        timeout=config.get('SENTINEL_TIMEOUT', 5),
+        negative_ttl=config.get('SENTINEL_NEGATIVE_TTL', 60),
+        lookup_path=config.get('SENTINEL_LOOKUP_PATH', DEFAULT_LOOKUP_PATH),
+        health_path=config.get('SENTINEL_HEALTH_PATH', DEFAULT_HEALTH_PATH),
+        failure_threshold=config.get('SENTINEL_FAILURE_THRESHOLD', 3),
+        backoff_base=config.get('SENTINEL_BACKOFF_BASE', 1.0),
+        backoff_max=config.get('SENTINEL_BACKOFF_MAX', 60.0),
+        token=config.get('SENTINEL_SHARED_SECRET') or None,
+    )
+    key = (tuple(app_urls), current_app_url, tuple(sorted(settings.items())))
+    with _services_lock:
+        service = _services.get(key)
+        if service is None:
+            service = _services[key] = SentinelUserSync(app_urls, current_app_url, **settings)
+        return service
@@ -0,0 +1,278 @@
+# backend/utils/archive.py
+"""
+Cold storage for old transactions.
+
+``flask archive-transactions`` moves transactions dated before the first of the
+month ARCHIVE_AFTER_MONTHS months back from ``transactions`` into
+``transactions_archive``, one household and month per database transaction.
+Each month's totals are folded into ``transaction_period_summaries`` (one row
+per household, month, category, type and account). Recurring templates and
+parents of live rows stay live. Archived rows keep their ids; ``transactions``
+never hands an id out twice (a sequence on PostgreSQL, AUTOINCREMENT on SQLite),
+so ids stay unique across both tables.
+
+Reads stay on ``transactions`` unless the requested range reaches an archived
+month. :func:`archived_span` answers that with one indexed lookup, and only
+then do :func:`ledger` and :func:`archived_query` add the archive. Aggregates
+take whole archived months from the summaries and read archived rows only for
+months the range cuts through.
+"""
+import logging
+from datetime import date, datetime, timedelta
+from sqlalchemy import and_, func, insert, literal, select, union_all
+from backend.database import db
+from backend.models import ArchivedTransaction, Transaction, TransactionPeriodSummary
+from backend.utils.money import Money
+from backend.utils.timeseries import bucket_expression
+
+logger = logging.getLogger(__name__)
+
+# Columns copied verbatim from transactions to transactions_archive
+COPIED = tuple(column.name for column in ArchivedTransaction.__table__.columns if column.name != "archived_at")
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def next_month(day):
+    """First day of the month after ``day``'s."""
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def archive_cutoff(months, today=None):
+    """First day of the month ``months`` months before ``today``'s; older rows are archived."""
+    cutoff = month_start(today or date.today())
+    for _ in range(months):
+        cutoff = month_start(cutoff - timedelta(days=1))
+    return cutoff
+
+
+def archived_span(household_id):
+    """(first day, last day) of the household's archived months, or None if nothing is archived."""
+    first, last = db.session.query(
+        func.min(TransactionPeriodSummary.period), func.max(TransactionPeriodSummary.period)
+    ).filter(TransactionPeriodSummary.household_id == household_id).one()
+    if first is None:
+        return None
+    return first, next_month(last) - timedelta(days=1)
+
+
+def _overlap(household_id, start, end):
+    span = archived_span(household_id)
+    if span is None:
+        return None
+    first = max(start, span[0]) if start else span[0]
+    last = min(end, span[1]) if end else span[1]
+    return (first, last) if first <= last else None
+
+
+def reaches_archive(household_id, start=None, end=None):
+    """Whether [start, end] (open-ended when None) includes any archived month."""
+    return _overlap(household_id, start, end) is not None
+
+
+def archived_query(household_id, start=None, end=None):
+    """
+    Query for the household's archived transactions in [start, end].
+
+    Returns:
+        Query, or None when the range doesn't reach an archived month
+    """
+    overlap = _overlap(household_id, start, end)
+    if overlap is None:
+        return None
+    return ArchivedTransaction.query.filter(
+        ArchivedTransaction.household_id == household_id,
+        ArchivedTransaction.date.between(*overlap),
+    )
+
+
+def archived_count(household_id):
+    """Number of archived transactions, from the summaries."""
+    return db.session.query(
+        func.coalesce(func.sum(TransactionPeriodSummary.transaction_count), 0)
+    ).filter(TransactionPeriodSummary.household_id == household_id).scalar()
+
+
+def _cold_plan(household_id, start, end, whole_months):
+    """Split the archived part of [start, end] into summary months and archived-row date ranges."""
+    overlap = _overlap(household_id, start, end)
+    if overlap is None:
+        return None, []
+    first, last = overlap
+    if not whole_months:
+        return None, [overlap]
+    months_from = first if first.day == 1 else next_month(first)
+    months_to = month_start(last + timedelta(days=1))  # exclusive
+    if months_from >= months_to:
+        return None, [overlap]
+    partial = []
+    if first < months_from:
+        partial.append((first, months_from - timedelta(days=1)))
+    if months_to <= last:
+        partial.append((months_to, last))
+    return (months_from, month_start(months_to - timedelta(days=1))), partial
+
+
+def _rows(model, household_id, start, end):
+    query = select(
+        model.date.label("date"), model.category.label("category"),
+        model.transaction_type.label("transaction_type"), model.account_id.label("account_id"),
+        model.amount.label("amount"), func.abs(model.amount).label("abs_amount"),
+        literal(1).label("transaction_count"),
+    ).where(model.household_id == household_id)
+    if start:
+        query = query.where(model.date >= start)
+    if end:
+        query = query.where(model.date <= end)
+    return query
+
+
+def ledger(household_id, start=None, end=None, whole_months=True):
+    """
+    A household's transactions in [start, end], live and archived, as one subquery.
+
+    Columns: date, category, transaction_type, account_id, amount, abs_amount
+    and transaction_count (1 per row, or the rows a summary stands for). Sum
+    amounts and counts rather than counting rows.
+
+    Args:
+        household_id: Household to read
+        start, end: Optional inclusive date bounds
+        whole_months: Take archived months inside the range from the summaries,
+            dated the first of the month. Only valid when grouping by month or
+            coarser; pass False to read the archived rows instead.
+
+    Returns:
+        Subquery named ``ledger``
+    """
+    parts = [_rows(Transaction, household_id, start, end)]
+    months, partial = _cold_plan(household_id, start, end, whole_months)
+    for first, last in partial:
+        parts.append(_rows(ArchivedTransaction, household_id, first, last))
+    if months:
+        summary = TransactionPeriodSummary
+        parts.append(select(
+            summary.period.label("date"), summary.category, summary.transaction_type, summary.account_id,
+            summary.amount, summary.abs_amount, summary.transaction_count,
+        ).where(summary.household_id == household_id, summary.period.between(*months)))
+    return (union_all(*parts) if len(parts) > 1 else parts[0]).subquery("ledger")
+
+
+def _movable(household_id, first, cutoff, last_id):
+    table = Transaction.__table__
+    parents = select(table.c.parent_transaction_id).where(table.c.parent_transaction_id.isnot(None))
+    return and_(
+        table.c.household_id == household_id,
+        table.c.date >= first,
+        table.c.date < cutoff,
+        table.c.is_recurring.isnot(True),
+        table.c.id.notin_(parents),
+        table.c.id <= last_id,
+    )
+
+
+def _fold_summaries(household_id, movable):
+    """Add the totals of the rows about to move to the household's summary rows."""
+    table = Transaction.__table__
+    dialect = db.session.get_bind(mapper=Transaction.__mapper__).dialect.name
+    period = bucket_expression(table.c.date, "month", dialect)
+    groups = db.session.execute(
+        select(period, table.c.category, table.c.transaction_type, table.c.account_id,
+               func.sum(table.c.amount), func.sum(func.abs(table.c.amount)), func.count())
+        .where(movable)
+        .group_by(period, table.c.category, table.c.transaction_type, table.c.account_id)
+    ).all()
+    periods = {row[0] if isinstance(row[0], date) else date.fromisoformat(row[0]) for row in groups}
+    existing = {
+        (s.period, s.category, s.transaction_type, s.account_id): s
+        for s in TransactionPeriodSummary.query.filter(
+            TransactionPeriodSummary.household_id == household_id,
+            TransactionPeriodSummary.period.in_(periods),
+        )
+    } if periods else {}
+    for label, category, transaction_type, account_id, amount, abs_amount, count in groups:
+        key = (label if isinstance(label, date) else date.fromisoformat(label), category, transaction_type, account_id)
+        summary = existing.get(key)
+        if summary is None:
+            db.session.add(TransactionPeriodSummary(
+                household_id=household_id, period=key[0], category=category,
+                transaction_type=transaction_type, account_id=account_id,
+                amount=amount or Money(), abs_amount=abs_amount or Money(), transaction_count=count,
+            ))
+        else:
+            summary.amount += amount or Money()
+            summary.abs_amount += abs_amount or Money()
+            summary.transaction_count += count
+    db.session.flush()
+
+
+def archive_household(household_id, cutoff):
+    """
+    Move a household's transactions dated before ``cutoff`` to the archive,
+    committing once per month.
+
+    Returns:
+        dict: {"transactions": rows moved, "months": months touched}
+    """
+    table = Transaction.__table__
+    archive = ArchivedTransaction.__table__
+    moved = months = 0
+    oldest = db.session.query(func.min(table.c.date)).filter(
+        table.c.household_id == household_id, table.c.date < cutoff
+    ).scalar()
+    if oldest is None:
+        return {"transactions": 0, "months": 0}
+    month = month_start(oldest)
+    while month < cutoff:
+        following = min(next_month(month), cutoff)
+        try:
+            # Fixed before copying, so a row inserted meanwhile can't be deleted uncopied
+            last_id = db.session.query(func.max(table.c.id)).scalar()
+            movable = _movable(household_id, month, following, last_id)
+            if db.session.get_bind(mapper=Transaction.__mapper__).dialect.name == "postgresql":
+                db.session.execute(select(table.c.id).where(movable).with_for_update()).all()
+            _fold_summaries(household_id, movable)
+            copied = db.session.execute(insert(archive).from_select(
+                COPIED + ("archived_at",),
+                select(*(table.c[name] for name in COPIED), literal(datetime.utcnow()).label("archived_at"))
+                .where(movable),
+            )).rowcount
+            deleted = db.session.execute(table.delete().where(movable)).rowcount
+            if copied != deleted:
+                raise RuntimeError(f"copied {copied} transactions but would delete {deleted}")
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        if copied:
+            moved += copied
+            months += 1
+            logger.info("Archived %s transactions of household %s for %s", copied, household_id, month)
+        month = following
+    return {"transactions": moved, "months": months}
+
+
+def archive_transactions(months, household_id=None, today=None):
+    """
+    Archive every household's (or one household's) transactions older than
+    ``months`` whole months.
+
+    Returns:
+        dict: {"households": households with rows moved, "transactions": ..., "months": ...}
+    """
+    cutoff = archive_cutoff(months, today)
+    if household_id is not None:
+        households = [household_id]
+    else:
+        households = [h for (h,) in db.session.query(Transaction.household_id)
+                      .filter(Transaction.date < cutoff).distinct()]
+    totals = {"households": 0, "transactions": 0, "months": 0}
+    for household in households:
+        result = archive_household(household, cutoff)
+        if result["transactions"]:
+            totals["households"] += 1
+            totals["transactions"] += result["transactions"]
+            totals["months"] += result["months"]
+    return totals
@@ -3,7 +3,7 @@
 Authentication and authorization helper functions for household-based access control
 """
 from flask_jwt_extended import get_jwt, get_jwt_identity
-from backend.models import User
+from backend.utils.membership import get_membership
 
 
 def get_current_household_id():
@@ -26,24 +26,27 @@ def get_current_user_id():
 
 def get_user_household(user_id):
     """
-    Get a user's default household ID from database.
+    Get a user's default household ID (cached, see utils/membership.py).
     Fallback when household_id is not in JWT claims.
     """
-    user = User.query.get(user_id)
-    if not user:
+    membership = get_membership(user_id)
+    if not membership:
         return None
-    return user.default_household_id
+    return membership.default_household_id
 
 
-def require_household_access(household_id):
+def require_household_access(household_id, role=None):
     """
     Check if current user has access to the specified household.
-    Returns True if user is a member, False otherwise.
-    """
-    current_household = get_current_household_id()
-    if not current_household:
-        # Fallback: check user's default household
-        user_id = get_current_user_id()
-        current_household = get_user_household(user_id)
-    
-    return current_household == household_id
+
+    The household must be the user's current one (JWT claim, else their
+    default) and they must still be a member of it. Pass ``role`` (e.g.
+    ``"owner"``) for actions limited to that role; any member passes when None.
+    Returns True if allowed, False otherwise.
+    """
+    membership = get_membership(get_current_user_id())
+    if membership is None:
+        return False
+    current_household = get_current_household_id() or membership.default_household_id
+    held = membership.roles.get(household_id)
+    return current_household == household_id and held is not None and (role is None or held == role)
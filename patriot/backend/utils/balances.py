@@ -0,0 +1,105 @@
+# backend/utils/balances.py
+"""
+Atomic balance updates for accounts, funds and debts.
+
+Every balance change is issued as a single ``UPDATE ... SET balance = balance + :delta``
+statement so concurrent writers in the same household can never overwrite each
+other's changes. Sufficient-funds checks are expressed as guard conditions on the
+UPDATE itself; when the guard fails no row is touched and ``None`` is returned.
+
+Balances are whole cents (see ``backend.utils.money``): deltas are converted to
+Money once and the database adds integers.
+"""
+from sqlalchemy import update, select
+from backend.database import db
+from backend.models.account import Account
+from backend.models.fund import Fund
+from backend.models.debt import Debt
+from backend.utils.money import Money
+
+
+def _apply_delta(model, column, row_id, delta, minimum=None):
+    """
+    Add ``delta`` to ``column`` of a single row in one statement.
+
+    Args:
+        model: Mapped model class owning the column
+        column: Column attribute holding the balance
+        row_id (int): Primary key of the row to update
+        delta (Money): Signed amount to add to the balance
+        minimum: If set, only apply the change when the resulting balance
+            stays at or above this value
+
+    Returns:
+        Money: The new balance, or None if the row does not exist or the guard failed
+    """
+    conditions = [model.id == row_id]
+    if minimum is not None:
+        conditions.append(column + delta >= minimum)
+
+    stmt = (
+        update(model)
+        .where(*conditions)
+        .values({column.key: column + delta})
+        .execution_options(synchronize_session="fetch")
+    )
+
+    if db.session.get_bind().dialect.update_returning:
+        return db.session.execute(stmt.returning(column)).scalar_one_or_none()
+
+    result = db.session.execute(stmt)
+    if result.rowcount == 0:
+        return None
+    return db.session.execute(select(column).where(model.id == row_id)).scalar()
+
+
+def adjust_account_balance(account_id, delta):
+    """
+    Atomically add ``delta`` (Money, or dollars) to an account balance.
+
+    Returns the new balance, or None if the account does not exist.
+    """
+    return _apply_delta(Account, Account.balance, account_id, Money.parse(delta))
+
+
+def adjust_fund_balance(fund_id, delta, require_sufficient=False):
+    """
+    Atomically add ``delta`` (Money, or dollars) to a fund balance.
+
+    With ``require_sufficient`` the update only happens when the fund would not
+    go negative. Returns the new balance, or None if the fund does not exist
+    or has insufficient balance.
+    """
+    minimum = 0 if require_sufficient else None
+    return _apply_delta(Fund, Fund.balance, fund_id, Money.parse(delta), minimum=minimum)
+
+
+def adjust_debt_balance(debt_id, delta):
+    """
+    Atomically add ``delta`` to a debt's current balance.
+
+    Payments pass a negative delta and are guarded so the balance can never
+    drop below zero. Returns the new balance, or None if the debt does not
+    exist or the payment exceeds the remaining balance.
+    """
+    return _apply_delta(
+        Debt, Debt.current_balance, debt_id, Money.parse(delta), minimum=0
+    )
+
+
+def move_fund_money(fund, delta, require_sufficient=False):
+    """
+    Apply ``delta`` to a fund and, if it is linked to an account, to that account.
+
+    Returns a tuple ``(fund_balance, account_balance)``. ``fund_balance`` is None
+    when the guarded fund update failed, in which case the account is untouched.
+    ``account_balance`` is None when the fund has no linked account.
+    """
+    fund_balance = adjust_fund_balance(fund.id, delta, require_sufficient)
+    if fund_balance is None:
+        return None, None
+
+    account_balance = None
+    if fund.account_id:
+        account_balance = adjust_account_balance(fund.account_id, delta)
+    return fund_balance, account_balance
@@ -0,0 +1,437 @@
+# backend/utils/data_generator.py
+"""
+Synthetic data for load and scale testing, benchmarks and the check scripts.
+
+:func:`generate` (``flask gen-data``) creates realistic households with
+members, accounts, funds, debts, bills, paychecks and multi-year transaction
+histories: bill payments, paycheck deposits, subscriptions (recurring parents
+plus their monthly instances), savings transfers and day-to-day spending.
+
+:func:`build_household` creates one household with exactly the requested
+number of transactions and bills, for benchmarks and checks that need a
+given scale rather than a realistic shape.
+
+Both write with Core ``insert()`` executemany in large chunks, bypassing the
+ORM unit of work, and their output is fully determined by ``seed`` (and
+``end_date``). :func:`generate` allocates primary keys up front from the
+current ``MAX(id)`` so rows can reference each other without round-trips; do
+not run it against a database that is taking writes at the same time.
+"""
+import random
+from datetime import date, datetime, timedelta
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import bindparam, func, select, text
+from backend.models import User, Household, Account, Fund, Bill, Income, Debt, Transaction, user_household
+
+FIRST_NAMES = ("Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery", "Quinn")
+LAST_NAMES = ("Smith", "Johnson", "Lee", "Garcia", "Brown", "Davis", "Miller", "Wilson", "Moore", "Clark")
+
+# name, category, low, high, autopay probability
+BILL_TEMPLATES = (
+    ("Rent", "Housing", 900, 2400, 0.8),
+    ("Electric", "Utilities", 60, 220, 0.6),
+    ("Water & Sewer", "Utilities", 30, 90, 0.6),
+    ("Internet", "Utilities", 50, 110, 0.7),
+    ("Phone", "Subscriptions", 40, 160, 0.8),
+    ("Car Insurance", "Insurance", 80, 260, 0.9),
+    ("Health Insurance", "Insurance", 150, 600, 0.9),
+    ("Gym", "Subscriptions", 15, 80, 0.5),
+    ("Trash", "Utilities", 20, 45, 0.4),
+)
+SUBSCRIPTIONS = (("Streaming", 8, 23), ("Music", 10, 17), ("Cloud Storage", 2, 10), ("News", 5, 20))
+DEBT_TEMPLATES = (
+    ("Visa", "Credit Card", 1000, 12000, 16, 28),
+    ("Student Loan", "Student Loan", 8000, 60000, 3, 8),
+    ("Car Loan", "Auto Loan", 6000, 35000, 4, 10),
+)
+# category, description, daily probability, low, high
+SPENDING = (
+    ("Dining", "Restaurant", 0.35, 8, 70),
+    ("Transportation", "Gas station", 0.15, 25, 70),
+    ("Shopping", "Online order", 0.12, 10, 150),
+    ("Entertainment", "Movies & events", 0.06, 10, 90),
+    ("Health", "Pharmacy", 0.04, 5, 60),
+    ("Personal Care", "Salon / barber", 0.02, 20, 90),
+)
+
+EXPENSE_CATEGORIES = ("Groceries",) + tuple(category for category, *_ in SPENDING)
+BILL_CATEGORIES = tuple(dict.fromkeys(category for _, category, *_ in BILL_TEMPLATES))
+FREQUENCIES = ("weekly", "biweekly", "monthly", "yearly")
+# Recurring templates build_household leaves due for processing
+RECURRING_DUE = 20
+
+_INSERT_ORDER = ("users", "households", "user_defaults", "user_household", "accounts", "funds",
+                 "debts", "bills", "incomes", "transactions")
+
+
+class _ChunkWriter:
+    """Buffers rows per table and flushes them all, parents first, once any buffer fills."""
+
+    def __init__(self, conn, chunk_size, progress=None):
+        self.conn = conn
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.buffers = {name: [] for name in _INSERT_ORDER}
+        self.totals = dict.fromkeys(_INSERT_ORDER, 0)
+        self.statements = {
+            "users": User.__table__.insert(),
+            "households": Household.__table__.insert(),
+            "user_defaults": User.__table__.update()
+                .where(User.__table__.c.id == bindparam("uid"))
+                .values(default_household_id=bindparam("hid")),
+            "user_household": user_household.insert(),
+            "accounts": Account.__table__.insert(),
+            "funds": Fund.__table__.insert(),
+            "debts": Debt.__table__.insert(),
+            "bills": Bill.__table__.insert(),
+            "incomes": Income.__table__.insert(),
+            "transactions": Transaction.__table__.insert(),
+        }
+
+    def add(self, name, row):
+        buffer = self.buffers[name]
+        buffer.append(row)
+        if len(buffer) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        for name in _INSERT_ORDER:
+            rows = self.buffers[name]
+            if rows:
+                self.conn.execute(self.statements[name], rows)
+                self.totals[name] += len(rows)
+                self.buffers[name] = []
+        if self.progress:
+            self.progress(dict(self.totals))
+
+
+def _next_id(conn, table):
+    return (conn.execute(select(func.max(table.c.id))).scalar() or 0) + 1
+
+
+def _sync_sequences(conn):
+    """Explicit ids bypass PostgreSQL sequences; move them past the new rows."""
+    if conn.dialect.name != "postgresql":
+        return
+    for table in ("users", "households", "accounts", "funds", "debts", "bills", "incomes", "transactions"):
+        conn.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM {table}), 1))"
+        ))
+
+
+def _money(rng, low, high):
+    return round(rng.uniform(low, high), 2)
+
+
+def _months(start, end, day):
+    """Yield the ``day``-th of every month between start and end (inclusive)."""
+    current = start.replace(day=min(day, 28))
+    while current <= end:
+        if current >= start:
+            yield current
+        current += relativedelta(months=1)
+
+
+def generate(engine, households=10, years=2, seed=42, end_date=None, chunk_size=50_000,
+             password_hash="x", progress=None):
+    """
+    Bulk-generate synthetic households.
+
+    Args:
+        engine: SQLAlchemy engine with the schema already created
+        households: Number of households to create
+        years: Length of each household's transaction history
+        seed: RNG seed; same seed and end_date always produce the same data
+        end_date: Last day of history (default: today)
+        chunk_size: Rows per executemany batch
+        password_hash: Stored password for every generated user
+        progress: Optional callable receiving running row totals per table
+
+    Returns:
+        dict: Rows inserted per table
+    """
+    rng = random.Random(seed)
+    end_date = end_date or date.today()
+    start_date = end_date - timedelta(days=365 * years)
+    now = datetime.utcnow()
+
+    with engine.begin() as conn:
+        ids = {
+            name: _next_id(conn, table)
+            for name, table in (("users", User.__table__), ("households", Household.__table__),
+                                ("accounts", Account.__table__), ("funds", Fund.__table__),
+                                ("debts", Debt.__table__), ("bills", Bill.__table__),
+                                ("incomes", Income.__table__), ("transactions", Transaction.__table__))
+        }
+
+        def new_id(name):
+            value = ids[name]
+            ids[name] += 1
+            return value
+
+        writer = _ChunkWriter(conn, chunk_size, progress)
+        tx_base = dict(
+            account_id=None, fund_id=None, bill_id=None, to_account_id=None, to_fund_id=None,
+            is_recurring=False, frequency=None, next_occurrence=None, parent_transaction_id=None,
+            is_skipped=False, is_autopay=False,
+        )
+
+        for _ in range(households):
+            household_id = new_id("households")
+            last = rng.choice(LAST_NAMES)
+            member_ids = []
+            for m in range(rng.choice((1, 1, 2, 2, 2, 3))):
+                user_id = new_id("users")
+                member_ids.append(user_id)
+                writer.add("users", dict(
+                    id=user_id, username=f"gen{user_id}", email=f"gen{user_id}@example.com",
+                    password=password_hash, name=f"{rng.choice(FIRST_NAMES)} {last}", theme="light",
+                    is_verified=True, created_at=now, default_household_id=None,
+                ))
+            owner = member_ids[0]
+            writer.add("households", dict(id=household_id, name=f"The {last} Household",
+                                          created_by=owner, created_at=now))
+            for m, user_id in enumerate(member_ids):
+                writer.add("user_defaults", dict(uid=user_id, hid=household_id))
+                writer.add("user_household", dict(user_id=user_id, household_id=household_id,
+                                                  role="owner" if m == 0 else "member", joined_at=now))
+
+            checking, savings, card = new_id("accounts"), new_id("accounts"), new_id("accounts")
+            for account_id, name, kind, balance in (
+                (checking, "Checking", "checking", _money(rng, 500, 8000)),
+                (savings, "Savings", "savings", _money(rng, 1000, 40000)),
+                (card, "Credit Card", "credit", -_money(rng, 0, 3000)),
+            ):
+                writer.add("accounts", dict(
+                    id=account_id, household_id=household_id, owner_user_id=owner, name=name, type=kind,
+                    institution=rng.choice(("First Bank", "Credit Union", "Online Bank")),
+                    balance=balance, last_four=f"{rng.randint(0, 9999):04d}", is_active=True,
+                    created_at=now, updated_at=now,
+                ))
+
+            emergency = new_id("funds")
+            funds = (
+                (emergency, "Emergency Fund", "Savings", savings, _money(rng, 50, 300)),
+                (new_id("funds"), "Groceries", "Expenses", checking, None),
+                (new_id("funds"), "Vacation", "Savings", savings, _money(rng, 25, 150)),
+                (new_id("funds"), "Cash", "Cash", None, None),
+            )
+            for fund_id, name, fund_type, account_id, recurring in funds:
+                writer.add("funds", dict(
+                    id=fund_id, household_id=household_id, name=name, fund_type=fund_type,
+                    balance=_money(rng, 50, 5000), goal=_money(rng, 1000, 15000), recurring_amount=recurring,
+                    next_deposit_date=end_date + timedelta(days=rng.randint(1, 30)) if recurring else None,
+                    skip_next=False, account_id=account_id, description=None, created_at=now,
+                ))
+
+            for name, category, low, high, rate_low, rate_high in rng.sample(DEBT_TEMPLATES, rng.randint(0, 3)):
+                total = _money(rng, low, high)
+                writer.add("debts", dict(
+                    id=new_id("debts"), household_id=household_id, owner_user_id=rng.choice(member_ids),
+                    name=name, description=None, total_amount=total,
+                    current_balance=round(total * rng.uniform(0.2, 0.95), 2),
+                    minimum_payment=round(max(25, total * 0.02), 2),
+                    interest_rate=round(rng.uniform(rate_low, rate_high), 2),
+                    due_date=end_date.replace(day=rng.randint(1, 28)), category=category,
+                    account_number=f"{rng.randint(0, 9999):04d}", is_active=True, created_at=now,
+                ))
+
+            def transaction(day, description, amount, category, kind, **fields):
+                tx_id = new_id("transactions")
+                row = dict(tx_base, id=tx_id, household_id=household_id,
+                           created_by_user_id=rng.choice(member_ids), date=day, description=description,
+                           amount=amount, category=category, transaction_type=kind,
+                           created_at=datetime.combine(day, datetime.min.time()))
+                row.update(fields)
+                writer.add("transactions", row)
+                return tx_id
+
+            for name, category, low, high, autopay_odds in rng.sample(BILL_TEMPLATES, rng.randint(4, len(BILL_TEMPLATES))):
+                bill_id = new_id("bills")
+                amount = _money(rng, low, high)
+                day = rng.randint(1, 28)
+                autopay = rng.random() < autopay_odds
+                next_due = next(_months(end_date + timedelta(days=1), end_date + timedelta(days=62), day))
+                writer.add("bills", dict(
+                    id=bill_id, household_id=household_id, name=name, description=None, amount=amount,
+                    due_date=next_due, frequency="monthly", category=category, is_autopay=autopay,
+                    next_due_date=next_due, is_active=True, account_id=checking, created_at=now,
+                ))
+                variable = category == "Utilities"
+                for due in _months(start_date, end_date, day):
+                    paid = round(amount * rng.uniform(0.8, 1.25), 2) if variable else amount
+                    transaction(due, name, paid, category, "expense", account_id=checking,
+                                bill_id=bill_id, is_autopay=autopay)
+
+            for earner in member_ids[:2]:
+                pay = _money(rng, 1200, 4200)
+                payday = start_date + timedelta(days=rng.randint(0, 13))
+                while payday <= end_date:
+                    amount = round(pay * rng.uniform(0.97, 1.03), 2)
+                    writer.add("incomes", dict(
+                        id=new_id("incomes"), household_id=household_id, date=payday, amount=amount,
+                        source="Employer", category="Paycheck", description=None, account_id=checking,
+                    ))
+                    transaction(payday, "Paycheck", amount, "Income", "income", account_id=checking)
+                    payday += timedelta(days=14)
+
+            for name, low, high in rng.sample(SUBSCRIPTIONS, rng.randint(1, len(SUBSCRIPTIONS))):
+                amount = _money(rng, low, high)
+                first = start_date + timedelta(days=rng.randint(0, 27))
+                occurrences = list(_months(first, end_date, first.day))
+                parent = transaction(first, name, amount, "Subscriptions", "expense", account_id=card,
+                                     is_recurring=True, frequency="monthly",
+                                     next_occurrence=occurrences[-1] + relativedelta(months=1))
+                for day in occurrences[1:]:
+                    transaction(day, name, amount, "Subscriptions", "expense", account_id=card,
+                                parent_transaction_id=parent)
+
+            transfer_day = rng.randint(1, 28)
+            transfer_amount = _money(rng, 100, 800)
+            for day in _months(start_date, end_date, transfer_day):
+                transaction(day, "Transfer to savings", transfer_amount, "Transfer", "transfer",
+                            account_id=checking, to_account_id=savings)
+
+            grocery_fund = funds[1][0]
+            grocery_weekday = rng.randint(0, 6)
+            spend = [(category, description, odds, low, high, rng.uniform(0.5, 1.5))
+                     for category, description, odds, low, high in SPENDING]
+            day = start_date
+            while day <= end_date:
+                if day.weekday() == grocery_weekday:
+                    transaction(day, "Grocery store", _money(rng, 60, 220), "Groceries", "expense",
+                                fund_id=grocery_fund)
+                for category, description, odds, low, high, appetite in spend:
+                    if rng.random() < odds * appetite:
+                        transaction(day, description, _money(rng, low, high), category, "expense",
+                                    account_id=card if rng.random() < 0.7 else checking)
+                day += timedelta(days=1)
+
+        writer.flush()
+        _sync_sequences(conn)
+
+    return writer.totals
+
+
+def _insert(conn, table, rows, chunk_size):
+    # executemany compiles one statement from the first row, so every row must
+    # carry the same keys
+    for start in range(0, len(rows), chunk_size):
+        conn.execute(table.insert(), rows[start:start + chunk_size])
+
+
+def build_household(engine, transactions, bills, seed=0, years=3, chunk_size=10_000):
+    """
+    Create one user, household and its accounts, funds, debts, incomes, bills
+    and transactions.
+
+    Args:
+        engine: SQLAlchemy engine with the schema already created
+        transactions: Number of transaction rows to generate
+        bills: Number of bills (a third on autopay, some already due)
+        seed: RNG seed; the same seed always yields the same rows
+        years: How far back the transaction history reaches
+        chunk_size: Rows per executemany batch
+
+    Returns:
+        tuple: (user_id, household_id)
+    """
+    rng = random.Random(seed)
+    today = date.today()
+    now = datetime.utcnow()
+    history_days = 365 * years
+
+    with engine.begin() as conn:
+        user_id = conn.execute(User.__table__.insert().values(
+            username=f"bench{seed}", email=f"bench{seed}@example.com", password="x",
+            name="Bench User", is_verified=True,
+        )).inserted_primary_key[0]
+        household_id = conn.execute(Household.__table__.insert().values(
+            name="Bench Household", created_by=user_id, created_at=now,
+        )).inserted_primary_key[0]
+        conn.execute(User.__table__.update().where(User.id == user_id).values(default_household_id=household_id))
+        conn.execute(user_household.insert().values(
+            user_id=user_id, household_id=household_id, role="owner", joined_at=now,
+        ))
+
+        account_ids = [
+            conn.execute(Account.__table__.insert().values(
+                household_id=household_id, owner_user_id=user_id, name=name, type=kind,
+                institution="Bench Bank", balance=_money(rng, 1000, 20000), is_active=True,
+                created_at=now, updated_at=now,
+            )).inserted_primary_key[0]
+            for name, kind in (("Checking", "checking"), ("Savings", "savings"), ("Card", "credit"))
+        ]
+
+        fund_ids = []
+        for i, fund_type in enumerate(("Expenses", "Savings", "Cash", "Savings")):
+            fund_ids.append(conn.execute(Fund.__table__.insert().values(
+                household_id=household_id, name=f"{fund_type} {i}", fund_type=fund_type,
+                balance=_money(rng, 100, 5000), goal=_money(rng, 5000, 20000),
+                recurring_amount=_money(rng, 25, 200) if i % 2 == 0 else None,
+                next_deposit_date=today - timedelta(days=rng.randint(0, 10)) if i % 2 == 0 else None,
+                skip_next=False, account_id=None if fund_type == "Cash" else account_ids[0],
+                created_at=now,
+            )).inserted_primary_key[0])
+
+        _insert(conn, Debt.__table__, [
+            dict(household_id=household_id, owner_user_id=user_id, name=f"Debt {i}",
+                 total_amount=_money(rng, 2000, 50000), current_balance=_money(rng, 500, 2000),
+                 minimum_payment=_money(rng, 25, 500), interest_rate=rng.uniform(2, 25),
+                 due_date=today + timedelta(days=rng.randint(1, 28)),
+                 category=rng.choice(("Credit Card", "Student Loan", "Auto Loan")),
+                 is_active=True, created_at=now)
+            for i in range(5)
+        ], chunk_size)
+
+        _insert(conn, Income.__table__, [
+            dict(household_id=household_id, date=today - timedelta(days=14 * i),
+                 amount=_money(rng, 1800, 2600), source="Employer", category="Paycheck",
+                 account_id=account_ids[0])
+            for i in range(history_days // 14)
+        ], chunk_size)
+
+        bill_rows = []
+        for i in range(bills):
+            due = today + timedelta(days=rng.randint(-5, 30))
+            bill_rows.append(dict(
+                household_id=household_id, name=f"Bill {i}", amount=_money(rng, 10, 400),
+                due_date=due, next_due_date=due, frequency=rng.choice(FREQUENCIES[1:]),
+                category=rng.choice(BILL_CATEGORIES), is_autopay=i % 3 == 0, is_active=True,
+                account_id=account_ids[0], created_at=now,
+            ))
+        _insert(conn, Bill.__table__, bill_rows, chunk_size)
+
+        rows = []
+        for i in range(transactions):
+            kind = rng.random()
+            row = dict(
+                household_id=household_id, created_by_user_id=user_id,
+                date=today - timedelta(days=rng.randint(0, history_days)),
+                amount=_money(rng, 2, 250), account_id=None, fund_id=None, to_account_id=None,
+                is_recurring=False, frequency=None, next_occurrence=None, is_skipped=False,
+                is_autopay=False, created_at=now,
+            )
+            if kind < 0.8:
+                row.update(description="Card purchase", category=rng.choice(EXPENSE_CATEGORIES),
+                           transaction_type="expense", account_id=rng.choice(account_ids))
+            elif kind < 0.9:
+                row.update(description="Fund spend", category=rng.choice(EXPENSE_CATEGORIES),
+                           transaction_type="expense", fund_id=rng.choice(fund_ids))
+            elif kind < 0.97:
+                row.update(description="Deposit", category="Income", transaction_type="income",
+                           account_id=account_ids[0])
+            else:
+                row.update(description="Transfer", category="Transfer", transaction_type="transfer",
+                           account_id=account_ids[0], to_account_id=account_ids[1])
+            if i < RECURRING_DUE:
+                row.update(is_recurring=True, frequency=rng.choice(FREQUENCIES),
+                           next_occurrence=today - timedelta(days=rng.randint(0, 3)))
+            rows.append(row)
+            if len(rows) >= chunk_size:
+                _insert(conn, Transaction.__table__, rows, chunk_size)
+                rows = []
+        _insert(conn, Transaction.__table__, rows, chunk_size)
+
+    return user_id, household_id
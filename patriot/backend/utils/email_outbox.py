@@ -0,0 +1,365 @@
+# backend/utils/email_outbox.py
+"""
+Email outbox: queue in the request transaction, deliver in the background.
+
+:func:`queue_email` adds an ``email_outbox`` row to the current session, so the
+email commits (or rolls back) with the change that caused it and the request
+never waits on SMTP. An :class:`OutboxWorker` claims due rows in batches and
+sends them over one SMTP connection that stays open between messages and
+batches (closed after MAIL_IDLE_TIMEOUT idle seconds).
+
+Failures are classified the way SMTP does: a 5xx reply marks the row ``dead``
+at once, a 4xx reply retries it with exponential backoff (EMAIL_RETRY_BASE,
+doubling up to EMAIL_RETRY_MAX) until EMAIL_MAX_ATTEMPTS, and an unreachable
+server puts the whole batch back without spending an attempt. Dead rows keep
+their ``last_error`` and can be re-queued with ``flask email-requeue``.
+
+The worker runs as a thread in each web process (EMAIL_WORKER_THREAD, started
+on the first queued email) or on its own with ``flask email-worker``. Claims are
+leased for EMAIL_LEASE_SECONDS, so several workers can share one outbox and a
+crashed worker's batch is picked up again.
+"""
+import logging
+import os
+import smtplib
+import ssl
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from backend.database import db
+from backend.models import EmailOutbox
+from backend.utils.metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+EMAIL_DELIVERIES = Counter(
+    "patriot_email_deliveries_total", "Outbox delivery attempts by email kind and result", ("kind", "result"),
+)
+
+
+class DeliveryUnavailable(Exception):
+    """The SMTP server could not be reached or refused the session."""
+
+
+def build_message(sender, to_email, subject, text_body, html_body=None):
+    """Plain-text email with an optional HTML alternative, as a string."""
+    message = MIMEMultipart("alternative")
+    message["Subject"] = subject
+    message["From"] = sender
+    message["To"] = to_email
+    message.attach(MIMEText(text_body, "plain"))
+    if html_body:
+        message.attach(MIMEText(html_body, "html"))
+    return message.as_string()
+
+
+class SMTPConnection:
+    """One SMTP session reused across messages, reopened when the server drops it."""
+
+    def __init__(self, host, port, username=None, password=None, use_tls=False, use_ssl=False,
+                 timeout=10.0, idle_timeout=30.0):
+        self.host, self.port = host, port
+        self.username, self.password = username, password
+        self.use_tls, self.use_ssl = use_tls, use_ssl
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.connects = 0
+        self._server = None
+        self._last_used = 0.0
+
+    def _connect(self):
+        if not self.host:
+            raise DeliveryUnavailable("MAIL_SERVER not configured")
+        try:
+            if self.use_ssl:
+                server = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout,
+                                          context=ssl.create_default_context())
+            else:
+                server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+                if self.use_tls:
+                    server.starttls(context=ssl.create_default_context())
+            if self.username:
+                server.login(self.username, self.password)
+        except (OSError, smtplib.SMTPException) as e:
+            raise DeliveryUnavailable(f"{self.host}:{self.port}: {e}") from e
+        self._server = server
+        self.connects += 1
+
+    def send(self, sender, to_email, message):
+        """
+        Send one message, connecting or reconnecting as needed.
+
+        Raises:
+            DeliveryUnavailable: no session could be established
+            smtplib.SMTPResponseException / SMTPRecipientsRefused: the server
+                rejected this message (the session stays usable)
+        """
+        self.close_if_idle()
+        for retry in (False, True):
+            if self._server is None:
+                self._connect()
+            try:
+                self._server.sendmail(sender, [to_email], message)
+                self._last_used = time.monotonic()
+                return
+            except (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError,
+                    smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused) as e:
+                # 421 is the server closing the session, not a verdict on this message
+                if isinstance(e, (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused)) \
+                        and _smtp_code(e) != 421:
+                    raise
+                # Servers drop idle sessions; a fresh one gets one more try
+                self.close()
+                if retry:
+                    raise DeliveryUnavailable(str(e)) from e
+
+    def close_if_idle(self):
+        if self._server is not None and time.monotonic() - self._last_used > self.idle_timeout:
+            self.close()
+
+    def close(self):
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except (OSError, smtplib.SMTPException):
+            pass
+        self._server = None
+
+
+def _smtp_code(error):
+    """Reply code of a per-message SMTP rejection."""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return min(code for code, _ in error.recipients.values())
+    return error.smtp_code
+
+
+def queue_email(to_email, subject, text_body, html_body=None, kind="email"):
+    """
+    Add an email to the outbox in the current session.
+
+    The caller commits; the worker is woken once the commit lands.
+
+    Args:
+        to_email: Recipient address
+        subject: Subject line
+        text_body: Plain-text body
+        html_body: Optional HTML alternative
+        kind: Short label for metrics and debugging (e.g. "verification")
+
+    Returns:
+        EmailOutbox: The pending row
+    """
+    from flask import current_app
+    app = current_app._get_current_object()
+    entry = EmailOutbox(kind=kind, to_email=to_email, subject=subject, text_body=text_body,
+                        html_body=html_body, next_attempt_at=datetime.utcnow())
+    db.session.add(entry)
+    worker = get_worker(app) if app.config.get("EMAIL_WORKER_THREAD", True) else None
+    if worker is not None:
+        db.session.info["email_outbox_worker"] = worker
+    return entry
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_worker(session):
+    worker = session.info.pop("email_outbox_worker", None)
+    if worker is not None:
+        worker.start()
+        worker.wake()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_worker(session):
+    session.info.pop("email_outbox_worker", None)
+
+
+class OutboxWorker:
+    """Claims due outbox rows and delivers them over a shared SMTP connection."""
+
+    def __init__(self, app):
+        self.app = app
+        config = app.config
+        self.sender = config.get("MAIL_DEFAULT_SENDER") or config.get("MAIL_USERNAME")
+        self.batch_size = config.get("EMAIL_BATCH_SIZE", 50)
+        self.poll_interval = config.get("EMAIL_POLL_INTERVAL", 5.0)
+        self.max_attempts = config.get("EMAIL_MAX_ATTEMPTS", 8)
+        self.retry_base = config.get("EMAIL_RETRY_BASE", 30.0)
+        self.retry_max = config.get("EMAIL_RETRY_MAX", 3600.0)
+        self.lease = timedelta(seconds=config.get("EMAIL_LEASE_SECONDS", 300))
+        self.connection = SMTPConnection(
+            config.get("MAIL_SERVER"), config.get("MAIL_PORT", 587),
+            username=config.get("MAIL_USERNAME") or None, password=config.get("MAIL_PASSWORD"),
+            use_tls=config.get("MAIL_USE_TLS", False), use_ssl=config.get("MAIL_USE_SSL", False),
+            timeout=config.get("MAIL_TIMEOUT", 10.0), idle_timeout=config.get("MAIL_IDLE_TIMEOUT", 30.0),
+        )
+        self.unavailable_streak = 0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._thread_pid = None
+        self._lock = threading.Lock()
+
+    def _retry_delay(self, attempts):
+        return min(self.retry_base * 2 ** (attempts - 1), self.retry_max)
+
+    def claim(self):
+        """Lease up to batch_size due rows to this call; returns them oldest first."""
+        now = datetime.utcnow()
+        due = [row_id for (row_id,) in db.session.query(EmailOutbox.id)
+               .filter(EmailOutbox.status == 'pending', EmailOutbox.next_attempt_at <= now)
+               .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+               .limit(self.batch_size)]
+        if not due:
+            db.session.rollback()
+            return []
+        token = str(uuid.uuid4())
+        # Conditional on the row still being due, so concurrent workers never share one
+        db.session.execute(
+            db.update(EmailOutbox)
+            .where(EmailOutbox.id.in_(due), EmailOutbox.status == 'pending', EmailOutbox.next_attempt_at <= now)
+            .values(claimed_by=token, next_attempt_at=now + self.lease)
+        )
+        db.session.commit()
+        return EmailOutbox.query.filter_by(claimed_by=token).order_by(EmailOutbox.id).all()
+
+    def deliver_batch(self):
+        """
+        Claim and send one batch. Call inside an app context.
+
+        Returns:
+            dict: counts of ``claimed``, ``sent``, ``retried``, ``dead`` and
+            ``released`` (put back because the server was unavailable)
+        """
+        counts = {"claimed": 0, "sent": 0, "retried": 0, "dead": 0, "released": 0}
+        batch = self.claim()
+        counts["claimed"] = len(batch)
+        for index, entry in enumerate(batch):
+            message = build_message(self.sender, entry.to_email, entry.subject, entry.text_body, entry.html_body)
+            try:
+                self.connection.send(self.sender, entry.to_email, message)
+            except DeliveryUnavailable as e:
+                counts["released"] = self._release(batch[index:], str(e))
+                return counts
+            except smtplib.SMTPException as e:
+                code = _smtp_code(e) if isinstance(e, (smtplib.SMTPResponseException,
+                                                       smtplib.SMTPRecipientsRefused)) else None
+                result = self._failed(entry, code, f"{code or ''} {e}".strip())
+                counts[result] += 1
+                EMAIL_DELIVERIES.inc(kind=entry.kind, result=result)
+                continue
+            entry.status, entry.sent_at, entry.claimed_by = 'sent', datetime.utcnow(), None
+            entry.attempts += 1
+            db.session.commit()
+            counts["sent"] += 1
+            EMAIL_DELIVERIES.inc(kind=entry.kind, result="sent")
+        self.unavailable_streak = 0
+        return counts
+
+    def _failed(self, entry, code, error):
+        entry.attempts += 1
+        entry.last_error = error
+        entry.claimed_by = None
+        if (code is not None and code >= 500) or entry.attempts >= self.max_attempts:
+            entry.status = 'dead'
+            logger.warning(f"Email {entry.id} to {entry.to_email} dead after {entry.attempts} attempts: {error}")
+        else:
+            entry.next_attempt_at = datetime.utcnow() + timedelta(seconds=self._retry_delay(entry.attempts))
+        db.session.commit()
+        return "dead" if entry.status == 'dead' else "retried"
+
+    def _release(self, entries, error):
+        """Put claimed rows back for a later batch without counting an attempt."""
+        self.unavailable_streak += 1
+        retry_at = datetime.utcnow() + timedelta(seconds=self.backoff())
+        for entry in entries:
+            entry.claimed_by, entry.next_attempt_at, entry.last_error = None, retry_at, error
+        db.session.commit()
+        logger.warning(f"SMTP unavailable, {len(entries)} emails deferred: {error}")
+        EMAIL_DELIVERIES.inc(len(entries), kind="all", result="deferred")
+        return len(entries)
+
+    def backoff(self):
+        """Seconds to wait after consecutive unavailable batches."""
+        if not self.unavailable_streak:
+            return 0.0
+        return self._retry_delay(self.unavailable_streak)
+
+    def run(self, once=False):
+        """
+        Deliver until stopped. With ``once``, drain what is due now and return the totals.
+        """
+        totals = {"claimed": 0, "sent": 0, "retried": 0, "dead": 0, "released": 0}
+        while not self._stop.is_set():
+            try:
+                with self.app.app_context():
+                    counts = self.deliver_batch()
+            except Exception:
+                logger.exception("Email outbox batch failed")
+                counts = {"claimed": 0, "released": 1}
+                self.unavailable_streak += 1
+            for key in totals:
+                totals[key] += counts.get(key, 0)
+            if counts["claimed"] == self.batch_size and not counts["released"]:
+                continue  # more may be due
+            if once:
+                break
+            self.connection.close_if_idle()
+            self._wake.wait(self.backoff() if counts["released"] else self.poll_interval)
+            self._wake.clear()
+        self.connection.close()
+        return totals
+
+    def start(self):
+        """Run in a daemon thread (once per process)."""
+        with self._lock:
+            if self._thread_pid == os.getpid() and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run, name="email-outbox", daemon=True)
+            self._thread_pid = os.getpid()
+            self._thread.start()
+
+    def wake(self):
+        self._wake.set()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None and self._thread_pid == os.getpid():
+            self._thread.join(timeout)
+
+
+def get_worker(app):
+    """The app's in-process outbox worker (created, not started, on first use)."""
+    worker = app.extensions.get("email_outbox")
+    if worker is None:
+        worker = app.extensions.setdefault("email_outbox", OutboxWorker(app))
+    return worker
+
+
+def requeue_dead(ids=None):
+    """Move dead rows (all, or ``ids``) back to pending; returns how many."""
+    query = db.update(EmailOutbox).where(EmailOutbox.status == 'dead')
+    if ids:
+        query = query.where(EmailOutbox.id.in_(ids))
+    result = db.session.execute(query.values(
+        status='pending', attempts=0, next_attempt_at=datetime.utcnow(), claimed_by=None
+    ))
+    db.session.commit()
+    return result.rowcount
+
+
+def purge_sent(days=30):
+    """Delete rows sent more than ``days`` ago; returns how many."""
+    result = db.session.execute(
+        db.delete(EmailOutbox).where(EmailOutbox.status == 'sent',
+                                     EmailOutbox.sent_at < datetime.utcnow() - timedelta(days=days))
+    )
+    db.session.commit()
+    return result.rowcount
@@ -1,18 +1,35 @@
 import smtplib
 import ssl
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 from flask import current_app
 import logging
+from backend.utils.email_outbox import build_message, queue_email
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+
+def _deliver(email, subject, text_body, html_body, kind):
+    """
+    Queue the email in the outbox (EMAIL_OUTBOX_ENABLED), or send it now.
+
+    Queued emails commit with the caller's transaction and are sent by the
+    outbox worker; call this before ``db.session.commit()``.
+    """
+    if current_app.config.get('EMAIL_OUTBOX_ENABLED', True):
+        queue_email(email, subject, text_body, html_body, kind=kind)
+        return True
+
+    try:
+        return _send_smtp_email(email, subject, text_body, html_body)
+    except Exception as e:
+        logger.error(f"Failed to send {kind} email to {email}: {str(e)}")
+        return False
+
 def send_verification_email(email, token):
     """
     Send verification email to user.
     In development: logs to console
-    In production: sends via SMTP
+    In production: queued in the email outbox (see _deliver)
     """
     config = current_app.config
     
@@ -62,13 +79,7 @@ def send_verification_email(email, token):
         print("="*60 + "\n")
         return True
     
-    # Production mode: send via SMTP
-    try:
-        return _send_smtp_email(email, subject, text_body, html_body)
-    except Exception as e:
-        logger.error(f"Failed to send verification email to {email}: {str(e)}")
-        # In production, we might want to queue for retry or use a different service
-        return False
+    return _deliver(email, subject, text_body, html_body, "verification")
 
 def _send_smtp_email(to_email, subject, text_body, html_body):
     """Send email via SMTP"""
@@ -81,18 +92,8 @@ def _send_smtp_email(to_email, subject, text_body, html_body):
         print(f"   Subject: {subject}")
         return False
     
-    # Create message
-    message = MIMEMultipart("alternative")
-    message["Subject"] = subject
-    message["From"] = config['MAIL_DEFAULT_SENDER']
-    message["To"] = to_email
-    
-    # Add text and HTML parts
-    text_part = MIMEText(text_body, "plain")
-    html_part = MIMEText(html_body, "html")
-    message.attach(text_part)
-    message.attach(html_part)
-    
+    message = build_message(config['MAIL_DEFAULT_SENDER'], to_email, subject, text_body, html_body)
+
     # Send email
     try:
         # Create secure SSL context
@@ -104,9 +105,9 @@ def _send_smtp_email(to_email, subject, text_body, html_body):
                 server.starttls(context=context)
             
             server.login(config['MAIL_USERNAME'], config['MAIL_PASSWORD'])
-            server.sendmail(config['MAIL_DEFAULT_SENDER'], to_email, message.as_string())
+            server.sendmail(config['MAIL_DEFAULT_SENDER'], to_email, message)
             
-        logger.info(f"Verification email sent successfully to {to_email}")
+        logger.info(f"Email sent successfully to {to_email}")
         return True
         
     except Exception as e:
@@ -118,7 +119,7 @@ def send_password_reset_email(email, token):
     """
     Send password reset email to user.
     In development: logs to console
-    In production: sends via SMTP
+    In production: queued in the email outbox (see _deliver)
     """
     config = current_app.config
     
@@ -171,9 +172,4 @@ def send_password_reset_email(email, token):
         print("="*60 + "\n")
         return True
     
-    # Production mode: send via SMTP
-    try:
-        return _send_smtp_email(email, subject, text_body, html_body)
-    except Exception as e:
-        logger.error(f"Failed to send password reset email to {email}: {str(e)}")
-        return False
+    return _deliver(email, subject, text_body, html_body, "password_reset")
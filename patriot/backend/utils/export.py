@@ -0,0 +1,180 @@
+# backend/utils/export.py
+"""
+Columnar export of household data for analytics.
+
+:func:`record_batches` streams a table as Arrow record batches of at most
+``batch_size`` rows, read from the database with ``yield_per``, so memory stays
+the same however large the table is. Column types carry over. Money becomes
+``decimal128(19, 2)`` dollars, which is exact for any BIGINT of cents. Dates
+become ``date32`` and timestamps ``timestamp[us]``. The transactions table
+includes archived transactions.
+
+``flask export-parquet`` writes one Parquet file per table with
+:func:`write_parquet`. ``GET /api/export/arrow`` sends one table as an Arrow IPC
+stream built by :func:`arrow_stream`.
+
+pyarrow is an optional dependency. Only this module imports it, when an export
+runs, and it raises :class:`ExportUnavailable` when pyarrow is missing.
+"""
+import io
+import os
+from decimal import Decimal
+from sqlalchemy import BigInteger, Boolean, Date, DateTime, Float, Integer, select, type_coerce
+from backend.database import db
+from backend.models import Account, ArchivedTransaction, Bill, Debt, Fund, Income, Transaction
+from backend.utils.archive import reaches_archive
+from backend.utils.money import MoneyType
+
+# Exported table name -> models whose rows it holds, in order
+EXPORT_TABLES = {
+    "accounts": (Account,),
+    "funds": (Fund,),
+    "bills": (Bill,),
+    "debts": (Debt,),
+    "incomes": (Income,),
+    "transactions": (Transaction, ArchivedTransaction),
+}
+
+
+class ExportUnavailable(RuntimeError):
+    """pyarrow is not installed."""
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.parquet
+    except ImportError as exc:
+        raise ExportUnavailable("Parquet/Arrow export needs pyarrow (pip install pyarrow)") from exc
+    return pyarrow
+
+
+def _arrow_type(pa, column_type):
+    if isinstance(column_type, MoneyType):
+        return pa.decimal128(19, 2)
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+    if isinstance(column_type, Integer):
+        return pa.int64()
+    if isinstance(column_type, Float):
+        return pa.float64()
+    if isinstance(column_type, DateTime):
+        return pa.timestamp("us")
+    if isinstance(column_type, Date):
+        return pa.date32()
+    return pa.string()
+
+
+def _columns(table):
+    return EXPORT_TABLES[table][0].__table__.columns
+
+
+def table_schema(table):
+    """Arrow schema of an exported table."""
+    pa = _pyarrow()
+    return pa.schema([
+        pa.field(column.name, _arrow_type(pa, column.type), nullable=column.nullable)
+        for column in _columns(table)
+    ])
+
+
+def _array(pa, values, field):
+    if pa.types.is_decimal(field.type):
+        # Cents to dollars in one vectorized step: decimal(19, 0) * 0.01 is exact
+        cents = pa.compute.cast(pa.array(values, pa.int64()), pa.decimal128(19, 0))
+        dollars = pa.compute.multiply(cents, pa.scalar(Decimal("0.01"), pa.decimal128(3, 2)))
+        return pa.compute.cast(dollars, field.type)
+    return pa.array(values, type=field.type)
+
+
+def record_batches(table, household_id=None, batch_size=50_000):
+    """
+    Stream an exported table as Arrow record batches, in id order.
+
+    Args:
+        table: Key of EXPORT_TABLES
+        household_id: Only this household's rows (default: every household)
+        batch_size: Rows per batch, and per database fetch
+
+    Yields:
+        pyarrow.RecordBatch
+    """
+    pa = _pyarrow()
+    schema = table_schema(table)
+    columns = _columns(table)
+    for model in EXPORT_TABLES[table]:
+        if model is ArchivedTransaction and household_id is not None and not reaches_archive(household_id):
+            continue
+        source = model.__table__
+        # Money as raw cents, converted per batch rather than per row
+        query = select(*(
+            type_coerce(source.c[column.name], BigInteger()) if isinstance(column.type, MoneyType)
+            else source.c[column.name]
+            for column in columns
+        )).order_by(source.c.id)
+        if household_id is not None:
+            query = query.where(source.c.household_id == household_id)
+        for rows in db.session.execute(query.execution_options(yield_per=batch_size)).partitions():
+            yield pa.record_batch(
+                [_array(pa, values, field) for values, field in zip(zip(*rows), schema)], schema=schema
+            )
+
+
+def write_parquet(directory, household_id=None, tables=None, batch_size=50_000, compression="zstd"):
+    """
+    Write exported tables to ``<directory>/<table>.parquet``, one row group per batch.
+
+    Args:
+        directory: Output directory (created if missing)
+        household_id: Only this household's rows (default: every household)
+        tables: Keys of EXPORT_TABLES (default: all)
+        batch_size: Rows per batch and row group
+        compression: Parquet codec
+
+    Returns:
+        dict: table -> rows written
+    """
+    pa = _pyarrow()
+    os.makedirs(directory, exist_ok=True)
+    counts = {}
+    for table in tables or EXPORT_TABLES:
+        counts[table] = 0
+        with pa.parquet.ParquetWriter(os.path.join(directory, f"{table}.parquet"), table_schema(table),
+                                      compression=compression) as writer:
+            for batch in record_batches(table, household_id, batch_size):
+                writer.write_batch(batch)
+                counts[table] += batch.num_rows
+    return counts
+
+
+def arrow_stream(table, household_id, batch_size=50_000):
+    """
+    An exported table as Arrow IPC stream bytes, one chunk per record batch.
+
+    Raises ExportUnavailable right away (not on first iteration) when pyarrow is
+    missing, so a view can still answer with an error.
+
+    Returns:
+        iterator of bytes
+    """
+    pa = _pyarrow()
+    schema = table_schema(table)
+
+    def chunks():
+        sink = io.BytesIO()
+        writer = pa.ipc.new_stream(sink, schema)
+        for batch in record_batches(table, household_id, batch_size):
+            writer.write_batch(batch)
+            yield _drain(sink)
+        writer.close()
+        yield _drain(sink)
+
+    return chunks()
+
+
+def _drain(sink):
+    data = sink.getvalue()
+    sink.seek(0)
+    sink.truncate()
+    return data
@@ -1,12 +1,19 @@
 # backend/utils/forecasting.py
-from datetime import datetime, date, timedelta
+"""
+Cash-flow forecasts. Balances are projected in whole cents and only turned into
+dollars for the response, so long projections don't accumulate float error.
+"""
+from datetime import date, timedelta
 from dateutil.relativedelta import relativedelta
 from backend.models.bill import Bill
 from backend.models.fund import Fund
 from backend.models.income import Income
 from backend.database import db
+from backend.utils.metrics import FORECAST_DURATION, timed
+from backend.utils.money import Money, to_cents
 
 
+@timed(FORECAST_DURATION, function="generate_forecast")
 def generate_forecast(household_id, start_date=None, months_to_project=3, buffer=100):
     """
     Generate a comprehensive financial forecast for the household.
@@ -38,9 +45,10 @@ def generate_forecast(household_id, start_date=None, months_to_project=3, buffer
     # Get household's income sources (Income model doesn't have is_active field)
     incomes = Income.query.filter_by(household_id=household_id).all()
 
-    # Calculate starting balance (sum of all cash funds)
+    # Calculate starting balance (sum of all cash funds), in cents
     cash_funds = Fund.query.filter_by(household_id=household_id, fund_type="Cash").all()
-    starting_balance = sum(fund.balance for fund in cash_funds)
+    starting_balance = sum((fund.balance for fund in cash_funds), Money()).cents
+    buffer = to_cents(buffer)
 
     # Generate projection events
     projection_events = []
@@ -84,18 +92,18 @@ def generate_forecast(household_id, start_date=None, months_to_project=3, buffer
                 "date": event["date"].isoformat(),
                 "event": event["description"],
                 "type": event["type"],
-                "amount": event["amount"],
-                "expected_balance": round(current_balance, 2),
+                "amount": event["amount"] / 100,
+                "expected_balance": current_balance / 100,
             }
         )
 
     # Calculate summary statistics
     expected_minimum = min_balance
     actual_minimum = min_balance - buffer
-    extra_payment_needed = max(0, buffer - min_balance) if min_balance < buffer else 0
+    extra_payment_needed = buffer - min_balance if min_balance < buffer else 0
 
     # Calculate buffer status
-    if min_balance >= buffer * 1.5:
+    if 2 * min_balance >= 3 * buffer:
         buffer_status = "OK"
     elif min_balance >= buffer:
         buffer_status = "Warning"
@@ -108,22 +116,22 @@ def generate_forecast(household_id, start_date=None, months_to_project=3, buffer
     # Calculate expected balance at next pay cycle
     next_pay_date = _get_next_pay_date(incomes, start_date)
     expected_balance_next_pay = _calculate_balance_at_date(
-        projection_events, next_pay_date, starting_balance
+        all_events, next_pay_date, starting_balance
     )
 
     return {
         "projection": projection_events,
         "summary": {
-            "starting_balance": round(starting_balance, 2),
-            "expected_minimum": round(expected_minimum, 2),
-            "actual_minimum": round(actual_minimum, 2),
-            "extra_payment_needed": round(extra_payment_needed, 2),
+            "starting_balance": starting_balance / 100,
+            "expected_minimum": expected_minimum / 100,
+            "actual_minimum": actual_minimum / 100,
+            "extra_payment_needed": extra_payment_needed / 100 if extra_payment_needed else 0,
             "buffer_status": buffer_status,
             "min_balance_date": min_balance_date.isoformat(),
             "upcoming_bills": upcoming_bills,
             "next_pay_date": next_pay_date.isoformat() if next_pay_date else None,
             "expected_balance_next_pay": (
-                round(expected_balance_next_pay, 2)
+                expected_balance_next_pay / 100
                 if expected_balance_next_pay
                 else None
             ),
@@ -132,7 +140,7 @@ def generate_forecast(household_id, start_date=None, months_to_project=3, buffer
 
 
 def _generate_bill_events(bill, start_date, end_date):
-    """Generate bill payment events within the date range"""
+    """Generate bill payment events (amounts in cents) within the date range"""
     events = []
     current_date = bill.calculate_next_due_date(start_date)
 
@@ -142,7 +150,7 @@ def _generate_bill_events(bill, start_date, end_date):
                 "date": current_date,
                 "description": f"{bill.name} (Bill)",
                 "type": "bill_payment",
-                "amount": -float(bill.amount),
+                "amount": -bill.amount.cents,
                 "bill_id": bill.id,
             }
         )
@@ -166,7 +174,7 @@ def _generate_bill_events(bill, start_date, end_date):
 
 
 def _generate_fund_events(fund, start_date, end_date):
-    """Generate fund deposit events within the date range"""
+    """Generate fund deposit events (amounts in cents) within the date range"""
     events = []
     current_date = fund.next_deposit_date
 
@@ -181,9 +189,7 @@ def _generate_fund_events(fund, start_date, end_date):
                 "date": current_date,
                 "description": f"{fund.name} Deposit",
                 "type": "fund_deposit",
-                "amount": -float(
-                    fund.recurring_amount
-                ),  # Negative because it's leaving cash
+                "amount": -fund.recurring_amount.cents,  # Negative because it's leaving cash
                 "fund_id": fund.id,
             }
         )
@@ -195,7 +201,7 @@ def _generate_fund_events(fund, start_date, end_date):
 
 
 def _generate_income_events(income, start_date, end_date):
-    """Generate income events within the date range"""
+    """Generate income events (amounts in cents) within the date range"""
     events = []
 
     # For now, assume biweekly income based on the existing income model
@@ -212,7 +218,7 @@ def _generate_income_events(income, start_date, end_date):
                 "date": current_date,
                 "description": f"{income.source} (Income)",
                 "type": "income",
-                "amount": float(income.amount),
+                "amount": income.amount.cents,
                 "income_id": income.id,
             }
         )
@@ -259,15 +265,14 @@ def _get_next_pay_date(incomes, start_date):
     return current_date
 
 
-def _calculate_balance_at_date(projection_events, target_date, starting_balance):
-    """Calculate expected balance at a specific date"""
+def _calculate_balance_at_date(events, target_date, starting_balance):
+    """Calculate expected balance in cents at a specific date from date-sorted events"""
     if not target_date:
         return None
 
     balance = starting_balance
-    for event in projection_events:
-        event_date = datetime.fromisoformat(event["date"]).date()
-        if event_date <= target_date:
+    for event in events:
+        if event["date"] <= target_date:
             balance += event["amount"]
         else:
             break
@@ -275,6 +280,7 @@ def _calculate_balance_at_date(projection_events, target_date, starting_balance)
     return balance
 
 
+@timed(FORECAST_DURATION, function="get_bill_schedule_summary")
 def get_bill_schedule_summary(household_id, start_date=None, days=30):
     """
     Get a simple bill schedule for the next N days.
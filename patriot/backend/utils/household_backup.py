@@ -0,0 +1,515 @@
+# backend/utils/household_backup.py
+"""
+Household backup and restore.
+
+A backup is one gzip-compressed JSON Lines stream:
+
+- a header line: format and version, the household, its members (users
+  without passwords or tokens, plus their roles), the column names of every
+  table, and the id ranges restore needs to remap ids
+- one line per chunk of up to ``batch_size`` rows:
+  ``{"table": ..., "rows": [[...], ...]}``. Money is in whole cents, dates and
+  timestamps are ISO strings.
+
+:func:`backup_chunks` reads with ``yield_per`` and yields compressed bytes as
+it goes, so memory and time to first byte stay flat for any household size.
+
+:func:`restore_backup` always creates a new household and never overwrites
+one, so the same file can clone a household within one database or move it to
+another. Everything happens in one database transaction and is bulk-inserted
+one chunk at a time. Files are untrusted input, so rows are checked against
+the header and every reference must stay inside the backup:
+
+- accounts, funds and bills get a dense block of ids above the target's
+  current maximum, in the order the header lists them; rows must bring
+  exactly those ids, in that order
+- transactions and archived transactions share one id space, so both are
+  numbered densely from one block in the order their rows arrive (sorted by
+  id, so parents come before their children), the header spans must match
+  the rows, and the id counter of ``transactions`` is moved past the block
+  (see backend/utils/archive.py)
+- the other tables get fresh ids
+- a reference to a row that is not in the backup rejects the file
+- from the CLI, members are matched to existing users by email and, with
+  ``create_users``, missing ones are created without a usable password.
+  Through the API the caller is the only member and no other user is linked.
+
+On SQLite the restored rows are added to the search index in one statement per
+table instead of by the per-row triggers (see
+:func:`backend.utils.search.deferred_index`).
+"""
+import gzip
+import io
+import json
+import secrets
+from contextlib import ExitStack
+from datetime import date, datetime
+from sqlalchemy import BigInteger, Date, DateTime, column, func, insert, select, text, type_coerce
+from sqlalchemy import table as table_clause
+from backend.database import db
+from backend.models import (
+    Account, ArchivedTransaction, Bill, Debt, Fund, Household, HouseholdInvite, Income, Transaction,
+    TransactionPeriodSummary, User, user_household,
+)
+from backend.utils.membership import invalidate_user
+from backend.utils.money import MoneyType
+from backend.utils.passwords import hash_password
+from backend.utils.search import SEARCHABLE, deferred_index
+
+FORMAT = "patriot-household-backup"
+VERSION = 1
+
+# Restored in this order, so referenced rows always come first
+TABLES = (Account, Fund, Bill, Debt, Income, Transaction, ArchivedTransaction, TransactionPeriodSummary,
+          HouseholdInvite)
+
+# Tables whose ids are kept (plus an offset) because other rows reference them
+KEPT_IDS = ("accounts", "funds", "bills")
+TRANSACTION_TABLES = ("transactions", "transactions_archive")
+
+# Reference column -> table it points to
+REFERENCES = {
+    "account_id": "accounts",
+    "to_account_id": "accounts",
+    "fund_id": "funds",
+    "to_fund_id": "funds",
+    "bill_id": "bills",
+}
+USER_REFERENCES = ("owner_user_id", "created_by_user_id", "inviter_id")
+USER_COLUMNS = ("id", "username", "email", "name", "theme", "is_verified", "created_at")
+
+# Longest line restore reads; a chunk of BACKUP_BATCH_SIZE rows is far below it
+MAX_LINE_BYTES = 64 * 2**20
+
+
+class BackupError(ValueError):
+    """The file is not a household backup this version can restore."""
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"cannot serialize {type(value).__name__}")
+
+
+def _line(data):
+    return (json.dumps(data, default=_json_default, separators=(",", ":")) + "\n").encode()
+
+
+def _selected(model):
+    # Money as raw cents rather than Money objects
+    return [
+        type_coerce(c, BigInteger()) if isinstance(c.type, MoneyType) else c
+        for c in model.__table__.columns
+    ]
+
+
+def _header(household_id):
+    household = db.session.get(Household, household_id)
+    if household is None:
+        raise BackupError(f"household {household_id} does not exist")
+    members = db.session.execute(
+        select(user_household.c.user_id, user_household.c.role, user_household.c.joined_at)
+        .where(user_household.c.household_id == household_id)
+    ).all()
+    users = db.session.execute(
+        select(*(User.__table__.c[name] for name in USER_COLUMNS))
+        .where(User.id.in_([user_id for user_id, _, _ in members]))
+    ).all()
+
+    ids = {}
+    for name in KEPT_IDS:
+        model = next(m for m in TABLES if m.__tablename__ == name)
+        ids[name] = db.session.execute(
+            select(model.id).where(model.household_id == household_id).order_by(model.id)
+        ).scalars().all()
+    spans = {}
+    for model in (Transaction, ArchivedTransaction):
+        spans[model.__tablename__] = list(db.session.query(func.min(model.id), func.max(model.id))
+                                          .filter(model.household_id == household_id).one())
+    # Live parents of archived rows; every other parent is in the same table as its child
+    live_parents = db.session.execute(
+        select(Transaction.id).distinct()
+        .join(ArchivedTransaction, ArchivedTransaction.parent_transaction_id == Transaction.id)
+        .where(ArchivedTransaction.household_id == household_id)
+    ).scalars().all()
+
+    return {
+        "format": FORMAT,
+        "version": VERSION,
+        "created_at": datetime.utcnow(),
+        "household": {"id": household.id, "name": household.name, "created_by": household.created_by,
+                      "created_at": household.created_at},
+        "users": [dict(zip(USER_COLUMNS, user)) for user in users],
+        "members": [{"user_id": user_id, "role": role, "joined_at": joined_at}
+                    for user_id, role, joined_at in members],
+        "columns": {model.__tablename__: [c.name for c in model.__table__.columns] for model in TABLES},
+        "ids": ids,
+        "spans": spans,
+        "live_parents": live_parents,
+    }
+
+
+def backup_chunks(household_id, batch_size=10_000, compresslevel=6):
+    """
+    A household's backup as gzip-compressed bytes, one chunk per batch of rows.
+
+    Reads the header right away, so a missing household raises before anything
+    is sent.
+
+    Args:
+        household_id: Household to back up
+        batch_size: Rows per line and per database fetch
+        compresslevel: gzip level
+
+    Returns:
+        iterator of bytes
+
+    Raises:
+        BackupError: the household does not exist
+    """
+    header = _line(_header(household_id))
+
+    def chunks():
+        buffer = io.BytesIO()
+        with gzip.GzipFile(fileobj=buffer, mode="wb", compresslevel=compresslevel) as archive:
+            archive.write(header)
+            for model in TABLES:
+                query = select(*_selected(model)).where(model.household_id == household_id).order_by(model.id)
+                for rows in db.session.execute(query.execution_options(yield_per=batch_size)).partitions():
+                    archive.write(_line({"table": model.__tablename__, "rows": [list(row) for row in rows]}))
+                    yield _drain(buffer)
+        yield _drain(buffer)
+
+    return chunks()
+
+
+def write_backup(path, household_id, batch_size=10_000):
+    """
+    Write a household's backup to ``path``.
+
+    Returns:
+        int: bytes written
+    """
+    written = 0
+    with open(path, "wb") as out:
+        for chunk in backup_chunks(household_id, batch_size):
+            out.write(chunk)
+            written += len(chunk)
+    return written
+
+
+def _drain(buffer):
+    data = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return data
+
+
+def _next_id(connection, *models):
+    return max(connection.execute(select(func.coalesce(func.max(m.id), 0))).scalar() for m in models) + 1
+
+
+def _restore_users(header, create_users):
+    """Map backup user ids to users here: by email, else created (or skipped)."""
+    emails = {user["email"]: user for user in header["users"]}
+    existing = dict(db.session.query(User.email, User.id).filter(User.email.in_(emails)))
+    user_map = {}
+    created = []
+    password = None
+    for email, user in emails.items():
+        if email in existing:
+            user_map[user["id"]] = existing[email]
+            continue
+        if not create_users:
+            continue
+        if password is None:
+            # Nobody knows this password; restored users set theirs with a reset
+            password = hash_password(secrets.token_urlsafe(32))
+        username, suffix = user["username"], 1
+        while User.query.filter_by(username=username).first() is not None:
+            suffix += 1
+            username = f"{user['username']}-{suffix}"
+        new_user = User(
+            username=username, email=email, password=password, name=user["name"], theme=user["theme"],
+            is_verified=user["is_verified"],
+            created_at=datetime.fromisoformat(user["created_at"]) if user["created_at"] else None,
+        )
+        db.session.add(new_user)
+        db.session.flush()
+        user_map[user["id"]] = new_user.id
+        created.append(new_user)
+    return user_map, created
+
+
+def _converters(model, columns, remap):
+    """Per-column functions turning backup values into insertable ones (None: unchanged)."""
+    types = model.__table__.c
+    converters = []
+    for name in columns:
+        if name not in types:
+            raise BackupError(f"{model.__tablename__}.{name} does not exist in this database")
+        if name in remap:
+            converters.append(remap[name])
+        elif isinstance(types[name].type, DateTime):
+            converters.append(lambda v: datetime.fromisoformat(v) if v is not None else None)
+        elif isinstance(types[name].type, Date):
+            converters.append(lambda v: date.fromisoformat(v) if v is not None else None)
+        else:
+            converters.append(None)
+    return converters
+
+
+def _read_line(lines):
+    line = lines.readline(MAX_LINE_BYTES + 1)
+    if len(line) > MAX_LINE_BYTES:
+        raise BackupError(f"backup line longer than {MAX_LINE_BYTES} bytes")
+    return line
+
+
+def _check_header(header):
+    """Reject headers whose id lists and spans restore can't trust."""
+    try:
+        for table in KEPT_IDS:
+            ids = header["ids"][table]
+            if not isinstance(ids, list) or not all(_is_id(i) for i in ids) \
+                    or any(a >= b for a, b in zip(ids, ids[1:])):
+                raise BackupError(f"header ids of {table} are not sorted, distinct ids")
+        for table in TRANSACTION_TABLES:
+            span = header["spans"][table]
+            if span != [None, None] and not (isinstance(span, list) and len(span) == 2
+                                             and all(_is_id(i) for i in span) and span[0] <= span[1]):
+                raise BackupError(f"header span of {table} is not an id range")
+        if set(header["columns"]) - {model.__tablename__ for model in TABLES}:
+            raise BackupError("header lists tables this database doesn't have")
+        if not all(isinstance(columns, list) and "id" in columns and all(isinstance(c, str) for c in columns)
+                   for columns in header["columns"].values()):
+            raise BackupError("header columns are not lists of names with an id")
+        if {"name", "created_by", "created_at"} - set(header["household"]) \
+                or not isinstance(header["users"], list) or not isinstance(header["members"], list):
+            raise BackupError("backup header is incomplete")
+    except (KeyError, TypeError, AttributeError) as exc:
+        raise BackupError("backup header is incomplete") from exc
+
+
+def _is_id(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+class _IdBlock:
+    """
+    New ids for one or more tables, handed out densely from ``start``.
+
+    With ``expected`` (ids listed in the header) the mapping is fixed up front
+    and rows must bring exactly those ids; otherwise ids are numbered in the
+    order rows arrive. References resolve only to ids of rows in the backup.
+    """
+
+    def __init__(self, start, expected=None):
+        self.start = start
+        self.new = {old: start + i for i, old in enumerate(expected)} if expected is not None else {}
+        self.fixed = expected is not None
+        self.seen = 0
+
+    def assign(self, old):
+        if self.fixed:
+            if not _is_id(old) or self.new.get(old) != self.start + self.seen:
+                raise BackupError(f"row id {old!r} is not the next id listed in the header")
+        else:
+            if not _is_id(old) or old in self.new:
+                raise BackupError(f"row id {old!r} is repeated or not an id")
+            self.new[old] = self.start + self.seen
+        self.seen += 1
+        return self.new[old]
+
+    def reference(self, old):
+        if old is None:
+            return None
+        if not _is_id(old) or old not in self.new:
+            raise BackupError(f"reference to id {old!r}, which is not in the backup")
+        return self.new[old]
+
+
+def restore_backup(stream, name=None, create_users=False, owner_id=None, batch_size=10_000):
+    """
+    Restore a backup into a new household, in one database transaction.
+
+    Args:
+        stream: Binary file object with the gzip-compressed backup
+        name: Name of the new household (default: the backed-up name)
+        create_users: Create members with no account here (CLI); otherwise they are left out
+        owner_id: Make this user (the API caller) the only member, as owner, and
+            link no other user; members in the file are then ignored
+        batch_size: Rows per bulk insert
+
+    Returns:
+        dict: {"household_id": ..., "users_created": ..., "members": ..., "<table>": rows restored}
+
+    Raises:
+        BackupError: not a backup, a newer version, columns this database lacks,
+            or rows that don't match the header or reference rows outside the backup
+    """
+    lines = gzip.GzipFile(fileobj=stream, mode="rb")
+    try:
+        header = json.loads(_read_line(lines) or b"{}")
+    except (OSError, EOFError, ValueError) as exc:
+        raise BackupError("not a household backup") from exc
+    if not isinstance(header, dict) or header.get("format") != FORMAT:
+        raise BackupError("not a household backup")
+    if header.get("version", 0) > VERSION:
+        raise BackupError(f"backup version {header['version']} is newer than this server's ({VERSION})")
+    _check_header(header)
+
+    connection = db.session.connection()
+    postgresql = connection.dialect.name == "postgresql"
+    counts = {"household_id": None}
+    try:
+        if postgresql:
+            # Nobody else may take ids inside the blocks reserved below
+            connection.execute(text("LOCK TABLE accounts, funds, bills, transactions, transactions_archive "
+                                    "IN SHARE ROW EXCLUSIVE MODE"))
+
+        if owner_id is None:
+            user_map, created = _restore_users(header, create_users)
+        else:
+            user_map, created = {}, []
+        source = header["household"]
+        fallback = owner_id or user_map.get(source["created_by"]) or next(iter(user_map.values()), None)
+        if fallback is None:
+            raise BackupError("no member of the backed-up household has an account here")
+        household = Household(
+            name=name or source["name"], created_by=user_map.get(source["created_by"], fallback),
+            created_at=datetime.fromisoformat(source["created_at"]) if source["created_at"] else datetime.utcnow(),
+        )
+        db.session.add(household)
+        db.session.flush()
+        counts["household_id"] = household.id
+
+        members = {}
+        if owner_id is not None:
+            members[owner_id] = ("owner", datetime.utcnow())
+        else:
+            for member in header["members"]:
+                if member["user_id"] in user_map:
+                    members[user_map[member["user_id"]]] = (
+                        member["role"],
+                        datetime.fromisoformat(member["joined_at"]) if member["joined_at"] else None,
+                    )
+        if members:
+            connection.execute(user_household.insert(), [
+                {"user_id": user_id, "household_id": household.id, "role": role, "joined_at": joined_at}
+                for user_id, (role, joined_at) in members.items()
+            ])
+        for user in created:
+            user.default_household_id = household.id
+        db.session.flush()
+        counts["users_created"] = len(created)
+        counts["members"] = len(members)
+
+        # Id blocks above everything already here
+        models = {model.__tablename__: model for model in TABLES}
+        blocks = {table: _IdBlock(_next_id(connection, models[table]), header["ids"][table]) for table in KEPT_IDS}
+        transaction_ids = _IdBlock(_next_id(connection, Transaction, ArchivedTransaction))
+
+        def user_reference(v):
+            return user_map.get(v)
+
+        remaps = {}
+        for table, model in models.items():
+            remap = {"household_id": lambda v, new=household.id: new}
+            remap.update({name: blocks[target].reference for name, target in REFERENCES.items()})
+            remap.update({name: user_reference for name in USER_REFERENCES})
+            if table in KEPT_IDS:
+                remap["id"] = blocks[table].assign
+            elif table in TRANSACTION_TABLES:
+                remap["id"] = transaction_ids.assign
+                remap["parent_transaction_id"] = transaction_ids.reference
+            if table == "household_invites":
+                remap["inviter_id"] = lambda v: user_map.get(v, household.created_by)
+                # Tokens are secrets of the original invites
+                remap["token"] = lambda v: secrets.token_urlsafe(32)
+            remaps[table] = remap
+
+        plans = {}
+        for table, columns in header["columns"].items():
+            model = models[table]
+            keep = [i for i, name in enumerate(columns) if name != "id" or table in KEPT_IDS + TRANSACTION_TABLES]
+            names = [columns[i] for i in keep]
+            converters = _converters(model, names, remaps[table])
+            # Money goes in as raw cents, like it came out
+            target = table_clause(table, *(
+                column(name, BigInteger() if isinstance(model.__table__.c[name].type, MoneyType)
+                       else model.__table__.c[name].type)
+                for name in names
+            ))
+            plans[table] = (keep, names, converters, insert(target), columns.index("id"))
+            counts[table] = 0
+
+        # Id range of each transaction table's rows, to hold against the header spans
+        observed = {table: [None, None] for table in TRANSACTION_TABLES}
+        with ExitStack() as stack:
+            # The household is new, so its search index can be built once at the end
+            for table in SEARCHABLE:
+                stack.enter_context(deferred_index(connection, table, household.id))
+            while True:
+                raw = _read_line(lines)
+                if not raw:
+                    break
+                chunk = json.loads(raw)
+                if not isinstance(chunk, dict) or chunk.get("table") not in plans:
+                    raise BackupError(f"unexpected table {chunk.get('table') if isinstance(chunk, dict) else None!r} "
+                                      f"in backup")
+                table = chunk["table"]
+                keep, names, converters, statement, id_index = plans[table]
+                if not isinstance(chunk.get("rows"), list):
+                    raise BackupError(f"malformed {table} chunk in backup")
+                rows = []
+                for row in chunk["rows"]:
+                    if not isinstance(row, list) or len(row) != len(header["columns"][table]):
+                        raise BackupError(f"malformed {table} row in backup")
+                    if table in observed:
+                        span = observed[table]
+                        if span[1] is not None and not (_is_id(row[id_index]) and row[id_index] > span[1]):
+                            raise BackupError(f"{table} rows are not sorted by id")
+                        span[0] = row[id_index] if span[0] is None else span[0]
+                        span[1] = row[id_index]
+                    values = [row[i] for i in keep]
+                    for i, convert in enumerate(converters):
+                        if convert is not None:
+                            values[i] = convert(values[i])
+                    rows.append(dict(zip(names, values)))
+                for start in range(0, len(rows), batch_size):
+                    connection.execute(statement, rows[start:start + batch_size])
+                counts[table] += len(rows)
+
+        for table in KEPT_IDS:
+            if blocks[table].seen != len(header["ids"][table]):
+                raise BackupError(f"the header lists {len(header['ids'][table])} {table}, "
+                                  f"the backup has {blocks[table].seen}")
+        for table in TRANSACTION_TABLES:
+            if observed[table] != header["spans"][table]:
+                raise BackupError(f"{table} ids {observed[table]} don't match the header span "
+                                  f"{header['spans'][table]}")
+
+        if postgresql:
+            # Explicit ids don't advance the sequences
+            for table, in_use in (("accounts", (Account,)), ("funds", (Fund,)), ("bills", (Bill,)),
+                                  ("transactions", (Transaction, ArchivedTransaction))):
+                connection.execute(text(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), :last)"),
+                                   {"last": _next_id(connection, *in_use) - 1 or 1})
+        elif connection.dialect.name == "sqlite":
+            # AUTOINCREMENT only follows ids inserted into transactions itself
+            last = _next_id(connection, Transaction, ArchivedTransaction) - 1
+            if not connection.execute(text("UPDATE sqlite_sequence SET seq = max(seq, :last) "
+                                           "WHERE name = 'transactions'"), {"last": last}).rowcount:
+                connection.execute(text("INSERT INTO sqlite_sequence (name, seq) VALUES ('transactions', :last)"),
+                                   {"last": last})
+        db.session.commit()
+        invalidate_user(*members)
+    except (OSError, EOFError, json.JSONDecodeError) as exc:
+        db.session.rollback()
+        raise BackupError("backup is truncated or corrupt") from exc
+    except Exception:
+        db.session.rollback()
+        raise
+    return counts
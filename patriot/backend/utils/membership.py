@@ -0,0 +1,174 @@
+# backend/utils/membership.py
+"""
+Cached household membership for authorization checks.
+
+Each entry maps a user ID to the user's default household and a
+``{household_id: role}`` dict, loaded with one query on a miss. Entries live
+for MEMBERSHIP_CACHE_TTL seconds and the least recently used entry is evicted
+beyond MEMBERSHIP_CACHE_SIZE. Routes that change membership call
+:func:`invalidate_user` / :func:`invalidate_household` after committing; other
+workers pick the change up when their entry expires.
+"""
+import functools
+import os
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from flask import g, jsonify
+from flask_jwt_extended import get_jwt, get_jwt_identity
+from backend.database import db
+from backend.models import Household, User, user_household
+
+Membership = namedtuple("Membership", ["user_id", "default_household_id", "roles"])
+
+
+class MembershipCache:
+    """Thread-safe LRU of :class:`Membership` entries with a per-entry TTL."""
+
+    def __init__(self, maxsize=10_000, ttl=60.0, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        """Return the cached entry for ``user_id`` or None if absent/expired."""
+        with self._lock:
+            item = self._entries.get(user_id)
+            if item is None or item[0] <= self._clock():
+                if item is not None:
+                    del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return item[1]
+
+    def set(self, membership):
+        if not self.enabled or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[membership.user_id] = (self._clock() + self.ttl, membership)
+            self._entries.move_to_end(membership.user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *user_ids):
+        with self._lock:
+            for user_id in user_ids:
+                self._entries.pop(int(user_id), None)
+
+    def invalidate_household(self, household_id):
+        """Drop every entry that references ``household_id``."""
+        with self._lock:
+            stale = [
+                user_id for user_id, (_, membership) in self._entries.items()
+                if household_id in membership.roles or membership.default_household_id == household_id
+            ]
+            for user_id in stale:
+                del self._entries[user_id]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+CACHE = MembershipCache()
+
+# A forked worker must not trust entries loaded by its parent
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=CACHE.clear)
+
+
+def init_membership_cache(app):
+    """Size the cache from config and start it empty."""
+    CACHE.maxsize = app.config.get("MEMBERSHIP_CACHE_SIZE", 10_000)
+    CACHE.ttl = app.config.get("MEMBERSHIP_CACHE_TTL", 60.0)
+    CACHE.enabled = app.config.get("MEMBERSHIP_CACHE_ENABLED", True)
+    CACHE.clear()
+
+
+def _load_membership(user_id):
+    rows = db.session.execute(
+        db.select(User.default_household_id, user_household.c.household_id, user_household.c.role)
+        .outerjoin(user_household, user_household.c.user_id == User.id)
+        .where(User.id == user_id)
+    ).all()
+    if not rows:
+        return None
+    roles = {household_id: role or "member" for _, household_id, role in rows if household_id is not None}
+    return Membership(user_id, rows[0][0], roles)
+
+
+def get_membership(user_id):
+    """
+    Get a user's households and roles, from the cache when possible.
+
+    Args:
+        user_id: User ID (int or the string JWT identity)
+
+    Returns:
+        Membership, or None if the user does not exist
+    """
+    if user_id is None:
+        return None
+    user_id = int(user_id)
+    membership = CACHE.get(user_id) if CACHE.enabled else None
+    if membership is None:
+        membership = _load_membership(user_id)
+        if membership is not None:
+            CACHE.set(membership)
+    return membership
+
+
+def invalidate_user(*user_ids):
+    """Forget cached membership for the given users (call after commit)."""
+    CACHE.invalidate(*user_ids)
+
+
+def invalidate_household(household_id):
+    """Forget cached membership for every user of ``household_id``."""
+    CACHE.invalidate_household(household_id)
+
+
+def household_member_required(role=None, message=None):
+    """
+    Route decorator: allow only members (or ``role`` holders) of the household.
+
+    The household comes from the ``household_id`` URL argument, falling back to
+    the JWT ``household_id`` claim. Must sit below ``@jwt_required()``. On a
+    cache hit no query is issued; the membership is left on ``g.membership``.
+
+    Args:
+        role: Required role, e.g. ``"owner"``; any member passes when None
+        message: Error text for the 403 response
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            household_id = kwargs.get("household_id")
+            if household_id is None:
+                household_id = get_jwt().get("household_id")
+            membership = get_membership(get_jwt_identity())
+            if membership is None:
+                return jsonify({"error": "User not found"}), 404
+
+            held = membership.roles.get(household_id)
+            if held is None or (role is not None and held != role):
+                # Keep "not found" distinct from "forbidden"; only denials pay for this
+                if household_id is not None and db.session.get(Household, household_id) is None:
+                    return jsonify({"error": "Household not found"}), 404
+                return jsonify({"error": message or "Access denied - you are not a member of this household"}), 403
+
+            g.membership = membership
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,408 @@
+# backend/utils/metrics.py
+"""
+In-process metrics with Prometheus text exposition at ``/metrics``.
+
+Every thread records into its own shard, so the request path never takes a lock;
+shards are merged when ``/metrics`` is scraped. Under gunicorn, set
+PROMETHEUS_MULTIPROC_DIR and use ``gunicorn.conf.py``: a background thread in each
+worker writes its merged snapshot to ``<dir>/metrics_<pid>.json`` and a scrape on any
+worker sums all of them. Counters and histograms of exited workers are kept;
+their gauges are dropped.
+
+A scrape must send ``Authorization: Bearer <METRICS_TOKEN>``. With no token
+configured, ``/metrics`` answers 403.
+"""
+import atexit
+import functools
+import hmac
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from flask import Response, g, jsonify, request
+from sqlalchemy import event
+from backend.database import db
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+POOL_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+
+class _Registry:
+    """Holds metric definitions and the per-thread value shards."""
+
+    def __init__(self):
+        self.metrics = {}
+        self.multiproc_dir = None
+        self.flush_interval = 1.0
+        self._local = threading.local()
+        self._shards = []
+        self._retired = {}
+        self._lock = threading.Lock()
+        self._last_flush = 0.0
+        self._flusher_pid = None
+
+    def register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def shard(self):
+        """Return the calling thread's value dict, creating it on first use."""
+        try:
+            return self._local.values
+        except AttributeError:
+            values = self._local.values = {}
+            with self._lock:
+                self._retire_dead_shards()
+                self._shards.append((threading.current_thread(), values))
+            return values
+
+    def reset(self):
+        """Drop all recorded values (definitions are kept)."""
+        self._local = threading.local()
+        self._shards = []
+        self._retired = {}
+        # After a fork the old lock may be held by a thread that no longer exists
+        self._lock = threading.Lock()
+        self._last_flush = 0.0
+        self._flusher_pid = None
+
+    def _retire_dead_shards(self):
+        # Thread-per-request servers would otherwise grow the shard list forever
+        live = []
+        for thread, values in self._shards:
+            if thread.is_alive():
+                live.append((thread, values))
+            else:
+                _merge(self._retired, values)
+        self._shards = live
+
+    def collect(self):
+        """Merge every thread shard into one ``{(name, labels): value}`` dict."""
+        with self._lock:
+            self._retire_dead_shards()
+            merged = _merge({}, self._retired)
+            for _, values in self._shards:
+                _merge(merged, dict(values))
+        return merged
+
+    def collect_all(self):
+        """Collect this process, plus every worker file in multi-process mode."""
+        if not self.multiproc_dir:
+            return self.collect()
+        self.flush(force=True)
+        merged = {}
+        for path in _snapshot_files(self.multiproc_dir):
+            _merge(merged, _read_snapshot(path))
+        return merged
+
+    def flush(self, force=False):
+        """Write this process's snapshot, at most once per flush interval."""
+        if not self.multiproc_dir:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_flush < self.flush_interval:
+            return
+        self._last_flush = now
+        path = os.path.join(self.multiproc_dir, f"metrics_{os.getpid()}.json")
+        _write_snapshot(path, self.collect())
+
+    def start_flusher(self):
+        """Flush in the background so idle workers still publish their last requests."""
+        if not self.multiproc_dir or self._flusher_pid == os.getpid():
+            return
+        self._flusher_pid = os.getpid()
+
+        def run():
+            while True:
+                time.sleep(self.flush_interval)
+                self.flush(force=True)
+
+        threading.Thread(target=run, name="metrics-flusher", daemon=True).start()
+
+
+REGISTRY = _Registry()
+# A forked worker (gunicorn --preload included) must not re-report whatever its
+# parent had recorded, nor inherit its lock or flusher thread
+os.register_at_fork(after_in_child=REGISTRY.reset)
+
+
+def _merge(into, values):
+    for key, value in values.items():
+        if isinstance(value, list):
+            current = into.get(key)
+            if current is None:
+                into[key] = list(value)
+            else:
+                for i, v in enumerate(value):
+                    current[i] += v
+        else:
+            into[key] = into.get(key, 0) + value
+    return into
+
+
+def _snapshot_files(directory):
+    return [
+        os.path.join(directory, name)
+        for name in os.listdir(directory)
+        if name.startswith("metrics_") and name.endswith(".json")
+    ]
+
+
+def _read_snapshot(path):
+    try:
+        with open(path) as f:
+            entries = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return {(name, tuple(labels)): value for name, labels, value in entries}
+
+
+def _write_snapshot(path, values):
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump([[name, list(labels), value] for (name, labels), value in values.items()], f)
+    os.replace(tmp, path)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=(), registry=REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        registry.register(self)
+
+    def _key(self, labels):
+        return (self.name, tuple(str(labels[name]) for name in self.labelnames))
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        values = REGISTRY.shard()
+        key = self._key(labels)
+        values[key] = values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """Up/down gauge; per-thread deltas sum to the current value."""
+    kind = "gauge"
+
+    def inc(self, amount=1, **labels):
+        values = REGISTRY.shard()
+        key = self._key(labels)
+        values[key] = values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """Bucket counts (last slot is +Inf) followed by the running sum."""
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS, registry=REGISTRY):
+        super().__init__(name, documentation, labelnames, registry)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        values = REGISTRY.shard()
+        key = self._key(labels)
+        slots = values.get(key)
+        if slots is None:
+            slots = values[key] = [0] * (len(self.buckets) + 2)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                slots[i] += 1
+                break
+        else:
+            slots[len(self.buckets)] += 1
+        slots[-1] += value
+
+
+REQUEST_COUNT = Counter(
+    "patriot_http_requests_total", "HTTP requests by endpoint, method and status",
+    ("endpoint", "method", "status"),
+)
+REQUEST_LATENCY = Histogram(
+    "patriot_http_request_duration_seconds", "HTTP request latency by endpoint",
+    ("endpoint", "method"),
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "patriot_http_requests_in_flight", "HTTP requests currently being served", ("endpoint",),
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "patriot_db_pool_checkout_wait_seconds", "Time spent waiting for a pooled DB connection",
+    ("bind",), buckets=POOL_BUCKETS,
+)
+FORECAST_DURATION = Histogram(
+    "patriot_forecast_compute_seconds", "Forecast and bill schedule computation time", ("function",),
+)
+JOB_DURATION = Histogram(
+    "patriot_job_duration_seconds", "Duration of recurring/autopay processing jobs", ("job",),
+)
+
+
+@contextmanager
+def time_block(histogram, **labels):
+    """Observe the wall time of the enclosed block on ``histogram``."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(time.perf_counter() - start, **labels)
+
+
+def timed(histogram, **labels):
+    """Decorator form of :func:`time_block`."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with time_block(histogram, **labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _format_value(value):
+    if isinstance(value, float) and math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def render(values=None, registry=REGISTRY):
+    """Render collected values in the Prometheus text exposition format."""
+    if values is None:
+        values = registry.collect_all()
+    by_metric = {}
+    for (name, labels), value in values.items():
+        by_metric.setdefault(name, []).append((labels, value))
+
+    lines = []
+    for name, metric in registry.metrics.items():
+        lines.append(f"# HELP {name} {metric.documentation}")
+        lines.append(f"# TYPE {name} {metric.kind}")
+        for labels, value in sorted(by_metric.get(name, [])):
+            if metric.kind != "histogram":
+                lines.append(f"{name}{_format_labels(metric.labelnames, labels)} {_format_value(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip(metric.buckets + (math.inf,), value[:-1]):
+                cumulative += count
+                le = _format_labels(metric.labelnames, labels, [("le", _format_value(float(bound)))])
+                lines.append(f"{name}_bucket{le} {cumulative}")
+            plain = _format_labels(metric.labelnames, labels)
+            lines.append(f"{name}_sum{plain} {_format_value(float(value[-1]))}")
+            lines.append(f"{name}_count{plain} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+def mark_process_dead(pid, directory=None):
+    """
+    Fold an exited worker's counters and histograms into the retired snapshot.
+
+    Call from gunicorn's ``child_exit`` hook; gauges of the dead worker are dropped.
+    """
+    directory = directory or os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if not directory:
+        return
+    path = os.path.join(directory, f"metrics_{pid}.json")
+    if not os.path.exists(path):
+        return
+    gauges = {name for name, metric in REGISTRY.metrics.items() if metric.kind == "gauge"}
+    values = {key: value for key, value in _read_snapshot(path).items() if key[0] not in gauges}
+    retired_path = os.path.join(directory, "metrics_retired.json")
+    _write_snapshot(retired_path, _merge(_read_snapshot(retired_path), values))
+    os.remove(path)
+
+
+def clear_multiprocess_dir(directory=None):
+    """Remove snapshots left over from a previous server run."""
+    directory = directory or os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if not directory:
+        return
+    os.makedirs(directory, exist_ok=True)
+    for path in _snapshot_files(directory):
+        os.remove(path)
+
+
+def _instrument_pool(engine, bind):
+    """Time ``pool.connect()`` - the wait for a free (or new) connection."""
+    pool = engine.pool
+    connect = pool.connect
+
+    def timed_connect():
+        start = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start, bind=bind)
+
+    pool.connect = timed_connect
+
+
+def init_metrics(app):
+    """Register request hooks, pool instrumentation and the /metrics endpoint."""
+    if not app.config.get("METRICS_ENABLED", True):
+        return
+
+    REGISTRY.multiproc_dir = app.config.get("METRICS_MULTIPROC_DIR")
+    REGISTRY.flush_interval = app.config.get("METRICS_FLUSH_INTERVAL", 1.0)
+    if REGISTRY.multiproc_dir:
+        os.makedirs(REGISTRY.multiproc_dir, exist_ok=True)
+        atexit.register(REGISTRY.flush, force=True)
+
+    with app.app_context():
+        for bind, engine in db.engines.items():
+            name = bind or "default"
+            _instrument_pool(engine, name)
+            # dispose() swaps in a fresh pool, which needs wrapping again
+            event.listen(engine, "engine_disposed",
+                         lambda eng, name=name: _instrument_pool(eng, name))
+
+    @app.before_request
+    def _start_request_metrics():
+        g.metrics_endpoint = request.endpoint or "unmatched"
+        g.metrics_start = time.perf_counter()
+        REQUESTS_IN_FLIGHT.inc(endpoint=g.metrics_endpoint)
+
+    @app.after_request
+    def _record_status(response):
+        g.metrics_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def _finish_request_metrics(exc):
+        start = g.pop("metrics_start", None)
+        if start is None:
+            return
+        endpoint = g.metrics_endpoint
+        REQUESTS_IN_FLIGHT.dec(endpoint=endpoint)
+        REQUEST_LATENCY.observe(time.perf_counter() - start, endpoint=endpoint, method=request.method)
+        REQUEST_COUNT.inc(endpoint=endpoint, method=request.method, status=g.get("metrics_status", 500))
+        REGISTRY.start_flusher()
+
+    @app.route("/metrics")
+    def metrics():
+        token = app.config.get("METRICS_TOKEN")
+        if not token:
+            return jsonify({"error": "METRICS_TOKEN is not configured"}), 403
+        sent = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        if not hmac.compare_digest(sent.encode(), token.encode()):
+            return jsonify({"error": "invalid metrics token"}), 401
+        return Response(render(), mimetype="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,229 @@
+# backend/utils/money.py
+"""
+Exact money: whole cents in the database and in arithmetic.
+
+Every money column is a :class:`MoneyType` (BIGINT cents) and loads as a
+:class:`Money`, a small immutable value holding an ``int``. Anything else that
+meets a ``Money`` -- a bound parameter, the other side of ``+`` or ``<`` -- is
+read as dollars, so ``Account.balance + 12.5``, ``fund.balance < amount`` and
+``amount > 0`` keep meaning what they did with Numeric and Float columns.
+Equality is exact, as it was for the Numeric columns' Decimals: a ``Money``
+equals a number only if that number is exactly its dollar value, so
+``Money('0.10') == Decimal('0.10')`` but not ``== 0.1``, and equal values hash
+equal.
+
+Request input is converted once with :meth:`Money.parse`; from there sums,
+balances and forecasts are integer additions. ``float(money)`` gives dollars for
+JSON, and a bare ``Money`` serializes as a ``"12.34"`` string, the way the old
+Numeric columns' Decimals did.
+"""
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import BigInteger, Integer
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.functions import ReturnTypeFromArgs
+from sqlalchemy.types import TypeDecorator
+
+_CENT = Decimal(1)
+_SCALING = (operators.mul, operators.truediv, operators.floordiv, operators.mod)
+
+
+def to_cents(value):
+    """
+    Whole cents for a dollar amount.
+
+    Args:
+        value: Money, int, float, Decimal or numeric string, in dollars
+
+    Returns:
+        int: cents, rounded half up
+
+    Raises:
+        ValueError: value is not a finite number
+        TypeError: value is not a number or string
+    """
+    kind = type(value)
+    if kind is Money:
+        return value.cents
+    if kind is int:
+        return value * 100
+    if kind is float or isinstance(value, float):
+        scaled = value * 100
+        if scaled - scaled != 0:
+            raise ValueError(f"invalid amount: {value!r}")  # NaN or infinity
+        nearest = round(scaled)
+        if -1e-6 < scaled - nearest < 1e-6:
+            return nearest  # already a whole number of cents, give or take binary noise
+        value = Decimal(repr(float(value)))
+    elif isinstance(value, str):
+        try:
+            value = Decimal(value.strip())
+        except InvalidOperation:
+            raise ValueError(f"invalid amount: {value!r}") from None
+    elif isinstance(value, bool):
+        raise TypeError("booleans are not money")
+    elif isinstance(value, int):
+        return int(value) * 100
+    elif not isinstance(value, Decimal):
+        raise TypeError(f"cannot convert {type(value).__name__} to money")
+    if not value.is_finite():
+        raise ValueError(f"invalid amount: {value}")
+    return int((value * 100).quantize(_CENT, rounding=ROUND_HALF_UP))
+
+
+def _half_even_div(cents, divisor):
+    quotient, remainder = divmod(cents, divisor)
+    twice = 2 * remainder
+    if twice > divisor or (twice == divisor and quotient % 2):
+        quotient += 1
+    return quotient
+
+
+class Money:
+    """An amount of money as whole cents."""
+
+    __slots__ = ("cents",)
+
+    def __init__(self, cents=0):
+        self.cents = cents
+
+    @classmethod
+    def parse(cls, value):
+        """Money from a dollar amount (see :func:`to_cents`)."""
+        return value if isinstance(value, Money) else cls(to_cents(value))
+
+    def __float__(self):
+        return self.cents / 100
+
+    def __str__(self):
+        sign = "-" if self.cents < 0 else ""
+        dollars, cents = divmod(abs(self.cents), 100)
+        return f"{sign}{dollars}.{cents:02d}"
+
+    def __repr__(self):
+        return f"Money('{self}')"
+
+    def __format__(self, spec):
+        return format(self.cents / 100, spec) if spec else str(self)
+
+    def __bool__(self):
+        return self.cents != 0
+
+    def _dollars(self):
+        return Decimal(self.cents).scaleb(-2)
+
+    def __hash__(self):
+        # Same hash as an equal int or Decimal: Money(100) == 1 == Decimal('1.00')
+        if self.cents % 100 == 0:
+            return hash(self.cents // 100)
+        return hash(self._dollars())
+
+    def __eq__(self, other):
+        if isinstance(other, Money):
+            return self.cents == other.cents
+        if isinstance(other, (int, float, Decimal)):
+            return self._dollars() == other
+        return NotImplemented
+
+    def __lt__(self, other):
+        return self.cents < to_cents(other)
+
+    def __le__(self, other):
+        return self.cents <= to_cents(other)
+
+    def __gt__(self, other):
+        return self.cents > to_cents(other)
+
+    def __ge__(self, other):
+        return self.cents >= to_cents(other)
+
+    def __neg__(self):
+        return Money(-self.cents)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return self if self.cents >= 0 else Money(-self.cents)
+
+    def __add__(self, other):
+        if type(other) is Money:
+            return Money(self.cents + other.cents)
+        return Money(self.cents + to_cents(other))
+
+    __radd__ = __add__  # sum() starts from 0
+
+    def __sub__(self, other):
+        if type(other) is Money:
+            return Money(self.cents - other.cents)
+        return Money(self.cents - to_cents(other))
+
+    def __rsub__(self, other):
+        return Money(to_cents(other) - self.cents)
+
+    def __mul__(self, factor):
+        if isinstance(factor, int):
+            return Money(self.cents * factor)
+        return Money(round(self.cents * factor))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        """Money / Money is a plain ratio; Money / number is Money, rounded half even."""
+        if isinstance(other, Money):
+            return self.cents / other.cents
+        if isinstance(other, int):
+            if other < 0:
+                return Money(_half_even_div(-self.cents, -other))
+            return Money(_half_even_div(self.cents, other))
+        return Money(round(self.cents / other))
+
+    def __round__(self, ndigits=None):
+        """Money rounded half even to ``ndigits`` decimal places (whole dollars by default)."""
+        return Money(round(self.cents, (ndigits or 0) - 2))
+
+
+class MoneyType(TypeDecorator):
+    """BIGINT column of cents that reads and writes :class:`Money`; other values bind as dollars."""
+
+    impl = BigInteger
+    cache_ok = True
+
+    @property
+    def python_type(self):
+        return Money
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else to_cents(value)
+
+    def process_result_value(self, value, dialect):
+        # SUM() comes back as NUMERIC on PostgreSQL
+        return None if value is None else Money(int(value))
+
+    def coerce_compared_value(self, op, value):
+        # amount * 2 scales by a plain number; amount + 2 and amount > 2 are dollars
+        if op in _SCALING:
+            return Integer()
+        return self
+
+
+class _abs(ReturnTypeFromArgs):
+    """Registers ``func.abs()`` as type-preserving, so ``abs(amount)`` still loads as Money."""
+
+    name = "abs"
+    inherit_cache = True
+
+
+class MoneyJSONProvider(DefaultJSONProvider):
+    """JSON provider that writes Money the way Decimal was written."""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, Money):
+            return str(o)
+        return DefaultJSONProvider.default(o)
+
+
+def init_money(app):
+    """Serialize Money in jsonify() responses."""
+    app.json = MoneyJSONProvider(app)
@@ -0,0 +1,164 @@
+# backend/utils/passwords.py
+"""
+Password hashing off the request thread.
+
+bcrypt runs in a small process pool (PASSWORD_HASH_WORKERS processes, started
+on first use in each worker), so a burst of logins uses at most that many cores
+and leaves the rest to other requests. At most PASSWORD_HASH_QUEUE hashes may
+be in flight per process; beyond that callers wait up to PASSWORD_HASH_TIMEOUT
+seconds and then get :class:`HasherBusy` (the routes answer 503).
+
+Hashes use BCRYPT_LOG_ROUNDS, the same setting Flask-Bcrypt reads, and
+:func:`needs_rehash` tells the login route when a stored hash was made with a
+different cost.
+"""
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import bcrypt
+
+# bcrypt only looks at the first 72 bytes; older bcrypt releases truncated
+# silently, newer ones raise, so truncate here to keep existing hashes valid
+_MAX_PASSWORD_BYTES = 72
+
+
+class HasherBusy(RuntimeError):
+    """Raised when the hashing pool is saturated for longer than the timeout."""
+
+
+def _encode(password):
+    if isinstance(password, str):
+        password = password.encode("utf-8")
+    return password[:_MAX_PASSWORD_BYTES]
+
+
+def _hash(password, rounds):
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds)).decode("utf-8")
+
+
+def _verify(password, hashed):
+    try:
+        return bcrypt.checkpw(password, hashed)
+    except ValueError:  # not a bcrypt hash
+        return False
+
+
+class PasswordHasher:
+    """bcrypt hashing and verification on a bounded process pool."""
+
+    def __init__(self, rounds=12, workers=None, queue=None, timeout=5.0):
+        self.configure(rounds, workers, queue, timeout)
+        self._executor = None
+        self._executor_pid = None
+        self._lock = threading.Lock()
+
+    def configure(self, rounds=12, workers=None, queue=None, timeout=5.0):
+        self.rounds = rounds
+        # 0 runs bcrypt inline on the calling thread
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.queue = queue or max(self.workers, 1) * 4
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(self.queue)
+
+    def _pool(self):
+        # A forked gunicorn worker must not reuse its parent's pool
+        if self._executor is None or self._executor_pid != os.getpid():
+            with self._lock:
+                if self._executor is None or self._executor_pid != os.getpid():
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                    self._executor_pid = os.getpid()
+        return self._executor
+
+    def _run(self, fn, *args):
+        if self.workers <= 0:
+            return fn(*args)
+        if not self._slots.acquire(timeout=self.timeout):
+            raise HasherBusy("password hashing pool is saturated")
+        try:
+            try:
+                return self._pool().submit(fn, *args).result()
+            except BrokenProcessPool:
+                # A pool process died (OOM kill, etc.); start a fresh pool once
+                with self._lock:
+                    self._executor = None
+                return self._pool().submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    def hash(self, password):
+        """Return a bcrypt hash (str) of ``password`` at the configured cost."""
+        return self._run(_hash, _encode(password), self.rounds)
+
+    def verify(self, hashed, password):
+        """Return True if ``password`` matches the stored ``hashed`` value."""
+        if not hashed:
+            return False
+        if isinstance(hashed, str):
+            hashed = hashed.encode("utf-8")
+        return self._run(_verify, _encode(password), hashed)
+
+    def needs_rehash(self, hashed):
+        """Return True if ``hashed`` was made with a cost other than the configured one."""
+        try:
+            return int(hashed.split("$")[2]) != self.rounds
+        except (AttributeError, IndexError, ValueError):
+            return True
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None and self._executor_pid == os.getpid():
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+HASHER = PasswordHasher()
+atexit.register(HASHER.shutdown)
+
+
+def init_password_hasher(app):
+    """Apply BCRYPT_LOG_ROUNDS and the PASSWORD_HASH_* settings."""
+    HASHER.shutdown()
+    HASHER.configure(
+        rounds=app.config.get("BCRYPT_LOG_ROUNDS", 12),
+        workers=app.config.get("PASSWORD_HASH_WORKERS"),
+        queue=app.config.get("PASSWORD_HASH_QUEUE"),
+        timeout=app.config.get("PASSWORD_HASH_TIMEOUT", 5.0),
+    )
+
+
+def hash_password(password):
+    """
+    Hash a password for storage.
+
+    Args:
+        password: Plain-text password
+
+    Returns:
+        bcrypt hash as a str
+    """
+    return HASHER.hash(password)
+
+
+def check_password(hashed, password):
+    """
+    Verify a password against a stored bcrypt hash.
+
+    Args:
+        hashed: Stored hash (``User.password``)
+        password: Plain-text password to check
+
+    Returns:
+        True if they match
+    """
+    return HASHER.verify(hashed, password)
+
+
+def needs_rehash(hashed):
+    """Return True if ``hashed`` should be replaced with a hash at the configured cost."""
+    return HASHER.needs_rehash(hashed)
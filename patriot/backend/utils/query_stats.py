@@ -0,0 +1,98 @@
+# backend/utils/query_stats.py
+"""
+Per-request SQL instrumentation and N+1 detection.
+
+Counts queries and total SQL time for every request, adds them to the response as
+``X-Query-Count`` and ``Server-Timing`` headers, and flags statements that repeat
+more than QUERY_REPEAT_THRESHOLD times within one request - the signature of an
+N+1 pattern such as lazy-loading ``Transaction.created_by`` inside a loop.
+"""
+import logging
+import re
+import time
+from collections import Counter
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from backend.database import db
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_IN_LIST = re.compile(r"\(\s*(?:\?|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%\(\w+\)s|:\w+))*\s*\)")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+class RepeatedQueryError(RuntimeError):
+    """Raised in test mode when a request repeats a statement too often."""
+
+
+def fingerprint(statement):
+    """Normalize a SQL statement so repeats with different parameters match."""
+    statement = _LITERAL.sub("?", statement)
+    statement = _IN_LIST.sub("(?)", statement)
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context():
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if not has_request_context() or not conn.info.get("query_start_time"):
+        return
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    stats = g.get("query_stats")
+    if stats is None:
+        return
+    stats["count"] += 1
+    stats["duration"] += elapsed
+    # A repeated executemany is a bulk write in batches, not an N+1
+    if not executemany:
+        stats["fingerprints"][fingerprint(statement)] += 1
+
+
+def init_query_stats(app):
+    """Hook the per-request query counter into the app and its engines."""
+    if not app.config.get("QUERY_STATS_ENABLED", True):
+        return
+
+    threshold = app.config.get("QUERY_REPEAT_THRESHOLD", 10)
+    raise_on_repeat = app.config.get("QUERY_REPEAT_RAISE") or app.config.get("TESTING", False)
+
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+    @app.before_request
+    def _start_query_stats():
+        g.query_stats = {"count": 0, "duration": 0.0, "fingerprints": Counter()}
+
+    @app.after_request
+    def _report_query_stats(response):
+        stats = g.get("query_stats")
+        if stats is None:
+            return response
+
+        response.headers["X-Query-Count"] = str(stats["count"])
+        response.headers.add(
+            "Server-Timing", f'db;dur={stats["duration"] * 1000:.2f};desc="{stats["count"]} queries"'
+        )
+
+        repeated = [
+            (statement, count)
+            for statement, count in stats["fingerprints"].most_common()
+            if count > threshold
+        ]
+        if repeated:
+            statement, count = repeated[0]
+            message = (
+                f"Possible N+1 on {request.method} {request.path}: statement ran {count} times "
+                f"(threshold {threshold}): {statement[:300]}"
+            )
+            if raise_on_repeat:
+                raise RepeatedQueryError(message)
+            logger.warning(message)
+
+        return response
@@ -0,0 +1,253 @@
+# backend/utils/search.py
+"""
+Full-text search over transactions (live and archived) and income.
+
+SQLite gets a contentless FTS5 table per searchable table (``transactions_fts``,
+``incomes_fts``, ``transactions_archive_fts``), PostgreSQL a ``search_vector``
+tsvector column with a GIN index. Either way triggers keep the index in step with every INSERT, UPDATE and
+DELETE, so no application code has to remember to reindex.
+
+The FTS5 tables also index the owning household as a ``household`` token
+(``h<id>``, weight 0 in the ranking), so a search reads only the posting lists
+of that household and the query terms instead of filtering every match in the
+database. Each query term is a prefix match; results are ordered by bm25 (or
+ts_rank_cd on PostgreSQL), best first. Other databases fall back to an unindexed
+LIKE scan that matches prefixes of space-separated words, newest first.
+
+The DDL runs after ``db.create_all()`` (see :func:`init_search`); migrations
+carry their own frozen copies of it. ``flask rebuild-search`` repopulates the
+indexes.
+"""
+import re
+from contextlib import contextmanager
+from sqlalchemy import event, text
+from backend.database import db
+
+# table -> (searchable columns, bm25 weights in the same order)
+SEARCHABLE = {
+    "transactions": (("description", "category"), (10.0, 4.0)),
+    "incomes": (("source", "category", "description"), (10.0, 4.0, 2.0)),
+    "transactions_archive": (("description", "category"), (10.0, 4.0)),
+}
+
+MAX_TERMS = 8
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+
+def _fts(table):
+    return f"{table}_fts"
+
+
+def _values(row, columns):
+    return ", ".join(f"coalesce({row}.{column}, '')" for column in columns) + f", 'h' || {row}.household_id"
+
+
+def _sqlite_insert(table):
+    columns, _ = SEARCHABLE[table]
+    return (f"INSERT INTO {_fts(table)}(rowid, {', '.join(columns)}, household) "
+            f"VALUES (new.id, {_values('new', columns)});")
+
+
+def sqlite_ddl(table):
+    """Statements creating the FTS5 table and its sync triggers for ``table``."""
+    columns, weights = SEARCHABLE[table]
+    fts = _fts(table)
+    names = ", ".join(columns) + ", household"
+    insert = _sqlite_insert(table)
+    delete = f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {_values('old', columns)});"
+    ranking = ", ".join(str(w) for w in weights) + ", 0.0"
+    return [
+        # Contentless: rows are read back from the base table, the index only stores postings
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({names}, content='', "
+        f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        f"INSERT INTO {fts}({fts}, rank) VALUES ('rank', 'bm25({ranking})')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN {insert} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN {delete} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {', '.join(columns)}, household_id "
+        f"ON {table} BEGIN {delete} {insert} END",
+    ]
+
+
+def postgresql_ddl(table):
+    """Statements adding the tsvector column, GIN index and sync trigger for ``table``."""
+    columns, _ = SEARCHABLE[table]
+    return [
+        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector",
+        f"CREATE INDEX IF NOT EXISTS ix_{table}_search_vector ON {table} USING gin (search_vector)",
+        f"DROP TRIGGER IF EXISTS {table}_search_vector_update ON {table}",
+        f"CREATE TRIGGER {table}_search_vector_update BEFORE INSERT OR UPDATE OF {', '.join(columns)} "
+        f"ON {table} FOR EACH ROW EXECUTE FUNCTION "
+        f"tsvector_update_trigger(search_vector, 'pg_catalog.simple', {', '.join(columns)})",
+    ]
+
+
+def drop_ddl(table, dialect):
+    if dialect == "sqlite":
+        return [f"DROP TABLE IF EXISTS {_fts(table)}"]  # triggers go with the base table
+    if dialect == "postgresql":
+        return [
+            f"DROP TRIGGER IF EXISTS {table}_search_vector_update ON {table}",
+            f"DROP INDEX IF EXISTS ix_{table}_search_vector",
+            f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector",
+        ]
+    return []
+
+
+def install(connection, tables=None):
+    """Create the search index and triggers for ``tables`` (default: all)."""
+    dialect = connection.dialect.name
+    for table in tables or SEARCHABLE:
+        statements = sqlite_ddl(table) if dialect == "sqlite" else \
+            postgresql_ddl(table) if dialect == "postgresql" else []
+        for statement in statements:
+            connection.execute(text(statement))
+
+
+def rebuild(connection, tables=None):
+    """Reindex every existing row of ``tables`` (default: all)."""
+    dialect = connection.dialect.name
+    for table in tables or SEARCHABLE:
+        columns, _ = SEARCHABLE[table]
+        if dialect == "sqlite":
+            fts = _fts(table)
+            connection.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('delete-all')"))
+            connection.execute(text(
+                f"INSERT INTO {fts}(rowid, {', '.join(columns)}, household) "
+                f"SELECT id, {_values(table, columns)} FROM {table}"
+            ))
+            connection.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('optimize')"))
+        elif dialect == "postgresql":
+            document = " || ' ' || ".join(f"coalesce({column}, '')" for column in columns)
+            connection.execute(text(f"UPDATE {table} SET search_vector = to_tsvector('pg_catalog.simple', {document})"))
+
+
+@contextmanager
+def deferred_index(connection, table, household_id):
+    """
+    Index rows inserted into ``table`` for a new household in one statement at the end.
+
+    On SQLite the per-row insert trigger is dropped for the block and recreated
+    afterwards; both are part of the surrounding transaction, so a rollback
+    brings the trigger back. Only for households whose rows are all inserted
+    inside the block. Elsewhere the triggers stay as they are.
+    """
+    if connection.dialect.name != "sqlite":
+        yield
+        return
+    columns, _ = SEARCHABLE[table]
+    fts = _fts(table)
+    connection.execute(text(f"DROP TRIGGER IF EXISTS {fts}_ai"))
+    yield
+    connection.execute(text(
+        f"INSERT INTO {fts}(rowid, {', '.join(columns)}, household) "
+        f"SELECT id, {_values(table, columns)} FROM {table} WHERE household_id = :household_id"
+    ), {"household_id": household_id})
+    connection.execute(text(f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN {_sqlite_insert(table)} END"))
+
+
+def parse_terms(query):
+    """Split user input into at most MAX_TERMS lower-cased word prefixes."""
+    return [term.lower() for term in _TERM.findall(query or "")][:MAX_TERMS]
+
+
+def _match(model, household_id, terms):
+    """FROM/WHERE clause of a household's matches: (clause, id column, rank order, parameters)."""
+    table = model.__tablename__
+    dialect = db.session.get_bind(mapper=model.__mapper__).dialect.name
+    if dialect == "sqlite":
+        fts = _fts(table)
+        match = f"household : h{int(household_id)} AND " + " AND ".join(f'"{term}"*' for term in terms)
+        return f"FROM {fts} WHERE {fts} MATCH :match", "rowid", "rank", {"match": match}
+    if dialect == "postgresql":
+        return (
+            f"FROM {table}, to_tsquery('pg_catalog.simple', :tsquery) AS q "
+            f"WHERE household_id = :household_id AND search_vector @@ q",
+            "id", "ts_rank_cd(search_vector, q) DESC, id DESC",
+            {"tsquery": " & ".join(f"{term}:*" for term in terms), "household_id": household_id},
+        )
+    return _like_match(table, household_id, terms)
+
+
+def _like_match(table, household_id, terms):
+    """Index-free stand-in for :func:`_match`: every term starts the column or a word in it."""
+    columns, _ = SEARCHABLE[table]
+    params = {"household_id": household_id}
+    conditions = []
+    for i, term in enumerate(terms):
+        escaped = term.replace("_", "!_")  # terms are \w+, so "_" is the only wildcard in them
+        params[f"start{i}"], params[f"word{i}"] = f"{escaped}%", f"% {escaped}%"
+        conditions.append("(" + " OR ".join(
+            f"lower({column}) LIKE :start{i} ESCAPE '!' OR lower({column}) LIKE :word{i} ESCAPE '!'"
+            for column in columns
+        ) + ")")
+    return (f"FROM {table} WHERE household_id = :household_id AND " + " AND ".join(conditions),
+            "id", "id DESC", params)
+
+
+def search_ids(model, household_id, terms, limit, offset=0):
+    """
+    Ids of ``model`` rows in a household matching every prefix in ``terms``, best match first.
+
+    Args:
+        model: Transaction, ArchivedTransaction or Income
+        household_id: Household to search in
+        terms: Output of :func:`parse_terms` (must not be empty)
+        limit: Rows to return
+        offset: Rows to skip
+
+    Returns:
+        list: ids in rank order
+    """
+    clause, id_column, order, params = _match(model, household_id, terms)
+    rows = db.session.execute(
+        text(f"SELECT {id_column} {clause} ORDER BY {order} LIMIT :limit OFFSET :offset"),
+        {**params, "limit": limit, "offset": offset},
+    )
+    return [row_id for (row_id,) in rows]
+
+
+def count_matches(model, household_id, query):
+    """Number of ``model`` rows in a household matching ``query``."""
+    terms = parse_terms(query)
+    if not terms:
+        return 0
+    clause, _, _, params = _match(model, household_id, terms)
+    return db.session.execute(text(f"SELECT count(*) {clause}"), params).scalar()
+
+
+def search(model, household_id, query, limit, offset=0):
+    """
+    Ranked page of ``model`` rows matching ``query``.
+
+    Returns:
+        tuple: (rows in rank order, whether more rows follow)
+    """
+    terms = parse_terms(query)
+    if not terms:
+        return [], False
+    ids = search_ids(model, household_id, terms, limit + 1, offset)
+    has_more = len(ids) > limit
+    ids = ids[:limit]
+    by_id = {row.id: row for row in model.query.filter(model.id.in_(ids))} if ids else {}
+    return [by_id[row_id] for row_id in ids if row_id in by_id], has_more
+
+
+def _after_create(target, connection, **kw):
+    tables = [t.name for t in kw.get("tables") or target.tables.values() if t.name in SEARCHABLE]
+    if tables:
+        install(connection, tables)
+
+
+def _before_drop(target, connection, **kw):
+    # PostgreSQL's column, index and trigger go with their table; FTS5 tables don't
+    if connection.dialect.name == "sqlite":
+        for table in SEARCHABLE:
+            for statement in drop_ddl(table, "sqlite"):
+                connection.execute(text(statement))
+
+
+def init_search(app):
+    """Install the search DDL whenever ``db.create_all()`` creates the searchable tables."""
+    if not event.contains(db.metadata, "after_create", _after_create):
+        event.listen(db.metadata, "after_create", _after_create)
+        event.listen(db.metadata, "before_drop", _before_drop)
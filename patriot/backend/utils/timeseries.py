@@ -0,0 +1,129 @@
+# backend/utils/timeseries.py
+"""
+Date bucketing and downsampling for /api/reports/timeseries.
+
+Buckets are labelled by their first day as an ISO date string: ``day`` is the
+date itself, ``week`` starts on Monday, ``month`` and ``quarter`` on the 1st.
+:func:`bucket_expression` computes the label in SQL so the database groups the
+rows; :func:`bucket_start` and :func:`bucket_labels` compute the same labels in
+Python to fill empty buckets. Only SQLite and PostgreSQL (``DIALECTS``) can
+bucket in SQL.
+"""
+from datetime import timedelta
+from sqlalchemy import Date, Integer, cast, func
+
+BUCKETS = ("day", "week", "month", "quarter")
+DIALECTS = ("sqlite", "postgresql")
+
+
+def bucket_expression(column, bucket, dialect):
+    """
+    SQL expression giving the bucket label of a date column.
+
+    Args:
+        column: Date column to bucket
+        bucket: One of BUCKETS
+        dialect: "sqlite" or "postgresql"
+
+    Returns:
+        SQL expression (an ISO date string on SQLite, a date on PostgreSQL)
+    """
+    if dialect == "postgresql":
+        return cast(func.date_trunc(bucket, column), Date)
+    if dialect != "sqlite":
+        raise NotImplementedError(f"timeseries buckets are not available on {dialect}")
+    if bucket == "day":
+        return func.date(column)
+    if bucket == "week":
+        # 'weekday 0' moves forward to Sunday (or stays), six days back is that week's Monday
+        return func.date(column, "weekday 0", "-6 days")
+    if bucket == "month":
+        return func.strftime("%Y-%m-01", column)
+    month = cast(func.strftime("%m", column), Integer)
+    first_month = (month - 1) // 3 * 3 + 1
+    return func.printf("%s-%02d-01", func.strftime("%Y", column), first_month)
+
+
+def bucket_start(day, bucket):
+    """First day of the bucket containing ``day``."""
+    if bucket == "day":
+        return day
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    return day.replace(month=(day.month - 1) // 3 * 3 + 1, day=1)
+
+
+def bucket_count(first, last, bucket):
+    """Number of labels :func:`bucket_labels` returns, without building them."""
+    first, last = bucket_start(first, bucket), bucket_start(last, bucket)
+    if last < first:
+        return 0
+    if bucket == "day":
+        return (last - first).days + 1
+    if bucket == "week":
+        return (last - first).days // 7 + 1
+    months = (last.year - first.year) * 12 + last.month - first.month
+    return months // (1 if bucket == "month" else 3) + 1
+
+
+def _next_start(start, bucket):
+    if bucket == "day":
+        return start + timedelta(days=1)
+    if bucket == "week":
+        return start + timedelta(days=7)
+    months = 1 if bucket == "month" else 3
+    month = start.month - 1 + months
+    return start.replace(year=start.year + month // 12, month=month % 12 + 1)
+
+
+def bucket_labels(first, last, bucket):
+    """Every bucket label from the bucket of ``first`` to the bucket of ``last``, in order."""
+    labels = []
+    current = bucket_start(first, bucket)
+    while current <= last:
+        labels.append(current.isoformat())
+        try:
+            current = _next_start(current, bucket)
+        except (OverflowError, ValueError):  # the bucket after one holding 9999-12-31
+            break
+    return labels
+
+
+def lttb(values, threshold):
+    """
+    Largest-Triangle-Three-Buckets: indices of ``threshold`` points that keep
+    the visual shape of ``values`` (plotted against their index).
+
+    Args:
+        values: y values, evenly spaced on x
+        threshold: Points to keep (at least 3)
+
+    Returns:
+        list: ascending indices, always including the first and last point
+    """
+    n = len(values)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+    selected = [0]
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        # Average of the next bucket is the third corner of the triangle
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = (next_start + next_end - 1) / 2
+        avg_y = sum(values[next_start:next_end]) / (next_end - next_start)
+
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((a - avg_x) * (values[j] - values[a]) - (a - j) * (avg_y - values[a]))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(n - 1)
+    return selected
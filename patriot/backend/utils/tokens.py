@@ -0,0 +1,96 @@
+# backend/utils/tokens.py
+"""
+Access/refresh token issuing with refresh-token rotation.
+
+Every refresh token is recorded in ``refresh_tokens`` by its ``jti``.
+:func:`rotate_refresh_token` revokes the presented token with a single
+conditional UPDATE, so of two concurrent refreshes with the same token only one
+wins; a token that is already revoked (or unknown) revokes its whole family.
+Access tokens are not looked up at all - verifying one is a signature check.
+"""
+import uuid
+from datetime import datetime
+from flask import current_app
+from flask_jwt_extended import create_access_token, create_refresh_token
+from backend.database import db
+from backend.models import RefreshToken
+
+
+def issue_tokens(user_id, household_id, family_id=None, jti=None):
+    """
+    Create an access token and a recorded refresh token for a user.
+
+    The caller commits the session.
+
+    Args:
+        user_id: User ID (token identity)
+        household_id: Current household, stored as the ``household_id`` claim
+        family_id: Rotation family to continue; a new one is started when None
+        jti: Pre-allocated jti for the refresh token
+
+    Returns:
+        tuple: (access_token, refresh_token)
+    """
+    jti = jti or str(uuid.uuid4())
+    family_id = family_id or str(uuid.uuid4())
+    claims = {"household_id": household_id}
+    expires = current_app.config["JWT_REFRESH_TOKEN_EXPIRES"]
+    access_token = create_access_token(
+        identity=str(user_id), additional_claims=claims,
+        expires_delta=current_app.config["JWT_ACCESS_TOKEN_EXPIRES"],
+    )
+    refresh_token = create_refresh_token(
+        identity=str(user_id), additional_claims={**claims, "jti": jti, "fam": family_id},
+        expires_delta=expires,
+    )
+    db.session.add(RefreshToken(
+        jti=jti, family_id=family_id, user_id=user_id,
+        issued_at=datetime.utcnow(), expires_at=datetime.utcnow() + expires,
+    ))
+    return access_token, refresh_token
+
+
+def rotate_refresh_token(jti):
+    """
+    Revoke refresh token ``jti`` in favour of a successor.
+
+    Args:
+        jti: jti of the presented refresh token
+
+    Returns:
+        The successor's jti, or None if ``jti`` was unknown or already revoked
+    """
+    successor = str(uuid.uuid4())
+    result = db.session.execute(
+        db.update(RefreshToken)
+        .where(RefreshToken.jti == jti, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow(), replaced_by=successor)
+    )
+    return successor if result.rowcount == 1 else None
+
+
+def revoke_family(family_id):
+    """Revoke every live refresh token in a rotation family."""
+    db.session.execute(
+        db.update(RefreshToken)
+        .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+    )
+
+
+def revoke_user_tokens(user_id):
+    """Revoke every live refresh token of a user (e.g. after a password reset)."""
+    db.session.execute(
+        db.update(RefreshToken)
+        .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+    )
+
+
+def purge_expired_refresh_tokens():
+    """Delete refresh-token rows past their expiry; returns the number removed."""
+    result = db.session.execute(
+        db.delete(RefreshToken).where(RefreshToken.expires_at < datetime.utcnow())
+    )
+    db.session.commit()
+    return result.rowcount